@@ -0,0 +1,189 @@
+# academia_core/actas.py
+# Carga de un acta completa (cursada de una comisión o mesa de final) en bloque.
+#
+# Todo lo que Movimiento.clean() consulta por fila se precarga una vez para el acta entera
+# (inscripciones, condiciones, un snapshot académico por estudiante con UNA query de
+# movimientos y el grafo de correlativas cacheado); después se validan las filas en memoria,
+# se insertan con un solo bulk_create y se recalculan promedios y cartón una vez.
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from . import carton, promedios
+from .estado_academico import StudentAcademicSnapshot
+from .models import (
+    Condicion,
+    EspacioCurricular,
+    EstadoInscripcion,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    InscripcionFinal,
+    Movimiento,
+)
+
+TIPOS = ("REG", "FIN")
+# campos del Movimiento que valida clean_fields() (los FK ya vienen resueltos)
+_SIN_VALIDAR = ("inscripcion", "espacio", "condicion")
+
+
+@dataclass
+class ResultadoActa:
+    creados: list[Movimiento] = field(default_factory=list)
+    validas: int = 0
+    errores: list[tuple[int, int | None, str]] = field(default_factory=list)  # fila, insc, msg
+
+    @property
+    def ok(self) -> bool:
+        return not self.errores
+
+
+def planilla(espacio_id: int, tipo: str, anio_academico: int | None = None, fecha=None):
+    """
+    Estudiantes que van en el acta: cursantes del espacio en el ciclo (REG) o
+    inscriptos a la mesa de esa fecha (FIN). Devuelve dicts listos para JSON.
+    """
+    if tipo == "FIN":
+        qs = InscripcionFinal.objects.filter(inscripcion_cursada__espacio_id=espacio_id)
+        if fecha:
+            qs = qs.filter(fecha_examen=fecha)
+        pref = "inscripcion_cursada__inscripcion"
+    else:
+        qs = InscripcionEspacio.objects.filter(
+            espacio_id=espacio_id, estado=EstadoInscripcion.EN_CURSO
+        )
+        if anio_academico:
+            qs = qs.filter(anio_academico=anio_academico)
+        pref = "inscripcion"
+    filas = (
+        qs.order_by(f"{pref}__estudiante__apellido", f"{pref}__estudiante__nombre")
+        .values_list(
+            f"{pref}_id",
+            f"{pref}__estudiante__apellido",
+            f"{pref}__estudiante__nombre",
+            f"{pref}__estudiante__dni",
+        )
+        .distinct()
+    )
+    return [
+        {"inscripcion": i, "apellido": ap, "nombre": nom, "dni": dni} for i, ap, nom, dni in filas
+    ]
+
+
+def _nota(valor) -> Decimal | None:
+    if valor in (None, ""):
+        return None
+    try:
+        return Decimal(str(valor).strip().replace(",", "."))
+    except InvalidOperation:
+        raise ValidationError(f"Nota inválida: {valor!r}.") from None
+
+
+def _bool(valor) -> bool:
+    if isinstance(valor, str):
+        return valor.strip().lower() in {"1", "true", "si", "sí", "on"}
+    return bool(valor)
+
+
+def _id(valor) -> int | None:
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def cargar_acta(
+    espacio_id: int,
+    tipo: str,
+    fecha: date,
+    filas,
+    *,
+    folio: str = "",
+    libro: str = "",
+    disposicion_interna: str = "",
+    solo_validar: bool = False,
+) -> ResultadoActa:
+    """
+    Valida todas las filas ({"inscripcion", "condicion", "nota", "nota_texto", "ausente",
+    "ausencia_justificada"}) con las mismas reglas que Movimiento.clean() y, si ninguna
+    falla, las guarda juntas. Un acta con errores no guarda nada: se corrige y se reenvía.
+    Levanta ValueError si el encabezado (espacio/tipo) no es válido.
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo de acta inválido: {tipo!r}")
+    espacio = (
+        EspacioCurricular.objects.select_related("plan", "materia").filter(pk=espacio_id).first()
+    )
+    if espacio is None:
+        raise ValueError(f"No existe el espacio {espacio_id}")
+
+    filas = list(filas)
+    ids = {i for i in (_id(f.get("inscripcion")) for f in filas) if i is not None}
+    inscripciones = EstudianteProfesorado.objects.select_related("carrera").in_bulk(ids)
+    condiciones = {c.codigo: c for c in Condicion.objects.filter(tipo=tipo)}
+    # los nombres de los requisitos faltantes salen de acá, sin una query por fila
+    espacios = {
+        e.id: e
+        for e in EspacioCurricular.objects.select_related("materia")
+        .filter(plan_id=espacio.plan_id)
+        .order_by()
+    }
+    snaps = StudentAcademicSnapshot.de_varias(inscripciones, espacios=espacios)
+
+    res = ResultadoActa()
+    vistos: set[int] = set()
+    for n, f in enumerate(filas, start=1):
+        insc_id = _id(f.get("inscripcion"))
+        try:
+            insc = inscripciones.get(insc_id)
+            if insc is None:
+                raise ValidationError("Inscripción inexistente.")
+            if insc_id in vistos:
+                raise ValidationError("El estudiante figura más de una vez en el acta.")
+            vistos.add(insc_id)
+            cond = condiciones.get((f.get("condicion") or "").strip())
+            if cond is None:
+                raise ValidationError(f"Condición inválida para el acta: {f.get('condicion')!r}.")
+            mov = Movimiento(
+                inscripcion=insc,
+                espacio=espacio,
+                tipo=tipo,
+                fecha=fecha,
+                condicion=cond,
+                nota_num=_nota(f.get("nota")),
+                nota_texto=(f.get("nota_texto") or "").strip(),
+                ausente=_bool(f.get("ausente")),
+                ausencia_justificada=_bool(f.get("ausencia_justificada")),
+                folio=folio,
+                libro=libro,
+                disposicion_interna=disposicion_interna,
+            )
+            mov.clean_fields(exclude=_SIN_VALIDAR)
+            if mov.nota_num is not None and not (0 <= mov.nota_num <= 10):
+                raise ValidationError("La nota debe estar entre 0 y 10.")
+            mov._snapshot = snaps[insc_id]
+            mov.clean()
+        except ValidationError as e:
+            res.errores.append((n, insc_id, " ".join(e.messages)))
+            continue
+        del mov._snapshot
+        res.creados.append(mov)
+
+    res.validas = len(res.creados)
+    if res.errores or solo_validar:
+        res.creados = []
+        return res
+
+    with transaction.atomic():
+        Movimiento.objects.bulk_create(res.creados)
+        # bulk_create no dispara post_save: promedio y cartón se recalculan una vez por estudiante
+        promedios.recalcular_promedios(m.inscripcion_id for m in res.creados)
+        carton.actualizar((m.inscripcion_id, m.espacio_id) for m in res.creados)
+    for m in res.creados:
+        m._promedio_previo = promedios.estado_promedio(m)
+    return res
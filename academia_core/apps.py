@@ -9,6 +9,11 @@ class AcademiaCoreConfig(AppConfig):
         # Importa las signals cuando la app se carga
         from . import signals  # noqa: F401
 
+        # Modelos/campos que usa eligibilidad: se resuelven una vez y no en cada request
+        from .enlaces_eligibilidad import resolver
+
+        resolver()
+
         # Importa los archivos admin.py para registrar los modelos
         # import academia_core.admin_config  # noqa: F401
         pass
@@ -0,0 +1,130 @@
+# academia_core/busqueda.py
+# Búsqueda de estudiantes para los typeahead: prefijo sobre columnas normalizadas
+# (sin acentos, minúscula) o sobre el DNI, paginado por keyset (apellido, nombre, id).
+#
+# Los prefijos se arman como rangos (campo >= "per" AND campo < "pes"): así usan el índice
+# B-tree en cualquier motor, sin depender de cómo traduzca cada uno el LIKE.
+
+from __future__ import annotations
+
+import base64
+import json
+
+from django import forms
+from django.apps import apps
+from django.db.models import Q
+from django.urls import reverse_lazy
+
+from .utils import normalizar
+
+LIMITE = 20
+LIMITE_MAX = 50
+ORDEN = ("apellido_norm", "nombre_norm", "id")
+
+
+def clave(s) -> str:
+    """Texto normalizado para guardar/buscar: sin acentos, minúscula, espacios simples."""
+    return " ".join(normalizar(s).replace(",", " ").split())
+
+
+def prefijo(campo: str, valor: str) -> Q:
+    return Q(**{f"{campo}__gte": valor, f"{campo}__lt": valor[:-1] + chr(ord(valor[-1]) + 1)})
+
+
+def filtro(q: str) -> Q:
+    """Q para lo tipeado: DNI (sólo dígitos) o apellido/nombre en cualquier orden."""
+    q = clave(q)
+    if not q:
+        return Q()
+    dni = q.replace(".", "").replace(" ", "")
+    if dni.isdigit():
+        return prefijo("dni", dni)
+
+    cond = prefijo("apellido_norm", q) | prefijo("nombre_norm", q)
+    palabras = q.split()
+    for i in range(1, len(palabras)):
+        a, b = " ".join(palabras[:i]), " ".join(palabras[i:])
+        cond |= prefijo("apellido_norm", a) & prefijo("nombre_norm", b)
+        cond |= prefijo("nombre_norm", a) & prefijo("apellido_norm", b)
+    return cond
+
+
+def _cursor(fila) -> str:
+    crudo = json.dumps([fila[c] for c in ORDEN], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip("=")
+
+
+def _despues_de(cursor: str) -> Q:
+    try:
+        crudo = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ape, nom, pk = json.loads(crudo)
+        pk = int(pk)
+    except (ValueError, TypeError):
+        raise ValueError("cursor inválido") from None
+    return (
+        Q(apellido_norm__gt=ape)
+        | Q(apellido_norm=ape, nombre_norm__gt=nom)
+        | Q(apellido_norm=ape, nombre_norm=nom, id__gt=pk)
+    )
+
+
+def buscar_estudiantes(
+    q: str = "",
+    cursor: str | None = None,
+    limite: int = LIMITE,
+    solo_activos: bool = True,
+    campos: tuple[str, ...] = ("id", "apellido", "nombre", "dni"),
+) -> dict:
+    """
+    Una página de estudiantes que coinciden con `q`.
+    -> {"items": [{id, apellido, nombre, dni, label, ...}], "next": cursor | None}
+    Una query por página, sin importar el tamaño de la tabla ni la página.
+    ValueError si el cursor no es válido.
+    """
+    Estudiante = apps.get_model("academia_core", "Estudiante")
+    limite = max(1, min(int(limite or LIMITE), LIMITE_MAX))
+
+    qs = Estudiante.objects.filter(filtro(q))
+    if solo_activos:
+        qs = qs.filter(activo=True)
+    if cursor:
+        qs = qs.filter(_despues_de(cursor))
+    filas = list(qs.order_by(*ORDEN).values(*dict.fromkeys(campos + ORDEN))[: limite + 1])
+
+    siguiente = _cursor(filas[limite - 1]) if len(filas) > limite else None
+    items = []
+    for f in filas[:limite]:
+        item = {c: f[c] for c in campos}
+        item["label"] = f"{f['apellido']}, {f['nombre']} — DNI {f['dni']}"
+        items.append(item)
+    return {"items": items, "next": siguiente}
+
+
+class EstudianteSelect(forms.Select):
+    """
+    Select de estudiantes que sólo renderiza el elegido: las opciones las trae el
+    typeahead (ui/js/estudiante_typeahead.js) desde ui:api_estudiantes_buscar.
+    El campo sigue validando contra su queryset (una query por pk).
+    """
+
+    def __init__(self, attrs=None):
+        base = {
+            "data-typeahead": "estudiantes",
+            "data-url": reverse_lazy("ui:api_estudiantes_buscar"),
+        }
+        super().__init__({**base, **(attrs or {})})
+
+    def optgroups(self, name, value, attrs=None):
+        field = getattr(self.choices, "field", None)
+        if field is None:
+            return super().optgroups(name, value, attrs)
+        elegidos = [v for v in value if str(v).isdigit()]
+        opciones = [("", field.empty_label)] if field.empty_label is not None else []
+        opciones += [
+            (o.pk, field.label_from_instance(o)) for o in field.queryset.filter(pk__in=elegidos)
+        ]
+        todas, self.choices = self.choices, opciones
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = todas
@@ -0,0 +1,300 @@
+# academia_core/carton.py
+# Cartón (trayectoria) materializado en CartonFila: una fila por (inscripción, espacio).
+#
+# Cada alta/edición/baja de Movimiento, InscripcionEspacio o InscripcionFinal recalcula sólo
+# su par (inscripción, espacio) al confirmar la transacción, con tres queries acotadas y un
+# upsert; las cargas masivas (actas) llaman a `actualizar()` con todos sus pares juntos y
+# `reconstruir()` rearma todo por lotes de inscripciones. Las vistas leen el cartón con una sola query indexada.
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+from functools import reduce
+from operator import or_
+
+from django.apps import apps as registro_global
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .estado_academico import VIGENCIA_REGULARIDAD, MovimientoSnap
+
+CAMPOS = (
+    "estado",
+    "nota",
+    "nota_texto",
+    "fecha_aprobacion",
+    "fecha_regularidad",
+    "regular_hasta",
+    "intentos_final",
+    "ultimo_final",
+    "mesa_inscripta",
+    "anio_cursada",
+    "actualizado",
+)
+LOTE = 500
+_RINDIO = {"APROBADO", "DESAPROBADO"}
+
+
+def _modelo(registro, nombre):
+    return (registro or registro_global).get_model("academia_core", nombre)
+
+
+# ---------- lectura de la actividad ----------
+def _actividad(filtro: Q, filtro_final: Q, registro=None):
+    """{(insc, espacio): [movimientos, cursadas, finales]} con tres queries."""
+    Movimiento = _modelo(registro, "Movimiento")
+    InscripcionEspacio = _modelo(registro, "InscripcionEspacio")
+    InscripcionFinal = _modelo(registro, "InscripcionFinal")
+
+    datos: dict[tuple[int, int], list[list]] = defaultdict(lambda: [[], [], []])
+    movs = (
+        Movimiento.objects.filter(filtro)
+        .order_by("fecha", "id")
+        .values_list(
+            "inscripcion_id",
+            "id",
+            "espacio_id",
+            "tipo",
+            "condicion_id",
+            "fecha",
+            "nota_num",
+            "nota_texto",
+            "ausente",
+            "ausencia_justificada",
+        )
+    )
+    for insc_id, *resto in movs:
+        m = MovimientoSnap(*resto)
+        datos[insc_id, m.espacio_id][0].append(m)
+    cursadas = InscripcionEspacio.objects.filter(filtro).values_list(
+        "inscripcion_id", "espacio_id", "anio_academico", "estado"
+    )
+    for insc_id, esp_id, anio, estado in cursadas.order_by():
+        datos[insc_id, esp_id][1].append((anio, estado))
+    finales = InscripcionFinal.objects.filter(filtro_final).values_list(
+        "inscripcion_cursada__inscripcion_id",
+        "inscripcion_cursada__espacio_id",
+        "fecha_examen",
+        "estado",
+        "nota_final",
+        "ausente",
+        "ausencia_justificada",
+    )
+    for insc_id, esp_id, *resto in finales.order_by():
+        datos[insc_id, esp_id][2].append(tuple(resto))
+    return datos
+
+
+# ---------- cálculo de una fila ----------
+def calcular(movs: list[MovimientoSnap], cursadas, finales, hoy: date | None = None) -> dict | None:
+    """
+    Campos de CartonFila a partir de la actividad de un par, o None si no hay nada.
+    `movs` ordenados por fecha; `cursadas` = [(anio, estado)];
+    `finales` = [(fecha_examen, estado, nota_final, ausente, ausencia_justificada)].
+    Una regularidad vencida a `hoy` queda LIBRE (ver vencimientos.vencer).
+    """
+    if not (movs or cursadas or finales):
+        return None
+    fila = dict.fromkeys(CAMPOS[:-1])
+    fila.update(nota_texto="", intentos_final=0)
+
+    # aprobación: la primera (por fecha) entre movimientos y actas de final
+    aprobaciones = [(m.fecha, m.nota_num, m.nota_texto) for m in movs if m.aprueba]
+    aprobaciones += [
+        (f, nota, "")
+        for f, estado, nota, *_ in finales
+        if estado == "APROBADO" and (nota or 0) >= 6
+    ]
+    if aprobaciones:
+        fecha, nota, texto = min(aprobaciones, key=lambda a: a[0] or date.max)
+        fila.update(fecha_aprobacion=fecha, nota=nota, nota_texto=texto)
+
+    regs = [m for m in movs if m.tipo == "REG"]
+    regulariza = [m for m in regs if m.regulariza]
+    if regulariza and regulariza[-1].fecha:
+        fila["fecha_regularidad"] = regulariza[-1].fecha
+    # mismo criterio que StudentAcademicSnapshot.vigentes: el último Regular + 2 años
+    regulares = [m.fecha for m in regs if m.codigo == "REGULAR" and m.fecha]
+    if regulares:
+        fila["regular_hasta"] = max(regulares) + VIGENCIA_REGULARIDAD
+
+    # finales rendidos (sin ausencias justificadas), una vez por fecha
+    rendidos = {
+        m.fecha for m in movs if m.tipo == "FIN" and not (m.ausente and m.ausencia_justificada)
+    }
+    rendidos |= {
+        f
+        for f, estado, _nota, ausente, justificada in finales
+        if estado in _RINDIO or (ausente and not justificada)
+    }
+    fila["intentos_final"] = len(rendidos)
+    fila["ultimo_final"] = max((f for f in rendidos if f), default=None)
+    fila["mesa_inscripta"] = max(
+        (f for f, e, _n, ausente, _j in finales if e == "INSCRIPTO" and not ausente), default=None
+    )
+    fila["anio_cursada"] = max((anio for anio, _e in cursadas), default=None)
+
+    if aprobaciones:
+        estado = "APROBADA"
+    elif (
+        regulariza
+        and not (regs[-1].codigo or "").startswith("LIBRE")
+        and (fila["regular_hasta"] or date.max) >= (hoy or timezone.localdate())
+    ):
+        estado = "REGULAR"
+    elif movs:
+        estado = "LIBRE"
+    elif any(e == "EN_CURSO" for _a, e in cursadas):
+        estado = "CURSANDO"
+    elif cursadas:
+        estado = "BAJA"
+    else:  # sólo inscripción a mesa
+        estado = "LIBRE"
+    fila["estado"] = estado
+    return fila
+
+
+# ---------- escritura ----------
+def _filas(datos, registro=None):
+    CartonFila = _modelo(registro, "CartonFila")
+    hoy = timezone.localdate()
+    filas = []
+    for (insc_id, esp_id), (movs, cursadas, finales) in datos.items():
+        campos = calcular(movs, cursadas, finales, hoy)
+        if campos is not None:
+            filas.append(CartonFila(inscripcion_id=insc_id, espacio_id=esp_id, **campos))
+    return filas
+
+
+def actualizar(pares: Iterable[tuple[int | None, int | None]]) -> int:
+    """Recalcula las filas de los pares (inscripción, espacio) dados. Devuelve cuántas
+    quedaron escritas (las de pares sin actividad se borran)."""
+    from .models import CartonFila
+
+    pares = {(i, e) for i, e in pares if i and e}
+    if not pares:
+        return 0
+    insc_ids = {i for i, _e in pares}
+    esp_ids = {e for _i, e in pares}
+    datos = _actividad(
+        Q(inscripcion_id__in=insc_ids, espacio_id__in=esp_ids),
+        Q(
+            inscripcion_cursada__inscripcion_id__in=insc_ids,
+            inscripcion_cursada__espacio_id__in=esp_ids,
+        ),
+    )
+    filas = [f for f in _filas(datos) if (f.inscripcion_id, f.espacio_id) in pares]
+    vacios = pares - {(f.inscripcion_id, f.espacio_id) for f in filas}
+    with transaction.atomic():
+        if vacios:
+            CartonFila.objects.filter(
+                reduce(or_, (Q(inscripcion_id=i, espacio_id=e) for i, e in vacios))
+            ).delete()
+        CartonFila.objects.bulk_create(
+            filas,
+            update_conflicts=True,
+            unique_fields=["inscripcion", "espacio"],
+            update_fields=list(CAMPOS),
+        )
+    return len(filas)
+
+
+def al_confirmar(pares: Iterable[tuple[int | None, int | None]]) -> None:
+    """actualizar() cuando se confirme la transacción en curso (en autocommit, ya): no
+    suma queries a la escritura y un rollback no deja filas con datos descartados."""
+    pares = set(pares)
+    transaction.on_commit(lambda: actualizar(pares))
+
+
+def al_confirmar_final(cursada_id: int) -> None:
+    """Ídem para una mesa final: el par sale de su InscripcionEspacio."""
+
+    def _actualizar():
+        par = (
+            _modelo(None, "InscripcionEspacio")
+            .objects.filter(pk=cursada_id)
+            .values_list("inscripcion_id", "espacio_id")
+            .first()
+        )
+        if par:  # si se borró la cursada, su propia signal ya actualizó el par
+            actualizar([par])
+
+    transaction.on_commit(_actualizar)
+
+
+def reconstruir(inscripcion_ids: Iterable[int] | None = None, lote: int = LOTE, registro=None):
+    """Rearma el cartón completo (o el de esas inscripciones) por lotes. Devuelve
+    (inscripciones, filas)."""
+    EstudianteProfesorado = _modelo(registro, "EstudianteProfesorado")
+    CartonFila = _modelo(registro, "CartonFila")
+
+    qs = EstudianteProfesorado.objects.order_by("pk").values_list("pk", flat=True)
+    ids = list(qs if inscripcion_ids is None else qs.filter(pk__in=list(inscripcion_ids)))
+    total = 0
+    for desde in range(0, len(ids), lote):
+        bloque = ids[desde : desde + lote]
+        datos = _actividad(
+            Q(inscripcion_id__in=bloque),
+            Q(inscripcion_cursada__inscripcion_id__in=bloque),
+            registro,
+        )
+        filas = _filas(datos, registro)
+        with transaction.atomic():
+            CartonFila.objects.filter(inscripcion_id__in=bloque).delete()
+            CartonFila.objects.bulk_create(filas, batch_size=1000)
+        total += len(filas)
+    return len(ids), total
+
+
+# ---------- lectura ----------
+def de_estudiante(estudiante_id: int):
+    """Filas del cartón de un estudiante (todas sus carreras), en orden de plan."""
+    from .models import CartonFila
+
+    return (
+        CartonFila.objects.filter(inscripcion__estudiante_id=estudiante_id)
+        .select_related("inscripcion__carrera", "inscripcion__estudiante", "espacio__materia")
+        .order_by(
+            "inscripcion_id", "espacio__anio", "espacio__cuatrimestre", "espacio__materia__nombre"
+        )
+    )
+
+
+def a_dict(f) -> dict:
+    return {
+        "inscripcion": f.inscripcion_id,
+        "carrera": f.inscripcion.carrera.nombre if f.inscripcion.carrera_id else "",
+        "espacio": f.espacio_id,
+        "nombre": f.espacio.materia.nombre if f.espacio.materia_id else "",
+        "anio": f.espacio.anio,
+        "cuatrimestre": f.espacio.cuatrimestre,
+        "estado": f.estado,
+        "nota": str(f.nota) if f.nota is not None else (f.nota_texto or None),
+        "fecha_aprobacion": f.fecha_aprobacion,
+        "fecha_regularidad": f.fecha_regularidad,
+        "regular_hasta": f.regular_hasta,
+        "intentos_final": f.intentos_final,
+        "ultimo_final": f.ultimo_final,
+        "mesa_inscripta": f.mesa_inscripta,
+        "anio_cursada": f.anio_cursada,
+    }
+
+
+def por_carrera(filas) -> list[dict]:
+    """Agrupa las filas (ya ordenadas) por inscripción a carrera, con totales por estado."""
+    grupos: dict[int, dict] = {}
+    for f in filas:
+        g = grupos.get(f.inscripcion_id)
+        if g is None:
+            g = grupos[f.inscripcion_id] = {
+                "inscripcion": f.inscripcion_id,
+                "carrera": f.inscripcion.carrera.nombre if f.inscripcion.carrera_id else "",
+                "filas": [],
+                "totales": dict.fromkeys(f.Estado.values, 0),
+            }
+        g["filas"].append(f)
+        g["totales"][f.estado] += 1
+    return list(grupos.values())
@@ -0,0 +1,172 @@
+# academia_core/consultas.py
+# Medición de consultas SQL por request: cantidad, tiempo en la base y detección de N+1
+# (la misma forma de SQL repetida muchas veces). Se expone en una línea JSON por request
+# (logger "academia_core.consultas"), en Server-Timing si SERVER_TIMING y, en tests, como
+# presupuesto por nombre de URL que hace fallar el request si se pasa.
+#
+#   MEDIR_CONSULTAS = True                      # False: el middleware se desactiva
+#   SERVER_TIMING = DEBUG                       # el header expone tiempos: no en producción
+#   CONSULTAS_REPETIDAS_UMBRAL = 10             # desde cuántas repeticiones es N+1
+#   PRESUPUESTO_CONSULTAS = {"ui:api_acta_guardar": 20}
+#   PRESUPUESTO_CONSULTAS_ESTRICTO = False      # True (tests): levanta PresupuestoExcedido
+#   CONSULTAS_LOG = "logs/consultas.log"        # archivo rotativo que lee reporte_consultas
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Iterable
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+UMBRAL_REPETIDAS = 10
+_IGNORAR = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+_LISTA = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_ESPACIOS = re.compile(r"\s+")
+
+
+class PresupuestoExcedido(AssertionError):
+    pass
+
+
+def forma(sql: str) -> str:
+    """SQL sin literales ni largo de listas IN: dos consultas con la misma forma sólo
+    difieren en los parámetros."""
+    s = _TEXTO.sub("?", sql)
+    s = _NUMERO.sub("?", s)
+    s = _LISTA.sub("(%s…)", s)
+    return _ESPACIOS.sub(" ", s).strip()
+
+
+class Medicion:
+    """execute_wrapper que acumula las consultas de un request."""
+
+    def __init__(self):
+        self.consultas = 0
+        self.db_ms = 0.0
+        self.formas: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - inicio) * 1000
+            if not sql.startswith(_IGNORAR):
+                self.consultas += 1
+                self.formas[forma(sql)] += 1
+
+    def repetidas(self, umbral: int = UMBRAL_REPETIDAS) -> list[tuple[str, int]]:
+        return [(f, n) for f, n in self.formas.most_common() if n >= umbral]
+
+
+def nombre_de(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match and match.view_name else request.path
+
+
+class ConsultasMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "MEDIR_CONSULTAS", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        med = Medicion()
+        inicio = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(med))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - inicio) * 1000
+
+        nombre = nombre_de(request)
+        umbral = getattr(settings, "CONSULTAS_REPETIDAS_UMBRAL", UMBRAL_REPETIDAS)
+        repetidas = med.repetidas(umbral)
+        if getattr(settings, "SERVER_TIMING", False):
+            response["Server-Timing"] = (
+                f'db;dur={med.db_ms:.1f};desc="{med.consultas} consultas", app;dur={total_ms:.1f}'
+            )
+
+        registro = {
+            "vista": nombre,
+            "metodo": request.method,
+            "status": response.status_code,
+            "consultas": med.consultas,
+            "db_ms": round(med.db_ms, 1),
+            "total_ms": round(total_ms, 1),
+            "repetidas": [{"n": n, "sql": f[:300]} for f, n in repetidas[:3]],
+        }
+        presupuesto = getattr(settings, "PRESUPUESTO_CONSULTAS", {}).get(nombre)
+        excedido = presupuesto is not None and med.consultas > presupuesto
+        if excedido:
+            registro["presupuesto"] = presupuesto
+        nivel = logging.WARNING if (excedido or repetidas) else logging.INFO
+        logger.log(nivel, json.dumps(registro, ensure_ascii=False))
+
+        if excedido and getattr(settings, "PRESUPUESTO_CONSULTAS_ESTRICTO", False):
+            detalle = "; ".join(f"{n}× {f[:120]}" for f, n in med.formas.most_common(3))
+            raise PresupuestoExcedido(
+                f"{nombre}: {med.consultas} consultas (presupuesto {presupuesto}). {detalle}"
+            )
+        return response
+
+
+# ---------- reporte ----------
+def leer_registros(lineas: Iterable[str]):
+    """Registros JSON del log (tolera prefijos de formato antes del '{')."""
+    for linea in lineas:
+        i = linea.find("{")
+        if i < 0:
+            continue
+        try:
+            reg = json.loads(linea[i:])
+        except ValueError:
+            continue
+        if isinstance(reg, dict) and "vista" in reg and "consultas" in reg:
+            yield reg
+
+
+def ranking(registros: Iterable[dict], orden: str = "consultas") -> list[dict]:
+    """Agrega por vista y ordena por promedio de consultas, de tiempo en base o por
+    cantidad de requests con N+1."""
+    por_vista: dict[str, dict] = {}
+    for reg in registros:
+        v = por_vista.setdefault(
+            reg["vista"],
+            {
+                "vista": reg["vista"],
+                "requests": 0,
+                "consultas": 0,
+                "max": 0,
+                "db_ms": 0.0,
+                "n_mas_1": 0,
+            },
+        )
+        v["requests"] += 1
+        v["consultas"] += reg["consultas"]
+        v["max"] = max(v["max"], reg["consultas"])
+        v["db_ms"] += reg.get("db_ms", 0.0)
+        if reg.get("repetidas"):
+            v["n_mas_1"] += 1
+            peor = max(reg["repetidas"], key=lambda r: r["n"])
+            if peor["n"] >= v.get("peor", {}).get("n", 0):
+                v["peor"] = peor
+    filas = []
+    for v in por_vista.values():
+        v["prom_consultas"] = v["consultas"] / v["requests"]
+        v["prom_db_ms"] = v["db_ms"] / v["requests"]
+        filas.append(v)
+    clave = {"consultas": "prom_consultas", "db": "prom_db_ms", "repetidas": "n_mas_1"}[orden]
+    return sorted(filas, key=lambda v: (v[clave], v["max"]), reverse=True)
@@ -9,6 +9,7 @@ from typing import Any
 
 from django.db.models import Q
 
+from .grafo_correlativas import APROBADA, CURSAR, grafo_para_plan
 from .utils import get_model
 
 # Estados "fuerza" para comparar mínimos
@@ -46,42 +47,24 @@ class Requisito:
 
 
 def _requisitos_desde_modelo(espacio) -> list[Requisito]:
-    """Intenta leer requisitos desde un modelo Correlatividad si existe.
-    Supuesto de campos (flexible): espacio_objetivo, espacio_requerido, tipo, minimo
-    """
-    Model = get_model("academia_core", "Correlatividad")
-    if Model is None:
-        return []
-    # Campos tolerantes
-    fields = {f.name for f in Model._meta.fields}
-    target_fk = (
-        "espacio_objetivo"
-        if "espacio_objetivo" in fields
-        else "espacio"
-        if "espacio" in fields
-        else None
-    )
-    req_fk = "espacio_requerido" if "espacio_requerido" in fields else None
-    tipo_f = "tipo" if "tipo" in fields else None
-    min_f = "minimo" if "minimo" in fields else None
-    if not target_fk or not req_fk:
+    """Lee los requisitos para cursar desde el grafo compilado del plan del espacio
+    (las reglas "todo hasta año N" ya vienen expandidas)."""
+    plan_id = getattr(espacio, "plan_id", None)
+    if not plan_id:
         return []
-    qs = Model.objects.filter(**{target_fk: espacio})
+    grafo = grafo_para_plan(plan_id)
     out: list[Requisito] = []
-    for row in qs.select_related(req_fk):
-        req = getattr(row, req_fk, None)
-        if not req:
-            continue
-        tipo = getattr(row, tipo_f, "CURSAR") if tipo_f else "CURSAR"
-        minimo = (getattr(row, min_f, "REGULAR") if min_f else "REGULAR") or "REGULAR"
-        out.append(
-            Requisito(
-                espacio_id=req.id,
-                etiqueta=getattr(req, "nombre", str(req)),
-                tipo=tipo,
-                minimo=minimo,
+    for regla in grafo.reglas_de(espacio.id, CURSAR):
+        minimo = "APROBADO" if regla.requisito == APROBADA else "REGULAR"
+        for req_id in sorted(regla.requeridos):
+            out.append(
+                Requisito(
+                    espacio_id=req_id,
+                    etiqueta=grafo.nombres.get(req_id, ""),
+                    tipo=CURSAR,
+                    minimo=minimo,
+                )
             )
-        )
     return out
 
 
@@ -0,0 +1,180 @@
+# academia_core/enlaces_eligibilidad.py
+# Qué modelos/campos usa el motor de eligibilidad, resuelto UNA vez en AppConfig.ready().
+#
+# Antes cada request recorría _meta.get_fields() de los modelos candidatos para encontrar
+# el FK al estudiante, al espacio y al plan y el campo de aprobación. Ahora cada fuente
+# queda como un Enlace con los lookups ya armados (también a través de la inscripción
+# a la carrera: InscripcionEspacio -> inscripcion__estudiante_id) y un queryset base
+# que sólo hay que filtrar. `python manage.py eligibilidad_enlaces` muestra el resultado.
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from django.apps import apps
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+APROBADAS = "aprobadas"
+REGULARES = "regulares"
+CURSADA = "inscriptas_cursada"
+FINAL = "inscriptas_final"
+FUENTES = (APROBADAS, REGULARES, CURSADA, FINAL)
+
+# Modelos candidatos por fuente (el primero que exista en academia_core).
+CANDIDATOS: dict[str, tuple[str, ...]] = {
+    APROBADAS: ("ResultadoFinal", "ActaFinal", "Aprobacion", "CalificacionFinal"),
+    REGULARES: ("Regularidad", "Cursada", "CondicionCursada"),
+    CURSADA: ("InscripcionEspacio", "InscripcionCursada", "InscripcionMateria"),
+    FINAL: ("InscripcionFinal", "MesaInscripcion"),
+}
+CAMPOS_CICLO = ("ciclo", "anio", "anio_lectivo", "anio_academico")
+PROFUNDIDAD = 3  # saltos de FK hasta el estudiante (InscripcionFinal -> cursada -> inscripción)
+
+
+@dataclass(frozen=True)
+class Enlace:
+    fuente: str
+    modelo: str  # "academia_core.InscripcionEspacio" o "" si no hay
+    estudiante: str = ""  # lookup al id del Estudiante
+    espacio: str = ""  # lookup al id del EspacioCurricular
+    plan: str = ""  # lookup al id del PlanEstudios
+    ciclo: str = ""
+    predicado: str = ""  # descripción legible del filtro de estado
+    motivo: str = ""  # por qué no se usa (si no se usa)
+    qs: QuerySet | None = field(default=None, compare=False, repr=False)  # filtrado por predicado
+
+    @property
+    def activo(self) -> bool:
+        return self.qs is not None
+
+    def filtrar(self, estudiante_id: int, plan_id: int, ciclo: int | None = None) -> QuerySet:
+        qs = self.qs.filter(**{self.estudiante: estudiante_id, self.plan: plan_id})
+        if not ciclo and self.fuente == CURSADA:
+            # una cursada de otro año no es "ya inscripto": sin ciclo, el actual (el mismo
+            # que usa api_inscribir_espacio para crear la inscripción)
+            ciclo = timezone.localdate().year
+        if ciclo and self.ciclo:
+            qs = qs.filter(**{self.ciclo: ciclo})
+        return qs.order_by()
+
+    def as_dict(self) -> dict:
+        return {
+            "fuente": self.fuente,
+            "modelo": self.modelo or None,
+            "estudiante": self.estudiante or None,
+            "espacio": self.espacio or None,
+            "plan": self.plan or None,
+            "ciclo": self.ciclo or None,
+            "predicado": self.predicado or None,
+            "motivo": self.motivo or None,
+        }
+
+
+# ---------- introspección (sólo al resolver) ----------
+def _campos(model) -> dict:
+    return {f.name: f for f in model._meta.get_fields() if getattr(f, "concrete", False)}
+
+
+def _camino_a(model, destino, profundidad: int = PROFUNDIDAD) -> str | None:
+    """Lookup (a lo ancho) desde `model` hasta el id de `destino` siguiendo FKs."""
+    frontera = [(model, "")]
+    for _ in range(profundidad):
+        siguiente = []
+        for m, prefijo in frontera:
+            for f in m._meta.get_fields():
+                if not (getattr(f, "many_to_one", False) and getattr(f, "concrete", False)):
+                    continue
+                if f.related_model is destino:
+                    return f"{prefijo}{f.name}_id"
+                siguiente.append((f.related_model, f"{prefijo}{f.name}__"))
+        frontera = siguiente
+    return None
+
+
+def _primero(campos: dict, *nombres) -> str | None:
+    return next((n for n in nombres if n in campos), None)
+
+
+def _tiene_opcion(campo, valor: str) -> bool:
+    return any(k == valor for k, _v in (campo.choices or ()))
+
+
+def _predicado(fuente: str, campos: dict) -> tuple[Q, str]:
+    if fuente == APROBADAS:
+        if f := _primero(campos, "aprobado", "is_aprobado", "ok"):
+            return Q(**{f: True}), f"{f}=True"
+        if f := _primero(campos, "estado", "situacion", "condicion", "resultado"):
+            valores = ["APROBADO", "PROMOCIONADO"]
+            return Q(**{f"{f}__in": valores}), f"{f} in {valores}"
+        if f := _primero(campos, "nota", "calificacion", "puntaje"):
+            return Q(**{f"{f}__gte": 4}), f"{f} >= 4"
+    elif fuente == REGULARES:
+        if f := _primero(campos, "regular", "es_regular", "is_regular"):
+            return Q(**{f: True}), f"{f}=True"
+        if f := _primero(campos, "estado", "situacion", "condicion"):
+            valores = ["REGULAR", "PROMOCIONADO", "APROBADO"]
+            return Q(**{f"{f}__in": valores}), f"{f} in {valores}"
+    elif "estado" in campos:
+        # inscripciones: una baja no cuenta; a final, sólo las pendientes de rendir
+        estado = campos["estado"]
+        if fuente == FINAL and _tiene_opcion(estado, "INSCRIPTO"):
+            return Q(estado="INSCRIPTO"), "estado='INSCRIPTO'"
+        if _tiene_opcion(estado, "BAJA"):
+            return ~Q(estado="BAJA"), "estado != 'BAJA'"
+    return Q(), "(todas las filas)"
+
+
+def resolver_enlace(fuente: str, candidatos=None) -> Enlace:
+    Estudiante = apps.get_model("academia_core", "Estudiante")
+    Espacio = apps.get_model("academia_core", "EspacioCurricular")
+    Plan = apps.get_model("academia_core", "PlanEstudios")
+
+    candidatos = CANDIDATOS[fuente] if candidatos is None else candidatos
+    model = None
+    for nombre in candidatos:
+        try:
+            model = apps.get_model("academia_core", nombre)
+            break
+        except LookupError:
+            continue
+    if model is None:
+        return Enlace(fuente, "", motivo=f"no existe ninguno de {', '.join(candidatos)}")
+
+    etiqueta = model._meta.label
+    est = _camino_a(model, Estudiante)
+    esp = _camino_a(model, Espacio)
+    if not est or not esp:
+        falta = "Estudiante" if not est else "EspacioCurricular"
+        return Enlace(
+            fuente, etiqueta, estudiante=est or "", espacio=esp or "", motivo=f"sin FK a {falta}"
+        )
+
+    campos = _campos(model)
+    plan = _camino_a(model, Plan, profundidad=1) or esp.removesuffix("_id") + "__plan_id"
+    pred, desc = _predicado(fuente, campos)
+    return Enlace(
+        fuente=fuente,
+        modelo=etiqueta,
+        estudiante=est,
+        espacio=esp,
+        plan=plan,
+        ciclo=_primero(campos, *CAMPOS_CICLO) or "",
+        predicado=desc,
+        qs=model._default_manager.filter(pred),
+    )
+
+
+# ---------- registro ----------
+_enlaces: dict[str, Enlace] = {}
+
+
+def resolver() -> dict[str, Enlace]:
+    """Resuelve todas las fuentes (AppConfig.ready)."""
+    _enlaces.clear()
+    _enlaces.update({f: resolver_enlace(f) for f in FUENTES})
+    return _enlaces
+
+
+def enlaces() -> dict[str, Enlace]:
+    return _enlaces or resolver()
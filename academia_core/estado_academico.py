@@ -0,0 +1,218 @@
+# academia_core/estado_academico.py
+# Foto del estado académico de una inscripción (EstudianteProfesorado) armada con UNA query
+# de Movimiento; todas las preguntas (aprobada, regular, vigente, correlativas) se responden
+# en memoria.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import cached_property
+
+from .grafo_correlativas import REGULARIZADA, grafo_para_plan
+
+REG_OK_CODIGOS = frozenset({"PROMOCION", "APROBADO", "REGULAR"})
+APROBADO_CURSADA_CODIGOS = frozenset({"PROMOCION", "APROBADO"})
+VIGENCIA_REGULARIDAD = timedelta(days=730)
+NOTA_MINIMA = 6
+
+
+@dataclass(frozen=True)
+class MovimientoSnap:
+    """Lo mínimo de un Movimiento que necesitan los predicados."""
+
+    id: int
+    espacio_id: int
+    tipo: str
+    codigo: str | None
+    fecha: date | None
+    nota_num: object
+    nota_texto: str
+    ausente: bool
+    ausencia_justificada: bool
+
+    @classmethod
+    def de(cls, m) -> MovimientoSnap:
+        return cls(
+            id=m.id,
+            espacio_id=m.espacio_id,
+            tipo=m.tipo,
+            codigo=m.condicion.codigo if m.condicion_id else None,
+            fecha=m.fecha,
+            nota_num=m.nota_num,
+            nota_texto=m.nota_texto or "",
+            ausente=m.ausente,
+            ausencia_justificada=m.ausencia_justificada,
+        )
+
+    def hasta(self, fecha: date | None) -> bool:
+        # mismo criterio que fecha__lte: sin fecha no cuenta si hay corte
+        return fecha is None or (self.fecha is not None and self.fecha <= fecha)
+
+    @property
+    def regulariza(self) -> bool:
+        return self.tipo == "REG" and self.codigo in REG_OK_CODIGOS
+
+    @property
+    def aprueba(self) -> bool:
+        if self.tipo == "REG":
+            return self.codigo in APROBADO_CURSADA_CODIGOS
+        if self.tipo == "FIN" and self.codigo == "REGULAR":
+            return self.nota_num is not None and self.nota_num >= NOTA_MINIMA
+        if self.tipo == "FIN" and self.codigo == "EQUIVALENCIA":
+            return self.nota_texto.lower() == "equivalencia"
+        return False
+
+
+def _id(espacio) -> int:
+    return getattr(espacio, "id", espacio)
+
+
+class StudentAcademicSnapshot:
+    """Estado académico de una inscripción, opcionalmente a una fecha de corte."""
+
+    def __init__(
+        self,
+        movimientos: list[MovimientoSnap],
+        hasta_fecha: date | None = None,
+        espacios: dict | None = None,
+    ):
+        self.hasta_fecha = hasta_fecha
+        self.movimientos = [m for m in movimientos if m.hasta(hasta_fecha)]
+        self._todos = movimientos
+        # EspacioCurricular (con materia) por id para armar los faltantes; compartible
+        self.espacios = {} if espacios is None else espacios
+
+    # ---------- construcción ----------
+    @staticmethod
+    def _queryset():
+        from .models import Movimiento
+
+        return (
+            Movimiento.objects.select_related("condicion")
+            .only(
+                "id",
+                "inscripcion_id",
+                "espacio_id",
+                "tipo",
+                "fecha",
+                "nota_num",
+                "nota_texto",
+                "ausente",
+                "ausencia_justificada",
+                "condicion__codigo",
+            )
+            .order_by("fecha", "id")
+        )
+
+    @classmethod
+    def de(cls, inscripcion, hasta_fecha: date | None = None) -> StudentAcademicSnapshot:
+        """Snapshot de un EstudianteProfesorado (instancia o id)."""
+        if inscripcion is None or _id(inscripcion) is None:
+            return cls([], hasta_fecha)
+        qs = cls._queryset().filter(inscripcion_id=_id(inscripcion))
+        return cls([MovimientoSnap.de(m) for m in qs], hasta_fecha)
+
+    @classmethod
+    def de_varias(
+        cls, inscripcion_ids, hasta_fecha: date | None = None, espacios: dict | None = None
+    ) -> dict[int, StudentAcademicSnapshot]:
+        """Snapshots de varias inscripciones con una sola query (ids sin movimientos incluidos)."""
+        por_insc: dict[int, list[MovimientoSnap]] = {i: [] for i in inscripcion_ids}
+        if por_insc:
+            for m in cls._queryset().filter(inscripcion_id__in=por_insc):
+                por_insc[m.inscripcion_id].append(MovimientoSnap.de(m))
+        espacios = {} if espacios is None else espacios
+        return {i: cls(movs, hasta_fecha, espacios) for i, movs in por_insc.items()}
+
+    @classmethod
+    def para_estudiante_plan(
+        cls, estudiante_id: int, plan_id: int, hasta_fecha: date | None = None
+    ) -> StudentAcademicSnapshot:
+        qs = cls._queryset().filter(
+            inscripcion__estudiante_id=estudiante_id, inscripcion__plan_id=plan_id
+        )
+        return cls([MovimientoSnap.de(m) for m in qs], hasta_fecha)
+
+    def al(self, fecha: date | None) -> StudentAcademicSnapshot:
+        """Misma foto, vista a otra fecha de corte (sin volver a la base)."""
+        return StudentAcademicSnapshot(self._todos, fecha, self.espacios)
+
+    # ---------- conjuntos ----------
+    @cached_property
+    def aprobadas(self) -> frozenset[int]:
+        return frozenset(m.espacio_id for m in self.movimientos if m.aprueba)
+
+    @cached_property
+    def regularizadas(self) -> frozenset[int]:
+        return frozenset(m.espacio_id for m in self.movimientos if m.regulariza)
+
+    def vigentes(self, a_fecha: date | None = None) -> frozenset[int]:
+        """
+        Espacios con un Regular de cursada obtenido dentro de los 2 años previos a `a_fecha`
+        (no después). Para hoy coincide con CartonFila.regular_hasta (vencimientos.vigente);
+        se calcula desde los movimientos porque las actas validan a fechas pasadas, que el
+        cartón ya no guarda si el estudiante volvió a regularizar, y porque en una carga en
+        bloque el cartón recién se rearma al confirmar la transacción.
+        """
+        a_fecha = a_fecha or self.hasta_fecha or date.today()
+        limite = a_fecha - VIGENCIA_REGULARIDAD
+        return frozenset(
+            m.espacio_id
+            for m in self.movimientos
+            if m.tipo == "REG"
+            and m.codigo == "REGULAR"
+            and m.fecha is not None
+            and limite <= m.fecha <= a_fecha
+        )
+
+    # ---------- predicados ----------
+    def _scope(self, hasta_fecha: date | None) -> StudentAcademicSnapshot:
+        return self if hasta_fecha is None else self.al(hasta_fecha)
+
+    def regularizada(self, espacio, hasta_fecha: date | None = None) -> bool:
+        return _id(espacio) in self._scope(hasta_fecha).regularizadas
+
+    def aprobada(self, espacio, hasta_fecha: date | None = None) -> bool:
+        return _id(espacio) in self._scope(hasta_fecha).aprobadas
+
+    def regularidad_vigente(self, espacio, a_fecha: date | None = None) -> bool:
+        return _id(espacio) in self.vigentes(a_fecha)
+
+    def tiene_regular(self, espacio) -> bool:
+        eid = _id(espacio)
+        return any(
+            m.espacio_id == eid and m.tipo == "REG" and m.codigo == "REGULAR"
+            for m in self.movimientos
+        )
+
+    def intentos_final(self, espacio, excluir_id: int | None = None) -> list[MovimientoSnap]:
+        """Finales rendidos en el espacio (sin contar ausencias justificadas), por fecha."""
+        eid = _id(espacio)
+        return [
+            m
+            for m in self._todos
+            if m.espacio_id == eid
+            and m.tipo == "FIN"
+            and m.id != excluir_id
+            and not (m.ausente and m.ausencia_justificada)
+        ]
+
+    def cumple_correlativas(self, espacio, tipo: str, fecha: date | None = None):
+        """Igual que utils_inscripciones.cumple_correlativas, sin queries por requisito."""
+        from .models import EspacioCurricular
+
+        scope = self._scope(fecha)
+        pendientes = []
+        for r in grafo_para_plan(espacio.plan_id).reglas_de(espacio.id, tipo):
+            objetivo = scope.regularizadas if r.requisito == REGULARIZADA else scope.aprobadas
+            pendientes += [(r, req_id) for req_id in sorted(r.requeridos - objetivo)]
+        if not pendientes:
+            return True, []
+
+        faltan = {req_id for _r, req_id in pendientes} - self.espacios.keys()
+        if faltan:
+            self.espacios.update(
+                EspacioCurricular.objects.select_related("materia").in_bulk(faltan)
+            )
+        return False, [(r, self.espacios[req_id]) for r, req_id in pendientes]
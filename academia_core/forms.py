@@ -1,5 +1,6 @@
 from django import forms
 
+from .busqueda import EstudianteSelect
 from .models import (
     Estudiante,
     EstudianteProfesorado,
@@ -32,6 +33,7 @@ class InscripcionCarreraForm(BaseStyledModelForm):
         model = EstudianteProfesorado
         fields = ["estudiante", "profesorado", "plan", "cohorte"]
         widgets = {
+            "estudiante": EstudianteSelect(),
             "cohorte": forms.NumberInput(attrs={"min": 2000, "max": 2100}),
         }
 
@@ -53,6 +55,7 @@ class InscripcionMateriaForm(BaseStyledModelForm):
         model = InscripcionMateria
         fields = ["estudiante", "materia", "comision", "estado"]
         widgets = {
+            "estudiante": EstudianteSelect(),
             "comision": forms.TextInput(attrs={"placeholder": "A, B, C… (opcional)"}),
         }
 
@@ -61,3 +64,4 @@ class InscripcionMesaForm(BaseStyledModelForm):
     class Meta:
         model = InscripcionMesa
         fields = ["estudiante", "mesa", "condicion", "llamada", "estado"]
+        widgets = {"estudiante": EstudianteSelect()}
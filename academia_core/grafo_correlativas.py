@@ -0,0 +1,173 @@
+# academia_core/grafo_correlativas.py
+# Grafo de correlatividades precompilado por PlanEstudios (inmutable + cache en proceso,
+# validado contra una versión por plan en el cache compartido: academia_core.versiones).
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from . import versiones
+
+CURSAR = "CURSAR"
+RENDIR = "RENDIR"
+REGULARIZADA = "REGULARIZADA"
+APROBADA = "APROBADA"
+
+_VACIO: frozenset[int] = frozenset()
+
+
+def normalizar_tipo(tipo: str | None) -> str:
+    """'PARA_CURSAR'/'CURSAR'/'' -> 'CURSAR'; 'PARA_RENDIR'/'RENDIR' -> 'RENDIR'."""
+    t = (tipo or "").upper()
+    return RENDIR if t.endswith(RENDIR) else CURSAR
+
+
+def normalizar_requisito(requisito: str | None) -> str:
+    return APROBADA if (requisito or "").upper().startswith("APROB") else REGULARIZADA
+
+
+def anio_num(anio: str | None) -> int:
+    """'2°' -> 2 (mismo criterio que EspacioCurricular.anio_num)."""
+    try:
+        return int("".join(ch for ch in (anio or "") if ch.isdigit()))
+    except ValueError:
+        return 0
+
+
+@dataclass(frozen=True)
+class ReglaCompilada:
+    """Una fila de Correlatividad con el conjunto de espacios requeridos ya expandido.
+    Conserva los nombres de atributo del modelo para que el código existente la use igual.
+    """
+
+    id: int
+    espacio_id: int
+    tipo: str
+    requisito: str
+    requiere_espacio_id: int | None
+    requiere_todos_hasta_anio: int | None
+    requeridos: frozenset[int]
+
+
+@dataclass(frozen=True)
+class GrafoCorrelativas:
+    plan_id: int
+    version: int
+    # espacio_id -> reglas del espacio (en el orden de la tabla)
+    reglas: Mapping[int, tuple[ReglaCompilada, ...]]
+    # espacio_id -> (tipo, requisito) -> ids requeridos
+    requeridos: Mapping[int, Mapping[tuple[str, str], frozenset[int]]]
+    # datos del plan que necesitan los reportes
+    nombres: Mapping[int, str]
+    anios: Mapping[int, int]
+
+    def reglas_de(self, espacio_id: int, tipo: str | None = None) -> tuple[ReglaCompilada, ...]:
+        reglas = self.reglas.get(espacio_id, ())
+        if tipo is None:
+            return reglas
+        tipo = normalizar_tipo(tipo)
+        return tuple(r for r in reglas if r.tipo == tipo)
+
+    def requeridos_de(self, espacio_id: int, tipo: str, requisito: str) -> frozenset[int]:
+        por_clave = self.requeridos.get(espacio_id)
+        if not por_clave:
+            return _VACIO
+        return por_clave.get((normalizar_tipo(tipo), normalizar_requisito(requisito)), _VACIO)
+
+
+def compilar(plan_id: int, version: int = 0) -> GrafoCorrelativas:
+    """Arma el grafo con dos queries: espacios del plan y sus correlatividades."""
+    from academia_core.models import Correlatividad, EspacioCurricular
+
+    nombres: dict[int, str] = {}
+    anios: dict[int, int] = {}
+    for eid, anio, nombre in EspacioCurricular.objects.filter(plan_id=plan_id).values_list(
+        "id", "anio", "materia__nombre"
+    ):
+        nombres[eid] = nombre or ""
+        anios[eid] = anio_num(anio)
+
+    def hasta(n: int, excluir: int) -> frozenset[int]:
+        return frozenset(eid for eid, a in anios.items() if a <= n and eid != excluir)
+
+    reglas: dict[int, list[ReglaCompilada]] = {}
+    requeridos: dict[int, dict[tuple[str, str], set[int]]] = {}
+    filas = Correlatividad.objects.filter(plan_id=plan_id).order_by("id")
+    for row in filas.values(
+        "id", "espacio_id", "tipo", "requisito", "requiere_espacio_id", "requiere_todos_hasta_anio"
+    ):
+        if row["requiere_espacio_id"]:
+            ids = frozenset([row["requiere_espacio_id"]])
+        elif row["requiere_todos_hasta_anio"]:
+            ids = hasta(int(row["requiere_todos_hasta_anio"]), row["espacio_id"])
+        else:
+            continue
+        regla = ReglaCompilada(
+            id=row["id"],
+            espacio_id=row["espacio_id"],
+            tipo=normalizar_tipo(row["tipo"]),
+            requisito=normalizar_requisito(row["requisito"]),
+            requiere_espacio_id=row["requiere_espacio_id"],
+            requiere_todos_hasta_anio=row["requiere_todos_hasta_anio"],
+            requeridos=ids,
+        )
+        reglas.setdefault(regla.espacio_id, []).append(regla)
+        clave = (regla.tipo, regla.requisito)
+        requeridos.setdefault(regla.espacio_id, {}).setdefault(clave, set()).update(ids)
+
+    return GrafoCorrelativas(
+        plan_id=plan_id,
+        version=version,
+        reglas=MappingProxyType({k: tuple(v) for k, v in reglas.items()}),
+        requeridos=MappingProxyType(
+            {
+                k: MappingProxyType({c: frozenset(s) for c, s in v.items()})
+                for k, v in requeridos.items()
+            }
+        ),
+        nombres=MappingProxyType(nombres),
+        anios=MappingProxyType(anios),
+    )
+
+
+# ---------- cache (grafo en memoria del proceso, versión en el cache de Django) ----------
+_grafos: dict[int, GrafoCorrelativas] = {}
+_lock = threading.Lock()
+
+
+def _version_key(plan_id: int) -> str:
+    return f"correlativas:plan:{plan_id}:version"
+
+
+def version_de(plan_id: int) -> int:
+    return versiones.leer(_version_key(plan_id))[0]
+
+
+def invalidar(plan_id: int | None) -> None:
+    """Sube la versión del plan en el cache compartido: la ven todos los procesos,
+    también los workers web cuando importa un comando de consola."""
+    if not plan_id:
+        return
+    versiones.subir_al_confirmar(_version_key(plan_id))
+
+
+def grafo_para_plan(plan_id: int) -> GrafoCorrelativas:
+    version = version_de(plan_id)
+    grafo = _grafos.get(plan_id)
+    if grafo is not None and grafo.version == version:
+        return grafo
+    with _lock:
+        grafo = _grafos.get(plan_id)
+        if grafo is None or grafo.version != version:
+            grafo = compilar(plan_id, version)
+            _grafos[plan_id] = grafo
+    return grafo
+
+
+def limpiar() -> None:
+    """Vacía el cache local (tests / comandos de mantenimiento)."""
+    with _lock:
+        _grafos.clear()
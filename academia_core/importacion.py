@@ -0,0 +1,365 @@
+# academia_core/importacion.py
+# Importación de espacios curriculares desde CSV/XLSX, en streaming y por lotes.
+#
+# Las filas se leen de a una (nunca el archivo entero en memoria), se validan y se
+# acumulan en lotes. Cada lote es UNA transacción: crea las Materias y Planes que falten y
+# hace upsert de EspacioCurricular con bulk_create(update_conflicts=True) contra
+# uniq_espacio_en_plan. Una fila mala no corta la importación: queda en el reporte.
+# Como cada lote se confirma por separado, una corrida cortada se retoma con `desde`
+# (el reporte dice cuál fue la última fila confirmada).
+
+from __future__ import annotations
+
+import csv
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.apps import apps
+from django.db import DatabaseError, transaction
+
+from . import grafo_correlativas, indice_busqueda, versiones
+from .busqueda import clave
+
+REQUERIDAS = ("anio", "cuatrimestre", "formato", "nombre", "horas")
+# largo máximo de cada columna (los max_length de los modelos)
+LARGOS = {"anio": 10, "formato": 80, "nombre": 150, "resolucion": 30}
+POR_FILA = ("carrera", "resolucion")  # archivos con varios planes
+LOTE = 500
+
+CUATRIMESTRES = {
+    "A": "A",
+    "ANUAL": "A",
+    "1": "1",
+    "1º": "1",
+    "1°": "1",
+    "PRIMERO": "1",
+    "2": "2",
+    "2º": "2",
+    "2°": "2",
+    "SEGUNDO": "2",
+}
+
+
+class ErrorFila(ValueError):
+    pass
+
+
+class ErrorArchivo(ValueError):
+    pass
+
+
+# ---------- lectura ----------
+def _celda(v) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        v = int(v)  # XLSX: 4.0 -> "4"
+    return str(v).strip()
+
+
+def _encabezados(nombres) -> list[str]:
+    return [_celda(n).lower() for n in nombres]
+
+
+def _fila(cols: list[str], valores) -> dict:
+    valores = [_celda(v) for v in valores]
+    return dict(zip(cols, valores + [""] * (len(cols) - len(valores)), strict=False))
+
+
+def leer_csv(path) -> Iterator[tuple[int, dict]]:
+    with open(path, newline="", encoding="utf-8-sig") as f:  # UTF-8 con o sin BOM
+        muestra = f.read(4096)
+        f.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+        rdr = csv.reader(f, dialecto)
+        cols = _encabezados(next(rdr, []))
+        for n, valores in enumerate(rdr, start=2):
+            if any(v.strip() for v in valores):
+                yield n, _fila(cols, valores)
+
+
+def leer_xlsx(path) -> Iterator[tuple[int, dict]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ErrorArchivo("Para leer .xlsx hace falta instalar openpyxl") from None
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        filas = wb.active.iter_rows(values_only=True)
+        cols = _encabezados(next(filas, ()))
+        for n, valores in enumerate(filas, start=2):
+            if any(_celda(v) for v in valores):
+                yield n, _fila(cols, valores)
+    finally:
+        wb.close()
+
+
+def leer(path) -> Iterator[tuple[int, dict]]:
+    """(número de fila en el archivo, {columna: texto}) de a una fila."""
+    ext = Path(path).suffix.lower()
+    if ext in (".xlsx", ".xlsm"):
+        return leer_xlsx(path)
+    if ext in (".csv", ".txt", ""):
+        return leer_csv(path)
+    raise ErrorArchivo(f"Formato no soportado: {ext} (use .csv o .xlsx)")
+
+
+# ---------- validación ----------
+@dataclass(frozen=True)
+class Fila:
+    n: int
+    carrera: str
+    resolucion: str
+    anio: str
+    cuatrimestre: str
+    formato: str
+    materia: str
+    horas: int
+
+
+def validar(n: int, row: dict, carrera: str = "", resolucion: str = "") -> Fila:
+    carrera = row.get("carrera") or carrera
+    resolucion = row.get("resolucion") or resolucion
+    for col, largo in LARGOS.items():
+        valor = resolucion if col == "resolucion" else row.get(col) or ""
+        if len(valor) > largo:
+            raise ErrorFila(f"'{col}' supera {largo} caracteres")
+    if not carrera or not resolucion:
+        raise ErrorFila("falta carrera/resolución (columna o --carrera/--resolucion)")
+    token = (row.get("cuatrimestre") or "").upper()
+    cuatri = CUATRIMESTRES.get(token)
+    if cuatri is None:
+        raise ErrorFila(f"cuatrimestre inválido '{token}' (use A, 1 o 2)")
+    nombre = row.get("nombre") or ""
+    if not nombre:
+        raise ErrorFila("falta el nombre de la materia")
+    anio = row.get("anio") or ""
+    if not anio:
+        raise ErrorFila("falta el año")
+    try:
+        horas = int(row.get("horas") or 0)
+    except ValueError:
+        raise ErrorFila(f"'horas' debe ser entero (vino '{row.get('horas')}')") from None
+    if horas < 0:
+        raise ErrorFila("'horas' no puede ser negativo")
+    return Fila(n, carrera, resolucion, anio, cuatri, row.get("formato") or "", nombre, horas)
+
+
+def validar_encabezados(cols: Iterable[str], con_plan: bool) -> None:
+    faltan = [c for c in REQUERIDAS if c not in cols]
+    if not con_plan:
+        faltan += [c for c in POR_FILA if c not in cols]
+    if faltan:
+        raise ErrorArchivo(
+            f"Faltan columnas: {', '.join(faltan)}. "
+            f"Se esperan {', '.join(REQUERIDAS)} (+ carrera, resolucion si el archivo trae "
+            "varios planes)"
+        )
+
+
+# ---------- reporte ----------
+@dataclass
+class Reporte:
+    dry_run: bool = False
+    leidas: int = 0
+    creados: int = 0
+    actualizados: int = 0
+    materias_creadas: int = 0
+    planes_creados: list = field(default_factory=list)
+    errores: list = field(default_factory=list)  # [(fila, mensaje)]
+    ultima_fila: int = 0  # última fila ya confirmada (para retomar con desde=ultima_fila+1)
+
+    def error(self, n: int, msg: str) -> None:
+        self.errores.append((n, msg))
+
+
+# ---------- importación ----------
+class Importador:
+    """
+    importar(filas) con filas = leer(path). Una query para el catálogo de Materias y
+    otra para los planes; después, por lote: las altas que falten y un upsert.
+    """
+
+    def __init__(self, carrera="", resolucion="", lote=LOTE, dry_run=False, desde=1):
+        self.carrera, self.resolucion = carrera, resolucion
+        self.lote = max(1, lote)
+        self.dry_run = dry_run
+        self.desde = desde
+        self.reporte = Reporte(dry_run=dry_run)
+
+        self.Carrera = apps.get_model("academia_core", "Carrera")
+        self.Plan = apps.get_model("academia_core", "PlanEstudios")
+        self.Materia = apps.get_model("academia_core", "Materia")
+        self.Espacio = apps.get_model("academia_core", "EspacioCurricular")
+        self.materias: dict[str, int] = {}  # clave(nombre) -> id
+        self.planes: dict[tuple[int, str], int] = {}  # (carrera_id, clave(resolución)) -> id
+        self.carreras: dict[str, int] = {}
+
+    def _precargar(self) -> None:
+        self.materias = {}
+        for pk, nombre in self.Materia.objects.order_by("id").values_list("id", "nombre"):
+            self.materias.setdefault(clave(nombre), pk)
+        self.carreras = {clave(n): pk for pk, n in self.Carrera.objects.values_list("id", "nombre")}
+        self.planes = {
+            (cid, clave(res)): pk
+            for pk, cid, res in self.Plan.objects.values_list("id", "carrera_id", "resolucion")
+        }
+
+    def importar(self, filas: Iterable[tuple[int, dict]]) -> Reporte:
+        self._precargar()
+        filas = iter(filas)
+        primera = next(filas, None)
+        if primera is None:
+            return self.reporte
+        validar_encabezados(primera[1].keys(), bool(self.carrera and self.resolucion))
+
+        lote: list[Fila] = []
+        n = 0
+        for n, row in _con(primera, filas):
+            if n < self.desde:
+                continue
+            self.reporte.leidas += 1
+            try:
+                lote.append(validar(n, row, self.carrera, self.resolucion))
+            except ErrorFila as e:
+                self.reporte.error(n, str(e))
+            if len(lote) >= self.lote:
+                self._lote(lote, n)
+                lote = []
+        self._lote(lote, n)
+        return self.reporte
+
+    # ---- un lote ----
+    def _lote(self, lote: list[Fila], hasta: int) -> None:
+        if not lote:
+            self.reporte.ultima_fila = hasta
+            return
+        if self.dry_run:
+            creados, actualizados = self._aplicar(lote)
+            self.reporte.creados += creados
+            self.reporte.actualizados += actualizados
+            self.reporte.ultima_fila = hasta
+            return
+
+        antes = (self.reporte.materias_creadas, len(self.reporte.planes_creados))
+        try:
+            with transaction.atomic():
+                creados, actualizados = self._aplicar(lote)
+        except DatabaseError as e:
+            # el lote entero se deshizo: se informa fila por fila y se sigue con el próximo
+            self.reporte.materias_creadas = antes[0]
+            del self.reporte.planes_creados[antes[1] :]
+            self._precargar()
+            for f in lote:
+                self.reporte.error(f.n, f"no se pudo guardar el lote: {e}")
+            return
+        self.reporte.creados += creados
+        self.reporte.actualizados += actualizados
+        self.reporte.ultima_fila = hasta
+
+    def _aplicar(self, lote: list[Fila]) -> tuple[int, int]:
+        lote = [f for f in lote if self._plan_de(f) is not None]
+        self._crear_materias(lote)
+
+        # clave única -> Fila (si el archivo repite un espacio, gana la última fila)
+        espacios: dict[tuple, Fila] = {self._clave(f): f for f in lote}
+        existentes = self._existentes(espacios)
+        nuevos = sum(1 for k in espacios if k not in existentes)
+        if self.dry_run:
+            return nuevos, len(espacios) - nuevos
+
+        self.Espacio.objects.bulk_create(
+            [
+                self.Espacio(
+                    plan_id=plan,
+                    materia_id=materia,
+                    anio=anio,
+                    cuatrimestre=cuatri,
+                    horas=f.horas,
+                    formato=f.formato,
+                )
+                for (plan, materia, anio, cuatri), f in espacios.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["plan", "materia", "anio", "cuatrimestre"],
+            update_fields=["horas", "formato"],
+        )
+        versiones.invalidar("academia_core.EspacioCurricular")  # bulk_create: sin señales
+        for plan_id in {k[0] for k in espacios}:  # "todo el año N" cambia con espacios nuevos
+            grafo_correlativas.invalidar(plan_id)
+        return nuevos, len(espacios) - nuevos
+
+    def _clave(self, f: Fila) -> tuple:
+        return (self._plan_de(f), self.materias[clave(f.materia)], f.anio, f.cuatrimestre)
+
+    def _plan_de(self, f: Fila) -> int | None:
+        """id del plan de la fila (lo crea si hace falta); None si la carrera no existe."""
+        cid = self.carreras.get(clave(f.carrera))
+        if cid is None:
+            self.reporte.error(f.n, f"carrera no encontrada: {f.carrera}")
+            return None
+        key = (cid, clave(f.resolucion))
+        if key not in self.planes:
+            self.reporte.planes_creados.append(f"{f.carrera} - Res. {f.resolucion}")
+            if self.dry_run:
+                self.planes[key] = -len(self.reporte.planes_creados)  # id ficticio
+            else:
+                vigente = not self.Plan.objects.filter(carrera_id=cid, vigente=True).exists()
+                self.planes[key] = self.Plan.objects.create(
+                    carrera_id=cid, resolucion=f.resolucion, vigente=vigente
+                ).pk
+        return self.planes[key]
+
+    def _crear_materias(self, lote: list[Fila]) -> None:
+        faltan: dict[str, str] = {}
+        for f in lote:
+            k = clave(f.materia)
+            if k not in self.materias:
+                faltan.setdefault(k, f.materia)
+        if not faltan:
+            return
+        self.reporte.materias_creadas += len(faltan)
+        if self.dry_run:
+            for k in faltan:
+                self.materias[k] = -(len(self.materias) + 1)  # id ficticio
+            return
+        creadas = self.Materia.objects.bulk_create(
+            [self.Materia(nombre=n) for n in faltan.values()]
+        )
+        if all(m.pk for m in creadas):
+            self.materias.update((clave(m.nombre), m.pk) for m in creadas)
+        else:  # MySQL no devuelve los pk de un bulk_create
+            for pk, nombre in self.Materia.objects.filter(
+                nombre__in=list(faltan.values())
+            ).values_list("id", "nombre"):
+                self.materias.setdefault(clave(nombre), pk)
+        # bulk_create no dispara las signals del índice de búsqueda ni de versiones
+        versiones.invalidar("academia_core.Materia")
+        indice_busqueda.indexar(
+            "materia", [self.Materia(pk=self.materias[k], nombre=n) for k, n in faltan.items()]
+        )
+
+    def _existentes(self, espacios: dict[tuple, Fila]) -> set[tuple]:
+        planes = {k[0] for k in espacios if k[0] > 0}
+        materias = {k[1] for k in espacios if k[1] > 0}
+        if not planes or not materias:
+            return set()
+        return set(
+            self.Espacio.objects.filter(plan_id__in=planes, materia_id__in=materias).values_list(
+                "plan_id", "materia_id", "anio", "cuatrimestre"
+            )
+        )
+
+
+def _con(primera, resto):
+    yield primera
+    yield from resto
+
+
+def importar_archivo(path, **opciones) -> Reporte:
+    return Importador(**opciones).importar(leer(path))
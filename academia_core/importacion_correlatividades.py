@@ -0,0 +1,415 @@
+# academia_core/importacion_correlatividades.py
+# Importación de correlatividades: un solo camino para el texto con viñetas
+# ("•Materia: X (A)" / "•Regularizadas: ...") y para los CSV (por nombres o por ids).
+#
+# 1) Los parsers leen en streaming y emiten Regla (forma intermedia, sin tocar la base).
+# 2) Por plan, un Emparejador (armado una vez) resuelve los nombres contra los espacios del
+#    plan: exacto sin acentos -> parecido (difflib) -> contenido único.
+# 3) Por plan, en UNA transacción: se calcula la diferencia contra lo cargado para los
+#    espacios que aparecen en el archivo y se aplica con un delete + un bulk_create.
+# Los nombres que no se pudieron resolver quedan en el reporte (con sugerencia si la hay).
+
+from __future__ import annotations
+
+import csv
+import difflib
+import re
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.apps import apps
+from django.db import transaction
+
+from . import grafo_correlativas
+from .busqueda import clave
+
+CURSAR, RENDIR = "CURSAR", "RENDIR"
+REGULARIZADA, APROBADA = "REGULARIZADA", "APROBADA"
+PARECIDO = 0.85  # ratio mínimo para aceptar un nombre parecido sin intervención
+SUGERENCIA = 0.5  # por debajo de esto ni se sugiere
+
+ORDINALES = {
+    "primer": 1,
+    "primero": 1,
+    "segundo": 2,
+    "tercer": 3,
+    "tercero": 3,
+    "cuarto": 4,
+    "quinto": 5,
+}
+
+
+class ErrorFormato(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Regla:
+    """Una correlatividad tal como viene del archivo (nombres o ids, todavía sin resolver)."""
+
+    linea: int
+    plan: tuple[str, str] | int | None  # (carrera, resolución) | id | None (=> --plan)
+    espacio: str | int
+    tipo: str  # CURSAR | RENDIR
+    requisito: str  # REGULARIZADA | APROBADA
+    requiere: str | int | None = None
+    hasta_anio: int | None = None
+    anio: int | None = None  # año del espacio (desambigua nombres repetidos)
+    observaciones: str = ""
+
+
+# ---------- normalización ----------
+_FORMATO = re.compile(r"\s*\([A-Za-z]{1,3}\)\s*$")  # "Didáctica General (A)"
+
+
+def norm(s) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", clave(s)).split())
+
+
+def sin_formato(nombre: str) -> str:
+    return _FORMATO.sub("", nombre or "").strip()
+
+
+def anio_de(texto) -> int | None:
+    """'Primer Año', '2°', '3er año', 'TODOS 1' -> número de año."""
+    t = norm(texto)
+    for palabra, n in ORDINALES.items():
+        if re.search(rf"\b{palabra}\b", t):
+            return n
+    m = re.search(r"\b(\d)\s*(?:o|er|do|ro|to)?\b", t)
+    return int(m.group(1)) if m else None
+
+
+_TODOS = re.compile(r"^(todo|todos|todas)\b", re.I)
+
+
+def requisitos(texto: str) -> Iterator[tuple[str | None, int | None]]:
+    """
+    'A (M), B (S)' / 'A, B' / 'Ninguna' / 'Todo 1° año' -> (nombre, None) | (None, hasta_anio).
+    """
+    texto = (texto or "").strip().rstrip(".")
+    if not texto or norm(texto) in ("ninguna", "ninguno", "no", "0"):
+        return
+    # con formato entre paréntesis las comas de adentro del nombre no cortan
+    if _FORMATO.search(texto):
+        partes = re.findall(r"\s*,?\s*([^()]+?\([A-Za-z]{1,3}\))", texto)
+    else:
+        partes = re.split(r"\s*[,;]\s*", texto)
+    for p in partes:
+        p = p.strip(" ,;")
+        if not p:
+            continue
+        if _TODOS.match(norm(p)):
+            hasta = anio_de(p)
+            if hasta:
+                yield None, hasta
+                continue
+        yield sin_formato(p), None
+
+
+# ---------- parser: texto con viñetas ----------
+_PLAN = re.compile(r"^(.+?)\s*\(\s*Plan\s+([^)]+)\)\s*$", re.I)
+_ANIO = re.compile(r"^(\S+)\s+a[ñn]o\s*$", re.I)
+_MATERIA = re.compile(r"^(?:materia|espacio)\s*:\s*(.+)$", re.I)
+_SECCION = re.compile(r"^correlativas\s+para\s+(cursar|rendir)", re.I)
+_REQ = re.compile(r"^(aprobadas?|regularizadas?)\s*:\s*(.*)$", re.I)
+_VINETA = re.compile(r"^[\s•·\-\*]*(?:o(?=[A-ZÁÉÍÓÚ]))?")
+
+
+def parsear_vinetas(lineas: Iterable[str]) -> Iterator[Regla]:
+    plan = anio = espacio = None
+    tipo = CURSAR
+    vistos: set[tuple] = set()
+    for n, crudo in enumerate(lineas, start=1):
+        linea = _VINETA.sub("", crudo.rstrip("\n")).strip()
+        if not linea:
+            continue
+        if m := _PLAN.match(linea):
+            plan, anio, espacio = (m.group(1).strip(), m.group(2).strip()), None, None
+        elif (m := _ANIO.match(linea)) and anio_de(m.group(1)):
+            anio, espacio = anio_de(m.group(1)), None
+        elif m := _MATERIA.match(linea):
+            espacio, tipo = sin_formato(m.group(1)), CURSAR
+        elif m := _SECCION.match(linea):
+            tipo = CURSAR if m.group(1).lower() == "cursar" else RENDIR
+        elif (m := _REQ.match(linea)) and espacio:
+            requisito = APROBADA if m.group(1).lower().startswith("aprob") else REGULARIZADA
+            hubo = False
+            for nombre, hasta in requisitos(m.group(2)):
+                hubo = True
+                yield Regla(n, plan, espacio, tipo, requisito, nombre, hasta, anio)
+            if not hubo and (plan, espacio) not in vistos:
+                # "Ninguna": el espacio queda en el archivo (sus reglas viejas se borran)
+                yield Regla(n, plan, espacio, tipo, requisito, anio=anio)
+            vistos.add((plan, espacio))
+
+
+# ---------- parser: CSV ----------
+# columnas del CSV "por nombres" (planilla de la institución)
+COLUMNAS_NOMBRES = {
+    "para cursar debe tener regular": (CURSAR, REGULARIZADA),
+    "para cursar debe aprobar": (CURSAR, APROBADA),
+    "para rendir debe tener aprobada": (RENDIR, APROBADA),
+    "para rendir debe tener regular": (RENDIR, REGULARIZADA),
+}
+COLUMNAS_IDS = {"plan_id", "espacio_id"}
+
+
+def parsear_csv(lineas: Iterable[str]) -> Iterator[Regla]:
+    lineas = iter(lineas)
+    primera = next(lineas, "")
+    try:
+        dialecto = csv.Sniffer().sniff(primera, delimiters=",;\t")
+    except csv.Error:
+        dialecto = csv.excel
+    rdr = csv.reader(_con(primera, lineas), dialecto)
+    cols = [norm(c).replace(" ", "_") for c in next(rdr, [])]
+    if COLUMNAS_IDS <= set(cols):
+        yield from _csv_ids(rdr, cols)
+        return
+    nombres = {c: COLUMNAS_NOMBRES.get(c.replace("_", " ")) for c in cols}
+    if not any(nombres.values()):
+        raise ErrorFormato(
+            "CSV sin columnas conocidas: se espera plan_id,espacio_id,... o "
+            "'Espacio Curricular' + 'Para cursar debe tener Regular', etc."
+        )
+    for n, valores in enumerate(rdr, start=2):
+        row = dict(zip(cols, valores, strict=False))
+        espacio = sin_formato(
+            row.get("espacio_curricular") or row.get("espacio") or row.get("materia") or ""
+        )
+        if not espacio:
+            continue
+        plan = None
+        if row.get("carrera") and row.get("resolucion"):
+            plan = (row["carrera"].strip(), row["resolucion"].strip())
+        anio = anio_de(row.get("anio") or "")
+        hubo = False
+        for col, destino in nombres.items():
+            if not destino:
+                continue
+            for nombre, hasta in requisitos(row.get(col) or ""):
+                hubo = True
+                yield Regla(n, plan, espacio, *destino, nombre, hasta, anio)
+        if not hubo:
+            yield Regla(n, plan, espacio, CURSAR, REGULARIZADA, anio=anio)
+
+
+def _csv_ids(rdr, cols) -> Iterator[Regla]:
+    for n, valores in enumerate(rdr, start=2):
+        row = {c: (v or "").strip() for c, v in zip(cols, valores, strict=False)}
+        if not row.get("plan_id") or not row.get("espacio_id"):
+            continue
+        hasta = row.get("requiere_todos_hasta_anio")
+        try:
+            yield Regla(
+                n,
+                int(row["plan_id"]),
+                int(row["espacio_id"]),
+                (row.get("tipo") or CURSAR).upper(),
+                (row.get("requisito") or REGULARIZADA).upper(),
+                int(row["requiere_espacio_id"]) if row.get("requiere_espacio_id") else None,
+                int(hasta) if hasta else None,
+                observaciones=row.get("observaciones", ""),
+            )
+        except ValueError as e:
+            raise ErrorFormato(f"línea {n}: id inválido ({e})") from None
+
+
+def _con(primera, resto):
+    yield primera
+    yield from resto
+
+
+def parsear(path, formato: str = "auto") -> Iterator[Regla]:
+    """Reglas de un archivo .txt (viñetas) o .csv, leído de a una línea."""
+    if formato == "auto":
+        formato = "csv" if Path(path).suffix.lower() == ".csv" else "vinetas"
+    parser = parsear_csv if formato == "csv" else parsear_vinetas
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        yield from parser(f)
+
+
+# ---------- resolución de nombres ----------
+class Emparejador:
+    """Espacios de un plan indexados por nombre normalizado (se arma una vez por plan)."""
+
+    def __init__(self, espacios: Iterable[tuple[int, str, int]]):
+        self.por_nombre: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        self.ids: set[int] = set()
+        for pk, nombre, anio in espacios:
+            self.por_nombre[norm(nombre)].append((pk, anio))
+            self.ids.add(pk)
+        self.nombres = list(self.por_nombre)
+
+    @classmethod
+    def de_plan(cls, plan_id: int) -> Emparejador:
+        Espacio = apps.get_model("academia_core", "EspacioCurricular")
+        filas = Espacio.objects.filter(plan_id=plan_id).values_list("id", "materia__nombre", "anio")
+        return cls((pk, nombre or "", _anio_num(anio)) for pk, nombre, anio in filas)
+
+    def _elegir(self, clave_: str, anio: int | None) -> int | None:
+        candidatos = self.por_nombre[clave_]
+        if len(candidatos) > 1 and anio:
+            candidatos = [c for c in candidatos if c[1] == anio] or candidatos
+        return candidatos[0][0] if len(candidatos) == 1 else None
+
+    def resolver(self, nombre, anio: int | None = None) -> tuple[int | None, str | None]:
+        """-> (id, None) si se resolvió; (None, sugerencia|None) si no."""
+        if isinstance(nombre, int):
+            return (nombre, None) if nombre in self.ids else (None, None)
+        n = norm(nombre)
+        if n in self.por_nombre:
+            pk = self._elegir(n, anio)
+            return (pk, None) if pk else (None, "nombre repetido en el plan (indicá el año)")
+        parecidos = difflib.get_close_matches(n, self.nombres, n=2, cutoff=SUGERENCIA)
+        if parecidos:
+            ratio = difflib.SequenceMatcher(None, n, parecidos[0]).ratio()
+            unico = len(parecidos) == 1 or (
+                ratio - difflib.SequenceMatcher(None, n, parecidos[1]).ratio() > 0.05
+            )
+            if ratio >= PARECIDO and unico:
+                pk = self._elegir(parecidos[0], anio)
+                if pk:
+                    return pk, None
+        contienen = [c for c in self.nombres if n and n in c]
+        if len(contienen) == 1:
+            pk = self._elegir(contienen[0], anio)
+            if pk:
+                return pk, None
+        sugerido = parecidos[0] if parecidos else (contienen[0] if contienen else None)
+        return None, sugerido
+
+
+def _anio_num(anio) -> int:
+    return anio_de(anio or "") or 0
+
+
+# ---------- escritura ----------
+# lo que identifica a una correlatividad (en el orden de las tuplas de `deseadas`)
+CAMPOS = (
+    "espacio_id",
+    "tipo",
+    "requisito",
+    "requiere_espacio_id",
+    "requiere_todos_hasta_anio",
+    "observaciones",
+)
+
+
+@dataclass
+class ReportePlan:
+    plan: str
+    reglas: int = 0
+    creadas: int = 0
+    borradas: int = 0
+    sin_cambios: int = 0
+    sin_resolver: list = field(default_factory=list)  # [(linea, nombre, sugerencia)]
+
+
+@dataclass
+class Reporte:
+    dry_run: bool = False
+    planes: list[ReportePlan] = field(default_factory=list)
+    errores: list = field(default_factory=list)  # [(linea, mensaje)]
+
+    @property
+    def sin_resolver(self) -> list:
+        return [x for p in self.planes for x in p.sin_resolver]
+
+
+def _plan_id(plan, por_defecto: int | None, cache: dict) -> int | None:
+    if plan is None:
+        return por_defecto
+    if isinstance(plan, int):
+        return plan
+    if plan not in cache:
+        Plan = apps.get_model("academia_core", "PlanEstudios")
+        carrera, resolucion = plan
+        candidatos = [
+            (pk, nombre)
+            for pk, nombre in Plan.objects.filter(resolucion=resolucion).values_list(
+                "id", "carrera__nombre"
+            )
+        ]
+        exactos = [pk for pk, nombre in candidatos if norm(nombre) == norm(carrera)]
+        cache[plan] = (
+            exactos[0] if len(exactos) == 1 else candidatos[0][0] if len(candidatos) == 1 else None
+        )
+    return cache[plan]
+
+
+def importar(reglas: Iterable[Regla], plan: int | None = None, dry_run=False) -> Reporte:
+    """
+    Agrupa las reglas por plan y aplica cada plan en su transacción. Para los espacios
+    que aparecen en el archivo, lo cargado queda EXACTAMENTE como dice el archivo.
+    """
+    reporte = Reporte(dry_run=dry_run)
+    por_plan: dict[int, list[Regla]] = defaultdict(list)
+    cache: dict = {}
+    for r in reglas:
+        pid = _plan_id(r.plan, plan, cache)
+        if pid is None:
+            reporte.errores.append((r.linea, f"plan no encontrado: {r.plan or '(sin --plan)'}"))
+            continue
+        por_plan[pid].append(r)
+    for pid, rs in por_plan.items():
+        reporte.planes.append(_importar_plan(pid, rs, dry_run))
+    return reporte
+
+
+def _importar_plan(plan_id: int, reglas: list[Regla], dry_run: bool) -> ReportePlan:
+    Plan = apps.get_model("academia_core", "PlanEstudios")
+    Correlatividad = apps.get_model("academia_core", "Correlatividad")
+    plan = Plan.objects.select_related("carrera").get(pk=plan_id)
+    rep = ReportePlan(plan=str(plan), reglas=len(reglas))
+    emp = Emparejador.de_plan(plan_id)
+
+    deseadas: set[tuple] = set()
+    cubiertos: set[int] = set()
+    incompletos: set[int] = set()  # espacios con algún requisito sin resolver
+    for r in reglas:
+        esp, sug = emp.resolver(r.espacio, r.anio)
+        if esp is None:
+            rep.sin_resolver.append((r.linea, str(r.espacio), sug))
+            continue
+        cubiertos.add(esp)
+        if r.requiere is None and r.hasta_anio is None:
+            continue  # "Ninguna"
+        req = None
+        if r.requiere is not None:
+            req, sug = emp.resolver(r.requiere)
+            if req is None:
+                rep.sin_resolver.append((r.linea, str(r.requiere), sug))
+                incompletos.add(esp)
+                continue
+        deseadas.add((esp, r.tipo, r.requisito, req, r.hasta_anio, r.observaciones))
+    # Un espacio con un requisito sin resolver no sabemos cómo tiene que quedar: se deja
+    # como está en la base (un error de tipeo no borra correlatividades).
+    cubiertos -= incompletos
+    deseadas = {k for k in deseadas if k[0] not in incompletos}
+
+    actuales: dict[tuple, list[int]] = defaultdict(list)
+    cargadas = Correlatividad.objects.filter(plan_id=plan_id, espacio_id__in=cubiertos).order_by()
+    for pk, *k in cargadas.values_list("id", *CAMPOS):
+        actuales[tuple(k)].append(pk)
+
+    # duplicadas en la base: se deja una
+    borrar = [pk for k, pks in actuales.items() for pk in (pks if k not in deseadas else pks[1:])]
+    crear = deseadas - actuales.keys()
+    rep.borradas, rep.creadas = len(borrar), len(crear)
+    rep.sin_cambios = len(deseadas) - len(crear)
+    if dry_run or not (borrar or crear):
+        return rep
+
+    with transaction.atomic():
+        Correlatividad.objects.filter(pk__in=borrar).delete()
+        Correlatividad.objects.bulk_create(
+            Correlatividad(plan_id=plan_id, **dict(zip(CAMPOS, k, strict=True)))
+            for k in sorted(crear, key=repr)
+        )
+        # bulk_create no dispara post_save
+        grafo_correlativas.invalidar(plan_id)
+    return rep
@@ -0,0 +1,150 @@
+# academia_core/indice_busqueda.py
+# Índice de búsqueda para Estudiante, Docente y Materia (modelo TerminoBusqueda).
+#
+# Cada objeto se parte en términos normalizados (sin acentos, minúscula, DNI sin puntos)
+# con un peso por campo. Una búsqueda pide que TODAS las palabras tipeadas sean prefijo
+# de algún término del objeto y ordena por puntaje (apellido > nombre > dni > email y,
+# dentro del mismo campo, coincidencia exacta > prefijo). Los prefijos son rangos sobre (tipo, termino), así
+# que usan el índice en vez de recorrer la tabla con un LIKE '%...%' por campo.
+#
+# Lo mantienen las signals (post_save/post_delete); lo que entra por bulk_create o
+# update() se reindexa con `python manage.py reindexar_busqueda`.
+
+from __future__ import annotations
+
+import re
+from functools import reduce
+from operator import or_
+
+from django.apps import apps as django_apps
+from django.db.models import Case, F, IntegerField, OuterRef, QuerySet, Subquery, Sum, When
+
+from .busqueda import clave, prefijo
+
+# tipo -> (modelo, {campo: peso})
+FUENTES: dict[str, tuple[str, dict[str, int]]] = {
+    "estudiante": ("Estudiante", {"apellido": 4, "nombre": 3, "dni": 2, "email": 1}),
+    "docente": ("Docente", {"apellido": 4, "nombre": 3, "dni": 2, "email": 1}),
+    "materia": ("Materia", {"nombre": 3}),
+}
+LARGO = 64  # TerminoBusqueda.termino
+LOTE = 2000
+
+_SEPARADOR = re.compile(r"[^0-9a-z]+")
+_PUNTO_DNI = re.compile(r"(?<=\d)\.(?=\d)")
+
+
+def terminos(valor) -> list[str]:
+    """'Pérez-Gómez', '30.111.222', 'ana.p@x.com' -> términos a indexar/buscar."""
+    s = _PUNTO_DNI.sub("", clave(valor))
+    partes = [p for p in _SEPARADOR.split(s) if p]
+    if "@" in s:
+        partes.append(s.replace(" ", ""))  # el email entero también
+    return list(dict.fromkeys(p[:LARGO] for p in partes))
+
+
+def tipo_de(model) -> str | None:
+    nombre = model._meta.object_name
+    return next((t for t, (m, _c) in FUENTES.items() if m == nombre), None)
+
+
+def _modelo(tipo: str, registro=None):
+    return (registro or django_apps).get_model("academia_core", FUENTES[tipo][0])
+
+
+def filas_de(tipo: str, obj, Termino=None) -> list:
+    Termino = Termino or django_apps.get_model("academia_core", "TerminoBusqueda")
+    pesos: dict[str, int] = {}
+    for campo, peso in FUENTES[tipo][1].items():
+        for t in terminos(getattr(obj, campo, "")):
+            pesos[t] = max(pesos.get(t, 0), peso)
+    return [Termino(tipo=tipo, objeto_id=obj.pk, termino=t, peso=p) for t, p in pesos.items()]
+
+
+# ---------- mantenimiento ----------
+def indexar(tipo: str, objs) -> None:
+    Termino = django_apps.get_model("academia_core", "TerminoBusqueda")
+    objs = list(objs)
+    Termino.objects.filter(tipo=tipo, objeto_id__in=[o.pk for o in objs]).delete()
+    Termino.objects.bulk_create(
+        [f for o in objs for f in filas_de(tipo, o, Termino)], batch_size=LOTE
+    )
+
+
+def desindexar(tipo: str, pk) -> None:
+    Termino = django_apps.get_model("academia_core", "TerminoBusqueda")
+    Termino.objects.filter(tipo=tipo, objeto_id=pk).delete()
+
+
+def reindexar(tipos=None, registro=None) -> dict[str, int]:
+    """Rearma el índice de cero. `registro` = apps históricas (desde una migración)."""
+    Termino = (registro or django_apps).get_model("academia_core", "TerminoBusqueda")
+    hechos = {}
+    for tipo in tipos or FUENTES:
+        Model = _modelo(tipo, registro)
+        Termino.objects.filter(tipo=tipo).delete()
+        campos = ["pk", *FUENTES[tipo][1]]
+        filas, n = [], 0
+        for obj in Model.objects.only(*campos).order_by().iterator(chunk_size=LOTE):
+            filas += filas_de(tipo, obj, Termino)
+            n += 1
+            if len(filas) >= LOTE:
+                Termino.objects.bulk_create(filas, batch_size=LOTE)
+                filas = []
+        Termino.objects.bulk_create(filas, batch_size=LOTE)
+        hechos[tipo] = n
+    return hechos
+
+
+# ---------- consulta ----------
+def _condiciones(q: str):
+    palabras = terminos(q)
+    return palabras, [prefijo("termino", p) for p in palabras]
+
+
+def coincidencias(tipo: str, q: str) -> list[QuerySet]:
+    """
+    Un values("objeto_id") por palabra de `q` (prefijo sobre el índice (tipo, termino)):
+    el objeto tiene que estar en todos. Vacío si `q` no tiene nada buscable.
+    """
+    Termino = django_apps.get_model("academia_core", "TerminoBusqueda")
+    _palabras, conds = _condiciones(q)
+    return [Termino.objects.filter(c, tipo=tipo).values("objeto_id") for c in conds]
+
+
+def puntaje(tipo: str, q: str, campo: str = "pk") -> Subquery:
+    """
+    Relevancia del objeto de la fila externa: por cada término que coincide, 2 x peso
+    del campo (+1 si coincide entero). Va por el índice (tipo, objeto_id).
+    """
+    palabras, conds = _condiciones(q)
+    Termino = django_apps.get_model("academia_core", "TerminoBusqueda")
+    valor = Case(
+        When(termino__in=palabras, then=F("peso") * 2 + 1),
+        When(reduce(or_, conds), then=F("peso") * 2),
+        default=0,
+        output_field=IntegerField(),
+    )
+    return Subquery(
+        Termino.objects.filter(tipo=tipo, objeto_id=OuterRef(campo))
+        .values("objeto_id")
+        .annotate(p=Sum(valor))
+        .values("p")[:1]
+    )
+
+
+def filtrar(qs: QuerySet, q: str, campo: str = "pk", tipo: str | None = None) -> QuerySet:
+    """
+    `qs` filtrado por `q` y ordenado por relevancia (después, por su orden de siempre).
+    `campo` es el lookup al objeto indexado (p.ej. "materia_id" desde EspacioCurricular).
+    """
+    tipo = tipo or tipo_de(qs.model)
+    por_palabra = coincidencias(tipo, q)
+    if not por_palabra:
+        return qs
+    orden = list(qs.query.order_by or qs.model._meta.ordering)
+    for ids in por_palabra:
+        qs = qs.filter(**{f"{campo}__in": ids})
+    return qs.annotate(puntaje_busqueda=puntaje(tipo, q, campo)).order_by(
+        "-puntaje_busqueda", *orden
+    )
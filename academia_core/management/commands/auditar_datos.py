@@ -1,34 +1,188 @@
+import time
+from datetime import datetime
 from decimal import Decimal
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
 from academia_core.models import EstudianteProfesorado, Movimiento
+from academia_core.promedios import Q_PUEDE_PROMEDIAR, nota_que_promedia, promedio
+
+CAMPOS_PROMEDIO = ["suma_notas_aprobadas", "cant_notas_aprobadas", "promedio_general"]
+
+
+def _nota_de_texto(texto: str) -> Decimal | None:
+    digitos = "".join(ch for ch in texto if ch.isdigit())
+    if not digitos:
+        return None
+    n = int(digitos)
+    return Decimal(n) if 0 <= n <= 10 else None
 
 
 class Command(BaseCommand):
-    help = "Audita notas textuales, promedios cacheados y regularidades vencidas (2 años)."
+    help = (
+        "Audita notas textuales y promedios cacheados. Recorre las tablas en bloques "
+        "(keyset + bulk_update, una transacción por bloque) y calcula los promedios con "
+        "una query por bloque."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Calcula y muestra las diferencias sin guardar nada.",
+        )
+        parser.add_argument(
+            "--since",
+            help="Sólo movimientos cargados desde esta fecha (YYYY-MM-DD) y sus inscripciones.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--max-diffs",
+            type=int,
+            default=50,
+            help="Cuántas diferencias listar en --dry-run (0 = todas).",
+        )
 
     def handle(self, *args, **opts):
-        # 1) Normaliza nota_texto -> nota_num cuando sea convertible
-        corr_numeros = 0
+        self.chunk = max(1, opts["chunk_size"])
+        self.verbosity = opts["verbosity"]
+        self.dry_run = opts["dry_run"]
+        self.max_diffs = opts["max_diffs"]
+        self.diffs: list[str] = []
+        self.n_diffs = 0
+
         movs = Movimiento.objects.all()
-        for m in movs:
-            if m.nota_num is None and m.nota_texto:
-                try:
-                    n = int("".join(ch for ch in m.nota_texto if ch.isdigit()))
-                    if 0 <= n <= 10:
-                        m.nota_num = Decimal(n)
-                        m.save(update_fields=["nota_num"])
-                        corr_numeros += 1
-                except Exception:
-                    pass
-        self.stdout.write(f"Notas textuales convertidas -> num: {corr_numeros}")
-
-        # 2) Recalcula promedios cacheados
-        recalc = 0
-        for insc in EstudianteProfesorado.objects.all():
-            insc.recalcular_promedio()
-            recalc += 1
-        self.stdout.write(f"Promedios recalculados: {recalc}")
-
-        self.stdout.write(self.style.SUCCESS("Auditoría terminada (soft)."))
+        inscs = EstudianteProfesorado.objects.all()
+        if opts["since"]:
+            try:
+                desde = datetime.strptime(opts["since"], "%Y-%m-%d").date()
+            except ValueError as e:
+                raise CommandError("--since debe tener formato YYYY-MM-DD") from e
+            movs = movs.filter(creado__date__gte=desde)
+            inscs = inscs.filter(pk__in=movs.values("inscripcion_id"))
+
+        # Cada bloque se confirma solo (locks y undo acotados al bloque). En --dry-run todo
+        # va además dentro de una transacción que se revierte al final, así el paso 2 ve
+        # las notas que el paso 1 habría normalizado.
+        if self.dry_run:
+            with transaction.atomic():
+                corr = self._normalizar_notas(movs)
+                recalc = self._recalcular_promedios(inscs)
+                transaction.set_rollback(True)
+        else:
+            corr = self._normalizar_notas(movs)
+            recalc = self._recalcular_promedios(inscs)
+
+        self.stdout.write(f"Notas textuales convertidas -> num: {corr}")
+        self.stdout.write(f"Promedios corregidos: {recalc}")
+        if self.dry_run:
+            for linea in self.diffs:
+                self.stdout.write(f"  {linea}")
+            if self.n_diffs > len(self.diffs):
+                self.stdout.write(f"  ... y {self.n_diffs - len(self.diffs)} más")
+            self.stdout.write(self.style.WARNING("Dry-run: no se guardó ningún cambio."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Auditoría terminada (soft)."))
+
+    # ---------- helpers ----------
+    def _diff(self, linea: str) -> None:
+        self.n_diffs += 1
+        if self.dry_run and (not self.max_diffs or len(self.diffs) < self.max_diffs):
+            self.diffs.append(linea)
+
+    def _por_bloques(self, qs, *campos):
+        """values_list por bloques de `chunk` filas ordenadas por id (keyset). A diferencia
+        de un cursor abierto con .iterator(), tolera que escribamos la misma tabla entre
+        bloques (SQLite no aísla queries dentro de una misma conexión)."""
+        ultimo = 0
+        while True:
+            bloque = list(
+                qs.filter(pk__gt=ultimo).order_by("pk").values_list("pk", *campos)[: self.chunk]
+            )
+            if not bloque:
+                return
+            yield bloque
+            ultimo = bloque[-1][0]
+
+    def _progreso(self, etiqueta: str, leidas: int, t0: float, final: bool = False) -> None:
+        if not final and self.verbosity < 2:
+            return
+        seg = max(time.monotonic() - t0, 1e-6)
+        self.stdout.write(f"  {etiqueta}: {leidas} filas en {seg:.1f}s ({leidas / seg:.0f}/s)")
+
+    # ---------- 1) nota_texto -> nota_num ----------
+    def _normalizar_notas(self, movs) -> int:
+        pendientes = movs.filter(nota_num__isnull=True).exclude(nota_texto="")
+
+        t0, leidas, corregidas = time.monotonic(), 0, 0
+        for bloque in self._por_bloques(pendientes, "nota_texto"):
+            leidas += len(bloque)
+            lote = []
+            for mov_id, texto in bloque:
+                n = _nota_de_texto(texto)
+                if n is not None:
+                    lote.append(Movimiento(pk=mov_id, nota_num=n))
+                    self._diff(f"movimiento #{mov_id}: nota_texto {texto!r} -> nota_num {n}")
+            corregidas += self._guardar(Movimiento, lote, ["nota_num"])
+            self._progreso("notas", leidas, t0)
+        self._progreso("notas", leidas, t0, final=True)
+        return corregidas
+
+    # ---------- 2) promedios ----------
+    def _recalcular_promedios(self, inscs) -> int:
+        t0, leidas, cambiadas, ultimo = time.monotonic(), 0, 0, 0
+        while True:
+            # bloque bloqueado + sus agregados en la misma transacción: un Movimiento
+            # guardado mientras tanto espera (aplicar_delta lockea la misma fila)
+            with transaction.atomic():
+                bloque = list(
+                    inscs.select_for_update()
+                    .filter(pk__gt=ultimo)
+                    .order_by("pk")
+                    .values_list("pk", *CAMPOS_PROMEDIO)[: self.chunk]
+                )
+                if not bloque:
+                    break
+                cambiadas += self._promedios_de_bloque(bloque)
+            leidas += len(bloque)
+            ultimo = bloque[-1][0]
+            self._progreso("promedios", leidas, t0)
+        self._progreso("promedios", leidas, t0, final=True)
+        return cambiadas
+
+    def _promedios_de_bloque(self, bloque) -> int:
+        # una query por bloque y la nota con nota_que_promedia, la misma regla que el
+        # recálculo y los deltas (con --since hay movimientos viejos sin normalizar)
+        agregados: dict[int, list] = {}
+        filas = Movimiento.objects.filter(
+            Q_PUEDE_PROMEDIAR, inscripcion_id__in=[fila[0] for fila in bloque]
+        ).values_list("inscripcion_id", "tipo", "condicion_id", "nota_num", "nota_texto")
+        for insc_id, tipo, codigo, nota_num, nota_texto in filas.order_by():
+            nota = nota_que_promedia(tipo, codigo, nota_num, nota_texto)
+            if nota is not None:
+                acum = agregados.setdefault(insc_id, [Decimal(0), 0])
+                acum[0] += nota
+                acum[1] += 1
+        lote = []
+        for insc_id, suma_ant, cant_ant, prom_ant in bloque:
+            suma, cant = agregados.get(insc_id, (Decimal(0), 0))
+            prom = promedio(suma, cant)
+            if (suma, cant, prom) == (suma_ant, cant_ant, prom_ant):
+                continue
+            lote.append(
+                EstudianteProfesorado(
+                    pk=insc_id,
+                    suma_notas_aprobadas=suma,
+                    cant_notas_aprobadas=cant,
+                    promedio_general=prom,
+                )
+            )
+            self._diff(f"inscripción #{insc_id}: promedio {prom_ant} -> {prom}")
+        return self._guardar(EstudianteProfesorado, lote, CAMPOS_PROMEDIO)
+
+    def _guardar(self, model, objs, campos) -> int:
+        if objs:
+            with transaction.atomic():  # el bloque se confirma entero o nada
+                model.objects.bulk_update(objs, campos, batch_size=self.chunk)
+        return len(objs)
@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from academia_core.enlaces_eligibilidad import enlaces
+
+
+class Command(BaseCommand):
+    help = (
+        "Muestra qué modelos, campos y filtros usa el motor de eligibilidad "
+        "(resueltos al arrancar la app)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true", help="Salida en JSON.")
+
+    def handle(self, *args, **opts):
+        filas = [e.as_dict() for e in enlaces().values()]
+        if opts["json"]:
+            self.stdout.write(json.dumps(filas, ensure_ascii=False, indent=2))
+            return
+
+        for e in filas:
+            if e["motivo"]:
+                modelo = e["modelo"] or "—"
+                self.stdout.write(
+                    self.style.WARNING(f"{e['fuente']}: {modelo} NO SE USA ({e['motivo']})")
+                )
+                continue
+            self.stdout.write(self.style.SUCCESS(f"{e['fuente']}: {e['modelo']}"))
+            for clave in ("estudiante", "espacio", "plan", "ciclo", "predicado"):
+                self.stdout.write(f"  {clave:<11} {e[clave] or '—'}")
@@ -0,0 +1,608 @@
+import math
+import random
+import time
+from datetime import date
+from datetime import time as hora
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Case, DateField, Value, When
+
+from academia_core import carton, grafo_correlativas, indice_busqueda, promedios, versiones
+from academia_core.busqueda import clave
+from academia_core.models import (
+    Carrera,
+    Condicion,
+    Correlatividad,
+    Docente,
+    DocenteEspacio,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    Materia,
+    Movimiento,
+    PlanEstudios,
+)
+from academia_horarios import ocupacion
+from academia_horarios.grillas import registro
+from academia_horarios.models import Comision, HorarioClase, MateriaEnPlan, Periodo, TimeSlot
+
+# Volúmenes con --scale 1 (un instituto grande de verdad)
+CARRERAS = 12
+ESTUDIANTES = 20_000
+MOVIMIENTOS = 500_000
+DOCENTES = 400
+ANIOS = 4
+MATERIAS_POR_ANIO = 8
+COHORTES = 7  # la más vieja ya terminó de cursar
+CUPO = 45
+HOY = date(2025, 6, 30)  # fecha de referencia por defecto: mismo resultado cualquier día
+
+PREFIJO = "SIN-"  # abreviatura de las carreras inventadas
+DNI_DESDE = 90_000_000  # fuera del rango de los DNI reales
+DNI_DOCENTES = 95_000_000
+
+PROFESORADOS = ["Educación Primaria", "Educación Inicial", "Matemática", "Lengua y Literatura"]
+PROFESORADOS += ["Historia", "Geografía", "Biología", "Física", "Química", "Inglés"]
+PROFESORADOS += ["Educación Física", "Música", "Artes Visuales", "Educación Especial"]
+PROFESORADOS += ["Filosofía", "Economía", "Informática", "Teatro"]
+BASES = ["Pedagogía", "Didáctica General", "Psicología Educacional", "Sociología", "Filosofía"]
+BASES += ["Historia Argentina", "Práctica Docente", "Taller de Lectura", "Álgebra", "Análisis"]
+BASES += ["Geometría", "Estadística", "Lengua", "Literatura", "Biología Celular", "Ecología"]
+BASES += ["Física", "Química General", "Inglés", "Fonética", "Educación Sexual Integral"]
+BASES += ["TIC en Educación", "Arte y Expresión", "Corporeidad", "Investigación Educativa"]
+BASES += ["Sujetos de la Educación", "Política Educativa", "Historia de la Educación"]
+BASES += ["Alfabetización", "Didáctica Específica", "Seminario de Integración", "Ética"]
+BASES += ["Geografía Física", "Historia Universal", "Probabilidad", "Lógica", "Música"]
+ROMANOS = ("I", "II", "III", "IV")
+APELLIDOS = ["Pérez", "Gómez", "Núñez", "Fernández", "López", "Martínez", "Rodríguez", "Sosa"]
+APELLIDOS += ["Álvarez", "Benítez", "Acuña", "Ibáñez", "Romero", "Giménez", "Peña", "Suárez"]
+APELLIDOS += ["Ruiz", "Díaz", "Torres", "Castro", "Ortiz", "Molina", "Silva", "Ríos", "Luna"]
+NOMBRES = ["Ana", "José", "María", "Lucía", "Martín", "Sofía", "Julián", "Inés", "Tomás", "Zoe"]
+NOMBRES += ["Valentina", "Mateo", "Camila", "Lautaro", "Florencia", "Agustín", "Micaela"]
+
+CONDICIONES = [
+    ("REGULAR", "Regular", "REG"),
+    ("PROMOCION", "Promoción", "REG"),
+    ("LIBRE_INASISTENCIAS", "Libre por inasistencias", "REG"),
+    ("DESAPROBADO_PARCIAL", "Desaprobado parcial", "REG"),
+    ("LIBRE", "Libre", "FIN"),
+]
+RESULTADO_CURSADA = (("REGULAR", 55), ("PROMOCION", 20), ("LIBRE_INASISTENCIAS", 10))
+RESULTADO_CURSADA += (("DESAPROBADO_PARCIAL", 15),)
+MOVS_POR_CURSADA = 1.5  # la cursada + los finales de los regulares (promedio)
+
+
+def _completar_ids(modelo, objs, campos):
+    """bulk_create no devuelve pk en todos los motores (MySQL): se buscan por clave natural."""
+    faltan = [o for o in objs if o.pk is None]
+    if not faltan:
+        return
+    primero = campos[0]
+    filtro = {f"{primero}__in": {getattr(o, primero) for o in faltan}}
+    ids = {
+        tuple(fila[:-1]): fila[-1]
+        for fila in modelo.objects.filter(**filtro).values_list(*campos, "pk").order_by()
+    }
+    for o in faltan:
+        o.pk = ids[tuple(getattr(o, c) for c in campos)]
+
+
+def _crear(modelo, objs, campos=None, lote=2000):
+    modelo.objects.bulk_create(objs, batch_size=lote)
+    if campos:
+        _completar_ids(modelo, objs, campos)
+    return objs
+
+
+def _pesado(rng, opciones):
+    valores, pesos = zip(*opciones, strict=True)
+    return rng.choices(valores, pesos)[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera un instituto inventado con volúmenes de producción (carreras, planes con "
+        "correlatividades, estudiantes, cursadas, movimientos, comisiones y horarios), "
+        "siempre igual para la misma --seed, --scale y --hoy. Para medir rendimiento en local."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help=f"Multiplica los volúmenes ({ESTUDIANTES} estudiantes, "
+            f"{MOVIMIENTOS} movimientos con 1).",
+        )
+        parser.add_argument(
+            "--hoy",
+            type=date.fromisoformat,
+            default=HOY,
+            help=f"Fecha de referencia AAAA-MM-DD: ciclo de la oferta y tope de las fechas "
+            f"(por defecto {HOY.isoformat()}).",
+        )
+        parser.add_argument("--lote", type=int, default=1000, help="Estudiantes por transacción.")
+        parser.add_argument(
+            "--sin-derivados",
+            action="store_true",
+            help="No rearma cartón, promedios ni índice de búsqueda (más rápido).",
+        )
+
+    def handle(self, *args, **opts):
+        escala = opts["scale"]
+        if escala <= 0:
+            raise CommandError("--scale tiene que ser mayor que 0.")
+        if Carrera.objects.filter(abreviatura__startswith=PREFIJO).exists():
+            raise CommandError("Ya hay un instituto sintético en esta base.")
+        self.rng = random.Random(opts["seed"])
+        self.hoy = opts["hoy"]
+        self.cuentas = {}
+        inicio = time.perf_counter()
+
+        n_carreras = min(max(2, round(CARRERAS * escala)), len(PROFESORADOS))
+        with transaction.atomic():
+            self._paso("condiciones", self._condiciones)
+            self._paso("planes", self._planes, n_carreras)
+            self._paso("docentes", self._docentes, max(5, round(DOCENTES * escala)))
+            self._paso("oferta", self._oferta)
+        self._paso(
+            "estudiantes",
+            self._estudiantes,
+            max(10, round(ESTUDIANTES * escala)),
+            max(1, round(MOVIMIENTOS * escala)),
+            opts["lote"],
+        )
+        if not opts["sin_derivados"]:
+            self._paso("derivados", self._derivados)
+
+        versiones.invalidar(*versiones.TABLAS)
+        ocupacion.invalidar()
+        for plan in self.planes:
+            grafo_correlativas.invalidar(plan.pk)
+
+        for nombre, n in self.cuentas.items():
+            self.stdout.write(f"{nombre:<22}{n:>10}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Listo en {time.perf_counter() - inicio:.1f} s (seed {opts['seed']})"
+            )
+        )
+
+    def _paso(self, nombre, fn, *args):
+        t = time.perf_counter()
+        fn(*args)
+        self.stdout.write(f"  {nombre}: {time.perf_counter() - t:.1f} s")
+
+    def _contar(self, nombre, n):
+        self.cuentas[nombre] = self.cuentas.get(nombre, 0) + n
+
+    # ---------- catálogos ----------
+    def _condiciones(self):
+        Condicion.objects.bulk_create(
+            [Condicion(codigo=c, nombre=n, tipo=t) for c, n, t in CONDICIONES],
+            ignore_conflicts=True,
+        )
+
+    def _planes(self, n_carreras):
+        rng = self.rng
+        carreras = _crear(
+            Carrera,
+            [
+                Carrera(nombre=f"Profesorado de {p} (sintético)", abreviatura=f"{PREFIJO}{i:02d}")
+                for i, p in enumerate(PROFESORADOS[:n_carreras], start=1)
+            ],
+            ["nombre"],
+        )
+        planes = []
+        for c in carreras:
+            anio_plan = rng.randrange(2009, 2016)
+            for vigente, anio, numeros in (
+                (False, anio_plan, (100, 5000)),
+                (True, anio_plan + rng.randrange(6, 10), (5000, 9999)),
+            ):
+                planes.append(
+                    PlanEstudios(
+                        carrera_id=c.pk,
+                        resolucion=f"{rng.randrange(*numeros)}/{anio % 100:02d}",
+                        nombre=f"Plan {anio}",
+                        vigente=vigente,
+                    )
+                )
+        self.planes = _crear(PlanEstudios, planes, ["carrera_id", "resolucion"])
+        vigentes = {p.carrera_id: p for p in self.planes if p.vigente}
+        for c in carreras:
+            c.plan_vigente_id = vigentes[c.pk].pk
+        Carrera.objects.bulk_update(carreras, ["plan_vigente"])
+        self.carreras = carreras
+
+        # Materias compartidas entre carreras, como en la realidad ("Pedagogía I")
+        nombres_por_plan = {}
+        for c in carreras:
+            comunes = [rng.sample(BASES, MATERIAS_POR_ANIO) for _ in range(ANIOS)]
+            for p in (p for p in self.planes if p.carrera_id == c.pk):
+                por_anio = []
+                for a, bases in enumerate(comunes):
+                    bases = list(bases)
+                    if not p.vigente:  # el plan viejo comparte la mayoría
+                        bases[rng.randrange(len(bases))] = rng.choice(
+                            [b for b in BASES if b not in bases]
+                        )
+                    por_anio.append([f"{b} {ROMANOS[a]}" for b in bases])
+                nombres_por_plan[p.pk] = por_anio
+        todos = sorted({n for anios in nombres_por_plan.values() for ns in anios for n in ns})
+        existentes = dict(Materia.objects.filter(nombre__in=todos).values_list("nombre", "pk"))
+        nuevas = _crear(
+            Materia, [Materia(nombre=n) for n in todos if n not in existentes], ["nombre"]
+        )
+        materia_id = existentes | {m.nombre: m.pk for m in nuevas}
+
+        espacios = []
+        for p in self.planes:
+            for a, nombres in enumerate(nombres_por_plan[p.pk], start=1):
+                for n in nombres:
+                    espacios.append(
+                        EspacioCurricular(
+                            plan_id=p.pk,
+                            materia_id=materia_id[n],
+                            anio=f"{a}°",
+                            cuatrimestre=rng.choice("12AA"),
+                            horas=rng.choice((48, 64, 64, 96, 128)),
+                            formato=rng.choice(("Asignatura", "Taller", "Seminario")),
+                            libre_habilitado=rng.random() < 0.3,
+                        )
+                    )
+        _crear(EspacioCurricular, espacios, ["plan_id", "materia_id", "anio", "cuatrimestre"])
+        # plan -> [espacios del 1° año, del 2°, ...]
+        self.espacios = {p.pk: [[] for _ in range(ANIOS)] for p in self.planes}
+        for e in espacios:
+            self.espacios[e.plan_id][int(e.anio[0]) - 1].append(e)
+        self._correlatividades()
+        self._contar("carreras", len(carreras))
+        self._contar("planes", len(self.planes))
+        self._contar("materias nuevas", len(nuevas))
+        self._contar("espacios", len(espacios))
+
+    def _correlatividades(self):
+        """Grafo en capas: cada espacio depende de espacios de años anteriores (sin ciclos)."""
+        rng, filas = self.rng, []
+        for plan_id, anios in self.espacios.items():
+            for a in range(1, ANIOS):
+                for e in anios[a]:
+                    previos = anios[a - 1]
+                    for req in rng.sample(previos, rng.randrange(0, 3)):
+                        filas.append((plan_id, e, "CURSAR", "REGULARIZADA", req, None))
+                        if rng.random() < 0.6:
+                            filas.append((plan_id, e, "RENDIR", "APROBADA", req, None))
+                    if a == ANIOS - 1 and rng.random() < 0.25:
+                        filas.append((plan_id, e, "CURSAR", "APROBADA", None, a - 1))
+        corr = [
+            Correlatividad(
+                plan_id=plan_id,
+                espacio_id=e.pk,
+                tipo=tipo,
+                requisito=req,
+                requiere_espacio_id=r.pk if r else None,
+                requiere_todos_hasta_anio=hasta,
+            )
+            for plan_id, e, tipo, req, r, hasta in filas
+        ]
+        _crear(Correlatividad, corr)
+        self._contar("correlatividades", len(corr))
+
+    def _docentes(self, n):
+        rng = self.rng
+        docentes = []
+        for i in range(n):
+            ape, nom = rng.choice(APELLIDOS), rng.choice(NOMBRES)
+            docentes.append(
+                Docente(
+                    dni=f"{DNI_DOCENTES + i}",
+                    apellido=ape,
+                    nombre=nom,
+                    email=f"{clave(nom)}.{clave(ape)}{i}@docentes.edu.ar",
+                )
+            )
+        _crear(Docente, docentes, ["dni"])
+        asignaciones = []
+        for p in self.planes:
+            if not p.vigente:
+                continue
+            for e in (e for anio in self.espacios[p.pk] for e in anio):
+                elegidos = rng.sample(docentes, 2 if rng.random() < 0.1 else 1)
+                asignaciones += [DocenteEspacio(docente_id=d.pk, espacio_id=e.pk) for d in elegidos]
+        _crear(DocenteEspacio, asignaciones)
+        self._contar("docentes", n)
+        self._contar("docente-espacio", len(asignaciones))
+
+    # ---------- oferta del ciclo actual ----------
+    def _timeslots(self, turno):
+        existentes = {
+            (t.dia_semana, t.inicio.hour * 60 + t.inicio.minute): t
+            for t in TimeSlot.objects.filter(turno=turno)
+        }
+        grilla = registro().get(turno)
+        faltan = [
+            TimeSlot(
+                turno=turno,
+                dia_semana=dia,
+                inicio=hora(a // 60, a % 60),
+                fin=hora(b // 60, b % 60),
+            )
+            for dia in range(1, 6)
+            for a, b in (grilla.slots if grilla else ())
+            if (dia, a) not in existentes
+        ]
+        _crear(TimeSlot, faltan, ["turno", "dia_semana", "inicio"])
+        for t in faltan:
+            existentes[(t.dia_semana, t.inicio.hour * 60 + t.inicio.minute)] = t
+        self._contar("timeslots", len(faltan))
+        # [día] -> timeslots en orden
+        return {
+            dia: [existentes[k] for k in sorted(k for k in existentes if k[0] == dia)]
+            for dia in range(1, 6)
+        }
+
+    def _oferta(self):
+        rng, ciclo = self.rng, self.hoy.year
+        periodos = {}
+        for cuatri in (1, 2):
+            periodos[cuatri], _ = Periodo.objects.get_or_create(
+                ciclo_lectivo=ciclo, cuatrimestre=cuatri
+            )
+        turnos = ("manana", "tarde", "vespertino")
+        slots = {t: self._timeslots(t) for t in turnos}
+
+        meps = []
+        for p in self.planes:
+            if not p.vigente:
+                continue
+            for a, espacios in enumerate(self.espacios[p.pk], start=1):
+                for e in espacios:
+                    anual = e.cuatrimestre == "A"
+                    semanales = rng.choice((3, 4, 4, 5))
+                    meps.append(
+                        MateriaEnPlan(
+                            plan_id=p.pk,
+                            materia_id=e.pk,
+                            anio=a,
+                            tipo_dictado="ANUAL" if anual else "CUATRIMESTRAL",
+                            horas_catedra_semana_1c=semanales if e.cuatrimestre != "2" else 0,
+                            horas_catedra_semana_2c=semanales if e.cuatrimestre != "1" else 0,
+                        )
+                    )
+        _crear(MateriaEnPlan, meps, ["plan_id", "materia_id", "anio"])
+
+        espacio = {e.pk: e for anios in self.espacios.values() for es in anios for e in es}
+        carrera_de_plan = {p.pk: p.carrera_id for p in self.planes}
+        orden = {c.pk: i for i, c in enumerate(self.carreras)}
+        # alumnos por curso (carrera + año) esperables, para decidir cuántas secciones
+        por_curso = ESTUDIANTES / (CARRERAS * COHORTES)
+        secciones = "ABC"[: min(3, max(1, math.ceil(por_curso / CUPO)))]
+        comisiones = []
+        for mep in meps:
+            e = espacio[mep.materia_id]
+            turno = turnos[orden[carrera_de_plan[mep.plan_id]] % len(turnos)]
+            periodo = periodos[2 if e.cuatrimestre == "2" else 1]
+            for s in secciones:
+                comisiones.append(
+                    Comision(
+                        materia_en_plan_id=mep.pk,
+                        periodo_id=periodo.pk,
+                        turno=turno,
+                        nombre=f"{mep.anio}° {s}",
+                        seccion=s,
+                        cupo=CUPO,
+                    )
+                )
+        _crear(Comision, comisiones, ["materia_en_plan_id", "periodo_id", "seccion"])
+
+        # Horarios: bloques consecutivos sin choques dentro de cada curso (plan, año, sección)
+        mep_de = {m.pk: m for m in meps}
+        ocupados, horarios = {}, []
+        for com in comisiones:
+            mep = mep_de[com.materia_en_plan_id]
+            curso = (mep.plan_id, mep.anio, com.seccion, com.periodo_id)
+            libres = ocupados.setdefault(
+                curso, {d: list(range(len(ts))) for d, ts in slots[com.turno].items()}
+            )
+            horas = max(mep.horas_catedra_semana_1c, mep.horas_catedra_semana_2c)
+            dias = [d for d in libres if libres[d]]
+            rng.shuffle(dias)
+            for dia in dias:  # de a bloques de 2 (a lo sumo) en días distintos
+                if horas <= 0:
+                    break
+                tomar = libres[dia][: min(2, horas)]
+                del libres[dia][: len(tomar)]
+                horas -= len(tomar)
+                horarios += [
+                    HorarioClase(comision_id=com.pk, timeslot_id=slots[com.turno][dia][i].pk)
+                    for i in tomar
+                ]
+        _crear(HorarioClase, horarios)
+        self._contar("materias en plan", len(meps))
+        self._contar("comisiones", len(comisiones))
+        self._contar("horarios", len(horarios))
+
+    # ---------- estudiantes y su historia ----------
+    def _estudiantes(self, n, movimientos, lote):
+        rng, hoy = self.rng, self.hoy
+        vigente = {p.carrera_id: p for p in self.planes if p.vigente}
+        viejo = {p.carrera_id: p for p in self.planes if not p.vigente}
+        cohortes = list(range(hoy.year - COHORTES + 1, hoy.year + 1))
+
+        # carrera/cohorte de cada uno primero: con eso se calibra cuánto cursó cada cual
+        trayectos = []
+        for _ in range(n):
+            carreras = [rng.choice(self.carreras)]
+            if rng.random() < 0.05:  # algunos hacen dos profesorados
+                carreras.append(rng.choice([c for c in self.carreras if c is not carreras[0]]))
+            fila = []
+            for c in carreras:
+                cohorte = rng.choice(cohortes)
+                plan = viejo[c.pk] if cohorte <= hoy.year - 5 else vigente[c.pk]
+                fila.append((c.pk, plan.pk, cohorte))
+            trayectos.append(fila)
+        cursables = sum(
+            len(self.espacios[plan_id][a])
+            for fila in trayectos
+            for _c, plan_id, cohorte in fila
+            for a in range(min(hoy.year - cohorte, ANIOS))
+        )
+        self.p_cursa = min(1.0, movimientos / max(1, cursables * MOVS_POR_CURSADA))
+
+        self.inscripciones = []
+        for desde in range(0, n, lote):
+            with transaction.atomic():
+                self._lote_estudiantes(desde, trayectos[desde : desde + lote])
+
+    def _lote_estudiantes(self, desde, trayectos):
+        rng = self.rng
+        estudiantes = []
+        for i in range(desde, desde + len(trayectos)):
+            ape, nom = rng.choice(APELLIDOS), rng.choice(NOMBRES)
+            if rng.random() < 0.3:
+                ape = f"{ape} {rng.choice(APELLIDOS)}"
+            estudiantes.append(
+                Estudiante(
+                    dni=f"{DNI_DESDE + i}",
+                    apellido=ape,
+                    nombre=nom,
+                    email=f"{clave(nom)}.{clave(ape).replace(' ', '')}{i}@mail.com",
+                    apellido_norm=clave(ape),
+                    nombre_norm=clave(nom),
+                )
+            )
+        _crear(Estudiante, estudiantes, ["dni"])
+
+        inscripciones = [
+            EstudianteProfesorado(
+                estudiante_id=est.pk,
+                carrera_id=carrera_id,
+                plan_id=plan_id,
+                cohorte=cohorte,
+                legajo_entregado=rng.random() < 0.8,
+                doc_dni_legalizado=rng.random() < 0.9,
+                doc_titulo_sec_legalizado=rng.random() < 0.7,
+            )
+            for est, fila in zip(estudiantes, trayectos, strict=True)
+            for carrera_id, plan_id, cohorte in fila
+        ]
+        _crear(EstudianteProfesorado, inscripciones, ["estudiante_id", "plan_id"])
+        self.inscripciones += [i.pk for i in inscripciones]
+
+        cursadas, movs = [], []
+        for insc in inscripciones:
+            self._historia(insc, cursadas, movs)
+        _crear(InscripcionEspacio, cursadas)
+        self._fechar_cursadas([i.pk for i in inscripciones])
+        _crear(Movimiento, movs)
+        self._contar("estudiantes", len(estudiantes))
+        self._contar("inscripciones", len(inscripciones))
+        self._contar("cursadas", len(cursadas))
+        self._contar("movimientos", len(movs))
+
+    def _fechar_cursadas(self, insc_ids):
+        """auto_now_add pone la fecha real en fecha_inscripcion: se lleva a --hoy junto con la
+        de las bajas, en un solo UPDATE (fecha_baja >= fecha_inscripcion fila por fila)."""
+        InscripcionEspacio.objects.filter(inscripcion_id__in=insc_ids).update(
+            fecha_inscripcion=self.hoy,
+            fecha_baja=Case(When(estado="BAJA", then=Value(self.hoy)), output_field=DateField()),
+        )
+
+    def _historia(self, insc, cursadas, movs):
+        """Años cursados completos (con cursada, resultado y finales) y el año en curso."""
+        rng, hoy = self.rng, self.hoy
+        anios = self.espacios[insc.plan_id]
+        for a in range(min(hoy.year - insc.cohorte + 1, ANIOS)):
+            ciclo = insc.cohorte + a
+            for e in anios[a]:
+                if ciclo == hoy.year:  # cursando ahora
+                    if rng.random() < self.p_cursa:
+                        baja = rng.random() < 0.04
+                        cursadas.append(
+                            InscripcionEspacio(
+                                inscripcion_id=insc.pk,
+                                espacio_id=e.pk,
+                                anio_academico=ciclo,
+                                estado="BAJA" if baja else "EN_CURSO",
+                                # fecha_inscripcion es auto_now_add: ver _fechar_cursadas
+                                fecha_baja=date.today() if baja else None,
+                            )
+                        )
+                    continue
+                if rng.random() >= self.p_cursa:
+                    continue
+                cursadas.append(
+                    InscripcionEspacio(
+                        inscripcion_id=insc.pk, espacio_id=e.pk, anio_academico=ciclo
+                    )
+                )
+                self._movimientos(insc.pk, e, ciclo, movs)
+
+    def _movimientos(self, insc_id, e, ciclo, movs):
+        rng = self.rng
+        cierre = date(ciclo, 7 if e.cuatrimestre == "1" else 12, rng.randrange(1, 29))
+        codigo = _pesado(rng, RESULTADO_CURSADA)
+        nota = None
+        if codigo == "PROMOCION":
+            nota = rng.randrange(7, 11)
+        elif codigo == "REGULAR" and rng.random() < 0.7:
+            nota = rng.randrange(6, 10)
+        elif codigo == "DESAPROBADO_PARCIAL":
+            nota = rng.randrange(1, 6)
+        movs.append(
+            Movimiento(
+                inscripcion_id=insc_id,
+                espacio_id=e.pk,
+                tipo="REG",
+                fecha=cierre,
+                condicion_id=codigo,
+                nota_num=nota,
+            )
+        )
+        if codigo == "REGULAR":
+            self._finales(insc_id, e, ciclo, "REGULAR", movs)
+        elif codigo == "LIBRE_INASISTENCIAS" and e.libre_habilitado and rng.random() < 0.3:
+            self._finales(insc_id, e, ciclo, "LIBRE", movs)
+
+    def _finales(self, insc_id, e, ciclo, codigo, movs):
+        """Mesas de final hasta aprobar (a lo sumo 3), todas en el pasado."""
+        rng = self.rng
+        for intento in range(3):
+            if rng.random() < 0.25:  # todavía no se presentó
+                return
+            fecha = date(ciclo + 1 + intento // 2, rng.choice((2, 3, 7, 12)), rng.randrange(1, 29))
+            if fecha >= self.hoy:
+                return
+            ausente = rng.random() < 0.08
+            aprobo = not ausente and rng.random() < 0.7
+            movs.append(
+                Movimiento(
+                    inscripcion_id=insc_id,
+                    espacio_id=e.pk,
+                    tipo="FIN",
+                    fecha=fecha,
+                    condicion_id=codigo,
+                    nota_num=None
+                    if ausente
+                    else (rng.randrange(6, 11) if aprobo else rng.randrange(1, 6)),
+                    ausente=ausente,
+                    folio=f"{rng.randrange(1, 300)}",
+                    libro=f"{ciclo % 100:02d}",
+                )
+            )
+            if aprobo:
+                return
+
+    # ---------- lo que las señales harían fila por fila ----------
+    def _derivados(self):
+        indice_busqueda.reindexar(["estudiante", "docente", "materia"])
+        ids = self.inscripciones
+        for desde in range(0, len(ids), 5000):
+            with transaction.atomic():
+                promedios.recalcular_promedios(ids[desde : desde + 5000])
+        _insc, filas = carton.reconstruir(ids)
+        self._contar("filas de cartón", filas)
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.importacion_correlatividades import ErrorFormato, importar, parsear
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa correlatividades desde texto con viñetas (.txt: '•Materia: X (A)' / "
+        "'•Regularizadas: ...') o CSV (por nombres de espacio o por ids). Por plan, deja las "
+        "reglas de los espacios del archivo exactamente como dice el archivo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivos", nargs="+", help="Archivos .txt/.csv")
+        parser.add_argument(
+            "--formato", choices=["auto", "vinetas", "csv"], default="auto", help="Por extensión."
+        )
+        parser.add_argument(
+            "--plan", type=int, help="ID del plan (si el archivo no dice a qué plan corresponde)."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Muestra qué cambiaría sin escribir nada."
+        )
+
+    def handle(self, *args, **opts):
+        prefijo = "[dry-run] " if opts["dry_run"] else ""
+        pendientes = 0
+        for path in opts["archivos"]:
+            try:
+                rep = importar(
+                    parsear(path, opts["formato"]), plan=opts["plan"], dry_run=opts["dry_run"]
+                )
+            except FileNotFoundError as e:
+                raise CommandError(f"No existe el archivo: {path}") from e
+            except ErrorFormato as e:
+                raise CommandError(f"{path}: {e}") from e
+
+            for p in rep.planes:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{prefijo}{p.plan}: {p.creadas} nuevas, {p.borradas} borradas, "
+                        f"{p.sin_cambios} sin cambios"
+                    )
+                )
+            for linea, msg in rep.errores:
+                self.stdout.write(self.style.ERROR(f"  {path}:{linea}: {msg}"))
+            for linea, nombre, sugerencia in rep.sin_resolver:
+                extra = f" (¿{sugerencia}?)" if sugerencia else ""
+                self.stdout.write(
+                    self.style.WARNING(f"  {path}:{linea}: sin resolver '{nombre}'{extra}")
+                )
+            pendientes += len(rep.errores) + len(rep.sin_resolver)
+        if pendientes:
+            self.stdout.write(self.style.WARNING(f"{pendientes} renglones sin importar"))
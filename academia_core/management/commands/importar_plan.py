@@ -2,84 +2,81 @@ import csv
 
 from django.core.management.base import BaseCommand, CommandError
 
-from academia_core.models import EspacioCurricular, PlanEstudios, Profesorado
+from academia_core.importacion import LOTE, ErrorArchivo, Importador, leer
 
 
 class Command(BaseCommand):
-    help = "Importa espacios curriculares a un Plan de Estudios desde un CSV."
+    help = (
+        "Importa espacios curriculares desde un CSV o XLSX (anio,cuatrimestre,formato,nombre,"
+        "horas). Con columnas carrera,resolucion el archivo puede traer varios planes. "
+        "Las filas con errores se informan y no cortan la importación."
+    )
 
     def add_arguments(self, parser):
-        parser.add_argument("--profesorado", required=True, help="Nombre exacto del profesorado")
-        parser.add_argument("--resolucion", required=True, help="Resolución del plan (ej. 1935/14)")
         parser.add_argument(
-            "--csv",
-            required=True,
-            help="Ruta al CSV con anio,cuatrimestre,formato,nombre,horas",
+            "--archivo", "--csv", dest="archivo", required=True, help="Ruta al .csv o .xlsx"
         )
+        parser.add_argument(
+            "--carrera",
+            "--profesorado",
+            dest="carrera",
+            default="",
+            help="Nombre de la carrera (si el archivo no trae la columna carrera).",
+        )
+        parser.add_argument(
+            "--resolucion", default="", help="Resolución del plan (ej. 1935/14), idem."
+        )
+        parser.add_argument("--lote", type=int, default=LOTE, help="Filas por transacción.")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Valida y cuenta sin escribir nada."
+        )
+        parser.add_argument(
+            "--desde",
+            type=int,
+            default=1,
+            metavar="FILA",
+            help="Retoma desde esta fila del archivo (la 2 es la primera después del encabezado).",
+        )
+        parser.add_argument("--reporte", help="Guarda los errores en este CSV (fila,error).")
 
     def handle(self, *args, **opts):
-        prof_name = opts["profesorado"]
-        resol = opts["resolucion"]
-        csv_path = opts["csv"]
+        if bool(opts["carrera"]) != bool(opts["resolucion"]):
+            raise CommandError("--carrera y --resolucion van juntos")
 
-        try:
-            p = Profesorado.objects.get(nombre=prof_name)
-        except Profesorado.DoesNotExist as e:
-            raise CommandError(f"Profesorado no encontrado: {prof_name}") from e
-
-        plan, _ = PlanEstudios.objects.get_or_create(
-            profesorado=p, resolucion=resol, defaults={"vigente": True}
+        imp = Importador(
+            carrera=opts["carrera"],
+            resolucion=opts["resolucion"],
+            lote=opts["lote"],
+            dry_run=opts["dry_run"],
+            desde=opts["desde"],
         )
+        try:
+            rep = imp.importar(leer(opts["archivo"]))
+        except FileNotFoundError as e:
+            raise CommandError(f"No existe el archivo: {opts['archivo']}") from e
+        except ErrorArchivo as e:
+            raise CommandError(str(e)) from e
 
-        requeridos = {"anio", "cuatrimestre", "formato", "nombre", "horas"}
-        mapa_cuatri = {
-            "A": "A",
-            "ANUAL": "A",
-            "1": "1",
-            "1º": "1",
-            "1°": "1",
-            "PRIMERO": "1",
-            "2": "2",
-            "2º": "2",
-            "2°": "2",
-            "SEGUNDO": "2",
-        }
-
-        creados = 0
-        with open(csv_path, newline="", encoding="utf-8-sig") as f:  # acepta UTF-8 y UTF-8 con BOM
-            rdr = csv.DictReader(f)
-            if set(rdr.fieldnames or []) != requeridos:
-                raise CommandError(
-                    f"Encabezados inválidos. Deben ser: {','.join(sorted(requeridos))}"
-                )
-
-            for i, row in enumerate(rdr, start=2):
-                anio = row["anio"].strip()
-                token = row["cuatrimestre"].strip().upper()
-                cuatri = mapa_cuatri.get(token)
-                if cuatri not in {"A", "1", "2"}:
-                    raise CommandError(f"Fila {i}: cuatrimestre inválido '{token}'. Use A, 1 o 2.")
-
-                nombre = row["nombre"].strip()
-                formato = row["formato"].strip()
-                try:
-                    horas = int(row["horas"])
-                except ValueError as e:
-                    raise CommandError(f"Fila {i}: 'horas' debe ser entero") from e
-
-                _, created = EspacioCurricular.objects.get_or_create(
-                    profesorado=p,
-                    plan=plan,
-                    anio=anio,
-                    cuatrimestre=cuatri,
-                    nombre=nombre,
-                    defaults={"horas": horas, "formato": formato},
-                )
-                if created:
-                    creados += 1
-
+        prefijo = "[dry-run] " if rep.dry_run else ""
         self.stdout.write(
             self.style.SUCCESS(
-                f"OK: {creados} espacios importados para {p.nombre} - Res. {plan.resolucion}"
+                f"{prefijo}{rep.leidas} filas: {rep.creados} espacios nuevos, "
+                f"{rep.actualizados} actualizados, {rep.materias_creadas} materias nuevas"
             )
         )
+        for plan in rep.planes_creados:
+            self.stdout.write(f"{prefijo}Plan nuevo: {plan}")
+
+        if rep.errores:
+            self.stdout.write(self.style.WARNING(f"{len(rep.errores)} filas con errores:"))
+            for n, msg in rep.errores[:50]:
+                self.stdout.write(f"  fila {n}: {msg}")
+            if len(rep.errores) > 50:
+                self.stdout.write(f"  … y {len(rep.errores) - 50} más (ver --reporte)")
+        if opts["reporte"]:
+            with open(opts["reporte"], "w", newline="", encoding="utf-8") as f:
+                w = csv.writer(f)
+                w.writerow(["fila", "error"])
+                w.writerows(rep.errores)
+        if not rep.dry_run:
+            self.stdout.write(f"Última fila confirmada: {rep.ultima_fila}")
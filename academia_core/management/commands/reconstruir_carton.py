@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from academia_core import carton
+
+
+class Command(BaseCommand):
+    help = (
+        "Rearma el cartón materializado (CartonFila) desde Movimiento, InscripcionEspacio e "
+        "InscripcionFinal, por lotes de inscripciones. Usar después de cargas con "
+        "update()/loaddata que no disparan signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--inscripcion",
+            type=int,
+            action="append",
+            dest="inscripciones",
+            help="Sólo esta inscripción a carrera (repetible).",
+        )
+        parser.add_argument("--lote", type=int, default=carton.LOTE)
+
+    def handle(self, *args, **opts):
+        inicio = time.perf_counter()
+        inscripciones, filas = carton.reconstruir(opts["inscripciones"], lote=opts["lote"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{inscripciones} inscripciones, {filas} filas de cartón "
+                f"({time.perf_counter() - inicio:.1f}s)"
+            )
+        )
@@ -0,0 +1,104 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from academia_core import indice_busqueda
+from academia_core.busqueda import clave
+from academia_core.models import Estudiante
+
+APELLIDOS = ["Pérez", "Gómez", "Núñez", "Fernández", "López", "Martínez", "Rodríguez", "Sosa"]
+APELLIDOS += ["Álvarez", "Benítez", "Acuña", "Ibáñez", "Romero", "Giménez", "Peña", "Suárez"]
+NOMBRES = ["Ana", "José", "María", "Lucía", "Martín", "Sofía", "Julián", "Inés", "Tomás", "Zoe"]
+CONSULTAS = ["perez", "Pérez ana", "nuñ", "30012", "ines ibanez", "zzz"]
+
+
+class _Deshacer(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Rearma el índice de búsqueda (Estudiante/Docente/Materia). Con --benchmark N "
+        "compara, sobre N estudiantes inventados, el índice contra la cadena de icontains."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tipo", action="append", choices=list(indice_busqueda.FUENTES), dest="tipos"
+        )
+        parser.add_argument(
+            "--benchmark",
+            type=int,
+            metavar="N",
+            help="Crea N estudiantes en una transacción que se descarta y mide las búsquedas.",
+        )
+        parser.add_argument("--repeticiones", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **opts):
+        if opts["benchmark"]:
+            return self._benchmark(opts["benchmark"], opts["repeticiones"], opts["seed"])
+
+        with transaction.atomic():
+            hechos = indice_busqueda.reindexar(opts["tipos"])
+        for tipo, n in hechos.items():
+            self.stdout.write(self.style.SUCCESS(f"{tipo}: {n} indexados"))
+
+    # ---------- benchmark ----------
+    def _benchmark(self, n, repeticiones, seed):
+        rnd = random.Random(seed)
+        try:
+            with transaction.atomic():
+                objs = []
+                for i in range(n):
+                    ape, nom = rnd.choice(APELLIDOS), rnd.choice(NOMBRES)
+                    objs.append(
+                        Estudiante(
+                            dni=f"{30000000 + i}",
+                            apellido=ape,
+                            nombre=nom,
+                            email=f"{clave(nom)}.{clave(ape)}{i}@mail.com",
+                            apellido_norm=clave(ape),
+                            nombre_norm=clave(nom),
+                        )
+                    )
+                Estudiante.objects.bulk_create(objs, batch_size=2000)
+                indice_busqueda.reindexar(["estudiante"])
+
+                self.stdout.write(f"{n} estudiantes; ms por búsqueda (count + primera página)")
+                self.stdout.write(f"{'consulta':<14}{'icontains':>12}{'índice':>10}{'filas':>10}")
+                for q in CONSULTAS:
+                    viejo, filas_v = self._medir(lambda q=q: self._icontains(q), repeticiones)
+                    nuevo, filas_n = self._medir(lambda q=q: self._indice(q), repeticiones)
+                    filas = f"{filas_n}" if filas_n == filas_v else f"{filas_n}/{filas_v}"
+                    self.stdout.write(f"{q:<14}{viejo:>12.1f}{nuevo:>10.1f}{filas:>10}")
+                raise _Deshacer
+        except _Deshacer:
+            pass
+
+    @staticmethod
+    def _icontains(q):
+        return Estudiante.objects.order_by("apellido", "nombre").filter(
+            Q(apellido__icontains=q)
+            | Q(nombre__icontains=q)
+            | Q(dni__icontains=q)
+            | Q(email__icontains=q)
+        )
+
+    @staticmethod
+    def _indice(q):
+        return indice_busqueda.filtrar(Estudiante.objects.order_by("apellido", "nombre"), q)
+
+    @staticmethod
+    def _medir(armar, repeticiones):
+        mejor, total = float("inf"), 0
+        for _ in range(repeticiones):
+            t0 = time.perf_counter()
+            qs = armar()
+            total = qs.count()
+            list(qs[:20])
+            mejor = min(mejor, (time.perf_counter() - t0) * 1000)
+        return mejor, total
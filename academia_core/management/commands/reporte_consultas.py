@@ -0,0 +1,61 @@
+import glob
+import os
+from collections import deque
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_core.consultas import leer_registros, ranking
+
+
+class Command(BaseCommand):
+    help = (
+        "Top de vistas por consultas SQL, tiempo en base o N+1, a partir del log rotativo "
+        "de ConsultasMiddleware (CONSULTAS_LOG)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--archivo", default="", help="Log a leer (default: CONSULTAS_LOG).")
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument(
+            "--orden", choices=["consultas", "db", "repetidas"], default="consultas"
+        )
+        parser.add_argument(
+            "--ultimos",
+            type=int,
+            default=10000,
+            metavar="N",
+            help="Sólo los últimos N requests registrados.",
+        )
+
+    def handle(self, *args, **opts):
+        archivo = opts["archivo"] or getattr(settings, "CONSULTAS_LOG", "")
+        if not archivo:
+            raise CommandError("Indicá --archivo o configurá CONSULTAS_LOG.")
+        # el rotativo deja archivo.3 … archivo.1 (más viejos primero) y luego archivo
+        rotados = sorted(
+            glob.glob(f"{glob.escape(archivo)}.[0-9]*"),
+            key=lambda p: int(p.rsplit(".", 1)[1]),
+            reverse=True,
+        )
+        partes = [p for p in [*rotados, archivo] if os.path.exists(p)]
+        if not partes:
+            raise CommandError(f"No existe el archivo: {archivo}")
+
+        ultimos = deque(maxlen=opts["ultimos"])
+        for path in partes:
+            with open(path, encoding="utf-8") as f:
+                ultimos.extend(leer_registros(f))
+
+        filas = ranking(ultimos, opts["orden"])[: opts["top"]]
+        self.stdout.write(
+            f"{len(ultimos)} requests · orden: {opts['orden']}\n"
+            f"{'vista':45} {'req':>6} {'prom':>7} {'max':>5} {'db ms':>8} {'N+1':>5}"
+        )
+        for v in filas:
+            self.stdout.write(
+                f"{v['vista'][:45]:45} {v['requests']:>6} {v['prom_consultas']:>7.1f} "
+                f"{v['max']:>5} {v['prom_db_ms']:>8.1f} {v['n_mas_1']:>5}"
+            )
+            if v.get("peor"):
+                self.stdout.write(f"    {v['peor']['n']}× {v['peor']['sql'][:150]}")
@@ -0,0 +1,44 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from academia_core import vencimientos
+
+
+class Command(BaseCommand):
+    help = (
+        "Pasa a LIBRE en el cartón las regularidades vencidas (un UPDATE por índice). "
+        "Pensado para cron diario; con --avisar N lista además las que vencen en N días."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fecha", help="Fecha de corte AAAA-MM-DD (por defecto, hoy).")
+        parser.add_argument("--avisar", type=int, metavar="DIAS", default=0)
+
+    def handle(self, *args, **opts):
+        try:
+            hoy = date.fromisoformat(opts["fecha"]) if opts["fecha"] else timezone.localdate()
+        except ValueError:
+            raise CommandError("--fecha debe ser AAAA-MM-DD") from None
+
+        vencidas = vencimientos.vencer(hoy)
+        self.stdout.write(self.style.SUCCESS(f"{vencidas} regularidades vencidas al {hoy}"))
+
+        if opts["avisar"] > 0:
+            pagina = {"next": None}
+            total = 0
+            while True:
+                pagina = vencimientos.por_vencer(
+                    dias=opts["avisar"], hoy=hoy, cursor=pagina["next"], limite=200
+                )
+                for it in pagina["items"]:
+                    self.stdout.write(
+                        f"{it['regular_hasta']}  {it['apellido']}, {it['nombre']} "
+                        f"(DNI {it['dni']})  {it['materia']}"
+                    )
+                total += len(pagina["items"])
+                if not pagina["next"]:
+                    break
+            hasta = hoy + timedelta(days=opts["avisar"])
+            self.stdout.write(f"{total} vencen hasta el {hasta}")
@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+
+from academia_core.promedios import nota_que_promedia, promedio
+
+
+def backfill(apps, schema_editor):
+    EstudianteProfesorado = apps.get_model("academia_core", "EstudianteProfesorado")
+    Movimiento = apps.get_model("academia_core", "Movimiento")
+
+    acum = {}
+    filas = Movimiento.objects.values_list(
+        "inscripcion_id", "tipo", "condicion_id", "nota_num", "nota_texto"
+    ).order_by()
+    for insc_id, tipo, codigo, nota_num, nota_texto in filas.iterator(chunk_size=2000):
+        nota = nota_que_promedia(tipo, codigo, nota_num, nota_texto)
+        if nota is not None:
+            s, c = acum.get(insc_id, (Decimal(0), 0))
+            acum[insc_id] = (s + nota, c + 1)
+
+    objs = [
+        EstudianteProfesorado(
+            pk=i, suma_notas_aprobadas=s, cant_notas_aprobadas=c, promedio_general=promedio(s, c)
+        )
+        for i, (s, c) in acum.items()
+    ]
+    EstudianteProfesorado.objects.bulk_update(
+        objs,
+        ["suma_notas_aprobadas", "cant_notas_aprobadas", "promedio_general"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0003_alter_carrera_abreviatura"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="estudianteprofesorado",
+            name="suma_notas_aprobadas",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=8),
+        ),
+        migrations.AddField(
+            model_name="estudianteprofesorado",
+            name="cant_notas_aprobadas",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
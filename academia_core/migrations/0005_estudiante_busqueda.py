@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+from academia_core.busqueda import clave
+
+
+def backfill(apps, schema_editor):
+    Estudiante = apps.get_model("academia_core", "Estudiante")
+    filas = list(Estudiante.objects.values_list("id", "apellido", "nombre"))
+    objs = [Estudiante(pk=i, apellido_norm=clave(a), nombre_norm=clave(n)) for i, a, n in filas]
+    Estudiante.objects.bulk_update(objs, ["apellido_norm", "nombre_norm"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0004_promedio_incremental"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="estudiante",
+            name="apellido_norm",
+            field=models.CharField(blank=True, default="", editable=False, max_length=120),
+        ),
+        migrations.AddField(
+            model_name="estudiante",
+            name="nombre_norm",
+            field=models.CharField(blank=True, default="", editable=False, max_length=120),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="estudiante",
+            index=models.Index(
+                fields=["apellido_norm", "nombre_norm", "id"], name="idx_est_busqueda"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="estudiante",
+            index=models.Index(fields=["nombre_norm"], name="idx_est_nombre_norm"),
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations, models
+
+from academia_core.indice_busqueda import reindexar
+
+
+def llenar(apps, schema_editor):
+    reindexar(registro=apps)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0005_estudiante_busqueda"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TerminoBusqueda",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "tipo",
+                    models.CharField(
+                        choices=[
+                            ("estudiante", "Estudiante"),
+                            ("docente", "Docente"),
+                            ("materia", "Materia"),
+                        ],
+                        max_length=12,
+                    ),
+                ),
+                ("objeto_id", models.PositiveIntegerField()),
+                ("termino", models.CharField(max_length=64)),
+                ("peso", models.PositiveSmallIntegerField(default=1)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["tipo", "termino", "objeto_id"], name="idx_termino_busqueda"
+                    ),
+                    models.Index(fields=["tipo", "objeto_id"], name="idx_termino_objeto"),
+                ],
+            },
+        ),
+        migrations.RunPython(llenar, migrations.RunPython.noop),
+    ]
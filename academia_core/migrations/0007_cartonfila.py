@@ -0,0 +1,78 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+from academia_core.carton import reconstruir
+
+
+def llenar(apps, schema_editor):
+    reconstruir(registro=apps)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0006_terminobusqueda"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CartonFila",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "estado",
+                    models.CharField(
+                        choices=[
+                            ("APROBADA", "Aprobada"),
+                            ("REGULAR", "Regular"),
+                            ("LIBRE", "Libre"),
+                            ("CURSANDO", "Cursando"),
+                            ("BAJA", "Baja"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "nota",
+                    models.DecimalField(blank=True, decimal_places=1, max_digits=4, null=True),
+                ),
+                ("nota_texto", models.CharField(blank=True, max_length=40)),
+                ("fecha_aprobacion", models.DateField(blank=True, null=True)),
+                ("fecha_regularidad", models.DateField(blank=True, null=True)),
+                ("regular_hasta", models.DateField(blank=True, null=True)),
+                ("intentos_final", models.PositiveSmallIntegerField(default=0)),
+                ("ultimo_final", models.DateField(blank=True, null=True)),
+                ("mesa_inscripta", models.DateField(blank=True, null=True)),
+                ("anio_cursada", models.PositiveIntegerField(blank=True, null=True)),
+                ("actualizado", models.DateTimeField(auto_now=True)),
+                (
+                    "espacio",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="academia_core.espaciocurricular",
+                    ),
+                ),
+                (
+                    "inscripcion",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="carton",
+                        to="academia_core.estudianteprofesorado",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("inscripcion", "espacio"), name="uniq_carton_insc_espacio"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(llenar, migrations.RunPython.noop),
+    ]
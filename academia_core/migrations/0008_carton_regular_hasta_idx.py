@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0007_cartonfila"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cartonfila",
+            index=models.Index(fields=["estado", "regular_hasta"], name="carton_estado_reg_hasta"),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0008_carton_regular_hasta_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="estudianteprofesorado",
+            name="suma_notas_aprobadas",
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=8),
+        ),
+        migrations.AlterField(
+            model_name="estudianteprofesorado",
+            name="cant_notas_aprobadas",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,6 +1,5 @@
 # academia_core/models.py
 import os
-from decimal import Decimal
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -8,11 +7,13 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import F, Q
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils.text import slugify
 
-from .utils_inscripciones import cumple_correlativas, tiene_aprobada, tiene_regularidad_vigente
+from . import promedios
+from .estado_academico import StudentAcademicSnapshot
+from .promedios import nota_que_promedia, recalcular_promedios
 
 
 # --- Choices administrativos ---
@@ -108,12 +109,32 @@ class Estudiante(models.Model):
     )
     # ### FIN DE LA ACTUALIZACIÓN SOLICITADA ###
 
+    # Búsqueda: apellido/nombre sin acentos y en minúscula (los completa save()).
+    apellido_norm = models.CharField(max_length=120, blank=True, default="", editable=False)
+    nombre_norm = models.CharField(max_length=120, blank=True, default="", editable=False)
+
     class Meta:
         ordering = ["apellido", "nombre"]
+        indexes = [
+            # typeahead: prefijo + paginado por (apellido, nombre, id) normalizados
+            models.Index(fields=["apellido_norm", "nombre_norm", "id"], name="idx_est_busqueda"),
+            models.Index(fields=["nombre_norm"], name="idx_est_nombre_norm"),
+        ]
 
     def __str__(self):
         return f"{self.apellido}, {self.nombre} ({self.dni})"
 
+    def save(self, *args, **kwargs):
+        from .busqueda import clave
+
+        self.apellido_norm = clave(self.apellido)
+        self.nombre_norm = clave(self.nombre)
+        if kwargs.get("update_fields") is not None:
+            campos = set(kwargs["update_fields"])
+            if campos & {"apellido", "nombre"}:
+                kwargs["update_fields"] = list(campos | {"apellido_norm", "nombre_norm"})
+        super().save(*args, **kwargs)
+
     @property
     def foto_url(self):
         try:
@@ -229,6 +250,11 @@ class EstudianteProfesorado(models.Model):
 
     # Promedio general (cacheado, por signal o llamado manual)
     promedio_general = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    # Agregados para mantener el promedio en forma incremental (ver promedios.py)
+    suma_notas_aprobadas = models.DecimalField(
+        max_digits=8, decimal_places=2, default=0, editable=False
+    )
+    cant_notas_aprobadas = models.PositiveIntegerField(default=0, editable=False)
 
     # Observaciones opcionales
     legajo = models.CharField(max_length=50, blank=True)
@@ -328,50 +354,16 @@ class EstudianteProfesorado(models.Model):
     def es_condicional(self) -> bool:
         return self.calcular_condicion_admin() == CondicionAdmin.CONDICIONAL
 
-    # --------- Promedio (igual que tenías) ---------
+    # --------- Promedio ---------
     def _mov_aprueba(self, m) -> bool:
-        if m.condicion is None:
-            return False
-
-        # FIN Regular >= 6
-        if (
-            m.tipo == "FIN"
-            and m.condicion.codigo == "REGULAR"
-            and m.nota_num is not None
-            and m.nota_num >= 6
-        ):
-            return True
-        # REG Promoción / Aprobado
-        if m.tipo == "REG" and m.condicion.codigo in {"PROMOCION", "APROBADO"}:
-            if m.nota_num is not None and m.nota_num >= 6:
-                return True
-            if m.nota_texto:
-                try:
-                    n = int("".join(ch for ch in m.nota_texto if ch.isdigit()) or "0")
-                    return n >= 6
-                except Exception:
-                    return False
-        return False
+        return nota_que_promedia(m.tipo, m.condicion_id, m.nota_num, m.nota_texto) is not None
 
     def recalcular_promedio(self):
-        movs = list(self.movimientos.all())
-        notas = []
-        for m in movs:
-            if self._mov_aprueba(m):
-                if m.nota_num is not None:
-                    notas.append(Decimal(m.nota_num))
-                elif m.nota_texto:
-                    try:
-                        n = Decimal(int("".join(ch for ch in m.nota_texto if ch.isdigit()) or "0"))
-                        notas.append(n)
-                    except Exception:
-                        pass
-        if notas:
-            prom = sum(notas) / Decimal(len(notas))
-            self.promedio_general = prom.quantize(Decimal("0.01"))
-        else:
-            self.promedio_general = None
-        self.save(update_fields=["promedio_general"])
+        """Recálculo completo (reconstruye también los agregados incrementales)."""
+        recalcular_promedios([self.pk])
+        self.refresh_from_db(
+            fields=["promedio_general", "suma_notas_aprobadas", "cant_notas_aprobadas"]
+        )
 
 
 if not hasattr(EstudianteProfesorado, "LegajoEstado"):
@@ -589,6 +581,15 @@ class Movimiento(models.Model):
 
     creado = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        obj = super().from_db(db, field_names, values)
+        # lo que aporta al promedio según la base, para aplicar sólo el delta al guardar
+        obj._promedio_previo = promedios.estado_promedio(obj)
+        # (inscripción, espacio) en la base, para actualizar también la fila vieja del cartón
+        obj._carton_previo = (obj.__dict__.get("inscripcion_id"), obj.__dict__.get("espacio_id"))
+        return obj
+
     class Meta:
         ordering = ["-fecha", "-creado"]
         constraints = [
@@ -598,20 +599,14 @@ class Movimiento(models.Model):
             ),
         ]
 
-    def _intentos_final_previos(self):
-        qs = self.__class__.objects.filter(
-            tipo="FIN",
-            inscripcion=self.inscripcion,
-            espacio=self.espacio,
-        )
-        if self.pk:
-            qs = qs.exclude(pk=self.pk)
-        qs = qs.exclude(ausente=True, ausencia_justificada=True)
-        return qs.order_by("fecha", "id")
-
     def clean(self):
         cond_codigo = self.condicion.codigo if self.condicion else None
         cond_tipo = self.condicion.tipo if self.condicion else None
+        # Una sola query de movimientos para todas las validaciones académicas
+        # (las actas en bloque dejan el snapshot ya armado en `_snapshot`). La vigencia de
+        # la regularidad sale del snapshot y no de CartonFila: se valida a self.fecha, que
+        # puede ser pasada (ver StudentAcademicSnapshot.vigentes).
+        snap = getattr(self, "_snapshot", None) or StudentAcademicSnapshot.de(self.inscripcion_id)
 
         if self.condicion and self.tipo != cond_tipo:
             raise ValidationError(
@@ -622,11 +617,8 @@ class Movimiento(models.Model):
             if self.nota_num is not None and not (0 <= self.nota_num <= 10):
                 raise ValidationError("La nota de Regularidad debe estar entre 0 y 10.")
 
-            if (
-                cond_codigo in {"LIBRE", "LIBRE-I", "LIBRE-AT"}
-                and self.inscripcion.movimientos.filter(
-                    espacio=self.espacio, tipo="REG", condicion__codigo="REGULAR"
-                ).exists()
+            if cond_codigo in {"LIBRE", "LIBRE-I", "LIBRE-AT"} and snap.tiene_regular(
+                self.espacio_id
             ):
                 raise ValidationError(
                     "No corresponde 'Libre' si el estudiante ya obtuvo Regular en este espacio."
@@ -653,19 +645,17 @@ class Movimiento(models.Model):
                         raise ValidationError("Debe cargar la nota o marcar Ausente.")
                     if self.nota_num < self.NOTA_MINIMA:
                         raise ValidationError("Nota de Final por regularidad debe ser >= 6.")
-                    if self.fecha and not tiene_regularidad_vigente(
-                        self.inscripcion, self.espacio, self.fecha
-                    ):
+                    if self.fecha and not snap.regularidad_vigente(self.espacio_id, self.fecha):
                         raise ValidationError("La regularidad no está vigente (2 años).")
 
             if cond_codigo == "LIBRE":
                 if hasattr(self.espacio, "libre_habilitado") and not self.espacio.libre_habilitado:
                     raise ValidationError("Este espacio no habilita condición Libre.")
-                if tiene_aprobada(self.inscripcion, self.espacio):
+                if snap.aprobada(self.espacio_id):
                     raise ValidationError(
                         "El espacio ya está aprobado; no corresponde rendir Libre."
                     )
-                if tiene_regularidad_vigente(self.inscripcion, self.espacio):
+                if snap.regularidad_vigente(self.espacio_id, self.fecha):
                     raise ValidationError(
                         "El estudiante está regular: no corresponde rendir Libre."
                     )
@@ -673,16 +663,14 @@ class Movimiento(models.Model):
                     raise ValidationError("Debe cargar la nota o marcar Ausente.")
 
             if cond_codigo != "EQUIVALENCIA":
-                ok, faltan = cumple_correlativas(
-                    self.inscripcion, self.espacio, "RENDIR", fecha=self.fecha
-                )
+                ok, faltan = snap.cumple_correlativas(self.espacio, "RENDIR", fecha=self.fecha)
                 if not ok:
                     msgs = [f"{r.requisito.lower()} de '{req.nombre}'" for r, req in faltan]
                     raise ValidationError(
                         f"No cumple correlatividades para RENDIR: faltan {', '.join(msgs)}."
                     )
 
-            prev = list(self._intentos_final_previos())
+            prev = snap.intentos_final(self.espacio_id, excluir_id=self.pk)
             if any((m.nota_num or 0) >= 6 and not m.ausente for m in prev):
                 raise ValidationError("El espacio ya fue aprobado por final anteriormente.")
             if len(prev) >= 3:
@@ -696,9 +684,7 @@ class Movimiento(models.Model):
             )
 
         if self.tipo == "REG":
-            ok, faltan = cumple_correlativas(
-                self.inscripcion, self.espacio, "CURSAR", fecha=self.fecha
-            )
+            ok, faltan = snap.cumple_correlativas(self.espacio, "CURSAR", fecha=self.fecha)
             if not ok:
                 msgs = [f"{r.requisito.lower()} de '{req.nombre}'" for r, req in faltan]
                 raise ValidationError(
@@ -792,8 +778,8 @@ class InscripcionEspacio(models.Model):
 
         # correlatividades según fecha_inscripcion
         try:
-            ok, faltan = cumple_correlativas(
-                self.inscripcion, self.espacio, "CURSAR", fecha=self.fecha_inscripcion
+            ok, faltan = StudentAcademicSnapshot.de(self.inscripcion_id).cumple_correlativas(
+                self.espacio, "CURSAR", fecha=self.fecha_inscripcion
             )
         except Exception:
             ok, faltan = True, []
@@ -827,11 +813,13 @@ class InscripcionEspacioEstadoLog(models.Model):
 
 
 @receiver(post_save, sender=Movimiento)
-def _recalc_promedio_on_mov(sender, instance, **kwargs):
-    try:
-        instance.inscripcion.recalcular_promedio()
-    except Exception:
-        pass
+def _promedio_on_mov_save(sender, instance, created, **kwargs):
+    promedios.movimiento_guardado(instance, created)
+
+
+@receiver(post_delete, sender=Movimiento)
+def _promedio_on_mov_delete(sender, instance, **kwargs):
+    promedios.movimiento_borrado(instance)
 
 
 @receiver(post_save, sender=EstudianteProfesorado)
@@ -1116,3 +1104,74 @@ class Aula(models.Model):
     class Meta:
         verbose_name = "Aula"
         verbose_name_plural = "Aulas"
+
+
+class TerminoBusqueda(models.Model):
+    """
+    Índice de búsqueda: un término normalizado (sin acentos, minúscula) por fila.
+    Lo mantienen las signals de Estudiante/Docente/Materia (ver indice_busqueda).
+    """
+
+    ESTUDIANTE = "estudiante"
+    DOCENTE = "docente"
+    MATERIA = "materia"
+    TIPOS = [(ESTUDIANTE, "Estudiante"), (DOCENTE, "Docente"), (MATERIA, "Materia")]
+
+    tipo = models.CharField(max_length=12, choices=TIPOS)
+    objeto_id = models.PositiveIntegerField()
+    termino = models.CharField(max_length=64)
+    peso = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["tipo", "termino", "objeto_id"], name="idx_termino_busqueda"),
+            models.Index(fields=["tipo", "objeto_id"], name="idx_termino_objeto"),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo}:{self.objeto_id} {self.termino}"
+
+
+class CartonFila(models.Model):
+    """
+    Cartón materializado: una fila por inscripción a carrera y espacio con actividad
+    (cursada, regularidad, finales). Lo mantienen las signals de Movimiento,
+    InscripcionEspacio e InscripcionFinal (ver carton); se rearma con reconstruir_carton.
+    """
+
+    class Estado(models.TextChoices):
+        APROBADA = "APROBADA", "Aprobada"
+        REGULAR = "REGULAR", "Regular"
+        LIBRE = "LIBRE", "Libre"
+        CURSANDO = "CURSANDO", "Cursando"
+        BAJA = "BAJA", "Baja"
+
+    inscripcion = models.ForeignKey(
+        EstudianteProfesorado, on_delete=models.CASCADE, related_name="carton"
+    )
+    espacio = models.ForeignKey(EspacioCurricular, on_delete=models.CASCADE, related_name="+")
+    estado = models.CharField(max_length=10, choices=Estado.choices)
+    nota = models.DecimalField(max_digits=4, decimal_places=1, null=True, blank=True)
+    nota_texto = models.CharField(max_length=40, blank=True)
+    fecha_aprobacion = models.DateField(null=True, blank=True)
+    fecha_regularidad = models.DateField(null=True, blank=True)
+    regular_hasta = models.DateField(null=True, blank=True)
+    intentos_final = models.PositiveSmallIntegerField(default=0)
+    ultimo_final = models.DateField(null=True, blank=True)
+    mesa_inscripta = models.DateField(null=True, blank=True)
+    anio_cursada = models.PositiveIntegerField(null=True, blank=True)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["inscripcion", "espacio"], name="uniq_carton_insc_espacio"
+            ),
+        ]
+        indexes = [
+            # barrido de vencimientos y listado de próximos a vencer
+            models.Index(fields=["estado", "regular_hasta"], name="carton_estado_reg_hasta"),
+        ]
+
+    def __str__(self):
+        return f"{self.inscripcion_id} · {self.espacio_id} · {self.estado}"
@@ -0,0 +1,204 @@
+# academia_core/promedios.py
+# Mantenimiento incremental de EstudianteProfesorado.promedio_general.
+#
+# Cada inscripción guarda la suma y la cantidad de notas que aprueban; un Movimiento
+# nuevo/editado/borrado aplica su delta sobre la fila de la inscripción (SELECT FOR UPDATE
+# + UPDATE, sin leer la historia del estudiante). Para cargas masivas (actas) usar `promedios_diferidos()`.
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Q
+
+NOTA_MINIMA = 6
+CODIGOS_APRUEBA_CURSADA = frozenset({"PROMOCION", "APROBADO"})
+_DOS_DECIMALES = Decimal("0.01")
+
+
+def _nota_de_texto(texto: str) -> Decimal:
+    return Decimal(int("".join(ch for ch in texto if ch.isdigit()) or "0"))
+
+
+def nota_que_promedia(tipo, condicion_codigo, nota_num, nota_texto) -> Decimal | None:
+    """
+    Nota con la que un movimiento entra al promedio, o None si no aprueba.
+    - FIN Regular con nota >= 6
+    - REG Promoción/Aprobado con nota >= 6 (la textual sólo si no hay nota_num)
+    """
+    if not condicion_codigo:
+        return None
+    if tipo == "FIN" and condicion_codigo == "REGULAR":
+        if nota_num is not None and nota_num >= NOTA_MINIMA:
+            return Decimal(nota_num)
+        return None
+    if tipo == "REG" and condicion_codigo in CODIGOS_APRUEBA_CURSADA:
+        if nota_num is not None:
+            return Decimal(nota_num) if nota_num >= NOTA_MINIMA else None
+        if nota_texto:
+            n = _nota_de_texto(nota_texto)
+            if n >= NOTA_MINIMA:
+                return n
+    return None
+
+
+# Movimientos que pueden entrar al promedio (filtro previo en SQL). La nota la decide
+# siempre nota_que_promedia, también en auditar_datos: una sola regla.
+Q_PUEDE_PROMEDIAR = Q(tipo="FIN", condicion_id="REGULAR") | Q(
+    tipo="REG", condicion_id__in=CODIGOS_APRUEBA_CURSADA
+)
+
+
+def promedio(suma: Decimal, cantidad: int) -> Decimal | None:
+    if not cantidad:
+        return None
+    return (Decimal(suma) / Decimal(cantidad)).quantize(_DOS_DECIMALES)
+
+
+# ---------- deltas con expresiones F ----------
+def aplicar_delta(inscripcion_id: int | None, delta_suma: Decimal, delta_cant: int) -> None:
+    if not inscripcion_id or (not delta_cant and not delta_suma):
+        return
+    if _diferidos_activos():
+        _marcar(inscripcion_id)
+        return
+
+    from .models import EstudianteProfesorado
+
+    # La fila de la inscripción (no la historia) bloqueada y el promedio con promedio():
+    # la misma regla de redondeo que el recálculo completo, así auditar_datos no ve deriva.
+    with transaction.atomic(savepoint=False):
+        fila = (
+            EstudianteProfesorado.objects.select_for_update()
+            .filter(pk=inscripcion_id)
+            .values_list("suma_notas_aprobadas", "cant_notas_aprobadas")
+            .first()
+        )
+        if fila is None:
+            return
+        suma, cant = (fila[0] or Decimal(0)) + delta_suma, (fila[1] or 0) + delta_cant
+        EstudianteProfesorado.objects.filter(pk=inscripcion_id).update(
+            suma_notas_aprobadas=suma,
+            cant_notas_aprobadas=cant,
+            promedio_general=promedio(suma, cant),
+        )
+
+
+def estado_promedio(mov) -> tuple[int | None, Decimal | None] | None:
+    """(inscripcion_id, nota) tal como está el movimiento en memoria; None si hay
+    campos diferidos (no sabemos qué había en la base)."""
+    d = mov.__dict__
+    campos = ("inscripcion_id", "tipo", "condicion_id", "nota_num", "nota_texto")
+    if any(c not in d for c in campos):
+        return None
+    return d["inscripcion_id"], nota_que_promedia(
+        d["tipo"], d["condicion_id"], d["nota_num"], d["nota_texto"]
+    )
+
+
+def _contribucion(nota: Decimal | None) -> tuple[Decimal, int]:
+    return (nota, 1) if nota is not None else (Decimal(0), 0)
+
+
+def movimiento_guardado(mov, created: bool) -> None:
+    previo = None if created else getattr(mov, "_promedio_previo", None)
+    actual = estado_promedio(mov)
+    if actual is None or (not created and previo is None):
+        # no sabemos qué había antes: recalculamos esa inscripción completa
+        recalcular_promedios([mov.inscripcion_id])
+    else:
+        insc_id, nota = actual
+        s_new, c_new = _contribucion(nota)
+        if previo is not None and previo[0] != insc_id:
+            s_old, c_old = _contribucion(previo[1])
+            aplicar_delta(previo[0], -s_old, -c_old)
+            aplicar_delta(insc_id, s_new, c_new)
+        else:
+            s_old, c_old = _contribucion(previo[1] if previo else None)
+            aplicar_delta(insc_id, s_new - s_old, c_new - c_old)
+    mov._promedio_previo = estado_promedio(mov)
+
+
+def movimiento_borrado(mov) -> None:
+    previo = getattr(mov, "_promedio_previo", None) or estado_promedio(mov)
+    if previo is None:
+        recalcular_promedios([mov.inscripcion_id])
+        return
+    s_old, c_old = _contribucion(previo[1])
+    aplicar_delta(previo[0], -s_old, -c_old)
+
+
+# ---------- recálculo completo ----------
+def recalcular_promedios(inscripcion_ids: Iterable[int]) -> int:
+    """Recalcula suma/cantidad/promedio para varias inscripciones con una query de
+    movimientos y un bulk_update. Devuelve cuántas inscripciones se tocaron."""
+    from .models import EstudianteProfesorado, Movimiento
+
+    ids = {i for i in inscripcion_ids if i}
+    if not ids:
+        return 0
+    acum: dict[int, list] = {i: [Decimal(0), 0] for i in ids}
+    filas = Movimiento.objects.filter(Q_PUEDE_PROMEDIAR, inscripcion_id__in=ids).values_list(
+        "inscripcion_id", "tipo", "condicion_id", "nota_num", "nota_texto"
+    )
+    for insc_id, tipo, codigo, nota_num, nota_texto in filas.order_by():
+        nota = nota_que_promedia(tipo, codigo, nota_num, nota_texto)
+        if nota is not None:
+            acum[insc_id][0] += nota
+            acum[insc_id][1] += 1
+
+    objs = [
+        EstudianteProfesorado(
+            pk=i,
+            suma_notas_aprobadas=s,
+            cant_notas_aprobadas=c,
+            promedio_general=promedio(s, c),
+        )
+        for i, (s, c) in acum.items()
+    ]
+    EstudianteProfesorado.objects.bulk_update(
+        objs, ["suma_notas_aprobadas", "cant_notas_aprobadas", "promedio_general"]
+    )
+    return len(objs)
+
+
+# ---------- diferido para cargas masivas ----------
+_local = threading.local()
+
+
+def _diferidos_activos() -> bool:
+    return bool(getattr(_local, "pila", None))
+
+
+def _marcar(inscripcion_id: int) -> None:
+    _local.pila[-1].add(inscripcion_id)
+
+
+@contextmanager
+def promedios_diferidos():
+    """
+    Durante el bloque, los movimientos guardados/borrados sólo anotan su inscripción;
+    al salir (del bloque más externo) cada inscripción afectada se recalcula una vez.
+
+        with transaction.atomic(), promedios_diferidos():
+            for fila in acta:
+                Movimiento.objects.create(...)
+    """
+    pila = getattr(_local, "pila", None)
+    if pila is None:
+        pila = _local.pila = []
+    pila.append(set())
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        pendientes = pila.pop()
+        if pila:
+            pila[-1] |= pendientes
+        elif ok:
+            recalcular_promedios(pendientes)
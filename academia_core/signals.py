@@ -4,8 +4,11 @@ from django.apps import apps
 
 # ¡Importante! Faltaba importar las señales de autenticación
 from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from . import carton, grafo_correlativas, indice_busqueda, versiones
+
 # No obtengas los modelos aquí arriba
 
 
@@ -47,3 +50,61 @@ def _on_logout(sender, user, **kwargs):
         )
     except Exception:
         pass
+
+
+# ---------- Invalidación del grafo de correlatividades ----------
+@receiver(post_save, sender="academia_core.Correlatividad")
+@receiver(post_delete, sender="academia_core.Correlatividad")
+@receiver(post_save, sender="academia_core.EspacioCurricular")
+@receiver(post_delete, sender="academia_core.EspacioCurricular")
+def _invalidar_grafo_correlativas(sender, instance, **kwargs):
+    grafo_correlativas.invalidar(getattr(instance, "plan_id", None))
+
+
+# ---------- Índice de búsqueda (Estudiante / Docente / Materia) ----------
+@receiver(post_save, sender="academia_core.Estudiante")
+@receiver(post_save, sender="academia_core.Docente")
+@receiver(post_save, sender="academia_core.Materia")
+def _indexar_busqueda(sender, instance, raw=False, **kwargs):
+    if not raw:  # loaddata: después se corre reindexar_busqueda
+        indice_busqueda.indexar(indice_busqueda.tipo_de(sender), [instance])
+
+
+@receiver(post_delete, sender="academia_core.Estudiante")
+@receiver(post_delete, sender="academia_core.Docente")
+@receiver(post_delete, sender="academia_core.Materia")
+def _desindexar_busqueda(sender, instance, **kwargs):
+    indice_busqueda.desindexar(indice_busqueda.tipo_de(sender), instance.pk)
+
+
+# ---------- Cartón materializado ----------
+@receiver(post_save, sender="academia_core.Movimiento")
+@receiver(post_delete, sender="academia_core.Movimiento")
+@receiver(post_save, sender="academia_core.InscripcionEspacio")
+@receiver(post_delete, sender="academia_core.InscripcionEspacio")
+def _actualizar_carton(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata: después se corre reconstruir_carton
+        return
+    pares = {(instance.inscripcion_id, instance.espacio_id)}
+    if kwargs.get("signal") is post_save:
+        pares.add(getattr(instance, "_carton_previo", (None, None)))
+        instance._carton_previo = (instance.inscripcion_id, instance.espacio_id)
+    carton.al_confirmar(pares)
+
+
+@receiver(post_save, sender="academia_core.InscripcionFinal")
+@receiver(post_delete, sender="academia_core.InscripcionFinal")
+def _actualizar_carton_final(sender, instance, raw=False, **kwargs):
+    if not raw:
+        carton.al_confirmar_final(instance.inscripcion_cursada_id)
+
+
+# ---------- Versiones de los datos de referencia (ui/cache_respuestas.py) ----------
+# También con raw: un loaddata cambia lo que devuelven las respuestas cacheadas.
+def _nueva_version(sender, **kwargs):
+    versiones.invalidar(sender._meta.label)
+
+
+for _tabla in versiones.TABLAS:
+    post_save.connect(_nueva_version, sender=_tabla, dispatch_uid=f"version_save_{_tabla}")
+    post_delete.connect(_nueva_version, sender=_tabla, dispatch_uid=f"version_del_{_tabla}")
@@ -1,4 +1,5 @@
 # academia_core/utils.py
+import unicodedata
 from typing import Any
 
 from django.apps import apps
@@ -17,3 +18,9 @@ def get_model(app_label: str, model_name: str):
         return apps.get_model(app_label, model_name)
     except LookupError:
         return None
+
+
+def normalizar(s) -> str:
+    """Sin acentos, en minúscula y sin espacios en los bordes (para buscar/comparar)."""
+    s = unicodedata.normalize("NFKD", s or "")
+    return "".join(ch for ch in s if not unicodedata.combining(ch)).lower().strip()
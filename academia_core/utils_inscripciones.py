@@ -1,61 +1,25 @@
-from datetime import timedelta
+from . import vencimientos
+from .estado_academico import (
+    REG_OK_CODIGOS,  # noqa: F401  (compatibilidad)
+    StudentAcademicSnapshot,
+)
 
-REG_OK_CODIGOS = {"PROMOCION", "APROBADO", "REGULAR"}
+# Cada helper arma un StudentAcademicSnapshot (una query). Si vas a hacer varias
+# preguntas sobre la misma inscripción, armá el snapshot una vez y usalo directo.
 
 
 def tiene_regularizada(insc, esp, hasta_fecha=None) -> bool:
-    qs = insc.movimientos.filter(espacio=esp, tipo="REG", condicion__codigo__in=REG_OK_CODIGOS)
-    if hasta_fecha:
-        qs = qs.filter(fecha__lte=hasta_fecha)
-    return qs.exists()
+    return StudentAcademicSnapshot.de(insc).regularizada(esp, hasta_fecha)
 
 
 def tiene_aprobada(insc, esp, hasta_fecha=None) -> bool:
-    qs1 = insc.movimientos.filter(
-        espacio=esp, tipo="REG", condicion__codigo__in={"PROMOCION", "APROBADO"}
-    )
-    qs2 = insc.movimientos.filter(
-        espacio=esp, tipo="FIN", condicion__codigo="REGULAR", nota_num__gte=6
-    )
-    qs3 = insc.movimientos.filter(
-        espacio=esp,
-        tipo="FIN",
-        condicion__codigo="EQUIVALENCIA",
-        nota_texto__iexact="Equivalencia",
-    )
-    if hasta_fecha:
-        qs1 = qs1.filter(fecha__lte=hasta_fecha)
-        qs2 = qs2.filter(fecha__lte=hasta_fecha)
-        qs3 = qs3.filter(fecha__lte=hasta_fecha)
-    return qs1.exists() or qs2.exists() or qs3.exists()
+    return StudentAcademicSnapshot.de(insc).aprobada(esp, hasta_fecha)
 
 
 def cumple_correlativas(insc, esp, tipo: str, fecha=None):
-    from academia_core.models import Correlatividad, EspacioCurricular
-
-    reglas = Correlatividad.objects.filter(plan=esp.plan, espacio=esp, tipo=tipo)
-    faltan = []
-    for r in reglas:
-        if r.requiere_espacio:
-            reqs = [r.requiere_espacio]
-        else:
-            reqs = list(
-                EspacioCurricular.objects.filter(plan=esp.plan).filter(
-                    anio__in=[f"{i}°" for i in range(1, (r.requiere_todos_hasta_anio or 0) + 1)]
-                )
-            )
-        for req in reqs:
-            if r.requisito == "REGULARIZADA":
-                ok = tiene_regularizada(insc, req, hasta_fecha=fecha)
-            else:
-                ok = tiene_aprobada(insc, req, hasta_fecha=fecha)
-            if not ok:
-                faltan.append((r, req))
-    return (len(faltan) == 0), faltan
-
-
-def tiene_regularidad_vigente(insc, esp, a_fecha) -> bool:
-    limite = a_fecha - timedelta(days=730)
-    return insc.movimientos.filter(
-        espacio=esp, tipo="REG", condicion__codigo="REGULAR", fecha__gte=limite
-    ).exists()
+    return StudentAcademicSnapshot.de(insc).cumple_correlativas(esp, tipo, fecha)
+
+
+def tiene_regularidad_vigente(insc, esp, a_fecha=None) -> bool:
+    # lee CartonFila.regular_hasta (una fila) en vez de los movimientos
+    return vencimientos.vigente(getattr(insc, "pk", insc), getattr(esp, "pk", esp), a_fecha)
@@ -0,0 +1,138 @@
+# academia_core/vencimientos.py
+# Vencimiento de regularidades sobre la columna CartonFila.regular_hasta (índice
+# estado + regular_hasta): consulta de vigencia sin leer movimientos, barrido diario que
+# pasa a LIBRE lo vencido y listado de próximos a vencer paginado por keyset
+# (regular_hasta, id).
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import date, timedelta
+
+from django.apps import apps
+from django.db.models import Q
+from django.utils import timezone
+
+DIAS = 60
+LIMITE = 50
+LIMITE_MAX = 200
+
+
+def _modelo():
+    return apps.get_model("academia_core", "CartonFila")
+
+
+def regular_hasta(inscripcion_id: int, espacio_id: int) -> date | None:
+    """Fin de la regularidad del par o None (nunca regularizó). Una query por la clave única.
+    Lee el cartón ya confirmado: lo escrito en la transacción en curso se ve al commit."""
+    return (
+        _modelo()
+        .objects.filter(inscripcion_id=inscripcion_id, espacio_id=espacio_id)
+        .values_list("regular_hasta", flat=True)
+        .first()
+    )
+
+
+def vigente(inscripcion_id: int, espacio_id: int, a_fecha: date | None = None) -> bool:
+    """Regular a `a_fecha`: dentro de [fecha_regularidad, regular_hasta]. Una query."""
+    a_fecha = a_fecha or timezone.localdate()
+    fila = (
+        _modelo()
+        .objects.filter(inscripcion_id=inscripcion_id, espacio_id=espacio_id)
+        .values_list("fecha_regularidad", "regular_hasta")
+        .first()
+    )
+    if fila is None or fila[1] is None:
+        return False
+    desde, hasta = fila
+    return (desde is None or desde <= a_fecha) and hasta >= a_fecha
+
+
+def vencer(hoy: date | None = None) -> int:
+    """Pasa a LIBRE las filas REGULAR cuya regularidad terminó antes de `hoy`. Un solo
+    UPDATE por el índice; idempotente, pensado para correr a diario (vencer_regularidades)."""
+    CartonFila = _modelo()
+    return CartonFila.objects.filter(
+        estado=CartonFila.Estado.REGULAR,
+        regular_hasta__lt=hoy or timezone.localdate(),
+    ).update(estado=CartonFila.Estado.LIBRE, actualizado=timezone.now())
+
+
+# ---------- próximos a vencer ----------
+def _cursor(fila) -> str:
+    crudo = json.dumps([fila["regular_hasta"].isoformat(), fila["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def _despues_de(cursor: str) -> Q:
+    try:
+        crudo = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        fecha, pk = json.loads(crudo)
+        fecha, pk = date.fromisoformat(fecha), int(pk)
+    except (ValueError, TypeError):
+        raise ValueError("cursor inválido") from None
+    return Q(regular_hasta__gt=fecha) | Q(regular_hasta=fecha, id__gt=pk)
+
+
+def por_vencer(
+    *,
+    carrera_id: int | None = None,
+    plan_id: int | None = None,
+    dias: int = DIAS,
+    hoy: date | None = None,
+    cursor: str | None = None,
+    limite: int = LIMITE,
+) -> dict:
+    """
+    Regularidades vigentes que vencen dentro de `dias`, de la más próxima a la más lejana.
+    -> {"items": [{..}], "next": cursor | None}; una query por página.
+    ValueError si el cursor no es válido.
+    """
+    CartonFila = _modelo()
+    hoy = hoy or timezone.localdate()
+    limite = max(1, min(int(limite or LIMITE), LIMITE_MAX))
+
+    qs = CartonFila.objects.filter(
+        estado=CartonFila.Estado.REGULAR,
+        regular_hasta__gte=hoy,
+        regular_hasta__lte=hoy + timedelta(days=max(0, int(dias))),
+    )
+    if carrera_id:
+        qs = qs.filter(inscripcion__carrera_id=carrera_id)
+    if plan_id:
+        qs = qs.filter(inscripcion__plan_id=plan_id)
+    if cursor:
+        qs = qs.filter(_despues_de(cursor))
+    filas = list(
+        qs.order_by("regular_hasta", "id").values(
+            "id",
+            "regular_hasta",
+            "intentos_final",
+            "mesa_inscripta",
+            "inscripcion_id",
+            "espacio_id",
+            "inscripcion__estudiante__apellido",
+            "inscripcion__estudiante__nombre",
+            "inscripcion__estudiante__dni",
+            "espacio__materia__nombre",
+        )[: limite + 1]
+    )
+
+    siguiente = _cursor(filas[limite - 1]) if len(filas) > limite else None
+    items = [
+        {
+            "inscripcion": f["inscripcion_id"],
+            "espacio": f["espacio_id"],
+            "apellido": f["inscripcion__estudiante__apellido"],
+            "nombre": f["inscripcion__estudiante__nombre"],
+            "dni": f["inscripcion__estudiante__dni"],
+            "materia": f["espacio__materia__nombre"],
+            "regular_hasta": f["regular_hasta"],
+            "dias": (f["regular_hasta"] - hoy).days,
+            "intentos_final": f["intentos_final"],
+            "mesa_inscripta": f["mesa_inscripta"],
+        }
+        for f in filas[:limite]
+    ]
+    return {"items": items, "next": siguiente}
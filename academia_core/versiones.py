@@ -0,0 +1,73 @@
+# academia_core/versiones.py
+# Contador de versión por tabla de datos de referencia (carreras, planes, materias, ...).
+# post_save/post_delete lo suben (academia_core/signals.py); quien cachea algo derivado de
+# esas tablas lo mete en la clave y nunca tiene que borrar nada: lo viejo queda huérfano.
+#
+# leer/subir/subir_al_confirmar son lo mismo para cualquier clave (tablas, grafo_correlativas,
+# ocupacion, grillas, grupos de ui). Todo en el cache "compartido": lo ven todos los
+# procesos, y una versión que falta (reinicio, desalojo) arranca en un valor nuevo, nunca
+# en uno ya usado.
+
+from __future__ import annotations
+
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+
+COMPARTIDO = "compartido"
+
+TABLAS = (
+    "academia_core.Carrera",
+    "academia_core.PlanEstudios",
+    "academia_core.EspacioCurricular",
+    "academia_core.Materia",
+    "academia_core.Docente",
+    "academia_core.DocenteEspacio",
+    "academia_horarios.Periodo",
+    "academia_horarios.TurnoModel",
+)
+
+
+def leer(*claves: str, alias: str = COMPARTIDO) -> tuple[int, ...]:
+    """Versión actual de cada clave (una lectura al cache para todas)."""
+    cache = caches[alias]
+    encontradas = cache.get_many(claves)
+    for key in claves:
+        if key not in encontradas:
+            # arranca en un valor no repetible: si el cache perdió la versión, no se
+            # vuelve a un número con el que ya se validó algo viejo
+            cache.add(key, time.time_ns(), timeout=None)
+            encontradas[key] = cache.get(key)
+    return tuple(encontradas[k] for k in claves)
+
+
+def subir(clave: str, alias: str = COMPARTIDO) -> None:
+    cache = caches[alias]
+    try:
+        cache.incr(clave)
+    except ValueError:
+        cache.set(clave, time.time_ns(), timeout=None)
+
+
+def subir_al_confirmar(clave: str, alias: str = COMPARTIDO) -> None:
+    """Ya mismo (este proceso/transacción) y al commitear (para que otros procesos no
+    rearmen con datos aún no confirmados)."""
+    subir(clave, alias)
+    transaction.on_commit(lambda: subir(clave, alias))
+
+
+def _key(tabla: str) -> str:
+    return f"version:{tabla.lower()}"
+
+
+def de(*tablas: str) -> tuple[int, ...]:
+    """Versión actual de cada tabla (una lectura al cache para todas)."""
+    return leer(*(_key(t) for t in tablas))
+
+
+def invalidar(*tablas: str) -> None:
+    """Sube la versión ya mismo y al commitear (como grafo_correlativas.invalidar).
+    bulk_create/update no disparan señales: quien los use llama a esto."""
+    for tabla in tablas:
+        subir_al_confirmar(_key(tabla))
@@ -1,16 +1,20 @@
 from django.apps import apps
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django.views.decorators.http import require_GET, require_POST
 
-from academia_core.eligibilidad import habilitado
+from academia_core.busqueda import buscar_estudiantes
+from academia_core.eligibilidad import evaluar_plan, habilitado
 from academia_core.models import Carrera as Profesorado
 from academia_core.models import (  # Added Correlatividad
     Correlatividad,
     Docente,
     EspacioCurricular,
     Estudiante,
+    EstudianteProfesorado,
     Movimiento,
     PlanEstudios,
 )
@@ -18,17 +22,26 @@ from academia_core.models import (  # Added Correlatividad
 
 @require_GET
 def api_listar_estudiantes(request):
-    estudiantes = Estudiante.objects.filter(activo=True).order_by("apellido", "nombre")
+    """Estudiantes activos de a una página (?q=, ?cursor=, ?limit=); `next` trae la siguiente."""
+    try:
+        pagina = buscar_estudiantes(
+            request.GET.get("q", ""),
+            cursor=request.GET.get("cursor") or None,
+            limite=int(request.GET.get("limit") or 20),
+            campos=("id", "apellido", "nombre", "dni", "email"),
+        )
+    except ValueError:
+        return JsonResponse({"error": "cursor o limit inválido"}, status=400)
     data = [
         {
-            "id": e.id,
-            "nombre_completo": f"{e.apellido}, {e.nombre}",
-            "dni": e.dni,
-            "email": e.email,
+            "id": e["id"],
+            "nombre_completo": f"{e['apellido']}, {e['nombre']}",
+            "dni": e["dni"],
+            "email": e["email"],
         }
-        for e in estudiantes
+        for e in pagina["items"]
     ]
-    return JsonResponse({"items": data})
+    return JsonResponse({"items": data, "next": pagina["next"]})
 
 
 @require_GET
@@ -215,9 +228,12 @@ def api_espacios_habilitados(request):
         else:
             qs = qs.filter(Q(periodo=periodo) | Q(periodo="ANUAL"))
 
+    espacios = list(qs.select_related("materia").order_by("anio", "materia__nombre"))
+    estado = evaluar_plan(est, plan, espacios, para, ciclo)
+
     items = []
-    for e in qs.order_by("anio", "nombre"):
-        ok, info = habilitado(est, plan, e, para, ciclo)
+    for e in espacios:
+        ok, info = estado[e.id]
         row = {
             "id": e.id,
             "nombre": e.nombre,
@@ -245,42 +261,34 @@ def api_inscribir_espacio(request):
     ciclo = int(ciclo) if (ciclo and ciclo.isdigit()) else None
 
     e = get_object_or_404(EspacioCurricular, id=esp, plan_id=plan)
-    ok, info = habilitado(est, plan, e, "PARA_CURSAR", ciclo)
-    if not ok:
-        return JsonResponse({"ok": False, "error": info}, status=400)
-
-    # obtener nombres de campos por introspección (estudiante/espacio/plan/ciclo)
-    def fk_name_to(model, related):
-        for f in model._meta.get_fields():
-            if (
-                getattr(f, "is_relation", False)
-                and getattr(f, "many_to_one", False)
-                and f.related_model is related
-            ):
-                return f.name
-        return None
-
-    fk_est = fk_name_to(InscripcionEspacio, Estudiante) or "estudiante"
-    fk_esp = fk_name_to(InscripcionEspacio, EspacioCurricular) or "espacio"
-    fk_plan = fk_name_to(InscripcionEspacio, PlanEstudios) or "plan"
-    f_ciclo = (
-        "ciclo" if "ciclo" in {f.name for f in InscripcionEspacio._meta.get_fields()} else None
-    )
-
-    # evitar duplicado por servidor
-    create_kwargs = {
-        f"{fk_est}_id": est,
-        f"{fk_esp}_id": esp,
-        f"{fk_plan}_id": plan,
+    insc = EstudianteProfesorado.objects.filter(estudiante_id=est, plan_id=plan).first()
+    if insc is None:
+        return JsonResponse({"ok": False, "error": "sin_inscripcion_a_la_carrera"}, status=400)
+
+    datos = {
+        "inscripcion": insc,
+        "espacio": e,
+        "anio_academico": ciclo or timezone.localdate().year,
     }
-    if f_ciclo and ciclo:
-        create_kwargs[f_ciclo] = ciclo
+    # reintento: ya inscripto (y ya no "habilitado" porque la está cursando)
+    ya = InscripcionEspacio.objects.filter(**datos).first()
+    if ya is not None:
+        return JsonResponse({"ok": True, "id": ya.id, "ya_inscripto": True})
 
-    exists = InscripcionEspacio.objects.filter(**create_kwargs).exists()
-    if exists:
-        return JsonResponse({"ok": False, "error": "ya_inscripto"}, status=400)
+    ok, info = habilitado(est, plan, e, "PARA_CURSAR", datos["anio_academico"])
+    if not ok:
+        return JsonResponse({"ok": False, "error": info}, status=400)
 
-    obj = InscripcionEspacio.objects.create(**create_kwargs)
+    # el insert no depende del chequeo: la unicidad (inscripción, espacio, ciclo) la
+    # garantiza la base, así que dos requests simultáneos terminan en la misma fila
+    try:
+        with transaction.atomic():
+            obj = InscripcionEspacio.objects.create(**datos)
+    except IntegrityError:
+        obj = InscripcionEspacio.objects.filter(**datos).first()
+        if obj is None:
+            raise
+        return JsonResponse({"ok": True, "id": obj.id, "ya_inscripto": True})
     return JsonResponse({"ok": True, "id": obj.id})
 
 
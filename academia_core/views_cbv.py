@@ -9,6 +9,7 @@ from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 from academia_core.auth_mixins import StaffOrGroupsRequiredMixin
 from academia_core.auth_utils import role_of as _rol
 
+from . import indice_busqueda
 from .forms_espacios import EspacioForm  # ← Form para Materias/Espacios
 from .models import (
     Actividad,
@@ -77,10 +78,17 @@ class PanelContextMixin:
 class SearchQueryMixin:
     search_param = "busqueda"
     search_fields = ()
+    # Si el modelo está en indice_busqueda: (tipo, lookup al objeto indexado)
+    search_index = None
 
     def apply_search(self, qs):
         term = (self.request.GET.get(self.search_param) or "").strip()
-        if not term or not self.search_fields:
+        if not term:
+            return qs
+        if self.search_index:
+            tipo, campo = self.search_index
+            return indice_busqueda.filtrar(qs, term, campo=campo, tipo=tipo)
+        if not self.search_fields:
             return qs
         q = Q()
         for f in self.search_fields:
@@ -99,6 +107,7 @@ class EstudianteListView(LoginRequiredMixin, PanelContextMixin, SearchQueryMixin
     panel_action = "alumnos_list"
     panel_title = "Listado de Alumnos"
     search_fields = ("apellido", "nombre", "dni", "email")
+    search_index = ("estudiante", "pk")
 
     def get_queryset(self):
         return self.apply_search(super().get_queryset().order_by("apellido", "nombre"))
@@ -202,6 +211,7 @@ class DocenteListView(LoginRequiredMixin, PanelContextMixin, SearchQueryMixin, L
     panel_title = "Listado de Docentes"
     panel_subtitle = "Búsqueda por nombre, apellido, DNI o email"
     search_fields = ("apellido", "nombre", "dni", "email")
+    search_index = ("docente", "pk")
 
     def get_queryset(self):
         return self.apply_search(super().get_queryset().order_by("apellido", "nombre"))
@@ -288,12 +298,16 @@ class MateriaListView(LoginRequiredMixin, PanelContextMixin, SearchQueryMixin, L
     panel_title = "Materias / Espacios"
     panel_subtitle = "Listado y búsqueda"
     search_fields = ("nombre", "plan__resolucion", "profesorado__nombre", "anio")
+    search_index = ("materia", "materia_id")
 
     def get_queryset(self):
-        qs = super().get_queryset().select_related("plan", "profesorado")
-        return self.apply_search(qs).order_by(
-            "profesorado__nombre", "plan__resolucion", "anio", "cuatrimestre", "nombre"
+        qs = (
+            super()
+            .get_queryset()
+            .select_related("plan", "profesorado")
+            .order_by("profesorado__nombre", "plan__resolucion", "anio", "cuatrimestre", "nombre")
         )
+        return self.apply_search(qs)
 
 
 class MateriaCreateView(
@@ -109,9 +109,6 @@ def panel(request: HttpRequest, **kwargs) -> HttpResponse:
     elif action in ("insc_carrera", "insc_prof"):
         ctx.update(
             {
-                "estudiantes": Estudiante.objects.filter(activo=True).order_by(
-                    "apellido", "nombre"
-                ),
                 "profesorados": Profesorado.objects.all().order_by("nombre"),
                 "planes_map": json.dumps(
                     {
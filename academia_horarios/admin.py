@@ -24,7 +24,7 @@ class MateriaEnPlanAdmin(admin.ModelAdmin):
 
 @admin.register(Comision)
 class ComisionAdmin(admin.ModelAdmin):
-    list_display = ("materia_en_plan", "periodo", "turno", "nombre", "cupo")
+    list_display = ("materia_en_plan", "periodo", "turno", "nombre", "cupo", "ocupados")
     list_filter = ("periodo", "turno", "materia_en_plan__plan", "materia_en_plan__anio")
 
 
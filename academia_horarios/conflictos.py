@@ -0,0 +1,239 @@
+# academia_horarios/conflictos.py
+# Motor de choques de horario: carga una vez las franjas relevantes, las agrupa por
+# (recurso, día) y las recorre ordenadas por inicio (barrido con heaps), reportando
+# TODOS los solapamientos en O((n+m) log(n+m) + k).
+#
+# Un "recurso" es lo que no puede estar en dos lugares a la vez:
+#   ("docente", ...)    el mismo docente
+#   ("estudiante", ...) el mismo estudiante
+#   ("aula", ...)       la misma aula
+#   ("cohorte", ...)    mismo profesorado + año (+ período / sección)
+
+from __future__ import annotations
+
+import heapq
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
+from datetime import time
+
+from django.apps import apps
+
+DOCENTE = "docente"
+ESTUDIANTE = "estudiante"
+AULA = "aula"
+COHORTE = "cohorte"
+
+DIAS = {
+    1: "Lunes",
+    2: "Martes",
+    3: "Miércoles",
+    4: "Jueves",
+    5: "Viernes",
+    6: "Sábado",
+    7: "Domingo",
+}
+# Horario.dia ("lu", "ma", ...) -> número de día de TimeSlot
+DIA_SLUG = {"lu": 1, "ma": 2, "mi": 3, "ju": 4, "vi": 5, "sa": 6, "do": 7}
+
+
+def minutos(t) -> int:
+    """time o 'HH:MM[:SS]' -> minutos desde las 00:00."""
+    if isinstance(t, time):
+        return t.hour * 60 + t.minute
+    h, m = str(t).split(":")[:2]
+    return int(h) * 60 + int(m)
+
+
+def _hhmm(m: int) -> str:
+    return f"{m // 60:02d}:{m % 60:02d}"
+
+
+def _aula(aula: str | None) -> str:
+    return " ".join((aula or "").split()).lower()
+
+
+@dataclass(frozen=True)
+class Franja:
+    """Un bloque de clase en un día, con los recursos que ocupa."""
+
+    dia: int
+    inicio: int  # minutos
+    fin: int
+    recursos: frozenset = field(default_factory=frozenset)
+    ref: tuple = ()  # ("horarioclase", pk) / ("horario", pk) / ("borrador", i)
+    comision_id: int | None = None
+    etiqueta: str = ""
+
+    def con_recursos(self, *recursos) -> Franja:
+        return replace(self, recursos=frozenset(recursos))
+
+    @property
+    def rango(self) -> str:
+        return f"{_hhmm(self.inicio)}-{_hhmm(self.fin)}"
+
+
+@dataclass(frozen=True)
+class Conflicto:
+    tipo: str  # DOCENTE / ESTUDIANTE / AULA / COHORTE
+    recurso: tuple
+    dia: int
+    nueva: Franja
+    existente: Franja
+
+    @property
+    def comision_id(self):
+        return self.existente.comision_id
+
+    @property
+    def mensaje(self) -> str:
+        quien = {
+            DOCENTE: "el docente ya tiene clase",
+            ESTUDIANTE: "el estudiante ya cursa",
+            AULA: "el aula ya está ocupada",
+            COHORTE: "el curso ya tiene clase",
+        }[self.tipo]
+        otro = f" ({self.existente.etiqueta})" if self.existente.etiqueta else ""
+        return (
+            f"Conflicto el {DIAS.get(self.dia, self.dia)} {self.nueva.rango}: "
+            f"{quien} {self.existente.rango}{otro}."
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "tipo": self.tipo,
+            "dia": self.dia,
+            "nuevo": {"ref": list(self.nueva.ref), "rango": self.nueva.rango},
+            "existente": {
+                "ref": list(self.existente.ref),
+                "rango": self.existente.rango,
+                "comision_id": self.existente.comision_id,
+                "etiqueta": self.existente.etiqueta,
+            },
+            "mensaje": self.mensaje,
+        }
+
+
+def _por_recurso_y_dia(franjas: Iterable[Franja]) -> dict[tuple, list[Franja]]:
+    grupos: dict[tuple, list[Franja]] = defaultdict(list)
+    for f in franjas:
+        for r in f.recursos:
+            grupos[(r, f.dia)].append(f)
+    return grupos
+
+
+def detectar_conflictos(
+    nuevas: Iterable[Franja],
+    existentes: Iterable[Franja],
+    entre_nuevas: bool = False,
+) -> list[Conflicto]:
+    """
+    Todos los pares (nueva, existente) que comparten recurso y se solapan (los bordes
+    que se tocan no chocan). Con `entre_nuevas`, también choques dentro de `nuevas`.
+    """
+    g_nuevas = _por_recurso_y_dia(nuevas)
+    g_exist = _por_recurso_y_dia(existentes)
+
+    conflictos: list[Conflicto] = []
+    for (recurso, dia), ns in g_nuevas.items():
+        es = g_exist.get((recurso, dia), [])
+        if not es and not (entre_nuevas and len(ns) > 1):
+            continue
+        eventos = sorted(
+            [(f.inicio, 1, i, f) for i, f in enumerate(es)]
+            + [(f.inicio, 0, i, f) for i, f in enumerate(ns)]
+        )
+        activos_e: list = []  # heaps (fin, i, franja)
+        activos_n: list = []
+        for inicio, es_existente, i, f in eventos:
+            for h in (activos_e, activos_n):
+                while h and h[0][0] <= inicio:
+                    heapq.heappop(h)
+            if es_existente:
+                conflictos += [Conflicto(recurso[0], recurso, dia, n, f) for _, _, n in activos_n]
+                heapq.heappush(activos_e, (f.fin, i, f))
+            else:
+                conflictos += [Conflicto(recurso[0], recurso, dia, f, e) for _, _, e in activos_e]
+                if entre_nuevas:
+                    conflictos += [
+                        Conflicto(recurso[0], recurso, dia, f, n) for _, _, n in activos_n
+                    ]
+                heapq.heappush(activos_n, (f.fin, i, f))
+
+    conflictos.sort(key=lambda c: (c.dia, c.nueva.inicio, c.tipo, c.existente.inicio))
+    return conflictos
+
+
+# ---------- carga desde los modelos ----------
+def docentes_por_comision(comision_ids: Iterable[int]) -> dict[int, set[int]]:
+    """Docentes con asignación activa por comisión (una query)."""
+    DocenteAsignacion = apps.get_model("academia_horarios", "DocenteAsignacion")
+    res: dict[int, set[int]] = defaultdict(set)
+    filas = DocenteAsignacion.objects.filter(
+        activa=True, catedra__comision_id__in=list(comision_ids)
+    ).values_list("catedra__comision_id", "docente_id")
+    for com_id, doc_id in filas:
+        res[com_id].add(doc_id)
+    return res
+
+
+def franja_de_clase(hc, docentes: Iterable[int] = ()) -> Franja:
+    """Franja de un HorarioClase (usa comision.materia_en_plan.plan y timeslot)."""
+    c = hc.comision
+    mep = c.materia_en_plan
+    ts = hc.timeslot
+    recursos = {(COHORTE, c.periodo_id, mep.plan.carrera_id, mep.anio)}
+    if _aula(hc.aula):
+        recursos.add((AULA, c.periodo_id, _aula(hc.aula)))
+    recursos |= {(DOCENTE, c.periodo_id, d) for d in docentes}
+    return Franja(
+        dia=ts.dia_semana,
+        inicio=minutos(ts.inicio),
+        fin=minutos(ts.fin),
+        recursos=frozenset(recursos),
+        ref=("horarioclase", hc.pk),
+        comision_id=hc.comision_id,
+        etiqueta=f"comisión {hc.comision_id}",
+    )
+
+
+def franjas_de_clases(qs) -> list[Franja]:
+    """Franjas de un queryset de HorarioClase con dos queries en total."""
+    clases = list(qs.select_related("timeslot", "comision__materia_en_plan__plan"))
+    docentes = docentes_por_comision({hc.comision_id for hc in clases})
+    return [franja_de_clase(hc, docentes.get(hc.comision_id, ())) for hc in clases]
+
+
+def franja_de_horario(h) -> Franja:
+    """Franja de un Horario (grilla por profesorado)."""
+    return franja_de_item(
+        {
+            "dia": h.dia,
+            "inicio": h.inicio,
+            "fin": h.fin,
+            "docente_id": h.docente_id,
+            "aula": h.aula,
+        },
+        profesorado_id=h.profesorado_id,
+        anio=h.anio,
+        comision=h.comision,
+        ref=("horario", h.pk),
+        etiqueta=f"horario {h.pk}",
+    )
+
+
+def franja_de_item(item, profesorado_id, anio, comision="", ref=(), etiqueta="") -> Franja:
+    """Franja de un bloque del borrador de api_horario_save (dict con dia/inicio/fin)."""
+    recursos = {(COHORTE, int(profesorado_id), anio, comision or "")}
+    if item.get("docente_id"):
+        recursos.add((DOCENTE, int(item["docente_id"])))
+    if _aula(item.get("aula")):
+        recursos.add((AULA, _aula(item["aula"])))
+    return Franja(
+        dia=DIA_SLUG.get(item["dia"], 0),
+        inicio=minutos(item["inicio"]),
+        fin=minutos(item["fin"]),
+        recursos=frozenset(recursos),
+        ref=ref,
+        etiqueta=etiqueta,
+    )
@@ -0,0 +1,428 @@
+# academia_horarios/generador.py
+# Generador automático de horarios para un Periodo.
+#
+# Núcleo en Python puro (la base sólo aporta la grilla de cada turno, vía grillas.py): las
+# comisiones se parten en sesiones de hasta 2 bloques de 40' consecutivos, en días distintos,
+# sin atravesar recreos. Primero se ubica todo en forma golosa (lo más restringido primero)
+# y después se repara con min-conflicts (desalojando lo que estorba) hasta vaciar la cola o
+# agotar el tiempo. Con la misma semilla y el mismo tope de iteraciones el resultado es idéntico.
+
+from __future__ import annotations
+
+import random
+import time as _time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import time
+
+from .conflictos import minutos
+from .grillas import grilla, normalizar_turno
+from .models import BLOCK_MIN
+
+DIAS_TURNO = {"manana": (1, 2, 3, 4, 5), "tarde": (1, 2, 3, 4, 5), "vespertino": (1, 2, 3, 4, 5)}
+DIAS_TURNO["sabado"] = (6,)
+LARGO_SESION = 2
+
+
+def _t(m: int) -> time:
+    return time(m // 60, m % 60)
+
+
+def _m(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+@dataclass(frozen=True)
+class Grilla:
+    turno: str
+    dias: tuple[int, ...]
+    slots: tuple[tuple[int, int], ...]  # (inicio, fin) en minutos
+    # largo -> índices de slot donde entra una sesión de ese largo
+    inicios: dict = field(compare=False, hash=False)
+
+    @classmethod
+    def de_turno(cls, turno: str) -> Grilla:
+        g = grilla(turno)
+        slots = g.slots
+        inicios = {}
+        for largo in (1, LARGO_SESION):
+            ok = []
+            for i in range(len(slots) - largo + 1):
+                tramo = slots[i : i + largo]
+                contiguo = all(a[1] == b[0] for a, b in zip(tramo, tramo[1:], strict=False))
+                ini, fi = tramo[0][0], tramo[-1][1]
+                if contiguo and g.dentro_de_jornada(ini, fi) and not g.atraviesa_recreo(ini, fi):
+                    ok.append(i)
+            inicios[largo] = tuple(ok)
+        return cls(g.turno, DIAS_TURNO.get(g.turno, (1, 2, 3, 4, 5)), slots, inicios)
+
+
+@dataclass(frozen=True)
+class Tarea:
+    """Una comisión a ubicar."""
+
+    comision_id: int
+    turno: str
+    horas: int
+    curso: tuple  # (carrera, plan, año): no puede tener dos clases a la vez
+    docentes: tuple[int, ...] = ()
+    cupo: int = 0
+
+    def sesiones(self) -> list[Sesion]:
+        largos = [LARGO_SESION] * (self.horas // LARGO_SESION) + [1] * (self.horas % LARGO_SESION)
+        return [Sesion(self, n, largo) for n, largo in enumerate(largos)]
+
+
+@dataclass(frozen=True)
+class Sesion:
+    tarea: Tarea
+    n: int
+    largo: int
+
+    @property
+    def clave(self) -> tuple[int, int]:
+        return (self.tarea.comision_id, self.n)
+
+
+@dataclass(frozen=True)
+class Ubicacion:
+    comision_id: int
+    dia: int
+    inicio: time
+    fin: time
+    aula: str = ""
+
+
+@dataclass
+class Propuesta:
+    ubicaciones: list[Ubicacion]
+    no_ubicadas: list[dict]
+    seed: int
+    segundos: float
+    iteraciones: int
+
+    @property
+    def completa(self) -> bool:
+        return not self.no_ubicadas
+
+    def grillas(self) -> dict[int, list[dict]]:
+        """Formato de services.guardar_grillas (un bloque de 40' por fila)."""
+        res: dict[int, list[dict]] = defaultdict(list)
+        for u in self.ubicaciones:
+            t = _m(u.inicio)
+            while t < _m(u.fin):
+                res[u.comision_id].append(
+                    {
+                        "dia_semana": u.dia,
+                        "inicio": _t(t).strftime("%H:%M"),
+                        "fin": _t(t + BLOCK_MIN).strftime("%H:%M"),
+                        "aula": u.aula,
+                    }
+                )
+                t += BLOCK_MIN
+        return dict(res)
+
+
+class Generador:
+    """
+    tareas:   comisiones con horas, curso, docentes y cupo.
+    aulas:    {nombre: capacidad}; si está vacío no se asignan aulas.
+    no_disponible: {docente_id: {(dia, turno, indice_slot), ...}} bloques vedados.
+    """
+
+    def __init__(
+        self,
+        tareas: list[Tarea],
+        aulas: dict[str, int] | None = None,
+        no_disponible: dict[int, set] | None = None,
+        seed: int = 0,
+    ):
+        self.tareas = tareas
+        self.aulas = sorted((aulas or {}).items(), key=lambda a: (a[1], a[0]))
+        self.no_disponible = no_disponible or {}
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.grillas = {
+            t: Grilla.de_turno(t) for t in {x.turno for x in tareas} if normalizar_turno(t)
+        }
+
+        self.ocupacion: dict[tuple, int] = defaultdict(int)  # (recurso, turno, dia) -> bits
+        self.duenio: dict[tuple, tuple] = {}  # (recurso, turno, dia, slot) -> clave sesión
+        self.ubicadas: dict[tuple, tuple] = {}  # clave sesión -> (dia, inicio, aula)
+        self.sesiones: dict[tuple, Sesion] = {}
+        self.dias_usados: dict[int, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.movida: dict[tuple, int] = {}
+
+    # ---------- recursos ----------
+    @staticmethod
+    def _recursos(s: Sesion, aula: str) -> list[tuple]:
+        rec = [("curso", s.tarea.curso)] + [("docente", d) for d in s.tarea.docentes]
+        if aula:
+            rec.append(("aula", aula))
+        return rec
+
+    def _bloqueado(self, s: Sesion, dia: int, inicio: int) -> bool:
+        turno = normalizar_turno(s.tarea.turno)
+        for d in s.tarea.docentes:
+            vedados = self.no_disponible.get(d)
+            if vedados and any((dia, turno, inicio + k) in vedados for k in range(s.largo)):
+                return True
+        return False
+
+    def _aulas_para(self, s: Sesion) -> list[str]:
+        if not self.aulas:
+            return [""]
+        return [nombre for nombre, cap in self.aulas if cap >= s.tarea.cupo]
+
+    def _conflictos(self, s: Sesion, dia: int, inicio: int, aula: str) -> set[tuple]:
+        turno = s.tarea.turno
+        quienes = set()
+        for r in self._recursos(s, aula):
+            for k in range(s.largo):
+                q = self.duenio.get((r, turno, dia, inicio + k))
+                if q is not None:
+                    quienes.add(q)
+        return quienes
+
+    def _libre(self, s: Sesion, dia: int, inicio: int, aula: str) -> bool:
+        mask = ((1 << s.largo) - 1) << inicio
+        turno = s.tarea.turno
+        return not any(self.ocupacion[(r, turno, dia)] & mask for r in self._recursos(s, aula))
+
+    def _poner(self, s: Sesion, dia: int, inicio: int, aula: str, it: int) -> None:
+        turno = s.tarea.turno
+        mask = ((1 << s.largo) - 1) << inicio
+        for r in self._recursos(s, aula):
+            self.ocupacion[(r, turno, dia)] |= mask
+            for k in range(s.largo):
+                self.duenio[(r, turno, dia, inicio + k)] = s.clave
+        self.ubicadas[s.clave] = (dia, inicio, aula)
+        self.dias_usados[s.tarea.comision_id][dia] += 1
+        self.movida[s.clave] = it
+
+    def _sacar(self, s: Sesion, it: int) -> None:
+        dia, inicio, aula = self.ubicadas.pop(s.clave)
+        turno = s.tarea.turno
+        mask = ((1 << s.largo) - 1) << inicio
+        for r in self._recursos(s, aula):
+            self.ocupacion[(r, turno, dia)] &= ~mask
+            for k in range(s.largo):
+                self.duenio.pop((r, turno, dia, inicio + k), None)
+        self.dias_usados[s.tarea.comision_id][dia] -= 1
+        self.movida[s.clave] = it
+
+    def _posiciones(self, s: Sesion):
+        g = self.grillas[s.tarea.turno]
+        usados = self.dias_usados[s.tarea.comision_id]
+        for dia in g.dias:
+            if usados.get(dia):
+                continue
+            for inicio in g.inicios.get(s.largo, ()):
+                if not self._bloqueado(s, dia, inicio):
+                    yield dia, inicio
+
+    # ---------- búsqueda ----------
+    def _ubicar_goloso(self, s: Sesion, it: int) -> bool:
+        mejor, mejor_score = None, None
+        carga = self.ocupacion
+        for dia, inicio in self._posiciones(s):
+            for aula in self._aulas_para(s):
+                if self._libre(s, dia, inicio, aula):
+                    curso_dia = carga[(("curso", s.tarea.curso), s.tarea.turno, dia)].bit_count()
+                    score = (curso_dia, inicio, self.rng.random())
+                    if mejor_score is None or score < mejor_score:
+                        mejor, mejor_score = (dia, inicio, aula), score
+                    break  # el aula más chica que sirve
+        if mejor is None:
+            return False
+        self._poner(s, *mejor, it)
+        return True
+
+    def _reparar(self, s: Sesion, it: int) -> list[Sesion]:
+        """Ubica `s` donde menos estorbe y devuelve las sesiones desalojadas."""
+        mejor, mejor_score, desalojar = None, None, set()
+        for dia, inicio in self._posiciones(s):
+            for aula in self._aulas_para(s):
+                quienes = self._conflictos(s, dia, inicio, aula)
+                # las sesiones movidas hace poco pesan más (evita ciclos)
+                score = (
+                    sum(1 + 4 * (it - self.movida.get(q, -99) < 8) for q in quienes),
+                    self.rng.random(),
+                )
+                if mejor_score is None or score < mejor_score:
+                    mejor, mejor_score, desalojar = (dia, inicio, aula), score, quienes
+        if mejor is None:
+            return [s]  # no tiene ninguna posición posible (grilla/días/disponibilidad)
+        fuera = [self.sesiones[q] for q in desalojar]
+        for q in fuera:
+            self._sacar(q, it)
+        self._poner(s, *mejor, it)
+        return fuera
+
+    def resolver(self, tiempo: float = 10.0, max_iter: int | None = None) -> Propuesta:
+        t0 = _time.monotonic()
+        pendientes: list[Sesion] = []
+        sin_grilla: list[Tarea] = []
+
+        tareas = list(self.tareas)
+        self.rng.shuffle(tareas)
+        # lo más restringido primero: más horas, más docentes, más cupo
+        tareas.sort(key=lambda t: (-t.horas, -len(t.docentes), -t.cupo))
+        for t in tareas:
+            if t.turno not in self.grillas or t.horas <= 0:
+                if t.horas > 0:
+                    sin_grilla.append(t)
+                continue
+            for s in t.sesiones():
+                self.sesiones[s.clave] = s
+                if not self._ubicar_goloso(s, 0):
+                    pendientes.append(s)
+
+        mejor = dict(self.ubicadas)
+        mejor_pend = sum(s.largo for s in pendientes)
+        it = 0
+        while pendientes:
+            if max_iter is not None and it >= max_iter:
+                break
+            if _time.monotonic() - t0 > tiempo:
+                break
+            it += 1
+            s = pendientes.pop(self.rng.randrange(len(pendientes)))
+            fuera = self._reparar(s, it)
+            if fuera == [s]:
+                continue  # imposible: queda afuera para siempre
+            pendientes += fuera
+            pend = sum(x.largo for x in pendientes)
+            if pend < mejor_pend:
+                mejor, mejor_pend = dict(self.ubicadas), pend
+
+        return self._propuesta(mejor, sin_grilla, t0, it)
+
+    def _propuesta(self, ubicadas, sin_grilla, t0, it) -> Propuesta:
+        ubicaciones = []
+        horas_ok: dict[int, int] = defaultdict(int)
+        for clave, (dia, inicio, aula) in sorted(ubicadas.items()):
+            s = self.sesiones[clave]
+            g = self.grillas[s.tarea.turno]
+            ubicaciones.append(
+                Ubicacion(
+                    comision_id=clave[0],
+                    dia=dia,
+                    inicio=_t(g.slots[inicio][0]),
+                    fin=_t(g.slots[inicio + s.largo - 1][1]),
+                    aula=aula,
+                )
+            )
+            horas_ok[clave[0]] += s.largo
+
+        no_ubicadas = [
+            {"comision_id": t.comision_id, "faltan": t.horas, "motivo": "turno sin grilla"}
+            for t in sin_grilla
+        ]
+        for t in self.tareas:
+            if t.turno in self.grillas and horas_ok[t.comision_id] < t.horas:
+                no_ubicadas.append(
+                    {
+                        "comision_id": t.comision_id,
+                        "faltan": t.horas - horas_ok[t.comision_id],
+                        "motivo": "sin lugar (curso, docentes o aulas ocupados)",
+                    }
+                )
+        return Propuesta(
+            ubicaciones=ubicaciones,
+            no_ubicadas=sorted(no_ubicadas, key=lambda x: x["comision_id"]),
+            seed=self.seed,
+            segundos=round(_time.monotonic() - t0, 3),
+            iteraciones=it,
+        )
+
+
+# ---------- entrada desde la base ----------
+def tareas_de_periodo(periodo) -> list[Tarea]:
+    """Comisiones del período con sus horas (hc_requeridas) y docentes activos."""
+    from .conflictos import docentes_por_comision
+    from .models import Comision, hc_requeridas
+
+    comisiones = list(
+        Comision.objects.filter(periodo=periodo).select_related(
+            "periodo", "materia_en_plan__plan", "materia_en_plan__materia"
+        )
+    )
+    docentes = docentes_por_comision(c.id for c in comisiones)
+    tareas = []
+    for c in comisiones:
+        mep = c.materia_en_plan
+        tareas.append(
+            Tarea(
+                comision_id=c.id,
+                turno=c.turno,
+                horas=hc_requeridas(mep, c.periodo) or 0,
+                curso=(mep.plan.carrera_id, mep.plan_id, mep.anio),
+                docentes=tuple(sorted(docentes.get(c.id, ()))),
+                cupo=c.cupo,
+            )
+        )
+    return tareas
+
+
+def aulas_de_base() -> dict[str, int]:
+    """{nombre: capacidad} de las Aulas cargadas (sin capacidad = entra cualquier cupo)."""
+    from django.apps import apps
+
+    Aula = apps.get_model("academia_core", "Aula")
+    return {
+        n: c if c is not None else 10**6 for n, c in Aula.objects.values_list("nombre", "capacidad")
+    }
+
+
+def no_disponible_de(datos: dict) -> dict[int, set]:
+    """{docente_id: [{"dia": 1, "turno": "manana", "inicio": "07:45", "fin": "09:05"}, ...]}
+    (JSON de --no-disponible) -> no_disponible del Generador: los slots del turno que se
+    solapan con cada rango. ValueError si un turno no tiene grilla."""
+    res: dict[int, set] = defaultdict(set)
+    for docente, rangos in datos.items():
+        for r in rangos:
+            turno = normalizar_turno(r["turno"])
+            if turno is None:
+                raise ValueError(f"turno desconocido: {r['turno']!r}")
+            ini, fin = minutos(r["inicio"]), minutos(r["fin"])
+            for i, (a, b) in enumerate(grilla(turno).slots):
+                if a < fin and ini < b:
+                    res[int(docente)].add((int(r["dia"]), turno, i))
+    return dict(res)
+
+
+# ---------- instituto sintético (benchmark) ----------
+def instituto_sintetico(n_comisiones: int = 500, seed: int = 0):
+    """Tareas y aulas de un instituto inventado, con carga factible por curso."""
+    rng = random.Random(seed)
+    turnos = ("manana", "tarde", "vespertino")
+    materias_por_curso = 8
+    n_docentes = max(1, n_comisiones * 2 // 5)
+    tareas = []
+    cid = 0
+    carrera = 0
+    while cid < n_comisiones:
+        carrera += 1
+        turno = turnos[carrera % len(turnos)]
+        for anio in range(1, 5):
+            for _ in range(materias_por_curso):
+                if cid >= n_comisiones:
+                    break
+                cid += 1
+                docentes = (rng.randrange(n_docentes),)
+                if rng.random() < 0.1:  # pareja pedagógica
+                    docentes += (rng.randrange(n_docentes),)
+                tareas.append(
+                    Tarea(
+                        comision_id=cid,
+                        turno=turno,
+                        horas=rng.choice((2, 3, 4, 4, 5)),
+                        curso=(carrera, carrera, anio),
+                        docentes=tuple(sorted(set(docentes))),
+                        cupo=rng.randrange(15, 46),
+                    )
+                )
+    n_aulas = max(4, n_comisiones // 12)
+    aulas = {f"A{i:03d}": rng.choice((30, 40, 50)) for i in range(n_aulas)}
+    return tareas, aulas
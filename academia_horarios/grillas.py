@@ -0,0 +1,223 @@
+# academia_horarios/grillas.py
+# Registro único de grillas por turno: bloques de 40' y recreos, en minutos.
+#
+# Sale de Bloque/TurnoModel (lo que carga seed_turnos_y_bloques); un turno sin bloques
+# cargados usa GRILLAS de models. Se arma una vez por proceso y se valida contra una
+# versión en el cache compartido (academia_core.versiones) que suben las escrituras de
+# Bloque/TurnoModel de cualquier proceso (igual que ocupacion y grafo_correlativas).
+# Las consultas (¿atraviesa un recreo?, ¿está dentro de la jornada?, ¿qué bloque empieza
+# a esta hora?) son O(1).
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from django.apps import apps
+
+from academia_core import versiones
+
+from .conflictos import minutos
+from .models import BLOCK_MIN, GRILLAS
+
+TURNOS = ("manana", "tarde", "vespertino", "sabado")
+# Slugs viejos que siguen dando vueltas (seed_bloques, el JS del panel, TurnoModel cargados a mano)
+ALIAS = {
+    "maniana": "manana",
+    "mañana": "manana",
+    "noche": "vespertino",
+    "nocturno": "vespertino",
+    "sábado": "sabado",
+    "sabado_am": "sabado",
+}
+SABADO = 5  # Bloque.dia_semana
+
+
+def normalizar_turno(turno) -> str | None:
+    """Slug canónico del turno (o None si no es ninguno conocido)."""
+    t = (turno or "").strip().lower()
+    t = ALIAS.get(t, t)
+    return t if t in TURNOS else None
+
+
+def _hhmm(m: int) -> str:
+    return f"{m // 60:02d}:{m % 60:02d}"
+
+
+@dataclass(frozen=True)
+class GrillaTurno:
+    turno: str
+    filas: tuple[tuple[int, int, bool], ...]  # línea de tiempo L-V: (inicio, fin, recreo)
+    filas_sab: tuple[tuple[int, int, bool], ...]  # la del sábado que se muestra con este turno
+    inicio: int
+    fin: int
+    slots: tuple[tuple[int, int], ...]  # bloques de clase (sin recreos)
+    indice: MappingProxyType  # minuto de inicio -> índice en `slots`
+    bordes: frozenset  # minutos donde empieza o termina un bloque de clase
+    recreo_acum: tuple[int, ...]  # [m - inicio] = minutos de recreo en [inicio, m)
+
+    @classmethod
+    def armar(cls, turno: str, filas, filas_sab=()) -> GrillaTurno:
+        filas = tuple(sorted(filas))
+        ini = filas[0][0] if filas else 0
+        fin = max((f for _i, f, _r in filas), default=0)
+        acum = [0] * (fin - ini + 1)
+        en_recreo = [False] * (fin - ini)
+        for a, b, recreo in filas:
+            if recreo:
+                for m in range(a - ini, b - ini):
+                    en_recreo[m] = True
+        for m, r in enumerate(en_recreo):
+            acum[m + 1] = acum[m] + r
+        slots = tuple((a, b) for a, b, recreo in filas if not recreo)
+        return cls(
+            turno=turno,
+            filas=filas,
+            filas_sab=tuple(sorted(filas_sab)),
+            inicio=ini,
+            fin=fin,
+            slots=slots,
+            indice=MappingProxyType({a: i for i, (a, _b) in enumerate(slots)}),
+            bordes=frozenset(m for s in slots for m in s),
+            recreo_acum=tuple(acum),
+        )
+
+    def _acum(self, m: int) -> int:
+        return self.recreo_acum[min(max(m, self.inicio), self.fin) - self.inicio]
+
+    def atraviesa_recreo(self, inicio: int, fin: int) -> bool:
+        return self._acum(fin) > self._acum(inicio)
+
+    def dentro_de_jornada(self, inicio: int, fin: int) -> bool:
+        return self.inicio <= inicio and fin <= self.fin
+
+    def es_borde(self, m: int) -> bool:
+        return m in self.bordes
+
+    def slot(self, inicio: int) -> int | None:
+        return self.indice.get(inicio)
+
+    def as_json(self) -> dict:
+        def filas(items):
+            return [
+                {"orden": o, "ini": _hhmm(a), "fin": _hhmm(b), "recreo": r}
+                for o, (a, b, r) in enumerate(items, start=1)
+            ]
+
+        return {"turno": self.turno, "lv": filas(self.filas), "sab": filas(self.filas_sab)}
+
+
+def _filas_de_constantes(turno: str) -> tuple[tuple[int, int, bool], ...]:
+    g = GRILLAS[turno]
+    t, fin = minutos(g["start"]), minutos(g["end"])
+    recreos = sorted((minutos(a), minutos(b)) for a, b in g["breaks"])
+    filas = []
+    while t + BLOCK_MIN <= fin:
+        recreo = next(((a, b) for a, b in recreos if a <= t < b), None)
+        if recreo:
+            filas.append((recreo[0], recreo[1], True))
+            t = recreo[1]
+            continue
+        filas.append((t, t + BLOCK_MIN, False))
+        t += BLOCK_MIN
+    return tuple(filas)
+
+
+@dataclass(frozen=True)
+class Registro:
+    version: int
+    grillas: MappingProxyType  # turno -> GrillaTurno
+    cuerpos: MappingProxyType  # turno -> JSON ya serializado (api_timeslots)
+    etags: MappingProxyType  # turno -> ETag del cuerpo
+
+    def get(self, turno) -> GrillaTurno | None:
+        t = normalizar_turno(turno)
+        return self.grillas.get(t) if t else None
+
+
+def construir(version: int = 0) -> Registro:
+    """Arma las grillas de todos los turnos (una query a Bloque)."""
+    Bloque = apps.get_model("academia_horarios", "Bloque")
+
+    # (turno, slug exacto?, día) -> filas. El slug canónico gana sobre los alias.
+    por_dia: dict[tuple, set] = defaultdict(set)
+    for slug, dia, ini, fin, recreo in Bloque.objects.values_list(
+        "turno__slug", "dia_semana", "inicio", "fin", "es_recreo"
+    ):
+        turno = "sabado" if slug is None else normalizar_turno(slug)
+        if turno:
+            por_dia[(turno, slug == turno, dia)].add((minutos(ini), minutos(fin), recreo))
+
+    def filas_de(turno: str, dias) -> tuple:
+        for exacto in (True, False):
+            for dia in dias:
+                filas = por_dia.get((turno, exacto, dia))
+                if filas:
+                    return tuple(sorted(filas))
+        return ()
+
+    filas = {}
+    for t in TURNOS:
+        dias = (SABADO,) if t == "sabado" else (0, 1, 2, 3, 4)
+        filas[t] = filas_de(t, dias) or _filas_de_constantes(t)
+
+    grillas, cuerpos, etags = {}, {}, {}
+    for t in TURNOS:
+        # El sábado se dicta a la mañana: es la columna "sab" del turno mañana.
+        sab = filas_de(t, (SABADO,)) if t != "sabado" else filas[t]
+        if t == "manana" and not sab:
+            sab = filas["sabado"]
+        g = GrillaTurno.armar(t, filas[t], sab)
+        grillas[t] = g
+        cuerpos[t] = json.dumps(g.as_json(), separators=(",", ":")).encode()
+        etags[t] = f'"{hashlib.sha1(cuerpos[t]).hexdigest()[:20]}"'
+    return Registro(
+        version=version,
+        grillas=MappingProxyType(grillas),
+        cuerpos=MappingProxyType(cuerpos),
+        etags=MappingProxyType(etags),
+    )
+
+
+# ---------- cache ----------
+_registro: Registro | None = None
+_lock = threading.Lock()
+VERSION_KEY = "grillas:version"
+
+
+def version() -> int:
+    return versiones.leer(VERSION_KEY)[0]
+
+
+def invalidar() -> None:
+    versiones.subir_al_confirmar(VERSION_KEY)
+
+
+def registro() -> Registro:
+    global _registro
+    v = version()
+    reg = _registro
+    if reg is not None and reg.version == v:
+        return reg
+    with _lock:
+        if _registro is None or _registro.version != v:
+            _registro = construir(v)
+        return _registro
+
+
+def grilla(turno) -> GrillaTurno:
+    """Grilla del turno; KeyError si el turno no existe."""
+    g = registro().get(turno)
+    if g is None:
+        raise KeyError(turno)
+    return g
+
+
+def limpiar() -> None:
+    global _registro
+    with _lock:
+        _registro = None
@@ -0,0 +1,125 @@
+# academia_horarios/management/commands/generar_horarios.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academia_horarios.generador import (
+    Generador,
+    aulas_de_base,
+    instituto_sintetico,
+    no_disponible_de,
+    tareas_de_periodo,
+)
+from academia_horarios.models import Periodo
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera una propuesta de horarios (HorarioClase) para todas las comisiones de un "
+        "Periodo, o corre el benchmark sobre un instituto sintético (--sintetico N)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--periodo", type=int, help="ID del Periodo a resolver.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--tiempo", type=float, default=10.0, help="Segundos máximos.")
+        parser.add_argument(
+            "--max-iter",
+            type=int,
+            default=None,
+            help="Tope de iteraciones de reparación (resultado reproducible).",
+        )
+        parser.add_argument(
+            "--aulas",
+            help='JSON {"Aula 1": 40, ...} con la capacidad de cada aula (por defecto, las Aulas cargadas).',
+        )
+        parser.add_argument(
+            "--no-disponible",
+            help='JSON {"<docente_id>": [{"dia": 1, "turno": "manana", "inicio": "07:45", '
+            '"fin": "09:05"}, ...]} con los bloques en que cada docente no puede dar clase.',
+        )
+        parser.add_argument("--salida", help="Guarda la propuesta en este archivo JSON.")
+        parser.add_argument(
+            "--aplicar",
+            action="store_true",
+            help="Guarda la propuesta (reemplaza la grilla de las comisiones ubicadas).",
+        )
+        parser.add_argument(
+            "--sintetico",
+            type=int,
+            metavar="N",
+            help="Benchmark: resuelve un instituto inventado de N comisiones (sin base).",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["sintetico"]:
+            tareas, aulas = instituto_sintetico(opts["sintetico"], opts["seed"])
+        elif opts["periodo"]:
+            try:
+                periodo = Periodo.objects.get(pk=opts["periodo"])
+            except Periodo.DoesNotExist as e:
+                raise CommandError(f"No existe el Periodo {opts['periodo']}") from e
+            tareas = tareas_de_periodo(periodo)
+            aulas = aulas_de_base()
+        else:
+            raise CommandError("Indicá --periodo ID o --sintetico N")
+
+        if opts["aulas"]:
+            try:
+                with open(opts["aulas"], encoding="utf-8") as fh:
+                    aulas = {str(k): int(v) for k, v in json.load(fh).items()}
+            except (OSError, ValueError, AttributeError) as e:
+                raise CommandError(f"No se pudo leer --aulas: {e}") from e
+
+        no_disponible = {}
+        if opts["no_disponible"]:
+            try:
+                with open(opts["no_disponible"], encoding="utf-8") as fh:
+                    no_disponible = no_disponible_de(json.load(fh))
+            except (OSError, ValueError, AttributeError, KeyError, TypeError) as e:
+                raise CommandError(f"No se pudo leer --no-disponible: {e}") from e
+
+        gen = Generador(tareas, aulas=aulas, no_disponible=no_disponible, seed=opts["seed"])
+        prop = gen.resolver(tiempo=opts["tiempo"], max_iter=opts["max_iter"])
+
+        horas = sum(t.horas for t in tareas)
+        faltan = sum(x["faltan"] for x in prop.no_ubicadas)
+        self.stdout.write(
+            f"Comisiones: {len(tareas)} | bloques: {horas - faltan}/{horas} ubicados | "
+            f"{prop.iteraciones} iteraciones en {prop.segundos:.2f}s (seed={prop.seed})"
+        )
+        for x in prop.no_ubicadas[:20]:
+            self.stdout.write(
+                f"  comisión {x['comision_id']}: faltan {x['faltan']} ({x['motivo']})"
+            )
+        if len(prop.no_ubicadas) > 20:
+            self.stdout.write(f"  ... y {len(prop.no_ubicadas) - 20} comisiones más")
+
+        if opts["salida"]:
+            with open(opts["salida"], "w", encoding="utf-8") as fh:
+                json.dump(
+                    {
+                        "seed": prop.seed,
+                        "segundos": prop.segundos,
+                        "grillas": prop.grillas(),
+                        "no_ubicadas": prop.no_ubicadas,
+                    },
+                    fh,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            self.stdout.write(f"Propuesta guardada en {opts['salida']}")
+
+        if opts["aplicar"]:
+            if opts["sintetico"]:
+                raise CommandError("--aplicar no tiene sentido con --sintetico")
+            from academia_horarios.services import guardar_grillas
+
+            res = guardar_grillas(prop.grillas())
+            if not res["ok"]:
+                raise CommandError(f"La propuesta no validó: {res['errores'] or res['conflictos']}")
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Aplicado: +{res['creados']} ~{res['actualizados']} -{res['borrados']}"
+                )
+            )
@@ -10,16 +10,16 @@ class Command(BaseCommand):
     help = "Genera bloques de 40' + recreos por turno"
 
     def handle(self, *args, **opts):
-        TurnoModel.objects.get_or_create(slug="maniana", defaults={"nombre": "Mañana"})
+        TurnoModel.objects.get_or_create(slug="manana", defaults={"nombre": "Mañana"})
         TurnoModel.objects.get_or_create(slug="tarde", defaults={"nombre": "Tarde"})
         TurnoModel.objects.get_or_create(slug="vespertino", defaults={"nombre": "Vespertino"})
-        TurnoModel.objects.get_or_create(slug="sabado_am", defaults={"nombre": "Sábado (Mañana)"})
+        TurnoModel.objects.get_or_create(slug="sabado", defaults={"nombre": "Sábado"})
 
         config = {
-            "maniana": dict(inicio=time(8, 0), bloques=6, recreos={3}),
+            "manana": dict(inicio=time(8, 0), bloques=6, recreos={3}),
             "tarde": dict(inicio=time(14, 0), bloques=6, recreos={3}),
             "vespertino": dict(inicio=time(18, 0), bloques=5, recreos={3}),
-            "sabado_am": dict(inicio=time(8, 0), bloques=4, recreos={0}),
+            "sabado": dict(inicio=time(8, 0), bloques=4, recreos={0}),
         }
 
         for slug, cfg in config.items():
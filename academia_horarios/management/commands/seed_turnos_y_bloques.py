@@ -3,7 +3,7 @@ from datetime import date, datetime, time, timedelta
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
-from academia_horarios.models import Bloque
+from academia_horarios.models import BLOCK_MIN, GRILLAS, Bloque
 from academia_horarios.models import TurnoModel as Turno
 
 # === TUS HORARIOS (exactos, sin tocar) ===
@@ -14,30 +14,7 @@ TURNOS = {
     "s": (time(9, 0), time(14, 0)),
 }
 
-GRILLAS = {
-    "manana": {
-        "start": time(7, 45),
-        "end": time(12, 45),
-        "breaks": [(time(9, 5), time(9, 15)), (time(10, 35), time(10, 45))],
-    },
-    "tarde": {
-        "start": time(13, 0),
-        "end": time(18, 0),
-        "breaks": [(time(14, 20), time(14, 30)), (time(15, 50), time(16, 0))],
-    },
-    "vespertino": {
-        "start": time(18, 10),
-        "end": time(23, 10),
-        "breaks": [(time(19, 30), time(19, 40)), (time(21, 0), time(21, 10))],
-    },
-    "sabado": {
-        "start": time(9, 0),
-        "end": time(14, 0),
-        "breaks": [(time(10, 20), time(10, 30)), (time(11, 50), time(12, 0))],
-    },
-}
-
-BLOCK_MIN = 40
+# GRILLAS/BLOCK_MIN viven en models (los usa también el registro de grillas)
 
 
 def t2dt(t: time) -> datetime:
@@ -0,0 +1,52 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academia_core", "0008_carton_regular_hasta_idx"),
+        ("academia_horarios", "0002_remove_docentes_from_horarioclase"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comision",
+            name="ocupados",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="InscripcionComision",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("creada", models.DateTimeField(auto_now_add=True)),
+                (
+                    "comision",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inscripciones",
+                        to="academia_horarios.comision",
+                    ),
+                ),
+                (
+                    "estudiante",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="comisiones",
+                        to="academia_core.estudiante",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("estudiante", "comision"), name="uniq_insc_comision"
+                    )
+                ],
+            },
+        ),
+    ]
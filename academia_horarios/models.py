@@ -1,6 +1,6 @@
 from datetime import time
 
-from django.core.exceptions import ValidationError
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
 from django.db import models
 
 
@@ -56,7 +56,9 @@ class Comision(models.Model):
     periodo = models.ForeignKey(Periodo, on_delete=models.PROTECT)
     turno = models.CharField(max_length=16, choices=Turno.choices)
     nombre = models.CharField(max_length=16, default="Única")
-    cupo = models.PositiveSmallIntegerField(default=0)
+    cupo = models.PositiveSmallIntegerField(default=0)  # 0 = sin tope
+    # lugares tomados: sólo lo mueve services.inscribir/dar_de_baja (UPDATE condicional)
+    ocupados = models.PositiveIntegerField(default=0, editable=False)
     # NUEVO:
     seccion = models.CharField(max_length=2, default="A")  # A, B, C...
 
@@ -82,6 +84,23 @@ class Comision(models.Model):
         unique_together = ("materia_en_plan", "periodo", "seccion")  # NEW
 
 
+class InscripcionComision(models.Model):
+    comision = models.ForeignKey(Comision, on_delete=models.CASCADE, related_name="inscripciones")
+    estudiante = models.ForeignKey(
+        "academia_core.Estudiante", on_delete=models.CASCADE, related_name="comisiones"
+    )
+    creada = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.estudiante} en {self.comision}"
+
+    class Meta:
+        constraints = [
+            # un reintento o dos requests simultáneos no inscriben dos veces
+            models.UniqueConstraint(fields=["estudiante", "comision"], name="uniq_insc_comision"),
+        ]
+
+
 class TimeSlot(models.Model):
     dia_semana = models.PositiveSmallIntegerField()
     inicio = models.TimeField()
@@ -183,27 +202,39 @@ class HorarioClase(models.Model):
             return
 
         c = self.comision
-
-        # 1) Validar solapamiento de bloques (misma materia, año, plan, etc)
-        mep = c.materia_en_plan
-        conflicto_bloque = (
-            HorarioClase.objects.filter(
-                timeslot=self.timeslot,
-                comision__periodo=c.periodo,
-                comision__materia_en_plan__anio=mep.anio,
-                comision__materia_en_plan__plan__carrera=mep.plan.carrera,
-            )
-            .exclude(pk=self.pk)
-            .exists()
+        ts = self.timeslot
+
+        # 0) El bloque tiene que caer en la grilla del turno (la misma regla que la grilla
+        #    completa de services.guardar_grillas)
+        error = error_de_bloque(c.turno, ts.dia_semana, ts.inicio, ts.fin)
+        if error:
+            raise ValidationError({"timeslot": error})
+
+        # 1) Choques con otros bloques del período: mismo curso (profesorado + año),
+        #    misma aula o mismo docente. Una carga de los bloques del día y un barrido.
+        from .conflictos import (
+            AULA,
+            COHORTE,
+            detectar_conflictos,
+            docentes_por_comision,
+            franja_de_clase,
+            franjas_de_clases,
         )
-        if conflicto_bloque:
-            raise ValidationError(
-                {
-                    "timeslot": (
-                        "Bloque ocupado para este Profesorado/Plan/Período/Año. Elegí otro bloque."
-                    )
-                }
-            )
+
+        mismo_dia = HorarioClase.objects.filter(
+            comision__periodo_id=c.periodo_id,
+            timeslot__dia_semana=ts.dia_semana,
+        ).exclude(pk=self.pk)
+        existentes = franjas_de_clases(mismo_dia)
+        docentes = docentes_por_comision([c.pk]).get(c.pk, ())
+        conflictos = detectar_conflictos([franja_de_clase(self, docentes)], existentes)
+        if conflictos:
+            campo = {COHORTE: "timeslot", AULA: "aula"}.get(conflictos[0].tipo, NON_FIELD_ERRORS)
+            if conflictos[0].tipo == COHORTE:
+                msg = "Bloque ocupado para este Profesorado/Plan/Período/Año. Elegí otro bloque."
+            else:
+                msg = conflictos[0].mensaje
+            raise ValidationError({campo: msg})
 
         # 2) Validar tope de horas cátedra de la comisión
         tope = c.horas_catedra_tope()
@@ -252,6 +283,7 @@ GRILLAS = {
     },
 }
 BLOCK_MIN = 40
+SABADO_TS = 6  # TimeSlot.dia_semana
 
 
 def hc_asignadas(comision: Comision) -> int:
@@ -290,20 +322,43 @@ def _mins(t: time) -> int:
     return t.hour * 60 + t.minute
 
 
-def es_multiplo_40(t: time) -> bool:
-    return (_mins(t) - _mins(GRILLAS["manana"]["start"])) % BLOCK_MIN == 0
+# Las tres consultas usan el registro de grillas (Bloque, o GRILLAS si no hay bloques).
+def es_multiplo_40(t: time, turno: str = "manana") -> bool:
+    """¿`t` es comienzo o fin de un bloque de 40' del turno? (salteando recreos)"""
+    from .grillas import grilla
+
+    return grilla(turno).es_borde(_mins(t))
 
 
 def atraviesa_recreo(turno: str, inicio: time, fin: time) -> bool:
-    for a, b in GRILLAS[turno]["breaks"]:
-        if inicio < b and fin > a:
-            return True
-    return False
+    from .grillas import grilla
+
+    return grilla(turno).atraviesa_recreo(_mins(inicio), _mins(fin))
 
 
 def dentro_de_jornada(turno: str, inicio: time, fin: time) -> bool:
-    s, e = GRILLAS[turno]["start"], GRILLAS[turno]["end"]
-    return (inicio >= s) and (fin <= e)
+    from .grillas import grilla
+
+    return grilla(turno).dentro_de_jornada(_mins(inicio), _mins(fin))
+
+
+def error_de_bloque(turno, dia_semana: int, inicio: time, fin: time) -> str | None:
+    """Por qué el bloque no entra en la grilla del turno (None si entra): dentro de la
+    jornada, sin atravesar recreos y con inicio y fin en bordes de bloques de 40'.
+    El sábado usa la grilla "sabado". Sin turno conocido no hay grilla contra qué validar."""
+    from .grillas import normalizar_turno
+
+    t = "sabado" if dia_semana == SABADO_TS else normalizar_turno(turno)
+    if t is None:
+        return None
+    rango = f"{inicio:%H:%M}-{fin:%H:%M}"
+    if not dentro_de_jornada(t, inicio, fin):
+        return f"El bloque {rango} está fuera de la jornada del turno."
+    if atraviesa_recreo(t, inicio, fin):
+        return f"El bloque {rango} atraviesa un recreo."
+    if not (es_multiplo_40(inicio, t) and es_multiplo_40(fin, t)):
+        return f"El bloque {rango} no coincide con los bloques de {BLOCK_MIN}' del turno."
+    return None
 
 
 def minutos(ts: TimeSlot) -> int:
@@ -0,0 +1,182 @@
+# academia_horarios/ocupacion.py
+# Índice de ocupación semanal por turno: para cada docente, aula y curso
+# (carrera, plan, año) un bitset por día de los bloques de 40' del turno.
+# "¿Qué bloques tiene libres el docente X en el aula Y?" = un OR y un NOT de enteros.
+#
+# Igual que grafo_correlativas: el índice vive en memoria del proceso y se valida
+# contra una versión en el cache compartido (academia_core.versiones), que suben las
+# escrituras de horarios de cualquier proceso.
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from django.apps import apps
+
+from academia_core import versiones
+
+from .conflictos import DIA_SLUG, minutos
+
+DIAS = ("lu", "ma", "mi", "ju", "vi", "sa")
+_VACIO = (0,) * len(DIAS)
+
+
+def _aula(aula: str | None) -> str:
+    return " ".join((aula or "").split()).lower()
+
+
+def clave_docente(docente_id) -> tuple:
+    return ("docente", int(docente_id))
+
+
+def clave_aula(aula) -> tuple:
+    return ("aula", _aula(aula))
+
+
+def clave_curso(carrera_id, plan_id, anio) -> tuple:
+    return ("curso", int(carrera_id), int(plan_id), int(anio))
+
+
+def slots_de_turno(turno: str) -> tuple[tuple[int, int], ...]:
+    """Bloques de clase del turno (sin recreos) como (inicio, fin) en minutos."""
+    from .grillas import registro
+
+    g = registro().get(turno)
+    return g.slots if g else ()
+
+
+@dataclass(frozen=True)
+class IndiceOcupacion:
+    turno: str
+    version: int
+    slots: tuple[tuple[int, int], ...]
+    # clave -> bitset por día (bit i = slots[i] ocupado)
+    ocupacion: MappingProxyType
+
+    @property
+    def completo(self) -> int:
+        return (1 << len(self.slots)) - 1
+
+    def ocupado(self, *claves) -> tuple[int, ...]:
+        res = list(_VACIO)
+        for k in claves:
+            for d, bits in enumerate(self.ocupacion.get(k, _VACIO)):
+                res[d] |= bits
+        return tuple(res)
+
+    def libres(self, *claves) -> tuple[int, ...]:
+        full = self.completo
+        return tuple(~bits & full for bits in self.ocupado(*claves))
+
+
+def _bits(inicios, fines, inicio: int, fin: int) -> int:
+    """Bits de los slots (ordenados) que se solapan con [inicio, fin)."""
+    desde = bisect_right(fines, inicio)  # primer slot que termina después de `inicio`
+    hasta = bisect_left(inicios, fin)  # slots que empiezan antes de `fin`
+    if hasta <= desde:
+        return 0
+    return ((1 << (hasta - desde)) - 1) << desde
+
+
+def construir(turno: str, version: int = 0) -> IndiceOcupacion:
+    """Arma el índice del turno: Horario + HorarioClase (4 queries)."""
+    Horario = apps.get_model("academia_horarios", "Horario")
+    HorarioClase = apps.get_model("academia_horarios", "HorarioClase")
+    from .conflictos import docentes_por_comision
+
+    slots = slots_de_turno(turno)
+    inicios = [i for i, _f in slots]
+    fines = [f for _i, f in slots]
+    ocup: dict[tuple, list[int]] = defaultdict(lambda: [0] * len(DIAS))
+
+    def marcar(claves, dia: int, inicio, fin):
+        if not 0 <= dia < len(DIAS):
+            return
+        bits = _bits(inicios, fines, minutos(inicio), minutos(fin))
+        if bits:
+            for k in claves:
+                ocup[k][dia] |= bits
+
+    filas = Horario.objects.filter(turno=turno).values_list(
+        "dia", "inicio", "fin", "docente_id", "aula", "profesorado_id", "plan_id", "anio"
+    )
+    for dia, ini, fin, doc, aula, carrera, plan, anio in filas:
+        claves = []
+        if doc:
+            claves.append(clave_docente(doc))
+        if _aula(aula):
+            claves.append(clave_aula(aula))
+        if anio:
+            claves.append(clave_curso(carrera, plan, anio))
+        marcar(claves, DIA_SLUG.get(dia, 0) - 1, ini, fin)
+
+    clases = list(
+        HorarioClase.objects.filter(comision__turno=turno).values_list(
+            "comision_id",
+            "timeslot__dia_semana",
+            "timeslot__inicio",
+            "timeslot__fin",
+            "aula",
+            "comision__materia_en_plan__plan__carrera_id",
+            "comision__materia_en_plan__plan_id",
+            "comision__materia_en_plan__anio",
+        )
+    )
+    docentes = docentes_por_comision({c[0] for c in clases})
+    for com, dia, ini, fin, aula, carrera, plan, anio in clases:
+        claves = [clave_curso(carrera, plan, anio)]
+        claves += [clave_docente(d) for d in docentes.get(com, ())]
+        if _aula(aula):
+            claves.append(clave_aula(aula))
+        marcar(claves, dia - 1, ini, fin)
+
+    return IndiceOcupacion(
+        turno=turno,
+        version=version,
+        slots=slots,
+        ocupacion=MappingProxyType({k: tuple(v) for k, v in ocup.items()}),
+    )
+
+
+# ---------- cache ----------
+_indices: dict[str, IndiceOcupacion] = {}
+_lock = threading.Lock()
+VERSION_KEY = "ocupacion:version"
+
+
+def version() -> int:
+    return versiones.leer(VERSION_KEY)[0]
+
+
+def invalidar() -> None:
+    """Cualquier escritura de horarios/bloques invalida todos los turnos (ya y al commit),
+    en el cache compartido: lo ven todos los procesos."""
+    versiones.subir_al_confirmar(VERSION_KEY)
+
+
+def indice(turno: str) -> IndiceOcupacion:
+    """Índice del turno (slug canónico); KeyError si no es un turno de la grilla, así un
+    valor cualquiera no arma ni guarda un índice nuevo."""
+    from .grillas import normalizar_turno
+
+    if normalizar_turno(turno) != turno:
+        raise KeyError(turno)
+    v = version()
+    idx = _indices.get(turno)
+    if idx is not None and idx.version == v:
+        return idx
+    with _lock:
+        idx = _indices.get(turno)
+        if idx is None or idx.version != v:
+            idx = construir(turno, v)
+            _indices[turno] = idx
+    return idx
+
+
+def limpiar() -> None:
+    with _lock:
+        _indices.clear()
@@ -1,89 +1,420 @@
 # academia_horarios/services.py
+from dataclasses import replace
+from datetime import datetime, time
+
 from django.apps import apps
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
-
-def _solapa(h1_ini, h1_fin, h2_ini, h2_fin) -> bool:
-    return (h1_ini < h2_fin) and (h2_ini < h1_fin)
+from . import ocupacion
+from .conflictos import (
+    DIA_SLUG,
+    DOCENTE,
+    ESTUDIANTE,
+    Franja,
+    detectar_conflictos,
+    docentes_por_comision,
+    franja_de_clase,
+    franja_de_horario,
+    franjas_de_clases,
+    minutos,
+)
 
 
 def detectar_conflicto_docente(
-    docente, dia_semana, hora_inicio, hora_fin, excluir_comision_id=None
+    docente, dia_semana, hora_inicio, hora_fin, excluir_comision_id=None, periodo_id=None
 ):
-    """Chequea choques del docente con otros bloques ese mismo día."""
+    """Primer choque del docente con otros bloques ese mismo día (o None)."""
     HorarioClase = apps.get_model("academia_horarios", "HorarioClase")
+    docente_id = getattr(docente, "id", docente)
     qs = HorarioClase.objects.filter(
-        docente=docente, timeslot__dia_semana=dia_semana
-    ).select_related("timeslot")
+        timeslot__dia_semana=dia_semana,
+        comision__catedra__asignaciones__docente_id=docente_id,
+        comision__catedra__asignaciones__activa=True,
+    )
+    if periodo_id:
+        qs = qs.filter(comision__periodo_id=periodo_id)
     if excluir_comision_id:
         qs = qs.exclude(comision_id=excluir_comision_id)
 
-    for hc in qs:
-        ini = hc.timeslot.inicio
-        fin = hc.timeslot.fin
-        if _solapa(ini, fin, hora_inicio, hora_fin):
-            return hc
-    return None
+    existentes = [f.con_recursos((DOCENTE, docente_id)) for f in franjas_de_clases(qs.distinct())]
+    nueva = Franja(
+        dia=dia_semana,
+        inicio=minutos(hora_inicio),
+        fin=minutos(hora_fin),
+        recursos=frozenset({(DOCENTE, docente_id)}),
+    )
+    conflictos = detectar_conflictos([nueva], existentes)
+    return conflictos[0] if conflictos else None
+
+
+def conflictos_docente_en_comision(comision, docente) -> list:
+    """Todos los choques entre los bloques de `comision` y las otras comisiones del
+    docente en el mismo período (cuatro queries, sin importar cuántos bloques haya)."""
+    HorarioClase = apps.get_model("academia_horarios", "HorarioClase")
+    docente_id = getattr(docente, "id", docente)
+    recurso = (DOCENTE, comision.periodo_id, docente_id)
+
+    nuevas = [
+        f.con_recursos(recurso)
+        for f in franjas_de_clases(HorarioClase.objects.filter(comision=comision))
+    ]
+    if not nuevas:
+        return []
+    otras = HorarioClase.objects.filter(
+        comision__periodo_id=comision.periodo_id,
+        comision__catedra__asignaciones__docente_id=docente_id,
+        comision__catedra__asignaciones__activa=True,
+        timeslot__dia_semana__in={f.dia for f in nuevas},
+    ).exclude(comision_id=comision.id)
+    existentes = [f.con_recursos(recurso) for f in franjas_de_clases(otras.distinct())]
+    return detectar_conflictos(nuevas, existentes)
 
 
-def asignar_docente_a_comision(comision, docente):
+def asignar_docente_a_comision(comision, docente, condicion="INTERINO", fecha_desde=None):
     """
-    Asigna el docente si NO hay choque de horarios con sus otras comisiones.
-    (Sin límite semanal: puede tener todas las horas que quiera.)
+    Asigna el docente (DocenteAsignacion activa en la cátedra de la comisión) si NO hay
+    choque de horarios con sus otras comisiones. Idempotente: si ya estaba asignado,
+    devuelve esa asignación. (Sin límite semanal: puede tener todas las horas que quiera.)
     """
-    HorarioClase = apps.get_model("academia_horarios", "HorarioClase")
-    for hc in HorarioClase.objects.filter(comision=comision).select_related("timeslot"):
-        ts = hc.timeslot
-        conflicto = detectar_conflicto_docente(
-            docente=docente,
-            dia_semana=ts.dia_semana,
-            hora_inicio=ts.inicio,
-            hora_fin=ts.fin,
-            excluir_comision_id=comision.id,
-        )
-        if conflicto:
+    Comision = apps.get_model("academia_horarios", "Comision")
+    Catedra = apps.get_model("academia_horarios", "Catedra")
+    DocenteAsignacion = apps.get_model("academia_horarios", "DocenteAsignacion")
+    TurnoModel = apps.get_model("academia_horarios", "TurnoModel")
+    docente_id = getattr(docente, "id", docente)
+
+    with transaction.atomic():
+        # dos asignaciones a la vez a la misma comisión se serializan acá
+        comision = Comision.objects.select_for_update().get(pk=getattr(comision, "pk", comision))
+        catedra = Catedra.objects.filter(comision=comision).order_by("pk").first()
+        if catedra is None:
+            turno = TurnoModel.objects.filter(slug=comision.turno).first()
+            if turno is None:
+                raise ValidationError(
+                    f"No hay turno cargado para '{comision.turno}'.", code="sin_turno"
+                )
+            catedra = Catedra.objects.create(
+                comision=comision,
+                materia_en_plan_id=comision.materia_en_plan_id,
+                turno=turno,
+                horas_semanales=0,
+            )
+        existente = DocenteAsignacion.objects.filter(
+            catedra=catedra, docente_id=docente_id, activa=True
+        ).first()
+        if existente is not None:
+            return existente
+
+        conflictos = conflictos_docente_en_comision(comision, docente_id)
+        if conflictos:
             raise ValidationError(
-                f"Conflicto: el docente ya está asignado en ese rango (comisión {conflicto.comision_id}).",
+                conflictos[0].mensaje,
                 code="conflicto_docente",
+                params={"conflictos": [c.as_dict() for c in conflictos]},
             )
-    comision.docente = docente
-    comision.save(update_fields=["docente"])
-    return comision
+        return DocenteAsignacion.objects.create(
+            catedra=catedra,
+            docente_id=docente_id,
+            condicion=condicion,
+            fecha_desde=fecha_desde or timezone.localdate(),
+        )
+
+
+def _choques_de_estudiante(estudiante_id, comision_id) -> list:
+    HorarioClase = apps.get_model("academia_horarios", "HorarioClase")
+    Inscripcion = apps.get_model("academia_horarios", "InscripcionComision")
+    recurso = (ESTUDIANTE, estudiante_id)
+    mis_comisiones = Inscripcion.objects.filter(estudiante_id=estudiante_id).values("comision_id")
+    existentes = [
+        f.con_recursos(recurso)
+        for f in franjas_de_clases(HorarioClase.objects.filter(comision_id__in=mis_comisiones))
+    ]
+    nuevas = [
+        f.con_recursos(recurso)
+        for f in franjas_de_clases(HorarioClase.objects.filter(comision_id=comision_id))
+    ]
+    return detectar_conflictos(nuevas, existentes)
+
+
+def _ocupar_lugar(comision_id) -> bool:
+    """Toma un lugar si queda (cupo 0 = sin tope). Un solo UPDATE condicional: la base
+    bloquea sólo esa fila y re-evalúa el WHERE, así que dos requests no toman el último."""
+    Comision = apps.get_model("academia_horarios", "Comision")
+    return bool(
+        Comision.objects.filter(Q(cupo=0) | Q(ocupados__lt=F("cupo")), pk=comision_id).update(
+            ocupados=F("ocupados") + 1
+        )
+    )
 
 
 def inscribir_estudiante_en_comision(estudiante, comision):
     """
     Inscribe al estudiante verificando:
-    - no duplicado en la misma comisión
     - no choque de horarios con otras comisiones ya inscriptas
+    - lugar en la comisión (Comision.ocupados < cupo, ver _ocupar_lugar)
+    Idempotente: si ya estaba inscripto (reintento, doble click) devuelve esa inscripción
+    sin ocupar otro lugar. Sin locks de tabla: la unicidad la garantiza la base.
     """
-    Inscripcion = apps.get_model(
-        "academia_core", "InscripcionComision"
-    )  # ajustá si tu modelo se llama distinto
-    HorarioClase = apps.get_model("academia_horarios", "HorarioClase")
+    Inscripcion = apps.get_model("academia_horarios", "InscripcionComision")
+    estudiante_id = getattr(estudiante, "id", estudiante)
+    comision_id = getattr(comision, "id", comision)
+    ya = Inscripcion.objects.filter(estudiante_id=estudiante_id, comision_id=comision_id)
+
+    existente = ya.first()
+    if existente is not None:
+        return existente
+
+    conflictos = _choques_de_estudiante(estudiante_id, comision_id)
+    if conflictos:
+        raise ValidationError(
+            "Conflicto de horarios con otra comisión ya inscripta.",
+            code="choque_estudiante",
+            params={"conflictos": [c.as_dict() for c in conflictos]},
+        )
+
+    try:
+        with transaction.atomic():
+            if not _ocupar_lugar(comision_id):
+                raise ValidationError("No quedan lugares en la comisión.", code="sin_cupo")
+            return Inscripcion.objects.create(estudiante_id=estudiante_id, comision_id=comision_id)
+    except IntegrityError:
+        # otro request lo inscribió entre el chequeo y el insert: el lugar se devolvió
+        # con el rollback y queda la inscripción del otro
+        existente = ya.first()
+        if existente is None:
+            raise
+        return existente
 
-    if Inscripcion.objects.filter(estudiante=estudiante, comision=comision).exists():
-        raise ValidationError("Ya estás inscripto en esta comisión.", code="duplicado")
 
-    mis_comisiones = Inscripcion.objects.filter(estudiante=estudiante).values_list(
-        "comision_id", flat=True
+def dar_de_baja_en_comision(estudiante, comision) -> bool:
+    """Borra la inscripción y libera su lugar; False si no estaba inscripto."""
+    Inscripcion = apps.get_model("academia_horarios", "InscripcionComision")
+    Comision = apps.get_model("academia_horarios", "Comision")
+    comision_id = getattr(comision, "id", comision)
+    with transaction.atomic():
+        borradas, _ = Inscripcion.objects.filter(
+            estudiante_id=getattr(estudiante, "id", estudiante), comision_id=comision_id
+        ).delete()
+        if not borradas:
+            return False
+        Comision.objects.filter(pk=comision_id, ocupados__gt=0).update(ocupados=F("ocupados") - 1)
+    return True
+
+
+def recontar_ocupados(comision_ids=None) -> int:
+    """Recalcula Comision.ocupados desde las inscripciones (cargas por fuera del servicio)."""
+    Comision = apps.get_model("academia_horarios", "Comision")
+    Inscripcion = apps.get_model("academia_horarios", "InscripcionComision")
+    qs = (
+        Comision.objects.all()
+        if comision_ids is None
+        else Comision.objects.filter(pk__in=comision_ids)
     )
-    mis_horarios = HorarioClase.objects.filter(comision_id__in=mis_comisiones).select_related(
-        "timeslot"
+    cuenta = (
+        Inscripcion.objects.filter(comision_id=OuterRef("pk"))
+        .values("comision_id")
+        .annotate(n=Count("id"))
+        .values("n")
     )
-    nuevos = HorarioClase.objects.filter(comision=comision).select_related("timeslot")
+    return qs.update(ocupados=Coalesce(Subquery(cuenta), 0))
 
-    for nuevo in nuevos:
-        for viejo in mis_horarios:
-            if (nuevo.timeslot.dia_semana == viejo.timeslot.dia_semana) and _solapa(
-                nuevo.timeslot.inicio, nuevo.timeslot.fin, viejo.timeslot.inicio, viejo.timeslot.fin
-            ):
-                raise ValidationError(
-                    "Conflicto de horarios con otra comisión ya inscripta.",
-                    code="choque_estudiante",
+
+def _hora(valor) -> time:
+    if isinstance(valor, time):
+        return valor
+    return datetime.strptime(str(valor)[:5], "%H:%M").time()
+
+
+def guardar_grillas(por_comision: dict, dry_run: bool = False) -> dict:
+    """
+    Valida y guarda de una vez la grilla semanal completa de una o más comisiones.
+
+    `por_comision` = {comision_id: [{"dia_semana": 1, "inicio": "07:45", "fin": "08:25",
+    "aula": ""}, ...]}. Las grillas enviadas reemplazan a las actuales de esas comisiones.
+
+    Cada bloque tiene que caer en la grilla del turno (models.error_de_bloque, igual que
+    HorarioClase.clean). Todo se valida contra la ocupación del período precargada (curso,
+    aula y docentes, entre sí y con el resto de las comisiones; los docentes también contra
+    sus Horario de la grilla por profesorado) y se aplica como diff mínimo
+    (insert/update/delete sólo de los bloques que cambian) en una transacción.
+    Validación y diff van dentro de la misma transacción, con los períodos y las comisiones
+    bloqueados: dos guardados del mismo período no validan a la vez contra la misma foto.
+    Devuelve {"ok", "errores", "conflictos", "creados", "actualizados", "borrados"}.
+    """
+    res = {
+        "ok": False,
+        "errores": [],
+        "conflictos": [],
+        "creados": 0,
+        "actualizados": 0,
+        "borrados": 0,
+    }
+    with transaction.atomic():
+        _guardar_grillas(por_comision, dry_run, res)
+    return res
+
+
+def _guardar_grillas(por_comision: dict, dry_run: bool, res: dict) -> None:
+    Comision = apps.get_model("academia_horarios", "Comision")
+    Periodo = apps.get_model("academia_horarios", "Periodo")
+    HorarioClase = apps.get_model("academia_horarios", "HorarioClase")
+    TimeSlot = apps.get_model("academia_horarios", "TimeSlot")
+    from .models import error_de_bloque, hc_requeridas
+
+    errores = res["errores"]
+    ids = [int(k) for k in por_comision]
+
+    # 0) locks, siempre en el mismo orden (períodos y después comisiones, por pk): todo
+    #    guardado de grilla de esos períodos espera acá hasta que este termine
+    periodos = Comision.objects.filter(pk__in=ids).values("periodo_id")
+    list(Periodo.objects.select_for_update().filter(pk__in=periodos).order_by("pk").values("pk"))
+    list(Comision.objects.select_for_update().filter(pk__in=ids).order_by("pk").values("pk"))
+    comisiones = Comision.objects.select_related(
+        "periodo", "materia_en_plan__plan", "materia_en_plan__materia"
+    ).in_bulk(ids)
+    for cid in ids:
+        if cid not in comisiones:
+            errores.append({"comision_id": cid, "error": "La comisión no existe."})
+
+    # 1) parseo + chequeos por comisión (sin base)
+    deseado: dict[tuple, str] = {}  # (comision_id, dia, inicio, fin) -> aula
+    for cid_raw, bloques in por_comision.items():
+        cid = int(cid_raw)
+        c = comisiones.get(cid)
+        if c is None:
+            continue
+        for i, b in enumerate(bloques or []):
+            try:
+                clave = (cid, int(b["dia_semana"]), _hora(b["inicio"]), _hora(b["fin"]))
+            except (KeyError, TypeError, ValueError):
+                errores.append({"comision_id": cid, "bloque": i, "error": "Bloque inválido."})
+                continue
+            if clave[2] >= clave[3]:
+                errores.append(
+                    {
+                        "comision_id": cid,
+                        "bloque": i,
+                        "error": "El inicio debe ser anterior al fin.",
+                    }
                 )
+            elif error := error_de_bloque(c.turno, *clave[1:]):
+                errores.append({"comision_id": cid, "bloque": i, "error": error})
+            elif clave in deseado:
+                errores.append({"comision_id": cid, "bloque": i, "error": "Bloque repetido."})
+            else:
+                deseado[clave] = (b.get("aula") or "").strip()
+        tope = hc_requeridas(c.materia_en_plan, c.periodo)
+        cant = sum(1 for k in deseado if k[0] == cid)
+        if tope is not None and cant > tope:
+            errores.append(
+                {
+                    "comision_id": cid,
+                    "error": f"Supera el tope de {tope} horas cátedra ({cant} bloques).",
+                }
+            )
+    if errores:
+        return
+
+    # 2) choques contra la ocupación precargada (3 queries, 4 si hay docentes)
+    docentes = docentes_por_comision(comisiones)
+    nuevas = []
+    for (cid, dia, ini, fin), aula in deseado.items():
+        hc = HorarioClase(comision=comisiones[cid], aula=aula)
+        hc.timeslot = TimeSlot(dia_semana=dia, inicio=ini, fin=fin)
+        f = franja_de_clase(hc, docentes.get(cid, ()))
+        nuevas.append(replace(f, ref=("grilla", cid, dia, ini.strftime("%H:%M"))))
+    resto = HorarioClase.objects.filter(
+        comision__periodo_id__in={c.periodo_id for c in comisiones.values()},
+        timeslot__dia_semana__in={k[1] for k in deseado},
+    ).exclude(comision_id__in=ids)
+    conflictos = detectar_conflictos(nuevas, franjas_de_clases(resto), entre_nuevas=True)
+    conflictos += _choques_con_horarios(nuevas, docentes, comisiones, {k[1] for k in deseado})
+    if conflictos:
+        res["conflictos"] = [c.as_dict() for c in conflictos]
+        return
+
+    # 3) diff mínimo
+    actuales = {
+        (hc.comision_id, hc.timeslot.dia_semana, hc.timeslot.inicio, hc.timeslot.fin): hc
+        for hc in HorarioClase.objects.filter(comision_id__in=ids).select_related("timeslot")
+    }
+    borrar = [hc.pk for k, hc in actuales.items() if k not in deseado]
+    actualizar = []
+    for k, hc in actuales.items():
+        if k in deseado and hc.aula != deseado[k]:
+            hc.aula = deseado[k]
+            actualizar.append(hc)
+    crear = [k for k in deseado if k not in actuales]
+
+    if crear and not dry_run:
+        slots = _timeslots_para(crear, comisiones)
+        HorarioClase.objects.bulk_create(
+            [HorarioClase(comision_id=k[0], timeslot=slots[k[1:]], aula=deseado[k]) for k in crear]
+        )
+    if actualizar and not dry_run:
+        HorarioClase.objects.bulk_update(actualizar, ["aula"])
+    if borrar and not dry_run:
+        HorarioClase.objects.filter(pk__in=borrar).delete()
+    if (crear or actualizar) and not dry_run:
+        ocupacion.invalidar()  # bulk_create/bulk_update no disparan señales
 
-    return Inscripcion.objects.create(estudiante=estudiante, comision=comision)
+    res.update(ok=True, creados=len(crear), actualizados=len(actualizar), borrados=len(borrar))
+
+
+def _choques_con_horarios(nuevas, docentes, comisiones, dias) -> list:
+    """Choques de los docentes de las comisiones con sus Horario (grilla por profesorado,
+    sin período), salvo los de esas mismas comisiones (una query)."""
+    Horario = apps.get_model("academia_horarios", "Horario")
+    ids = {d for ds in docentes.values() for d in ds}
+    if not ids:
+        return []
+    slugs = {slug for slug, n in DIA_SLUG.items() if n in dias}
+    propios = Q(pk__in=[])
+    for c in comisiones.values():
+        mep = c.materia_en_plan
+        propios |= Q(
+            materia_id=mep.materia_id, plan_id=mep.plan_id, comision__in=(c.seccion, c.nombre)
+        )
+    existentes = [
+        franja_de_horario(h).con_recursos((DOCENTE, h.docente_id))
+        for h in Horario.objects.filter(docente_id__in=ids, dia__in=slugs).exclude(propios)
+    ]
+    if not existentes:
+        return []
+    por_docente = [
+        f.con_recursos(*((DOCENTE, d) for d in docentes.get(f.comision_id, ()))) for f in nuevas
+    ]
+    return detectar_conflictos(por_docente, existentes)
+
+
+def _timeslots_para(claves, comisiones) -> dict:
+    """(dia, inicio, fin) -> TimeSlot, creando los que falten (2 queries)."""
+    TimeSlot = apps.get_model("academia_horarios", "TimeSlot")
+    necesarios = {k[1:]: comisiones[k[0]].turno for k in claves}
+    slots = {
+        (ts.dia_semana, ts.inicio, ts.fin): ts
+        for ts in TimeSlot.objects.filter(
+            dia_semana__in={d for d, _i, _f in necesarios},
+            inicio__in={i for _d, i, _f in necesarios},
+        )
+    }
+    faltan = [
+        TimeSlot(dia_semana=d, inicio=i, fin=f, turno=turno or "manana")
+        for (d, i, f), turno in necesarios.items()
+        if (d, i, f) not in slots
+    ]
+    if faltan:
+        TimeSlot.objects.bulk_create(faltan)
+        # bulk_create no devuelve pk en todos los motores: releer sólo los creados
+        for ts in TimeSlot.objects.filter(
+            dia_semana__in={t.dia_semana for t in faltan},
+            inicio__in={t.inicio for t in faltan},
+        ):
+            slots.setdefault((ts.dia_semana, ts.inicio, ts.fin), ts)
+    return slots
 
 
 # No usamos .env ni settings para topes. Solo evitamos solapamientos de horarios del docente.
@@ -0,0 +1,33 @@
+# academia_horarios/signals.py
+from django.db.models.signals import post_delete, post_save
+
+from . import grillas, ocupacion
+
+# Todo lo que cambia qué bloque ocupa quién invalida el índice de ocupación.
+# (bulk_create no dispara señales: quien lo use llama a ocupacion.invalidar()).
+_MODELOS_OCUPACION = (
+    "academia_horarios.Horario",
+    "academia_horarios.HorarioClase",
+    "academia_horarios.Comision",
+    "academia_horarios.Bloque",
+    "academia_horarios.DocenteAsignacion",
+)
+# Y los bloques/turnos, el registro de grillas.
+_MODELOS_GRILLA = ("academia_horarios.Bloque", "academia_horarios.TurnoModel")
+
+
+def _invalidar_ocupacion(sender, **kwargs):
+    ocupacion.invalidar()
+
+
+def _invalidar_grillas(sender, **kwargs):
+    grillas.invalidar()
+
+
+for _modelo in _MODELOS_OCUPACION:
+    post_save.connect(_invalidar_ocupacion, sender=_modelo, dispatch_uid=f"ocup_save_{_modelo}")
+    post_delete.connect(_invalidar_ocupacion, sender=_modelo, dispatch_uid=f"ocup_del_{_modelo}")
+
+for _modelo in _MODELOS_GRILLA:
+    post_save.connect(_invalidar_grillas, sender=_modelo, dispatch_uid=f"grilla_save_{_modelo}")
+    post_delete.connect(_invalidar_grillas, sender=_modelo, dispatch_uid=f"grilla_del_{_modelo}")
@@ -1,10 +1,11 @@
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseBadRequest, JsonResponse
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotModified, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import DetailView
 
 from academia_core.models import Carrera
+from academia_horarios import grillas
 from academia_horarios.forms import DocenteAsignacionForm, HorarioInlineForm
 from academia_horarios.models import (
     Catedra,
@@ -12,6 +13,7 @@ from academia_horarios.models import (
     DocenteAsignacion,
     HorarioClase,
     Periodo,
+    Turno,
     TurnoModel,
 )
 from ui.api import api_materias_por_plan, api_planes_por_carrera
@@ -25,9 +27,7 @@ def cargar_horario(request):
         "carreras": Carrera.objects.order_by("nombre"),
         "periodos": Periodo.objects.all().order_by("-ciclo_lectivo", "-cuatrimestre"),
         "turnos": [
-            {"id": "maniana", "label": "Mañana"},
-            {"id": "tarde", "label": "Tarde"},
-            {"id": "noche", "label": "Noche"},
+            {"id": slug, "label": label} for slug, label in Turno.choices if slug != "sabado"
         ],
     }
     return render(request, "academia_horarios/cargar_horario.html", ctx)
@@ -38,77 +38,31 @@ def cargar_horario(request):
 @require_GET
 def api_timeslots(request):
     """
-    GET /panel/horarios/api/timeslots?turno=maniana|tarde|noche
+    GET /panel/horarios/api/timeslots?turno=manana|tarde|vespertino|sabado
+    (acepta los slugs viejos maniana/noche; un turno desconocido devuelve la mañana)
     -> 200 JSON:
        {
+         "turno": "manana",
          "lv":  [{"orden":..,"ini":..,"fin":..,"recreo":..}, ...],
          "sab": [{"orden":..,"ini":..,"fin":..,"recreo":..}, ...]
        }
+    El cuerpo sale ya serializado del registro de grillas; con If-None-Match -> 304.
     """
-    turno = (request.GET.get("turno") or "").lower()
-
-    # Acá devolvemos "constantes" (pueden venir de tu modelo TimeSlot si querés)
-    MAPA = {
-        "maniana": dict(
-            lv=[
-                (1, "07:45", "08:25", False),
-                (2, "08:25", "09:05", False),
-                (3, "09:05", "09:15", True),  # recreo
-                (4, "09:15", "09:55", False),
-                (5, "09:55", "10:35", False),
-                (6, "10:35", "10:45", True),  # recreo
-                (7, "10:45", "11:25", False),
-                (8, "11:25", "12:05", False),
-                (9, "12:05", "12:45", False),
-            ],
-            sab=[
-                (1, "09:00", "09:40", False),
-                (2, "09:40", "10:20", False),
-                (3, "10:20", "10:30", True),
-                (4, "10:30", "11:10", False),
-                (5, "11:10", "11:50", False),
-                (6, "11:50", "12:00", True),
-                (7, "12:00", "12:40", False),
-                (8, "12:40", "13:20", False),
-                (9, "13:20", "14:00", False),
-            ],
-        ),
-        "tarde": dict(
-            lv=[
-                (1, "13:00", "13:40", False),
-                (2, "13:40", "14:20", False),
-                (3, "14:20", "14:30", True),
-                (4, "14:30", "15:10", False),
-                (5, "15:10", "15:50", False),
-                (6, "15:50", "16:00", True),
-                (7, "16:00", "16:40", False),
-                (8, "16:40", "17:20", False),
-                (9, "17:20", "18:00", False),
-            ],
-            sab=[],  # si no hay, devolvés []
-        ),
-        "noche": dict(
-            lv=[
-                (1, "18:10", "18:50", False),
-                (2, "18:50", "19:30", False),
-                (3, "19:30", "19:40", True),
-                (4, "19:40", "20:20", False),
-                (5, "20:20", "21:00", False),
-                (6, "21:00", "21:10", True),
-                (7, "21:10", "21:50", False),
-                (8, "21:50", "22:30", False),
-                (9, "22:30", "23:10", False),
-            ],
-            sab=[],
-        ),
-    }
-
-    cfg = MAPA.get(turno) or MAPA["maniana"]
+    reg = grillas.registro()
+    turno = grillas.normalizar_turno(request.GET.get("turno")) or "manana"
+    etag = reg.etags[turno]
+    if etag in _etags_pedidos(request):
+        resp = HttpResponseNotModified()
+    else:
+        resp = HttpResponse(reg.cuerpos[turno], content_type="application/json")
+    resp["ETag"] = etag
+    resp["Cache-Control"] = "private, no-cache"
+    return resp
 
-    def mk(items):
-        return [{"orden": o, "ini": a, "fin": b, "recreo": r} for (o, a, b, r) in items]
 
-    return JsonResponse({"lv": mk(cfg["lv"]), "sab": mk(cfg["sab"])}, safe=False)
+def _etags_pedidos(request) -> set[str]:
+    valor = request.headers.get("If-None-Match", "")
+    return {e.strip().removeprefix("W/") for e in valor.split(",") if e.strip()}
 
 
 # ========== Guardar grilla ==========
@@ -123,7 +77,7 @@ def api_guardar(request):
     {
       "plan_id": 123,
       "espacio_id": 456,    // id de EspacioCurricular
-      "turno": "maniana",   // o 'tarde' / 'noche'
+      "turno": "manana",    // o 'tarde' / 'vespertino'
       "seleccion": {
         "Lun": [1,2,4],     // órdenes de slots L-V
         "Mar": [],
@@ -9,6 +9,7 @@ Configurado para:
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 from django.core.exceptions import ImproperlyConfigured
@@ -174,8 +175,42 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # Consultas por request (Server-Timing, N+1, presupuestos); ver academia_core/consultas.py
+    "academia_core.consultas.ConsultasMiddleware",
+    # Sala de espera de las vistas de inscripción; ver ui/admision.py
+    "ui.admision.AdmisionMiddleware",
 ]
 
+MEDIR_CONSULTAS = getenv_bool("MEDIR_CONSULTAS", default=True)
+# Header Server-Timing con consultas y tiempos: sólo en desarrollo salvo que se pida
+SERVER_TIMING = getenv_bool("SERVER_TIMING", default=DEBUG)
+CONSULTAS_REPETIDAS_UMBRAL = int(os.getenv("CONSULTAS_REPETIDAS_UMBRAL", "10"))
+# Máximo de consultas por nombre de URL; en tests (ESTRICTO) pasarse hace fallar el request
+PRESUPUESTO_CONSULTAS: dict[str, int] = {}
+PRESUPUESTO_CONSULTAS_ESTRICTO = False
+# Control de admisión (ui/admision.py): límites por id de carrera, "*" para el resto
+ADMISION_VISTAS = getenv_list("ADMISION_VISTAS", ["ui:inscribir_materias"])
+ADMISION_LIMITES = {"*": {"concurrencia": 40, "rafaga": 10, "por_minuto": 30}}
+ADMISION_SONDEO_S = 3
+# Archivo rotativo con una línea JSON por request (lo lee `manage.py reporte_consultas`)
+CONSULTAS_LOG = os.getenv("CONSULTAS_LOG", "")
+if CONSULTAS_LOG:
+    os.makedirs(os.path.dirname(os.path.abspath(CONSULTAS_LOG)), exist_ok=True)
+    LOGGING["formatters"] = {"solo_mensaje": {"format": "%(message)s"}}
+    LOGGING["handlers"]["consultas"] = {
+        "class": "logging.handlers.RotatingFileHandler",
+        "filename": CONSULTAS_LOG,
+        "maxBytes": 5 * 1024 * 1024,
+        "backupCount": 3,
+        "encoding": "utf-8",
+        "formatter": "solo_mensaje",
+    }
+    LOGGING["loggers"]["academia_core.consultas"] = {
+        "handlers": ["consultas"],
+        "level": "INFO",
+        "propagate": False,
+    }
+
 
 # =============================================================================
 # URL / WSGI
@@ -248,6 +283,55 @@ if os.getenv("USE_SQLITE_FOR_TESTS") == "1":
     }
 
 
+# =============================================================================
+# Cache
+# =============================================================================
+
+# "respuestas": JSON de datos de referencia ya codificado (ui/cache_respuestas.py) y las
+# versiones por tabla que lo invalidan (academia_core/versiones.py). Con
+# RESPUESTAS_CACHE_DIR se comparte en disco entre los procesos del servidor; si no, en
+# memoria de cada proceso.
+RESPUESTAS_CACHE_DIR = os.getenv("RESPUESTAS_CACHE_DIR", "")
+# "compartido": lo que tienen que ver igual todos los procesos del servidor (versiones que
+# invalidan los caches en memoria de cada proceso). En disco por defecto (mismo host); con
+# varios hosts, apuntar CACHE_COMPARTIDO_DIR a un volumen común.
+CACHE_COMPARTIDO_DIR = os.getenv(
+    "CACHE_COMPARTIDO_DIR", os.path.join(tempfile.gettempdir(), "academia_cache")
+)
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "compartido": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(CACHE_COMPARTIDO_DIR, "versiones"),
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
+    "respuestas": (
+        {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": RESPUESTAS_CACHE_DIR,
+            "TIMEOUT": 24 * 60 * 60,
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+        if RESPUESTAS_CACHE_DIR
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "respuestas",
+            "TIMEOUT": 24 * 60 * 60,
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+    ),
+    # ui/admision.py: buckets, colas y métricas de la sala de espera
+    "admision": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(CACHE_COMPARTIDO_DIR, "admision"),
+        # sin vencimiento por defecto: cada clave lleva su TTL (ver ui/admision.py)
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 50000},
+    },
+}
+
+
 # =============================================================================
 # Validadores de contraseña
 # =============================================================================
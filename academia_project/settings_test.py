@@ -19,3 +19,32 @@ MIGRATION_MODULES = {
     "ui": None,
     # Add other apps here if they have migrations
 }
+
+# Presupuesto de consultas por vista: un request que se pasa hace fallar el test
+# (academia_core.consultas.ConsultasMiddleware). Ajustar sólo con un motivo.
+PRESUPUESTO_CONSULTAS_ESTRICTO = True
+SERVER_TIMING = True
+PRESUPUESTO_CONSULTAS = {
+    "ui:api_acta_guardar": 20,
+    "ui:api_acta_planilla": 5,
+    "ui:cargar_acta": 5,
+    "ui:api_estudiantes_buscar": 5,
+    "ui:api_carton": 5,
+    "ui:carton_estudiante": 6,
+    "ui:api_regularidades_por_vencer": 5,
+    "academia_horarios:cargar_horario": 8,
+    "academia_horarios:api_timeslots": 4,
+    "academia_horarios:api_planes": 4,
+    "ui:correlatividades": 3,
+    "ui:gestionar_comisiones": 5,
+    "ui:horarios_profesorado": 4,
+    "ui:horarios_docente": 3,
+    "ui:api_admision_turno": 0,
+}
+
+# Un solo proceso: lo compartido puede vivir en memoria (y no ensucia /tmp).
+CACHES = {
+    **CACHES,  # noqa: F405
+    "compartido": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "c"},
+    "admision": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "a"},
+}
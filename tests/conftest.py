@@ -1,7 +1,10 @@
+from datetime import time
+
 import pytest
 from django.contrib.auth import get_user_model
 
-from academia_core.models import Carrera, PlanEstudios
+from academia_core.models import Carrera, EspacioCurricular, Materia, PlanEstudios
+from academia_horarios.models import Comision, MateriaEnPlan, Periodo, TimeSlot, TurnoModel
 
 
 @pytest.fixture
@@ -20,3 +23,53 @@ def carrera(db):
 @pytest.fixture
 def plan_estudios(db, carrera):
     return PlanEstudios.objects.create(carrera=carrera, resolucion="1234/2025", nombre="Plan 2025")
+
+
+@pytest.fixture
+def oferta(plan_estudios):
+    """Dos comisiones de 1° y una de 2° en el mismo período; bloques del lunes 7:45-8:25,
+    7:45-9:05 y 8:25-9:05 (el doble del medio pisa a los otros dos)."""
+    periodo = Periodo.objects.create(ciclo_lectivo=2025, cuatrimestre=1)
+    turno = TurnoModel.objects.create(nombre="Mañana", slug="manana")
+    coms = []
+    for i in range(3):
+        esp = EspacioCurricular.objects.create(
+            plan=plan_estudios,
+            materia=Materia.objects.create(nombre=f"H{i}"),
+            anio="1°",
+            cuatrimestre="A",
+        )
+        mep = MateriaEnPlan.objects.create(
+            plan=plan_estudios,
+            materia=esp,
+            anio=1 + (i == 2),
+            tipo_dictado="ANUAL",
+            horas_catedra_semana_1c=4,
+        )
+        coms.append(Comision.objects.create(materia_en_plan=mep, periodo=periodo, turno="manana"))
+    slots = [
+        TimeSlot.objects.create(dia_semana=1, inicio=time(7, 45), fin=time(8, 25)),
+        TimeSlot.objects.create(dia_semana=1, inicio=time(7, 45), fin=time(9, 5)),
+        TimeSlot.objects.create(dia_semana=1, inicio=time(8, 25), fin=time(9, 5)),
+    ]
+    return periodo, turno, coms, slots
+
+
+@pytest.fixture(autouse=True)
+def _caches_en_proceso_limpios():
+    # Los ids se reutilizan entre tests: no arrastrar grafos/índices armados con otra base.
+    from academia_core import grafo_correlativas
+    from academia_horarios import grillas, ocupacion
+    from ui import admision, cache_respuestas
+
+    grafo_correlativas.limpiar()
+    ocupacion.limpiar()
+    grillas.limpiar()
+    cache_respuestas.limpiar()
+    admision.limpiar()
+    yield
+    grafo_correlativas.limpiar()
+    ocupacion.limpiar()
+    grillas.limpiar()
+    cache_respuestas.limpiar()
+    admision.limpiar()
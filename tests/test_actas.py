@@ -0,0 +1,218 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from academia_core.actas import cargar_acta, planilla
+from academia_core.models import (
+    Condicion,
+    Correlatividad,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    Materia,
+    Movimiento,
+)
+
+pytestmark = pytest.mark.django_db
+
+DOCS = dict(
+    doc_dni_legalizado=True,
+    doc_cert_medico=True,
+    doc_fotos_carnet=True,
+    doc_folios_oficio=True,
+    doc_titulo_sec_legalizado=True,
+)
+FECHA = date(2025, 7, 10)
+
+
+@pytest.fixture
+def condiciones(db):
+    for c, t in [
+        ("REGULAR", "REG"),
+        ("PROMOCION", "REG"),
+        ("LIBRE", "REG"),
+        ("FINAL_APROBADO", "FIN"),
+    ]:
+        Condicion.objects.create(codigo=c, nombre=c.title(), tipo=t)
+
+
+@pytest.fixture
+def espacios(plan_estudios):
+    a, b = (
+        EspacioCurricular.objects.create(
+            plan=plan_estudios,
+            materia=Materia.objects.create(nombre=n),
+            anio=anio,
+            cuatrimestre="A",
+        )
+        for n, anio in [("Álgebra", "1°"), ("Análisis", "2°")]
+    )
+    Correlatividad.objects.create(
+        plan=plan_estudios, espacio=b, tipo="CURSAR", requisito="REGULARIZADA", requiere_espacio=a
+    )
+    return a, b
+
+
+def _inscripciones(plan, n, **kw):
+    return [
+        EstudianteProfesorado.objects.create(
+            estudiante=Estudiante.objects.create(
+                dni=f"40{i:06d}", apellido=f"Ap{i:02d}", nombre="X"
+            ),
+            carrera=plan.carrera,
+            plan=plan,
+            **{**DOCS, **kw},
+        )
+        for i in range(n)
+    ]
+
+
+def _filas(inscs, condicion="PROMOCION", nota=8):
+    return [{"inscripcion": i.pk, "condicion": condicion, "nota": nota} for i in inscs]
+
+
+def test_guarda_el_acta_y_recalcula_promedios(condiciones, espacios):
+    a, _b = espacios
+    inscs = _inscripciones(a.plan, 3)
+    res = cargar_acta(a.pk, "REG", FECHA, _filas(inscs), folio="12", libro="3")
+    assert res.ok and len(res.creados) == 3
+    movs = Movimiento.objects.filter(espacio=a)
+    assert movs.count() == 3 and {m.folio for m in movs} == {"12"}
+    inscs[0].refresh_from_db()
+    assert inscs[0].promedio_general == Decimal("8.00")
+    assert inscs[0].cant_notas_aprobadas == 1
+
+
+def test_queries_no_dependen_de_la_cantidad_de_filas(condiciones, espacios):
+    _a, b = espacios
+    inscs = _inscripciones(b.plan, 60)
+    for i in inscs:
+        Movimiento.objects.create(
+            inscripcion=i, espacio=_a, tipo="REG", condicion_id="REGULAR", fecha=date(2024, 7, 1)
+        )
+    cargar_acta(b.pk, "REG", FECHA, _filas(inscs[:5]), solo_validar=True)  # arma el grafo
+
+    with CaptureQueriesContext(connection) as pocas:
+        assert cargar_acta(b.pk, "REG", FECHA, _filas(inscs[:5])).ok
+    with CaptureQueriesContext(connection) as muchas:
+        assert cargar_acta(b.pk, "REG", FECHA, _filas(inscs[5:])).ok
+    assert len(muchas.captured_queries) == len(pocas.captured_queries)
+    assert len(muchas.captured_queries) <= 16
+    assert Movimiento.objects.filter(espacio=b).count() == 60
+
+
+def test_errores_por_fila_no_guardan_nada(condiciones, espacios):
+    a, b = espacios
+    ok, sin_correlativa, dup, otro = _inscripciones(b.plan, 4)
+    Movimiento.objects.create(
+        inscripcion=ok, espacio=a, tipo="REG", condicion_id="REGULAR", fecha=date(2024, 7, 1)
+    )
+    Movimiento.objects.create(
+        inscripcion=dup, espacio=a, tipo="REG", condicion_id="REGULAR", fecha=date(2024, 7, 1)
+    )
+    filas = [
+        {"inscripcion": ok.pk, "condicion": "REGULAR", "nota": "7,5"},
+        {"inscripcion": sin_correlativa.pk, "condicion": "REGULAR", "nota": 7},
+        {"inscripcion": dup.pk, "condicion": "REGULAR", "nota": 11},
+        {"inscripcion": 999999, "condicion": "REGULAR"},
+        {"inscripcion": ok.pk, "condicion": "REGULAR"},
+        {"inscripcion": otro.pk, "condicion": "FINAL_APROBADO"},
+    ]
+    res = cargar_acta(b.pk, "REG", FECHA, filas)
+    assert not res.ok and res.validas == 1 and res.creados == []
+    errores = {n: msg for n, _i, msg in res.errores}
+    assert errores[2] == "No cumple correlatividades para CURSAR: faltan regularizada de 'Álgebra'."
+    assert errores[3] == "La nota debe estar entre 0 y 10."
+    assert errores[4] == "Inscripción inexistente."
+    assert errores[5] == "El estudiante figura más de una vez en el acta."
+    assert errores[6].startswith("Condición inválida")
+    assert not Movimiento.objects.filter(espacio=b).exists()
+
+
+def test_mismas_reglas_que_movimiento_clean(condiciones, espacios):
+    a, _b = espacios
+    (condicional,) = _inscripciones(a.plan, 1, doc_cert_medico=False)
+    res = cargar_acta(a.pk, "REG", FECHA, _filas([condicional]))
+    mov = Movimiento(
+        inscripcion=condicional,
+        espacio=a,
+        tipo="REG",
+        fecha=FECHA,
+        condicion_id="PROMOCION",
+        nota_num=8,
+    )
+    with pytest.raises(ValidationError) as e:
+        mov.clean()
+    assert res.errores == [(1, condicional.pk, e.value.messages[0])]
+
+
+def test_final_por_regularidad(condiciones, espacios):
+    a, _b = espacios
+    vigente, vencida = _inscripciones(a.plan, 2)
+    for insc, fecha in [(vigente, date(2024, 7, 1)), (vencida, date(2021, 7, 1))]:
+        Movimiento.objects.create(
+            inscripcion=insc, espacio=a, tipo="REG", condicion_id="REGULAR", fecha=fecha
+        )
+    res = cargar_acta(a.pk, "FIN", FECHA, _filas([vigente, vencida], "FINAL_APROBADO", 7))
+    assert res.errores == [(2, vencida.pk, "La regularidad no está vigente (2 años).")]
+    assert cargar_acta(a.pk, "FIN", FECHA, _filas([vigente], "FINAL_APROBADO", 7)).ok
+
+    with pytest.raises(ValueError):
+        cargar_acta(a.pk, "XXX", FECHA, [])
+
+
+def test_planilla_de_cursada(condiciones, espacios):
+    a, _b = espacios
+    inscs = _inscripciones(a.plan, 3)
+    for i in inscs[:2]:
+        InscripcionEspacio.objects.create(inscripcion=i, espacio=a, anio_academico=2025)
+    InscripcionEspacio.objects.create(inscripcion=inscs[2], espacio=a, anio_academico=2024)
+    items = planilla(a.pk, "REG", anio_academico=2025)
+    assert [it["inscripcion"] for it in items] == [inscs[0].pk, inscs[1].pk]
+    assert items[0]["apellido"] == "Ap00"
+
+
+def test_api_acta(client, admin_user, condiciones, espacios):
+    a, _b = espacios
+    inscs = _inscripciones(a.plan, 2)
+    url = reverse("ui:api_acta_guardar")
+    payload = {"espacio": a.pk, "tipo": "REG", "fecha": "2025-07-10", "filas": _filas(inscs)}
+
+    otro = get_user_model().objects.create_user("alumno", password="x")
+    client.force_login(otro)
+    r = client.post(url, json.dumps(payload), content_type="application/json")
+    assert r.status_code == 403
+    planilla_url = reverse("ui:api_acta_planilla")
+    assert client.get(planilla_url, {"espacio": a.pk, "tipo": "REG"}).status_code == 403
+
+    client.force_login(admin_user)
+    payload["filas"].append({"inscripcion": inscs[0].pk, "condicion": "PROMOCION"})
+    r = client.post(url, json.dumps(payload), content_type="application/json")
+    assert r.status_code == 400
+    assert r.json()["errores"] == [
+        {
+            "fila": 3,
+            "inscripcion": inscs[0].pk,
+            "error": "El estudiante figura más de una vez en el acta.",
+        }
+    ]
+
+    payload["filas"].pop()
+    r = client.post(url, json.dumps(payload), content_type="application/json")
+    assert r.json() == {"ok": True, "validas": 2, "creados": 2}
+    assert Movimiento.objects.filter(espacio=a).count() == 2
+
+    r = client.get(planilla_url, {"espacio": a.pk, "tipo": "REG"})
+    assert r.status_code == 200 and r.json() == {"items": []}
+    for fecha in ("2024-13-45", "ayer"):
+        r = client.get(planilla_url, {"espacio": a.pk, "tipo": "FIN", "fecha": fecha})
+        assert r.status_code == 400
+    assert client.get(reverse("ui:cargar_acta")).status_code == 200
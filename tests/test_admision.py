@@ -0,0 +1,135 @@
+import time
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from academia_core.models import (
+    Carrera,
+    Estudiante,
+    EstudianteProfesorado,
+    PlanEstudios,
+    UserProfile,
+)
+from academia_project import settings as base_settings
+from ui import admision
+
+pytestmark = pytest.mark.django_db
+
+URL = "/inscribir/materias"
+
+
+def _usuario(client, nombre):
+    user = get_user_model().objects.create_superuser(nombre, f"{nombre}@x.com", "x")
+    client.force_login(user)
+    return user
+
+
+def _estudiante_de(user, *carreras):
+    est = Estudiante.objects.create(dni=str(user.pk), apellido=user.username, nombre="X")
+    for c in carreras:
+        plan = PlanEstudios.objects.create(carrera=c, resolucion=f"{c.pk}/2025", nombre="Plan")
+        EstudianteProfesorado.objects.create(estudiante=est, carrera=c, plan=plan)
+    UserProfile.objects.update_or_create(user=user, defaults={"estudiante": est})
+
+
+@override_settings(
+    ADMISION_LIMITES={"*": {"concurrencia": 10, "rafaga": 2, "por_minuto": 6}},
+    ADMISION_SONDEO_S=0,
+)
+def test_bucket_ticket_y_pase(client):
+    assert reverse("ui:inscribir_materias") == URL
+    user = _usuario(client, "ana")
+    with mock.patch.object(admision, "_ahora", return_value=1000.0):
+        assert client.get(URL).status_code == 200
+        assert client.get(URL).status_code == 200
+        espera = client.get(URL)
+        otra_vez = client.get(URL, HTTP_ACCEPT="application/json")
+    assert espera.status_code == 429 and espera["Retry-After"] == "0"
+    assert "Tu turno es el" in espera.content.decode()
+    ticket = otra_vez.json()
+    assert ticket["turno"] == 1 and ticket["adelante"] == 0  # el mismo ticket, no otro
+    assert espera.context["ticket"] == ticket["ticket"]
+
+    with (
+        mock.patch.object(admision, "_ahora", return_value=1004.0),
+        CaptureQueriesContext(connection) as q,
+    ):
+        turno = client.get(ticket["consultar"]).json()
+    assert not q.captured_queries
+    assert turno == {"estado": "adelante", "url": URL, "espera_s": 4.0}
+    assert client.get(ticket["consultar"]).status_code == 404
+
+    # el pase deja entrar aunque el bucket siga vacío
+    with mock.patch.object(admision, "_ahora", return_value=1004.0):
+        assert client.get(URL).status_code == 200
+        assert client.get(URL).status_code == 429  # vuelve a hacer fila
+    # el bucket se repone con el tiempo
+    with mock.patch.object(admision, "_ahora", return_value=2000.0):
+        assert admision.tomar_token(user.pk, "*")
+
+
+@override_settings(
+    ADMISION_LIMITES={
+        "*": {"concurrencia": 1, "rafaga": 10, "por_minuto": 60},
+        "7": {"concurrencia": 0},
+    },
+    ADMISION_SONDEO_S=0,
+)
+def test_concurrencia_cola_en_orden_y_metricas(client, django_user_model):
+    admision.entrar("*")  # un request en curso: la carrera "*" está llena
+    _usuario(client, "ana")
+    primero = client.get(URL, HTTP_ACCEPT="application/json").json()
+    _usuario(client, "beto")
+    segundo = client.get(URL, HTTP_ACCEPT="application/json").json()
+    assert (primero["turno"], segundo["turno"]) == (1, 2)
+
+    assert client.get(segundo["consultar"]).json()["estado"] == "esperando"
+    admision.salir("*")
+    assert client.get(segundo["consultar"]).json()["adelante"] == 0  # pasó el primero
+    assert client.get(primero["consultar"]).json()["estado"] == "adelante"
+    # el lugar libre es del primero hasta que llegue: el segundo sigue esperando
+    assert client.get(segundo["consultar"]).json()["estado"] == "esperando"
+
+    # límite propio de la carrera 7 (una de las del estudiante, elegida por parámetro), la
+    # cola de "*" no lo afecta
+    otra = Carrera.objects.create(nombre="Profesorado de Historia", abreviatura="PH")
+    septima = Carrera.objects.create(pk=7, nombre="Profesorado de Letras", abreviatura="PL")
+    _estudiante_de(_usuario(client, "caro"), otra, septima)
+    carrera7 = client.get(URL, {"carrera": 7}, HTTP_ACCEPT="application/json").json()
+    assert carrera7["turno"] == 1
+
+    # un id de carrera ajeno no elige límite ni cola: va a la suya ("*" si no tiene)
+    _usuario(client, "dani")
+    ajena = client.get(URL, {"carrera": 7}, HTTP_ACCEPT="application/json").json()
+    assert ajena["turno"] == 3
+
+    metricas = reverse("ui:api_admision_metricas")
+    assert client.get(metricas, {"carrera": "x"}).status_code == 400
+    datos = client.get(metricas).json()
+    assert datos["*"]["en_cola"] == 2 and datos["*"]["atendidos"] == 1
+    assert datos["*"]["emitidos"] == 3 and datos["*"]["espera_max_s"] >= 0
+    assert datos["7"]["en_cola"] == 1
+
+    client.force_login(django_user_model.objects.create_user("alumno", password="x"))
+    assert client.get(metricas).status_code == 403
+
+
+def test_contadores_en_disco_vencen_con_su_ttl(tmp_path):
+    # la configuración real del alias (FileBasedCache), en un directorio del test
+    disco = {**base_settings.CACHES["admision"], "LOCATION": str(tmp_path)}
+    with override_settings(CACHES={**base_settings.CACHES, "admision": disco}):
+        admision.entrar("*")
+        admision.emitir(1, "*", URL)
+        admision.emitir(2, "*", URL)
+        despues = time.time() + admision.EN_CURSO_TTL + 1
+        with mock.patch("time.time", return_value=despues):
+            datos = admision.metricas(["*"])["*"]
+            admision.salir("*")  # el contador ya venció: no queda en negativo
+            en_curso = admision.metricas(["*"])["*"]["en_curso"]
+    assert datos["en_curso"] == en_curso == 0
+    assert datos["emitidos"] == 2 and datos["en_cola"] == 2  # la cola sigue entera
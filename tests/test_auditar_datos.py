@@ -0,0 +1,140 @@
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from academia_core.management.commands.auditar_datos import CAMPOS_PROMEDIO, Command
+from academia_core.models import (
+    Condicion,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+    Movimiento,
+)
+from academia_core.promedios import recalcular_promedios
+
+
+@pytest.fixture
+def datos(carrera, plan_estudios):
+    Condicion.objects.create(codigo="PROMOCION", nombre="Promoción", tipo="REG")
+    inscs = []
+    for i in range(3):
+        est = Estudiante.objects.create(dni=f"4200000{i}", apellido=f"A{i}", nombre="X")
+        insc = EstudianteProfesorado.objects.create(
+            estudiante=est, carrera=carrera, plan=plan_estudios
+        )
+        for j, nota in enumerate([8, 6]):
+            esp, _ = EspacioCurricular.objects.get_or_create(
+                plan=plan_estudios,
+                materia=Materia.objects.get_or_create(nombre=f"Aud{j}")[0],
+                anio="1°",
+                cuatrimestre="A",
+            )
+            Movimiento.objects.create(
+                inscripcion=insc,
+                espacio=esp,
+                tipo="REG",
+                condicion_id="PROMOCION",
+                fecha=date(2024, 7, 1),
+                nota_num=nota,
+            )
+        inscs.append(insc)
+    # una nota sólo textual y un promedio desincronizado (cargas viejas / bulk)
+    Movimiento.objects.filter(inscripcion=inscs[0], nota_num=6).update(
+        nota_num=None, nota_texto="10 (diez)"
+    )
+    EstudianteProfesorado.objects.filter(pk=inscs[1].pk).update(promedio_general=Decimal("1"))
+    return inscs
+
+
+def _run(*args):
+    out = StringIO()
+    call_command("auditar_datos", *args, "--chunk-size", "2", stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+def test_dry_run_informa_y_no_guarda(datos):
+    out = _run("--dry-run")
+    assert "nota_texto '10 (diez)' -> nota_num 10" in out
+    assert f"inscripción #{datos[1].pk}: promedio 1.00 -> 7.00" in out
+    assert "Dry-run" in out
+    assert Movimiento.objects.filter(nota_num__isnull=True).count() == 1
+    datos[1].refresh_from_db()
+    assert datos[1].promedio_general == Decimal("1")
+
+
+@pytest.mark.django_db
+def test_corrige_notas_y_promedios(datos):
+    out = _run()
+    assert "Notas textuales convertidas -> num: 1" in out
+    assert "filas en" in out
+    for insc in datos:
+        insc.refresh_from_db()
+    assert datos[0].promedio_general == Decimal("9.00")
+    assert datos[1].promedio_general == Decimal("7.00")
+    assert (datos[2].promedio_general, datos[2].cant_notas_aprobadas) == (Decimal("7.00"), 2)
+    # segunda pasada: nada que corregir
+    assert "Promedios corregidos: 0" in _run()
+
+
+@pytest.mark.django_db
+def test_since_limita_a_movimientos_recientes(datos):
+    out = _run("--since", "2999-01-01", "--dry-run")
+    assert "Notas textuales convertidas -> num: 0" in out
+    assert "Promedios corregidos: 0" in out
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cada_bloque_se_confirma_solo(datos):
+    EstudianteProfesorado.objects.update(promedio_general=Decimal("1"))
+    original = Command._guardar
+    llamadas = []
+
+    def guardar(self, model, objs, campos):
+        if model is EstudianteProfesorado:
+            llamadas.append(len(objs))
+            if len(llamadas) == 2:
+                raise RuntimeError("se cortó")
+        return original(self, model, objs, campos)
+
+    with mock.patch.object(Command, "_guardar", guardar), pytest.raises(RuntimeError):
+        _run()
+    # el primer bloque (2 inscripciones) quedó guardado; el segundo no
+    proms = list(EstudianteProfesorado.objects.order_by("pk").values_list("promedio_general"))
+    assert proms == [(Decimal("9.00"),), (Decimal("7.00"),), (Decimal("1"),)]
+
+
+@pytest.mark.django_db
+def test_misma_regla_que_el_recalculo(datos):
+    # notas viejas fuera de --since: la textual de datos[0] sigue sin normalizar
+    Movimiento.objects.update(creado=timezone.make_aware(datetime(2024, 1, 1)))
+    Movimiento.objects.create(
+        inscripcion=datos[0],
+        espacio=EspacioCurricular.objects.create(
+            plan=datos[0].plan, materia=Materia.objects.create(nombre="Aud2"), anio="2°"
+        ),
+        tipo="REG",
+        condicion_id="PROMOCION",
+        fecha=date.today(),
+        nota_num=7,
+    )
+    # un texto fuera de rango: el paso 1 no lo toca, pero igual promedia
+    Movimiento.objects.filter(inscripcion=datos[2], nota_num=6).update(
+        nota_num=None, nota_texto="12"
+    )
+    recalcular_promedios([d.pk for d in datos])
+    esperados = list(EstudianteProfesorado.objects.order_by("pk").values_list(*CAMPOS_PROMEDIO))
+    assert esperados[0][2] == Decimal("8.33")  # (8 + 10 + 7) / 3
+
+    assert "Promedios corregidos: 0" in _run("--since", date.today().isoformat())
+    assert "Promedios corregidos: 0" in _run()
+    assert (
+        list(EstudianteProfesorado.objects.order_by("pk").values_list(*CAMPOS_PROMEDIO))
+        == esperados
+    )
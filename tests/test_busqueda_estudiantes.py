@@ -0,0 +1,126 @@
+import json
+
+import pytest
+from django import forms
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from academia_core.busqueda import EstudianteSelect, buscar_estudiantes
+from academia_core.models import Estudiante
+from ui.api import api_estudiantes_buscar
+
+pytestmark = pytest.mark.django_db
+
+
+def _buscar(user, **params):
+    req = RequestFactory().get("/", params)
+    req.user = user
+    return api_estudiantes_buscar(req)
+
+
+@pytest.fixture
+def alumnos(db):
+    datos = [
+        ("30111222", "Pérez", "Ana"),
+        ("30111333", "Perez", "Bruno"),
+        ("31222444", "Ánchez", "Pérez"),
+        ("40555666", "Gómez", "Ana María"),
+        ("40555777", "Núñez", "José"),
+    ]
+    return [Estudiante.objects.create(dni=d, apellido=a, nombre=n) for d, a, n in datos]
+
+
+def test_save_completa_columnas_normalizadas(alumnos):
+    e = Estudiante.objects.get(dni="40555777")
+    assert (e.apellido_norm, e.nombre_norm) == ("nunez", "jose")
+    e.apellido = "Ñandú"
+    e.save(update_fields=["apellido"])
+    e.refresh_from_db()
+    assert e.apellido_norm == "nandu"
+
+
+def test_sin_acentos_ni_mayusculas(alumnos):
+    dnis = [i["dni"] for i in buscar_estudiantes("PEREZ")["items"]]
+    # apellido Pérez/Perez primero (orden apellido, nombre), después el nombre "Pérez"
+    assert dnis == ["31222444", "30111222", "30111333"]
+    assert [i["dni"] for i in buscar_estudiantes("nuñ")["items"]] == ["40555777"]
+
+
+def test_dni_por_prefijo(alumnos):
+    assert [i["dni"] for i in buscar_estudiantes("40.555")["items"]] == ["40555666", "40555777"]
+    assert buscar_estudiantes("999")["items"] == []
+
+
+def test_apellido_y_nombre_en_cualquier_orden(alumnos):
+    for q in ("ana perez", "perez ana", "Pérez, Ana"):
+        assert [i["dni"] for i in buscar_estudiantes(q)["items"]] == ["30111222"], q
+    assert [i["dni"] for i in buscar_estudiantes("gomez ana ma")["items"]] == ["40555666"]
+
+
+def test_inactivos_solo_con_todos(alumnos):
+    Estudiante.objects.filter(dni="40555777").update(activo=False)
+    assert buscar_estudiantes("nunez")["items"] == []
+    assert len(buscar_estudiantes("nunez", solo_activos=False)["items"]) == 1
+
+
+def test_keyset_sin_repetir_ni_saltear():
+    Estudiante.objects.bulk_create(
+        Estudiante(
+            dni=f"5000{i:04d}",
+            apellido="Lopez",
+            nombre=f"N{i % 7}",
+            apellido_norm="lopez",
+            nombre_norm=f"n{i % 7}",
+        )
+        for i in range(53)
+    )
+    vistos, cursor, paginas = [], None, 0
+    while True:
+        with CaptureQueriesContext(connection) as ctx:
+            pag = buscar_estudiantes("lop", cursor=cursor, limite=10)
+        assert len(ctx.captured_queries) == 1
+        vistos += [i["id"] for i in pag["items"]]
+        paginas += 1
+        cursor = pag["next"]
+        if cursor is None:
+            break
+    assert paginas == 6
+    assert len(vistos) == len(set(vistos)) == 53
+
+
+def test_api(admin_user, alumnos):
+    resp = _buscar(admin_user, q="perez", limit="2")
+    data = json.loads(resp.content)
+    assert resp.status_code == 200
+    assert data["items"][0]["label"] == "Ánchez, Pérez — DNI 31222444"
+    assert data["next"]
+
+    data = json.loads(_buscar(admin_user, q="perez", limit="2", cursor=data["next"]).content)
+    assert [i["dni"] for i in data["items"]] == ["30111333"]
+    assert data["next"] is None
+
+    assert _buscar(admin_user, q="perez", cursor="no-es-un-cursor").status_code == 400
+
+
+def test_api_requiere_login(client):
+    resp = client.get(reverse("ui:api_estudiantes_buscar"), {"q": "perez"})
+    assert resp.status_code == 302
+
+
+def test_widget_solo_renderiza_el_elegido(alumnos):
+    class F(forms.Form):
+        estudiante = forms.ModelChoiceField(
+            queryset=Estudiante.objects.all(), widget=EstudianteSelect()
+        )
+
+    elegido = alumnos[1]
+    html = str(F(initial={"estudiante": elegido.pk})["estudiante"])
+    assert 'data-typeahead="estudiantes"' in html
+    assert reverse("ui:api_estudiantes_buscar") in html
+    assert html.count("<option") == 2
+    assert f'value="{elegido.pk}" selected' in html
+
+    assert str(F()["estudiante"]).count("<option") == 1
+    assert F(data={"estudiante": elegido.pk}).is_valid()
@@ -0,0 +1,133 @@
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from academia_core import versiones
+from academia_core.models import Carrera, Docente, DocenteEspacio, EspacioCurricular, Materia
+from academia_horarios.models import TurnoModel
+from ui import cache_respuestas
+
+pytestmark = pytest.mark.django_db
+
+
+def test_hit_etag_y_304(client, carrera):
+    url = reverse("ui:api_carreras")
+    primera = client.get(url)
+    assert primera.json() == {"results": [{"id": carrera.pk, "nombre": carrera.nombre}]}
+    etag = primera["ETag"]
+    assert etag.startswith('"') and primera["Cache-Control"] == "private, no-cache"
+
+    with CaptureQueriesContext(connection) as q:
+        segunda = client.get(url)
+        no_cambio = client.get(url, HTTP_IF_NONE_MATCH=f'"otro", W/{etag}')
+    assert len(q.captured_queries) == 0
+    assert segunda.content == primera.content and segunda["ETag"] == etag
+    assert no_cambio.status_code == 304 and no_cambio["ETag"] == etag and not no_cambio.content
+    assert cache_respuestas.estadisticas() == {"api_carreras": {"hit": 2, "miss": 1, "304": 1}}
+
+    assert client.get(url, HTTP_IF_NONE_MATCH='"otro"').status_code == 200
+    assert client.post(url).status_code == 405
+
+
+def test_guardar_o_borrar_invalida(client, plan_estudios):
+    url = reverse("ui:api_carreras")
+    etag = client.get(url)["ETag"]
+    otra = Carrera.objects.create(nombre="Prof. de Historia", abreviatura="PH")
+    resp = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200 and len(resp.json()["results"]) == 2
+    otra.delete()
+    assert client.get(url)["ETag"] == etag  # mismo contenido, mismo ETag
+
+    planes = reverse("ui:api_planes")
+    assert client.get(planes, {"carrera": plan_estudios.carrera_id}).json()["results"]
+    assert client.get(planes).json() == {"results": []}  # otra query string, otra entrada
+    plan_estudios.vigente = False
+    plan_estudios.save()
+    assert client.get(planes, {"carrera": plan_estudios.carrera_id}).json() == {"results": []}
+
+
+def test_docentes_y_materias_siguen_sus_tablas(client, plan_estudios):
+    esp = EspacioCurricular.objects.create(
+        plan=plan_estudios,
+        materia=Materia.objects.create(nombre="Álgebra"),
+        anio="1°",
+        cuatrimestre="A",
+    )
+    params = {"carrera": plan_estudios.carrera_id, "materia": esp.pk}
+    url = reverse("ui:api_docentes")
+    assert client.get(url, params).json() == {"results": []}
+    doc = Docente.objects.create(dni="20000000", apellido="Pérez", nombre="Ana")
+    assert len(client.get(url).json()["results"]) == 1
+    DocenteEspacio.objects.create(docente=doc, espacio=esp)
+    assert client.get(url, params).json() == {"results": [{"id": doc.pk, "nombre": "Pérez, Ana"}]}
+
+    url = reverse("ui:api_materias")
+    assert (
+        client.get(url, {"plan_id": plan_estudios.pk}).json()["results"][0]["nombre"] == "Álgebra"
+    )
+    Materia.objects.filter(pk=esp.materia_id).update(nombre="Álgebra I")
+    versiones.invalidar("academia_core.Materia")  # update() no dispara señales
+    assert client.get(url, {"plan_id": plan_estudios.pk}).json()["results"][0]["nombre"] == (
+        "Álgebra I"
+    )
+    assert client.get(url).status_code == 400
+
+
+def test_turnos_grilla_y_cohortes(client, admin_user):
+    turnos = reverse("ui:api_turnos")
+    assert client.get(turnos).json() == {"turnos": []}
+    TurnoModel.objects.create(nombre="Mañana", slug="manana")
+    assert client.get(turnos).json() == {"turnos": [{"value": "manana", "label": "Mañana"}]}
+
+    grilla = reverse("ui:api_grilla_config")
+    assert client.get(grilla, {"turno": "manana"}).json()["rows"]
+    assert client.get(grilla, {"turno": "manana"}).json()["rows"]
+
+    cohortes = reverse("ui:api_cohortes")
+    assert client.get(cohortes).status_code == 302  # login antes que el cache
+    client.force_login(admin_user)
+    items = client.get(cohortes, {"start": 2020, "end": 2021}).json()["items"]
+    assert items == [{"id": 2020, "label": "2020"}, {"id": 2021, "label": "2021"}]
+    stats = cache_respuestas.estadisticas()
+    assert stats["api_grilla_config"]["hit"] == 1 and stats["api_cohortes_por_plan"]["miss"] == 1
+
+
+def test_backend_en_disco(client, carrera, tmp_path):
+    disco = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "compartido": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "versiones"),
+        },
+        "respuestas": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "respuestas"),
+        },
+    }
+    with override_settings(CACHES=disco):
+        url = reverse("ui:api_carreras")
+        antes = versiones.de("academia_core.Carrera")
+        etag = client.get(url)["ETag"]
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        carrera.nombre = "Otro nombre"
+        carrera.save()
+        assert versiones.de("academia_core.Carrera") != antes
+        assert client.get(url).json()["results"][0]["nombre"] == "Otro nombre"
+        assert any(tmp_path.iterdir())
+
+
+def test_version_de_tabla_compartida_entre_procesos(client, carrera):
+    url = reverse("ui:api_carreras")
+    assert client.get(url).json()["results"][0]["nombre"] == carrera.nombre
+    Carrera.objects.filter(pk=carrera.pk).update(nombre="Otro nombre")  # sin señales
+    # la señal de otro worker sube la versión en el cache compartido: este proceso la ve
+    caches["compartido"].incr("version:academia_core.carrera")
+    assert client.get(url).json()["results"][0]["nombre"] == "Otro nombre"
+
+
+def test_tablas_desconocidas():
+    with pytest.raises(ValueError):
+        cache_respuestas.cacheada("academia_core.Estudiante")
@@ -0,0 +1,213 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from academia_core import carton
+from academia_core.actas import cargar_acta
+from academia_core.models import (
+    CartonFila,
+    Condicion,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    InscripcionFinal,
+    Materia,
+    Movimiento,
+)
+
+# transaction=True: el cartón se recalcula en on_commit, como en producción
+pytestmark = pytest.mark.django_db(transaction=True)
+
+DOCS = dict(
+    doc_dni_legalizado=True,
+    doc_cert_medico=True,
+    doc_fotos_carnet=True,
+    doc_folios_oficio=True,
+    doc_titulo_sec_legalizado=True,
+)
+
+
+@pytest.fixture
+def condiciones(db):
+    for c, t in [
+        ("REGULAR", "REG"),
+        ("PROMOCION", "REG"),
+        ("LIBRE", "REG"),
+        ("FINAL_APROBADO", "FIN"),
+    ]:
+        Condicion.objects.create(codigo=c, nombre=c.title(), tipo=t)
+
+
+@pytest.fixture
+def espacios(plan_estudios):
+    return [
+        EspacioCurricular.objects.create(
+            plan=plan_estudios,
+            materia=Materia.objects.create(nombre=n),
+            anio="1°",
+            cuatrimestre="A",
+        )
+        for n in ("Álgebra", "Geometría", "Lógica")
+    ]
+
+
+@pytest.fixture
+def insc(plan_estudios):
+    est = Estudiante.objects.create(dni="40111222", apellido="Pérez", nombre="Ana")
+    return EstudianteProfesorado.objects.create(
+        estudiante=est, carrera=plan_estudios.carrera, plan=plan_estudios, **DOCS
+    )
+
+
+HOY = date.today()
+
+
+def hace(dias):
+    return HOY - timedelta(days=dias)
+
+
+def _fila(insc, esp):
+    return CartonFila.objects.filter(inscripcion=insc, espacio=esp).first()
+
+
+def _como_tuplas():
+    return sorted(
+        CartonFila.objects.values_list("inscripcion_id", "espacio_id", *carton.CAMPOS[:-1])
+    )
+
+
+def test_movimientos_actualizan_su_par(condiciones, espacios, insc):
+    a, b, _c = espacios
+    InscripcionEspacio.objects.create(inscripcion=insc, espacio=a, anio_academico=2023)
+    assert _fila(insc, a).estado == "CURSANDO" and _fila(insc, a).anio_cursada == 2023
+
+    reg = Movimiento.objects.create(
+        inscripcion=insc, espacio=a, tipo="REG", condicion_id="REGULAR", fecha=hace(300)
+    )
+    f = _fila(insc, a)
+    assert f.estado == "REGULAR" and f.regular_hasta == hace(300) + timedelta(days=730)
+
+    Movimiento.objects.create(
+        inscripcion=insc,
+        espacio=a,
+        tipo="FIN",
+        condicion_id="REGULAR",
+        fecha=hace(200),
+        nota_num=2,
+    )
+    Movimiento.objects.create(
+        inscripcion=insc,
+        espacio=a,
+        tipo="FIN",
+        condicion_id="REGULAR",
+        fecha=hace(100),
+        nota_num=8,
+    )
+    f = _fila(insc, a)
+    assert f.estado == "APROBADA" and f.nota == Decimal("8.0")
+    assert f.fecha_aprobacion == hace(100)
+    assert f.intentos_final == 2 and f.ultimo_final == hace(100)
+
+    # mover la regularidad a otro espacio recalcula los dos pares
+    reg.espacio = b
+    reg.save()
+    assert _fila(insc, a).regular_hasta is None
+    assert _fila(insc, b).estado == "REGULAR"
+    reg.delete()
+    assert _fila(insc, b) is None
+
+
+def test_mesas_finales(condiciones, espacios, insc):
+    a, _b, _c = espacios
+    cursada = InscripcionEspacio.objects.create(inscripcion=insc, espacio=a, anio_academico=2023)
+    Movimiento.objects.create(
+        inscripcion=insc, espacio=a, tipo="REG", condicion_id="REGULAR", fecha=hace(300)
+    )
+    InscripcionFinal.objects.create(
+        inscripcion_cursada=cursada, fecha_examen=hace(200), ausente=True
+    )
+    mesa = InscripcionFinal.objects.create(inscripcion_cursada=cursada, fecha_examen=hace(100))
+    f = _fila(insc, a)
+    assert f.estado == "REGULAR" and f.intentos_final == 1
+    assert f.mesa_inscripta == hace(100)
+
+    mesa.estado, mesa.nota_final = "APROBADO", 9
+    mesa.save()
+    f = _fila(insc, a)
+    assert f.estado == "APROBADA" and f.nota == 9 and f.intentos_final == 2
+    assert f.mesa_inscripta is None
+
+    cursada.delete()
+    assert _fila(insc, a).estado == "REGULAR"
+
+
+def test_acta_masiva_actualiza_el_carton(condiciones, espacios, insc):
+    a, _b, _c = espacios
+    res = cargar_acta(
+        a.pk,
+        "REG",
+        date(2025, 7, 10),
+        [{"inscripcion": insc.pk, "nota": 9, "condicion": "PROMOCION"}],
+    )
+    assert res.ok
+    f = _fila(insc, a)
+    assert f.estado == "APROBADA" and f.nota == 9
+
+
+def test_reconstruir_coincide_con_lo_incremental(condiciones, espacios, insc):
+    a, b, c = espacios
+    InscripcionEspacio.objects.create(inscripcion=insc, espacio=c, anio_academico=2025)
+    cursada = InscripcionEspacio.objects.create(inscripcion=insc, espacio=a, anio_academico=2023)
+    Movimiento.objects.create(
+        inscripcion=insc, espacio=a, tipo="REG", condicion_id="REGULAR", fecha=hace(300)
+    )
+    InscripcionFinal.objects.create(
+        inscripcion_cursada=cursada, fecha_examen=hace(100), estado="DESAPROBADO"
+    )
+    Movimiento.objects.create(
+        inscripcion=insc, espacio=b, tipo="REG", condicion_id="LIBRE", fecha=hace(50)
+    )
+    incremental = _como_tuplas()
+    assert [t[2] for t in incremental] == ["REGULAR", "LIBRE", "CURSANDO"]
+
+    CartonFila.objects.all().delete()
+    out = StringIO()
+    call_command("reconstruir_carton", lote=1, stdout=out)
+    assert out.getvalue().startswith("1 inscripciones, 3 filas")
+    assert _como_tuplas() == incremental
+
+
+def test_vista_y_api_leen_con_una_query(client, condiciones, espacios, insc):
+    for esp in espacios:
+        Movimiento.objects.create(
+            inscripcion=insc,
+            espacio=esp,
+            tipo="REG",
+            condicion_id="REGULAR",
+            fecha=hace(50),
+        )
+    user = get_user_model().objects.create_user("ana", password="x")
+    user.groups.add(Group.objects.create(name="Estudiante"))
+    user.perfil.estudiante = insc.estudiante
+    user.perfil.save()
+    client.force_login(user)
+
+    otro = Estudiante.objects.create(dni="40999888", apellido="Otro", nombre="B")
+    with CaptureQueriesContext(connection) as q:
+        r = client.get(reverse("ui:api_carton"), {"est": otro.pk})  # ?est= se ignora
+    (grupo,) = r.json()["carreras"]
+    assert grupo["totales"]["REGULAR"] == 3
+    assert {f["nombre"] for f in grupo["filas"]} == {"Álgebra", "Geometría", "Lógica"}
+    assert len([x for x in q.captured_queries if "academia_core_cartonfila" in x["sql"]]) == 1
+
+    r = client.get(reverse("ui:carton_estudiante"))
+    assert r.status_code == 200 and "Geometría" in r.content.decode()
@@ -0,0 +1,180 @@
+import json
+from datetime import date, time
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from academia_core.models import Docente
+from academia_horarios.conflictos import (
+    AULA,
+    COHORTE,
+    DOCENTE,
+    Franja,
+    detectar_conflictos,
+)
+from academia_horarios.models import (
+    Catedra,
+    DocenteAsignacion,
+    Horario,
+    HorarioClase,
+    TimeSlot,
+)
+from academia_horarios.services import asignar_docente_a_comision, conflictos_docente_en_comision
+from ui.views_api import api_horario_save
+
+
+def _f(ini, fin, *recursos, dia=1, ref=()):
+    return Franja(dia=dia, inicio=ini, fin=fin, recursos=frozenset(recursos), ref=ref)
+
+
+def test_detecta_todos_los_solapamientos_por_recurso_y_dia():
+    doc = (DOCENTE, 1)
+    existentes = [_f(0, 40, doc, ref=("e", 1)), _f(30, 120, doc, ref=("e", 2))]
+    nuevas = [
+        _f(35, 50, doc, ref=("n", 1)),  # pisa ambos
+        _f(120, 160, doc, ref=("n", 2)),  # sólo toca el borde: no choca
+        _f(35, 50, doc, dia=2, ref=("n", 3)),  # otro día
+        _f(35, 50, (DOCENTE, 2), ref=("n", 4)),  # otro docente
+    ]
+    pares = {(c.nueva.ref, c.existente.ref) for c in detectar_conflictos(nuevas, existentes)}
+    assert pares == {(("n", 1), ("e", 1)), (("n", 1), ("e", 2))}
+
+
+def test_entre_nuevas_y_varios_recursos():
+    a = _f(0, 60, (DOCENTE, 1), (AULA, "a1"), ref=("n", 1))
+    b = _f(30, 90, (AULA, "a1"), ref=("n", 2))
+    assert detectar_conflictos([a, b], []) == []
+    (c,) = detectar_conflictos([a, b], [], entre_nuevas=True)
+    assert c.tipo == AULA and {c.nueva.ref, c.existente.ref} == {("n", 1), ("n", 2)}
+    assert c.as_dict()["mensaje"].startswith("Conflicto el Lunes")
+
+
+def _asignar(comision, docente, turno):
+    catedra = Catedra.objects.create(
+        materia_en_plan=comision.materia_en_plan, comision=comision, turno=turno, horas_semanales=2
+    )
+    DocenteAsignacion.objects.create(
+        catedra=catedra, docente=docente, condicion="INTERINO", fecha_desde=date(2025, 3, 1)
+    )
+
+
+@pytest.mark.django_db
+def test_horarioclase_clean_cohorte_y_aula(oferta):
+    _periodo, _turno, (c1, c2, c3), (s1, s2, s3) = oferta
+    HorarioClase.objects.create(comision=c1, timeslot=s1, aula="Aula 5")
+
+    # mismo profesorado + año, bloque que se solapa (aunque no sea el mismo TimeSlot)
+    with pytest.raises(ValidationError) as e:
+        HorarioClase(comision=c2, timeslot=s2).clean()
+    assert "timeslot" in e.value.message_dict
+
+    # otro año pero misma aula
+    with pytest.raises(ValidationError) as e:
+        HorarioClase(comision=c3, timeslot=s2, aula="aula  5").clean()
+    assert "aula" in e.value.message_dict
+
+    # bloque contiguo: sin choque
+    HorarioClase(comision=c2, timeslot=s3).clean()
+
+    # fuera de los bordes de 40' del turno (la misma regla que la grilla completa)
+    corrido = TimeSlot.objects.create(dia_semana=2, inicio=time(8, 5), fin=time(8, 45))
+    with pytest.raises(ValidationError) as e:
+        HorarioClase(comision=c2, timeslot=corrido).clean()
+    assert "bloques de 40'" in e.value.message_dict["timeslot"][0]
+
+
+@pytest.mark.django_db
+def test_asignar_docente_reporta_choques_en_queries_fijas(oferta):
+    _periodo, turno, (c1, _c2, c3), (s1, s2, s3) = oferta
+    doc = Docente.objects.create(dni="30111222", apellido="Lopez", nombre="Ana")
+    HorarioClase.objects.create(comision=c1, timeslot=s1)
+    _asignar(c1, doc, turno)
+    HorarioClase.objects.create(comision=c3, timeslot=s2)
+    HorarioClase.objects.create(comision=c3, timeslot=s3)
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert len(conflictos_docente_en_comision(c3, doc)) == 1
+    assert len(ctx.captured_queries) <= 4
+
+    with pytest.raises(ValidationError) as e:
+        asignar_docente_a_comision(c3, doc)
+    assert e.value.code == "conflicto_docente"
+    (conf,) = e.value.params["conflictos"]
+    assert conf["tipo"] == DOCENTE and conf["existente"]["comision_id"] == c1.id
+    assert not Catedra.objects.filter(comision=c3).exists()  # nada a medias
+
+
+@pytest.mark.django_db
+def test_asignar_docente_sin_choque_crea_la_asignacion(oferta):
+    _periodo, turno, (c1, c2, c3), (s1, _s2, s3) = oferta
+    doc = Docente.objects.create(dni="30111444", apellido="Paz", nombre="Sol")
+    HorarioClase.objects.create(comision=c1, timeslot=s1)
+    _asignar(c1, doc, turno)
+    HorarioClase.objects.create(comision=c2, timeslot=s3)  # contiguo: no choca
+
+    asignacion = asignar_docente_a_comision(c2, doc, fecha_desde=date(2025, 3, 1))
+    assert asignacion.pk and asignacion.activa and asignacion.docente_id == doc.pk
+    assert asignacion.catedra.comision_id == c2.pk and asignacion.catedra.turno == turno
+    assert asignar_docente_a_comision(c2.pk, doc.pk) == asignacion  # reintento
+    assert DocenteAsignacion.objects.filter(catedra__comision=c2).count() == 1
+    # ahora cuenta como ocupado para el docente
+    HorarioClase.objects.create(comision=c3, timeslot=s3)
+    assert conflictos_docente_en_comision(c3, doc)
+
+
+@pytest.mark.django_db
+def test_api_horario_save_rechaza_docente_ocupado(carrera, plan_estudios, oferta):
+    _periodo, _turno, (c1, c2, _c3), _slots = oferta
+    doc = Docente.objects.create(dni="30111333", apellido="Ruiz", nombre="Leo")
+    otro = c2.materia_en_plan
+    Horario.objects.create(
+        materia=otro.materia,
+        plan=plan_estudios,
+        profesorado=carrera,
+        anio=3,
+        comision="B",
+        docente=doc,
+        dia="lu",
+        inicio=time(8, 0),
+        fin=time(8, 40),
+        turno="manana",
+    )
+    payload = {
+        "materia_id": c1.materia_en_plan.materia_id,
+        "plan_id": plan_estudios.id,
+        "profesorado_id": carrera.id,
+        "periodo_id": c1.periodo_id,
+        "turno": "manana",
+        "comision_id": c1.id,
+        "items": [{"dia": "lu", "inicio": "07:45", "fin": "08:25", "docente_id": doc.id}],
+    }
+
+    def post(data):
+        req = RequestFactory().post("/", json.dumps(data), content_type="application/json")
+        return api_horario_save(req)
+
+    resp = post(payload)
+    assert resp.status_code == 400
+    body = json.loads(resp.content)
+    assert [c["tipo"] for c in body["conflictos"]] == [DOCENTE]
+
+    # mismo curso (año 1, comisión A): también choca aunque sea otro docente
+    payload["items"] = [{"dia": "lu", "inicio": "08:40", "fin": "09:20"}]
+    Horario.objects.create(
+        materia=otro.materia,
+        plan=plan_estudios,
+        profesorado=carrera,
+        anio=1,
+        comision="A",
+        dia="lu",
+        inicio=time(9, 0),
+        fin=time(9, 40),
+    )
+    body = json.loads(post(payload).content)
+    assert [c["tipo"] for c in body["conflictos"]] == [COHORTE]
+
+    payload["items"] = [{"dia": "lu", "inicio": "10:00", "fin": "10:40", "docente_id": doc.id}]
+    assert post(payload).status_code == 200
@@ -0,0 +1,110 @@
+import json
+import logging
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+
+from academia_core.consultas import Medicion, PresupuestoExcedido, forma, ranking
+from academia_core.models import Carrera, Estudiante
+from academia_horarios.models import Periodo
+
+pytestmark = pytest.mark.django_db
+
+
+def test_forma_ignora_parametros_y_largo_de_listas():
+    a = forma("SELECT \"x\" FROM t WHERE id IN (%s, %s, %s) AND n = 3 AND s = 'a'")
+    b = forma("SELECT \"x\"   FROM t WHERE id IN (%s, %s) AND n = 10 AND s = 'otro'")
+    assert a == b == 'SELECT "x" FROM t WHERE id IN (%s…) AND n = ? AND s = ?'
+
+
+def test_medicion_detecta_n_mas_1():
+    med = Medicion()
+    with connection.execute_wrapper(med):
+        for i in range(12):
+            Estudiante.objects.filter(pk=i).first()
+        Estudiante.objects.count()
+    assert med.consultas == 13 and med.db_ms > 0
+    ((sql, n),) = med.repetidas(10)
+    assert n == 12 and sql.startswith('SELECT "academia_core_estudiante"')
+
+
+def test_middleware_server_timing_y_log(client, admin_user, caplog):
+    client.force_login(admin_user)
+    with caplog.at_level(logging.INFO, logger="academia_core.consultas"):
+        r = client.get(reverse("ui:cargar_acta"))
+    assert r.status_code == 200
+    assert r["Server-Timing"].startswith("db;dur=")
+    (reg,) = [json.loads(rec.getMessage()) for rec in caplog.records]
+    assert reg["vista"] == "ui:cargar_acta" and reg["status"] == 200
+    assert reg["consultas"] >= 1 and reg["repetidas"] == []
+
+
+def test_server_timing_solo_si_se_pide(client, admin_user, caplog):
+    client.force_login(admin_user)
+    with override_settings(SERVER_TIMING=False):
+        with caplog.at_level(logging.INFO, logger="academia_core.consultas"):
+            r = client.get(reverse("ui:cargar_acta"))
+    assert r.status_code == 200 and "Server-Timing" not in r
+    assert len(caplog.records) == 1
+
+
+@pytest.mark.parametrize("n", [1, 10])
+def test_panel_y_correlatividades_dentro_del_presupuesto(client, admin_user, n):
+    # Las consultas no crecen con la cantidad de carreras y períodos (settings_test)
+    carreras = [Carrera.objects.create(nombre=f"Carrera {i}") for i in range(n)]
+    for i in range(n):
+        Periodo.objects.create(ciclo_lectivo=2020 + i, cuatrimestre=1)
+    client.force_login(admin_user)
+    urls = [
+        reverse("ui:correlatividades"),
+        reverse("ui:gestionar_comisiones"),
+        reverse("ui:horarios_profesorado"),
+        reverse("ui:horarios_docente"),
+        reverse("academia_horarios:cargar_horario"),
+        reverse("academia_horarios:api_timeslots") + "?turno=tarde",
+        reverse("academia_horarios:api_planes") + f"?carrera={carreras[0].pk}",
+    ]
+    for url in urls:
+        assert client.get(url).status_code == 200, url
+
+
+def test_presupuesto_excedido_falla_en_tests(client, admin_user):
+    client.force_login(admin_user)
+    with override_settings(PRESUPUESTO_CONSULTAS={"ui:cargar_acta": 0}):
+        with pytest.raises(PresupuestoExcedido, match="ui:cargar_acta"):
+            client.get(reverse("ui:cargar_acta"))
+    with override_settings(PRESUPUESTO_CONSULTAS_ESTRICTO=False):
+        with override_settings(PRESUPUESTO_CONSULTAS={"ui:cargar_acta": 0}):
+            assert client.get(reverse("ui:cargar_acta")).status_code == 200
+
+
+def _reg(vista, consultas, repetidas=()):
+    return {
+        "vista": vista,
+        "consultas": consultas,
+        "db_ms": consultas * 0.5,
+        "repetidas": [{"n": n, "sql": "SELECT ?"} for n in repetidas],
+    }
+
+
+def test_ranking_y_reporte(tmp_path):
+    regs = [_reg("a", 5), _reg("a", 7), _reg("b", 40, [30]), _reg("c", 2)]
+    filas = ranking(regs)
+    assert [f["vista"] for f in filas] == ["b", "a", "c"]
+    assert filas[1]["prom_consultas"] == 6 and filas[1]["max"] == 7
+    assert filas[0]["n_mas_1"] == 1 and filas[0]["peor"]["n"] == 30
+
+    log = tmp_path / "consultas.log"
+    (tmp_path / "consultas.log.1").write_text(json.dumps(_reg("viejo", 99)) + "\n")
+    log.write_text("basura\n" + "".join(json.dumps(r) + "\n" for r in regs))
+    out = StringIO()
+    call_command("reporte_consultas", archivo=str(log), ultimos=4, top=2, stdout=out)
+    salida = out.getvalue()
+    assert salida.startswith("4 requests")
+    assert "viejo" not in salida and "30× SELECT ?" in salida
+    assert salida.index("\nb ") < salida.index("\na ")
+    assert "\nc " not in salida
@@ -0,0 +1,67 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from academia_core.models import EspacioCurricular, Materia, PlanEstudios
+from ui import descubrimiento
+
+pytestmark = pytest.mark.django_db
+
+
+def test_registro_resuelto_al_arrancar():
+    planes, espacios = descubrimiento.PLANES, descubrimiento.ESPACIOS
+    assert planes.model is PlanEstudios and planes.fk == "carrera_id"
+    assert planes.etiquetas == ("nombre", "resolucion")
+    assert espacios.model is EspacioCurricular and espacios.fk == "plan_id"
+    assert espacios.etiquetas == ("materia__nombre",)  # EspacioCurricular.nombre es property
+    with pytest.raises(AttributeError):
+        planes.fk = "otro"
+
+
+def test_endpoints_sin_heuristicas_y_una_query(client, admin_user, plan_estudios):
+    sin_nombre = PlanEstudios.objects.create(
+        carrera=plan_estudios.carrera, resolucion="77/2020", vigente=False
+    )
+    for n in ("Álgebra", "Geometría"):
+        EspacioCurricular.objects.create(
+            plan=plan_estudios,
+            materia=Materia.objects.create(nombre=n),
+            anio="1°",
+            cuatrimestre="A",
+        )
+    client.force_login(admin_user)
+    client.get(reverse("ui:dashboard"))  # sesión y grupos ya cacheados
+
+    with (
+        mock.patch("django.apps.apps.get_models", side_effect=AssertionError),
+        CaptureQueriesContext(connection) as q,
+    ):
+        planes = client.get(
+            reverse("academia_horarios:api_planes"), {"carrera": plan_estudios.carrera_id}
+        )
+        materias = client.get(reverse("ui:api_materias_por_plan"), {"plan_id": plan_estudios.pk})
+    assert planes.json() == {
+        "planes": [
+            {"id": plan_estudios.pk, "nombre": "Plan 2025"},
+            {"id": sin_nombre.pk, "nombre": "77/2020"},
+        ]
+    }
+    assert [it["label"] for it in materias.json()["items"]] == ["Álgebra", "Geometría"]
+    datos = [x["sql"] for x in q.captured_queries if "django_session" not in x["sql"]]
+    datos = [sql for sql in datos if "auth_user" not in sql]
+    assert len(datos) == 2
+
+    assert client.get(reverse("ui:api_materias_por_plan"), {"plan_id": "x"}).status_code == 400
+
+
+def test_benchmark():
+    out = StringIO()
+    call_command("medir_selects", espacios=5, repeticiones=2, stdout=out)
+    lineas = out.getvalue().splitlines()
+    assert [linea.split()[0] for linea in lineas[2:]] == ["descubrimiento", "planes", "materias"]
+    assert not EspacioCurricular.objects.exists()
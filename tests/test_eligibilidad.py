@@ -0,0 +1,159 @@
+from datetime import date
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from academia_core import enlaces_eligibilidad
+from academia_core.eligibilidad import estado_sets_para_estudiante, evaluar_plan, habilitado
+from academia_core.models import (
+    Correlatividad,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    InscripcionFinal,
+    Materia,
+)
+from academia_core.views_api import api_espacios_habilitados
+
+
+def _mk_plan_espacios(plan, n):
+    espacios = []
+    for i in range(n):
+        mat = Materia.objects.create(nombre=f"Materia {i:02d}")
+        espacios.append(
+            EspacioCurricular.objects.create(
+                plan=plan, materia=mat, anio=f"{i % 4 + 1}°", cuatrimestre="A"
+            )
+        )
+    # cada espacio de 2° en adelante pide regularizada la anterior
+    for prev, esp in zip(espacios, espacios[1:], strict=False):
+        Correlatividad.objects.create(
+            plan=plan,
+            espacio=esp,
+            tipo="CURSAR",
+            requisito="REGULARIZADA",
+            requiere_espacio=prev,
+        )
+    # y el último pide todo 1° año aprobado
+    Correlatividad.objects.create(
+        plan=plan,
+        espacio=espacios[-1],
+        tipo="CURSAR",
+        requisito="APROBADA",
+        requiere_todos_hasta_anio=1,
+    )
+    return espacios
+
+
+def _queries_habilitados(plan, est):
+    req = RequestFactory().get("/", {"est": est.id, "plan": plan.id})
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api_espacios_habilitados(req)
+    assert resp.status_code == 200
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_evaluar_plan_bloquea_por_correlativas(plan_estudios):
+    est = Estudiante.objects.create(dni="1", apellido="Perez", nombre="Ana")
+    espacios = _mk_plan_espacios(plan_estudios, 5)
+
+    estado = evaluar_plan(est.id, plan_estudios.id)
+
+    assert estado[espacios[0].id] == (True, None)
+    ok, info = estado[espacios[1].id]
+    assert not ok
+    assert info["faltantes"] == [
+        {"tipo": "CURSAR", "requisito": "REGULARIZADA", "requiere_espacio_id": espacios[0].id}
+    ]
+    ok, info = estado[espacios[-1].id]
+    assert {"tipo": "CURSAR", "requisito": "APROBADA", "requiere_todos_hasta_anio": 1} in info[
+        "faltantes"
+    ]
+    # habilitado() conserva la misma respuesta que el evaluador por plan
+    assert habilitado(est.id, plan_estudios.id, espacios[1]) == estado[espacios[1].id]
+
+
+@pytest.mark.django_db
+def test_api_espacios_habilitados_queries_no_crecen_con_el_plan(carrera):
+    from academia_core.models import PlanEstudios
+
+    est = Estudiante.objects.create(dni="2", apellido="Gomez", nombre="Luis")
+    chico = PlanEstudios.objects.create(carrera=carrera, resolucion="1/2020", vigente=False)
+    grande = PlanEstudios.objects.create(carrera=carrera, resolucion="2/2020", vigente=False)
+    _mk_plan_espacios(chico, 5)
+    _mk_plan_espacios(grande, 40)
+
+    n_chico = _queries_habilitados(chico, est)
+    n_grande = _queries_habilitados(grande, est)
+
+    assert n_chico == n_grande
+    assert n_grande <= 8
+
+
+def test_enlaces_resueltos_al_arrancar():
+    e = enlaces_eligibilidad.enlaces()
+    assert not e["aprobadas"].activo and "ResultadoFinal" in e["aprobadas"].motivo
+    cursada = e["inscriptas_cursada"]
+    assert (cursada.estudiante, cursada.espacio, cursada.plan, cursada.ciclo) == (
+        "inscripcion__estudiante_id",
+        "espacio_id",
+        "espacio__plan_id",
+        "anio_academico",
+    )
+    assert e["inscriptas_final"].estudiante == "inscripcion_cursada__inscripcion__estudiante_id"
+
+
+@pytest.mark.django_db
+def test_estado_sets_sin_introspeccion_y_queries_fijas(carrera, plan_estudios, monkeypatch):
+    est = Estudiante.objects.create(dni="3", apellido="Ruiz", nombre="Eva")
+    insc = EstudianteProfesorado.objects.create(estudiante=est, carrera=carrera, plan=plan_estudios)
+    e1, e2, e3 = _mk_plan_espacios(plan_estudios, 3)
+    anio = date.today().year
+    cursa = InscripcionEspacio.objects.create(inscripcion=insc, espacio=e1, anio_academico=anio)
+    InscripcionEspacio.objects.create(
+        inscripcion=insc, espacio=e2, anio_academico=anio, estado="BAJA", fecha_baja=date.today()
+    )
+    InscripcionFinal.objects.create(inscripcion_cursada=cursa, fecha_examen=date(anio, 12, 1))
+
+    def no_introspectar(*a, **kw):
+        raise AssertionError("introspección en el request")
+
+    monkeypatch.setattr(enlaces_eligibilidad, "_camino_a", no_introspectar)
+    monkeypatch.setattr(enlaces_eligibilidad, "_campos", no_introspectar)
+    with CaptureQueriesContext(connection) as ctx:
+        aprob, regs, curs, final = estado_sets_para_estudiante(est.id, plan_estudios.id)
+    assert len(ctx.captured_queries) == 2  # UNION de inscripciones + snapshot
+
+    assert curs == {e1.id}  # la baja no cuenta
+    assert final == {e1.id}
+    assert estado_sets_para_estudiante(est.id, plan_estudios.id, ciclo=anio - 1)[2] == set()
+    assert evaluar_plan(est.id, plan_estudios.id, [e1])[e1.id] == (False, "ya_inscripto")
+    assert e3.id not in curs
+
+
+@pytest.mark.django_db
+def test_cursada_de_otro_anio_no_bloquea_la_reinscripcion(carrera, plan_estudios):
+    est = Estudiante.objects.create(dni="4", apellido="Paz", nombre="Ana")
+    insc = EstudianteProfesorado.objects.create(estudiante=est, carrera=carrera, plan=plan_estudios)
+    (e1,) = _mk_plan_espacios(plan_estudios, 1)
+    anio = date.today().year
+    InscripcionEspacio.objects.create(inscripcion=insc, espacio=e1, anio_academico=anio - 1)
+
+    # sin ciclo explícito vale el año en curso, no cualquier cursada histórica
+    assert estado_sets_para_estudiante(est.id, plan_estudios.id)[2] == set()
+    assert evaluar_plan(est.id, plan_estudios.id, [e1])[e1.id] == (True, None)
+    assert estado_sets_para_estudiante(est.id, plan_estudios.id, ciclo=anio - 1)[2] == {e1.id}
+
+
+def test_comando_eligibilidad_enlaces():
+    out = StringIO()
+    call_command("eligibilidad_enlaces", stdout=out)
+    texto = out.getvalue()
+    assert "inscriptas_cursada: academia_core.InscripcionEspacio" in texto
+    assert "aprobadas: — NO SE USA" in texto
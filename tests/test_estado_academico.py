@@ -0,0 +1,106 @@
+from datetime import date
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from academia_core.eligibilidad import evaluar_plan
+from academia_core.estado_academico import StudentAcademicSnapshot
+from academia_core.models import (
+    Condicion,
+    Correlatividad,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+    Movimiento,
+)
+
+
+@pytest.fixture
+def escenario(carrera, plan_estudios):
+    conds = {
+        c: Condicion.objects.create(codigo=c, nombre=c.title(), tipo=t)
+        for c, t in [("REGULAR", "REG"), ("PROMOCION", "REG"), ("LIBRE", "REG")]
+    }
+    esp = [
+        EspacioCurricular.objects.create(
+            plan=plan_estudios,
+            materia=Materia.objects.create(nombre=f"M{i}"),
+            anio="1°",
+            cuatrimestre="A",
+        )
+        for i in range(4)
+    ]
+    est = Estudiante.objects.create(dni="40000000", apellido="Diaz", nombre="Sol")
+    insc = EstudianteProfesorado.objects.create(estudiante=est, carrera=carrera, plan=plan_estudios)
+    Movimiento.objects.create(
+        inscripcion=insc,
+        espacio=esp[0],
+        tipo="REG",
+        condicion=conds["REGULAR"],
+        fecha=date(2020, 7, 1),
+    )
+    Movimiento.objects.create(
+        inscripcion=insc,
+        espacio=esp[1],
+        tipo="REG",
+        condicion=conds["PROMOCION"],
+        fecha=date(2024, 7, 1),
+        nota_num=8,
+    )
+    return insc, esp, conds
+
+
+@pytest.mark.django_db
+def test_snapshot_sets_y_corte(escenario):
+    insc, esp, _ = escenario
+    with CaptureQueriesContext(connection) as ctx:
+        snap = StudentAcademicSnapshot.de(insc)
+    assert len(ctx.captured_queries) == 1
+
+    assert snap.regularizadas == {esp[0].id, esp[1].id}
+    assert snap.aprobadas == {esp[1].id}
+    assert snap.regularidad_vigente(esp[0], date(2021, 1, 1))
+    assert not snap.regularidad_vigente(esp[0], date(2023, 1, 1))
+
+    al_2021 = snap.al(date(2021, 1, 1))
+    assert al_2021.regularizadas == {esp[0].id}
+    assert not snap.aprobada(esp[1], hasta_fecha=date(2021, 1, 1))
+
+
+@pytest.mark.django_db
+def test_movimiento_clean_usa_snapshot(escenario, plan_estudios):
+    insc, esp, conds = escenario
+    for req in esp[:3]:
+        Correlatividad.objects.create(
+            plan=plan_estudios,
+            espacio=esp[3],
+            tipo="CURSAR",
+            requisito="REGULARIZADA",
+            requiere_espacio=req,
+        )
+    mov = Movimiento(
+        inscripcion=insc,
+        espacio=esp[3],
+        tipo="REG",
+        condicion=conds["REGULAR"],
+        fecha=date(2025, 3, 1),
+    )
+    with pytest.raises(ValidationError, match="regularizada de 'M2'"):
+        mov.clean()
+
+    libre = Movimiento(inscripcion=insc, espacio=esp[0], tipo="REG", condicion=conds["LIBRE"])
+    with pytest.raises(ValidationError, match="ya obtuvo Regular"):
+        libre.clean()
+
+
+@pytest.mark.django_db
+def test_eligibilidad_toma_aprobadas_del_snapshot(escenario, plan_estudios):
+    insc, esp, _ = escenario
+    estado = evaluar_plan(insc.estudiante_id, plan_estudios.id)
+    assert estado[esp[0].id] == (False, "ya_regular")
+    assert estado[esp[2].id] == (True, None)
+    rendir = evaluar_plan(insc.estudiante_id, plan_estudios.id, para="PARA_RENDIR")
+    assert rendir[esp[1].id] == (False, "ya_aprobado")
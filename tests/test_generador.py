@@ -0,0 +1,173 @@
+import json
+from collections import defaultdict
+from datetime import date, time
+
+import pytest
+from django.core.management import call_command
+
+from academia_horarios.generador import (
+    Generador,
+    Grilla,
+    Tarea,
+    instituto_sintetico,
+    no_disponible_de,
+    tareas_de_periodo,
+)
+from academia_horarios.models import GRILLAS, HorarioClase, atraviesa_recreo
+from academia_horarios.services import guardar_grillas
+
+# Las grillas de los turnos salen del registro (Bloque, o GRILLAS si no hay bloques).
+pytestmark = pytest.mark.django_db
+
+
+def _solapan(prop, tareas):
+    """Pares (recurso, día) con dos clases en el mismo bloque."""
+    por_id = {t.comision_id: t for t in tareas}
+    vistos = defaultdict(set)
+    choques = []
+    for u in prop.ubicaciones:
+        t = por_id[u.comision_id]
+        recursos = [("curso", t.curso)] + [("docente", d) for d in t.docentes]
+        if u.aula:
+            recursos.append(("aula", u.aula))
+        for r in recursos:
+            clave = (r, t.turno, u.dia)
+            bloque = (u.inicio, u.fin)
+            for otro in vistos[clave]:
+                if bloque[0] < otro[1] and otro[0] < bloque[1]:
+                    choques.append((r, u.dia, bloque, otro))
+            vistos[clave].add(bloque)
+    return choques
+
+
+def test_grilla_manana_respeta_recreos():
+    g = Grilla.de_turno("manana")
+    assert g.dias == (1, 2, 3, 4, 5)
+    assert len(g.slots) == 7
+    for inicio in g.inicios[2]:
+        (a, _), (_, b) = g.slots[inicio], g.slots[inicio + 1]
+        assert b - a == 80
+    # ningún bloque pisa un recreo
+    for a, b in g.slots:
+        assert not atraviesa_recreo("manana", time(a // 60, a % 60), time(b // 60, b % 60))
+    assert GRILLAS["manana"]["breaks"]
+
+
+def test_mismo_seed_mismo_resultado():
+    tareas, aulas = instituto_sintetico(60, seed=3)
+    p1 = Generador(tareas, aulas, seed=7).resolver(tiempo=30, max_iter=200)
+    p2 = Generador(tareas, aulas, seed=7).resolver(tiempo=30, max_iter=200)
+    assert p1.ubicaciones == p2.ubicaciones
+    assert p1.no_ubicadas == p2.no_ubicadas
+
+
+def test_sintetico_sin_choques():
+    tareas, aulas = instituto_sintetico(60, seed=1)
+    prop = Generador(tareas, aulas, seed=1).resolver(tiempo=2)
+    horas = sum(t.horas for t in tareas)
+    faltan = sum(x["faltan"] for x in prop.no_ubicadas)
+    assert faltan <= horas * 0.05
+    assert not _solapan(prop, tareas)
+    # cada sesión de la misma comisión en un día distinto
+    dias = defaultdict(list)
+    for u in prop.ubicaciones:
+        dias[u.comision_id].append(u.dia)
+    assert all(len(d) == len(set(d)) for d in dias.values())
+    # las aulas alcanzan para el cupo
+    cupo = {t.comision_id: t.cupo for t in tareas}
+    assert all(aulas[u.aula] >= cupo[u.comision_id] for u in prop.ubicaciones)
+
+
+def test_curso_lleno_se_reparte_entero():
+    # 5 materias de 7 bloques para un mismo curso: exactamente la semana completa
+    tareas = [
+        Tarea(comision_id=i, turno="manana", horas=7, curso=(1, 1, 1), docentes=(i,))
+        for i in range(1, 6)
+    ]
+    prop = Generador(tareas, seed=2).resolver(tiempo=5)
+    assert not _solapan(prop, tareas)
+    assert sum(t.horas for t in tareas) - sum(x["faltan"] for x in prop.no_ubicadas) >= 30
+
+
+def test_no_disponible_del_docente():
+    tareas = [Tarea(comision_id=1, turno="manana", horas=2, curso=(1, 1, 1), docentes=(9,))]
+    vedados = {(d, "manana", i) for d in (1, 2, 3, 4) for i in range(7)}
+    prop = Generador(tareas, no_disponible={9: vedados}).resolver(max_iter=50)
+    assert prop.completa
+    assert {u.dia for u in prop.ubicaciones} == {5}
+
+
+def test_no_disponible_desde_json():
+    datos = {"9": [{"dia": 2, "turno": "Maniana", "inicio": "08:00", "fin": "09:05"}]}
+    assert no_disponible_de(datos) == {9: {(2, "manana", 0), (2, "manana", 1)}}
+    with pytest.raises(ValueError):
+        no_disponible_de({"9": [{"dia": 2, "turno": "x", "inicio": "08:00", "fin": "09:00"}]})
+
+
+def test_comando_respeta_no_disponible(oferta, tmp_path):
+    from academia_core.models import Docente
+    from academia_horarios.models import Catedra, DocenteAsignacion
+
+    periodo, turno, (c1, _c2, _c3), _slots = oferta
+    doc = Docente.objects.create(dni="30111666", apellido="Sosa", nombre="Ema")
+    catedra = Catedra.objects.create(
+        materia_en_plan=c1.materia_en_plan, comision=c1, turno=turno, horas_semanales=4
+    )
+    DocenteAsignacion.objects.create(
+        catedra=catedra, docente=doc, condicion="INTERINO", fecha_desde=date(2025, 3, 1)
+    )
+    vedados = [{"dia": d, "turno": "manana", "inicio": "07:45", "fin": "12:45"} for d in (1, 2, 3)]
+    archivo = tmp_path / "no_disponible.json"
+    archivo.write_text(json.dumps({str(doc.pk): vedados}))
+
+    call_command(
+        "generar_horarios",
+        "--periodo",
+        periodo.pk,
+        "--no-disponible",
+        archivo,
+        "--aplicar",
+        "--max-iter",
+        "50",
+    )
+    dias = set(
+        HorarioClase.objects.filter(comision=c1).values_list("timeslot__dia_semana", flat=True)
+    )
+    assert dias == {4, 5}
+
+
+def test_turno_sin_grilla_queda_afuera():
+    tareas = [Tarea(comision_id=1, turno="domingo", horas=2, curso=(1, 1, 1))]
+    prop = Generador(tareas).resolver(max_iter=10)
+    assert prop.no_ubicadas == [{"comision_id": 1, "faltan": 2, "motivo": "turno sin grilla"}]
+
+
+def test_periodo_propuesta_valida_y_se_guarda(oferta):
+    periodo, _turno, coms, _slots = oferta
+    tareas = tareas_de_periodo(periodo)
+    assert {t.horas for t in tareas} == {4}
+
+    prop = Generador(tareas, seed=0).resolver(max_iter=100)
+    assert prop.completa
+    res = guardar_grillas(prop.grillas())
+    assert res["ok"], res
+    assert HorarioClase.objects.filter(comision__in=coms).count() == 12
+
+
+def test_comando_sintetico(capsys, tmp_path):
+    salida = tmp_path / "prop.json"
+    call_command("generar_horarios", "--sintetico", "40", "--tiempo", "2", "--salida", salida)
+    out = capsys.readouterr().out
+    assert "Comisiones: 40" in out
+    assert salida.exists()
+
+
+def test_periodo_usa_las_aulas_cargadas(oferta):
+    from academia_core.models import Aula
+
+    periodo, _turno, coms, _slots = oferta
+    Aula.objects.create(nombre="Aula 1", capacidad=30)
+    call_command("generar_horarios", "--periodo", periodo.pk, "--aplicar", "--max-iter", "50")
+    assert set(HorarioClase.objects.filter(comision__in=coms).values_list("aula", flat=True)) == {
+        "Aula 1"
+    }
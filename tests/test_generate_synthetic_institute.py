@@ -0,0 +1,89 @@
+from datetime import date
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.db.models import Count, F, Max
+
+from academia_core.models import (
+    Correlatividad,
+    Estudiante,
+    EstudianteProfesorado,
+    InscripcionEspacio,
+    Movimiento,
+)
+from academia_horarios.models import Comision, HorarioClase, Periodo
+
+pytestmark = pytest.mark.django_db
+
+
+def _generar(**opts):
+    out = StringIO()
+    call_command("generate_synthetic_institute", scale=0.01, seed=7, stdout=out, **opts)
+    return out.getvalue()
+
+
+def test_volumenes_y_consistencia():
+    salida = _generar()
+    assert "Listo en" in salida
+    assert Estudiante.objects.count() == 200
+    movs = Movimiento.objects.count()
+    assert 3500 <= movs <= 6500  # ~500k * 0.01, calibrado por cursadas posibles
+    assert InscripcionEspacio.objects.exists() and HorarioClase.objects.exists()
+    # los norms que pone Estudiante.save y los promedios que ponen las señales
+    assert not Estudiante.objects.filter(apellido_norm="").exists()
+    assert EstudianteProfesorado.objects.filter(cant_notas_aprobadas__gt=0).exists()
+
+    # correlatividades sólo hacia años anteriores del mismo plan (grafo sin ciclos)
+    for c in Correlatividad.objects.select_related("espacio", "requiere_espacio"):
+        if c.requiere_espacio_id:
+            assert c.requiere_espacio.plan_id == c.plan_id == c.espacio.plan_id
+            assert c.requiere_espacio.anio < c.espacio.anio
+    # ningún curso con dos comisiones en el mismo bloque
+    choques = (
+        HorarioClase.objects.values(
+            "timeslot",
+            "comision__periodo",
+            "comision__seccion",
+            "comision__materia_en_plan__plan",
+            "comision__materia_en_plan__anio",
+        )
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+    )
+    assert not choques.exists()
+    assert not Comision.objects.filter(ocupados__gt=F("cupo")).exists()
+
+    with pytest.raises(CommandError):
+        _generar()
+
+
+class _Deshacer(Exception):
+    pass
+
+
+def _movimientos():
+    return list(
+        Movimiento.objects.order_by("pk").values_list(
+            "inscripcion__estudiante__dni", "espacio__materia__nombre", "tipo", "fecha", "nota_num"
+        )
+    )
+
+
+def test_misma_seed_mismos_datos():
+    with pytest.raises(_Deshacer), transaction.atomic():
+        _generar(sin_derivados=True)
+        primera = _movimientos()
+        raise _Deshacer
+    _generar(sin_derivados=True)
+    assert _movimientos() == primera
+
+
+def test_hoy_fija_la_oferta_y_el_tope_de_fechas():
+    hoy = date(2022, 4, 15)
+    _generar(sin_derivados=True, hoy=hoy)
+    assert set(Periodo.objects.values_list("ciclo_lectivo", flat=True)) == {2022}
+    assert Movimiento.objects.aggregate(m=Max("fecha"))["m"] < hoy
+    fechas = InscripcionEspacio.objects.values_list("fecha_inscripcion", "fecha_baja")
+    assert {f for f, _b in fechas} == {hoy} and {b for _f, b in fechas} == {None, hoy}
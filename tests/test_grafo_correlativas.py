@@ -0,0 +1,111 @@
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from academia_core import grafo_correlativas
+from academia_core.correlativas import evaluar_correlatividades
+from academia_core.models import (
+    Correlatividad,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+)
+from academia_core.utils_inscripciones import cumple_correlativas
+
+
+def _esp(plan, nombre, anio):
+    return EspacioCurricular.objects.create(
+        plan=plan, materia=Materia.objects.create(nombre=nombre), anio=anio, cuatrimestre="A"
+    )
+
+
+@pytest.fixture
+def plan_con_reglas(plan_estudios):
+    a = _esp(plan_estudios, "Pedagogía", "1°")
+    b = _esp(plan_estudios, "Didáctica", "1°")
+    c = _esp(plan_estudios, "Práctica II", "2°")
+    d = _esp(plan_estudios, "Práctica III", "3°")
+    Correlatividad.objects.create(
+        plan=plan_estudios, espacio=c, tipo="CURSAR", requisito="REGULARIZADA", requiere_espacio=a
+    )
+    Correlatividad.objects.create(
+        plan=plan_estudios, espacio=c, tipo="RENDIR", requisito="APROBADA", requiere_espacio=b
+    )
+    Correlatividad.objects.create(
+        plan=plan_estudios,
+        espacio=d,
+        tipo="CURSAR",
+        requisito="APROBADA",
+        requiere_todos_hasta_anio=2,
+    )
+    return plan_estudios, a, b, c, d
+
+
+@pytest.mark.django_db
+def test_grafo_expande_y_separa_por_tipo_y_requisito(plan_con_reglas):
+    plan, a, b, c, d = plan_con_reglas
+    g = grafo_correlativas.grafo_para_plan(plan.id)
+
+    assert g.requeridos_de(c.id, "CURSAR", "REGULARIZADA") == {a.id}
+    assert g.requeridos_de(c.id, "PARA_RENDIR", "APROBADA") == {b.id}
+    assert g.requeridos_de(c.id, "CURSAR", "APROBADA") == set()
+    assert g.requeridos_de(d.id, "CURSAR", "APROBADA") == {a.id, b.id, c.id}
+    assert g.nombres[a.id] == "Pedagogía"
+
+
+@pytest.mark.django_db
+def test_grafo_cacheado_e_invalidado_por_signals(plan_con_reglas):
+    plan, a, b, c, d = plan_con_reglas
+    g1 = grafo_correlativas.grafo_para_plan(plan.id)
+    with CaptureQueriesContext(connection) as ctx:
+        assert grafo_correlativas.grafo_para_plan(plan.id) is g1
+    assert len(ctx.captured_queries) == 0
+
+    Correlatividad.objects.create(
+        plan=plan, espacio=b, tipo="CURSAR", requisito="REGULARIZADA", requiere_espacio=a
+    )
+    g2 = grafo_correlativas.grafo_para_plan(plan.id)
+    assert g2 is not g1
+    assert g2.requeridos_de(b.id, "CURSAR", "REGULARIZADA") == {a.id}
+
+    e = _esp(plan, "Práctica I", "1°")
+    g3 = grafo_correlativas.grafo_para_plan(plan.id)
+    assert e.id in g3.requeridos_de(d.id, "CURSAR", "APROBADA")
+
+
+@pytest.mark.django_db
+def test_version_compartida_entre_procesos(plan_con_reglas):
+    plan, a, b, c, d = plan_con_reglas
+    compartido = caches["compartido"]
+    g1 = grafo_correlativas.grafo_para_plan(plan.id)
+    clave = grafo_correlativas._version_key(plan.id)
+    assert compartido.get(clave) == g1.version
+
+    # otro proceso (un comando de consola) escribe y sube la versión en el cache compartido
+    Correlatividad.objects.filter(espacio=c, tipo="RENDIR").update(requiere_espacio=a)
+    compartido.incr(clave)
+    g2 = grafo_correlativas.grafo_para_plan(plan.id)
+    assert g2.requeridos_de(c.id, "RENDIR", "APROBADA") == {a.id}
+
+    # si el cache pierde la versión no se vuelve a una ya usada: se recompila
+    compartido.clear()
+    assert grafo_correlativas.grafo_para_plan(plan.id) is not g2
+
+
+@pytest.mark.django_db
+def test_consumidores_leen_del_grafo(plan_con_reglas, carrera):
+    plan, a, b, c, d = plan_con_reglas
+    est = Estudiante.objects.create(dni="30111222", apellido="Lopez", nombre="Eva")
+    insc = EstudianteProfesorado.objects.create(estudiante=est, carrera=carrera, plan=plan)
+
+    ok, faltan = cumple_correlativas(insc, d, "CURSAR")
+    assert not ok
+    assert {req.id for _r, req in faltan} == {a.id, b.id, c.id}
+    assert all(r.requisito == "APROBADA" for r, _req in faltan)
+
+    ok, detalles = evaluar_correlatividades(insc, c)
+    assert not ok
+    assert [det["requisito"].espacio_id for det in detalles] == [a.id]
+    assert detalles[0]["requisito"].etiqueta == "Pedagogía"
@@ -0,0 +1,169 @@
+import json
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from academia_core.models import Docente
+from academia_horarios import grillas
+from academia_horarios.models import Catedra, DocenteAsignacion, Horario, HorarioClase
+from ui.views_api import api_grilla_save
+
+
+def _post(data):
+    req = RequestFactory().post("/", json.dumps(data), content_type="application/json")
+    resp = api_grilla_save(req)
+    return resp.status_code, json.loads(resp.content)
+
+
+def _bloque(inicio, fin, dia=1, aula=""):
+    return {"dia_semana": dia, "inicio": inicio, "fin": fin, "aula": aula}
+
+
+@pytest.mark.django_db
+def test_grilla_aplica_diff_minimo(oferta):
+    _periodo, _turno, (c1, _c2, c3), (s1, _s2, s3) = oferta
+    queda = HorarioClase.objects.create(comision=c1, timeslot=s1)
+    HorarioClase.objects.create(comision=c1, timeslot=s3)
+
+    status, body = _post(
+        {
+            "comisiones": [
+                {
+                    "comision_id": c1.id,
+                    "bloques": [
+                        _bloque("07:45", "08:25", aula="A1"),
+                        _bloque("09:15", "09:55", dia=2),
+                    ],
+                },
+                {"comision_id": c3.id, "bloques": [_bloque("08:25", "09:05")]},
+            ]
+        }
+    )
+
+    assert status == 200, body
+    assert (body["creados"], body["actualizados"], body["borrados"]) == (2, 1, 1)
+    queda.refresh_from_db()
+    assert queda.aula == "A1"  # mismo bloque: se actualiza, no se borra y recrea
+    assert HorarioClase.objects.filter(comision=c1).count() == 2
+    assert HorarioClase.objects.filter(comision=c3).count() == 1
+
+
+@pytest.mark.django_db
+def test_grilla_rechaza_choques_sin_tocar_nada(oferta):
+    _periodo, _turno, (c1, c2, c3), (s1, _s2, _s3) = oferta
+    HorarioClase.objects.create(comision=c1, timeslot=s1, aula="Aula 5")
+    grillas.registro()  # ya armado (una vez por proceso)
+
+    with CaptureQueriesContext(connection) as ctx:
+        status, body = _post(
+            {
+                "comisiones": [
+                    # mismo curso que c1 (1° año): choca con el bloque guardado
+                    {"comision_id": c2.id, "bloques": [_bloque("07:45", "09:05")]},
+                    # otro año, pero misma aula que c1
+                    {"comision_id": c3.id, "bloques": [_bloque("07:45", "08:25", aula="aula 5")]},
+                ]
+            }
+        )
+    assert status == 400
+    assert {c["tipo"] for c in body["conflictos"]} == {"cohorte", "aula"}
+    sqls = [
+        q["sql"] for q in ctx.captured_queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))
+    ]
+    assert len(sqls) <= 6  # locks de período y comisiones + 4 de validación
+    assert HorarioClase.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_grilla_valida_con_los_locks_tomados(oferta):
+    _periodo, _turno, (c1, _c2, _c3), _slots = oferta
+    with CaptureQueriesContext(connection) as ctx:
+        status, _body = _post({"comisiones": [{"comision_id": c1.id, "bloques": []}]})
+    assert status == 200
+    sqls = [q["sql"] for q in ctx.captured_queries]
+    # una sola transacción (savepoint en el test) que arranca bloqueando el período
+    assert sqls[0].startswith("SAVEPOINT") and sqls[-1].startswith("RELEASE")
+    assert 'FROM "academia_horarios_periodo"' in sqls[1]
+    lecturas = [i for i, s in enumerate(sqls) if 'FROM "academia_horarios_horarioclase"' in s]
+    assert lecturas and min(lecturas) > 1
+
+
+@pytest.mark.django_db
+def test_grilla_valida_tope_y_dry_run(oferta):
+    _periodo, _turno, (c1, _c2, _c3), _slots = oferta
+    rangos = [("07:45", "08:25"), ("08:25", "09:05"), ("09:15", "09:55"), ("09:55", "10:35")]
+    bloques = [_bloque(i, f, dia=3) for i, f in [*rangos, ("10:45", "11:25")]]
+    status, body = _post({"comisiones": [{"comision_id": c1.id, "bloques": bloques}]})
+    assert status == 400 and "tope de 4" in body["error"]
+
+    status, body = _post(
+        {"comisiones": [{"comision_id": c1.id, "bloques": bloques[:4]}], "dry_run": True}
+    )
+    assert status == 200 and body["creados"] == 4
+    assert not HorarioClase.objects.exists()
+
+
+@pytest.mark.django_db
+def test_grilla_valida_la_grilla_del_turno(oferta):
+    _periodo, _turno, (c1, _c2, _c3), _slots = oferta
+    for inicio, fin, motivo in [
+        ("07:00", "07:40", "fuera de la jornada"),
+        ("08:25", "09:55", "atraviesa un recreo"),
+        ("08:05", "08:45", "no coincide con los bloques"),
+    ]:
+        status, body = _post(
+            {"comisiones": [{"comision_id": c1.id, "bloques": [_bloque(inicio, fin)]}]}
+        )
+        assert status == 400 and motivo in body["error"], body
+    # el sábado se valida con la grilla del sábado
+    status, _body = _post(
+        {"comisiones": [{"comision_id": c1.id, "bloques": [_bloque("09:00", "09:40", dia=6)]}]}
+    )
+    assert status == 200
+    assert HorarioClase.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_grilla_choca_con_los_horario_del_docente(carrera, plan_estudios, oferta):
+    _periodo, turno, (c1, c2, _c3), _slots = oferta
+    doc = Docente.objects.create(dni="30111555", apellido="Gil", nombre="Eva")
+    catedra = Catedra.objects.create(
+        materia_en_plan=c1.materia_en_plan, comision=c1, turno=turno, horas_semanales=2
+    )
+    DocenteAsignacion.objects.create(
+        catedra=catedra, docente=doc, condicion="INTERINO", fecha_desde=date(2025, 3, 1)
+    )
+    # la propia comisión en la grilla por profesorado no cuenta como choque
+    mep = c1.materia_en_plan
+    Horario.objects.create(
+        materia=mep.materia,
+        plan=plan_estudios,
+        profesorado=carrera,
+        anio=1,
+        comision=c1.seccion,
+        docente=doc,
+        dia="lu",
+        inicio="07:45",
+        fin="08:25",
+    )
+    bloques = [{"comision_id": c1.id, "bloques": [_bloque("07:45", "08:25")]}]
+    assert _post({**{"comisiones": bloques}, "dry_run": True})[0] == 200
+
+    Horario.objects.create(
+        materia=c2.materia_en_plan.materia,
+        plan=plan_estudios,
+        profesorado=carrera,
+        anio=3,
+        docente=doc,
+        dia="lu",
+        inicio="08:00",
+        fin="08:40",
+    )
+    status, body = _post({"comisiones": bloques})
+    assert status == 400
+    assert [c["tipo"] for c in body["conflictos"]] == ["docente"]
+    assert body["conflictos"][0]["existente"]["ref"][0] == "horario"
+    assert not HorarioClase.objects.exists()
@@ -0,0 +1,135 @@
+import json
+from datetime import time
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from academia_horarios import grillas
+from academia_horarios.models import (
+    Bloque,
+    TurnoModel,
+    atraviesa_recreo,
+    dentro_de_jornada,
+    es_multiplo_40,
+)
+from academia_horarios.views import api_timeslots
+from ui.views_api import api_grilla_config
+
+pytestmark = pytest.mark.django_db
+
+
+def _timeslots(user, headers=None, **params):
+    req = RequestFactory().get("/", params, headers=headers or {})
+    req.user = user
+    return api_timeslots(req)
+
+
+def test_sin_bloques_usa_grillas_de_models():
+    g = grillas.grilla("manana")
+    assert g.inicio == 7 * 60 + 45 and g.fin == 12 * 60 + 45
+    assert len(g.slots) == 7
+    assert [r for r in g.filas if r[2]] == [(545, 555, True), (635, 645, True)]
+    assert g.slot(9 * 60 + 15) == 2
+    assert g.slot(9 * 60 + 5) is None
+
+
+def test_consultas_de_models_usan_el_registro():
+    assert atraviesa_recreo("manana", time(8, 25), time(9, 55))
+    assert not atraviesa_recreo("manana", time(9, 15), time(10, 35))
+    assert dentro_de_jornada("tarde", time(13, 0), time(18, 0))
+    assert not dentro_de_jornada("tarde", time(12, 20), time(13, 40))
+    # bordes de bloque, salteando recreos (9:15 arranca después del primero)
+    assert es_multiplo_40(time(9, 15))
+    assert es_multiplo_40(time(13, 40), turno="tarde")
+    assert not es_multiplo_40(time(9, 10))
+
+
+def test_slugs_viejos_se_normalizan():
+    assert grillas.normalizar_turno("maniana") == "manana"
+    assert grillas.normalizar_turno("Noche") == "vespertino"
+    assert grillas.normalizar_turno("sabado_am") == "sabado"
+    assert grillas.normalizar_turno("domingo") is None
+    assert grillas.grilla("noche") is grillas.grilla("vespertino")
+    with pytest.raises(KeyError):
+        grillas.grilla("domingo")
+
+
+def test_bloques_cargados_mandan_y_se_invalidan():
+    viejo = TurnoModel.objects.create(nombre="Mañana", slug="maniana")
+    for orden, (a, b, r) in enumerate(
+        [((8, 0), (8, 40), False), ((8, 40), (9, 0), True), ((9, 0), (9, 40), False)], start=1
+    ):
+        Bloque.objects.create(
+            turno=viejo, dia_semana=0, orden=orden, inicio=time(*a), fin=time(*b), es_recreo=r
+        )
+    g = grillas.grilla("manana")
+    assert g.slots == ((480, 520), (540, 580))
+    assert atraviesa_recreo("manana", time(8, 0), time(9, 40))
+
+    # el slug canónico gana sobre el alias
+    nuevo = TurnoModel.objects.create(nombre="Mañana", slug="manana")
+    Bloque.objects.create(turno=nuevo, dia_semana=0, orden=1, inicio=time(7, 0), fin=time(7, 40))
+    assert grillas.grilla("manana").slots == ((420, 460),)
+
+    # el sábado cargado sin turno también cuenta
+    Bloque.objects.create(turno=None, dia_semana=5, orden=1, inicio=time(10, 0), fin=time(10, 40))
+    assert grillas.grilla("sabado").slots == ((600, 640),)
+    assert grillas.grilla("manana").filas_sab == ((600, 640, False),)
+
+
+def test_version_compartida_entre_procesos():
+    compartido = caches["compartido"]
+    turno = TurnoModel.objects.create(nombre="Tarde", slug="tarde")
+    original = grillas.grilla("tarde").slots
+
+    # un comando de consola carga bloques (sin señales acá) y sube la versión compartida
+    Bloque.objects.bulk_create(
+        [Bloque(turno=turno, dia_semana=0, orden=1, inicio=time(13, 0), fin=time(13, 40))]
+    )
+    assert grillas.grilla("tarde").slots == original  # todavía nadie avisó
+    compartido.incr(grillas.VERSION_KEY)
+    assert grillas.grilla("tarde").slots == ((780, 820),)
+
+    # si el cache pierde la versión no se vuelve a una ya usada: se rearma
+    Bloque.objects.update(inicio=time(14, 0), fin=time(14, 40))  # update(): sin señales
+    compartido.clear()
+    assert grillas.grilla("tarde").slots == ((840, 880),)
+
+
+def test_api_timeslots_cuerpo_precalculado_y_304(admin_user):
+    resp = _timeslots(admin_user, turno="noche")
+    assert resp.status_code == 200
+    data = json.loads(resp.content)
+    assert data["turno"] == "vespertino"
+    assert data["lv"][0] == {"orden": 1, "ini": "18:10", "fin": "18:50", "recreo": False}
+    assert data["sab"] == []
+    etag = resp["ETag"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = _timeslots(admin_user, headers={"If-None-Match": etag}, turno="vespertino")
+    assert resp.status_code == 304
+    assert len(ctx.captured_queries) == 0
+
+    # turno desconocido -> mañana, con el sábado en "sab"
+    data = json.loads(_timeslots(admin_user, turno="invalid").content)
+    assert data["turno"] == "manana"
+    assert data["sab"][0]["ini"] == "09:00"
+
+
+def test_api_timeslots_etag_cambia_con_los_bloques(admin_user):
+    antes = _timeslots(admin_user, turno="tarde")["ETag"]
+    t = TurnoModel.objects.create(nombre="Tarde", slug="tarde")
+    Bloque.objects.create(turno=t, dia_semana=0, orden=1, inicio=time(14, 0), fin=time(14, 40))
+    resp = _timeslots(admin_user, headers={"If-None-Match": antes}, turno="tarde")
+    assert resp.status_code == 200
+    assert resp["ETag"] != antes
+
+
+def test_api_grilla_config_una_fila_por_bloque():
+    req = RequestFactory().get("/", {"turno": "sabado"})
+    rows = json.loads(api_grilla_config(req).content)["rows"]
+    assert rows[0] == {"ini": "09:00", "fin": "09:40", "recreo": False}
+    assert sum(r["recreo"] for r in rows) == 2
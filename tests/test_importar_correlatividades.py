@@ -0,0 +1,217 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from academia_core.importacion_correlatividades import (
+    Emparejador,
+    importar,
+    parsear,
+    parsear_vinetas,
+)
+from academia_core.models import Correlatividad, EspacioCurricular, Materia
+
+pytestmark = pytest.mark.django_db
+
+DATOS = Path(__file__).resolve().parent.parent / "datos" / "correlatividades"
+
+TEXTO = """\
+Profesorado de Matemática (Plan 1234/2025)
+Primer Año
+•Materia: Didáctica General (A)
+\toCorrelativas para Cursar:
+\t\t•Aprobadas: Ninguna
+\t\t•Regularizadas: Ninguna
+Segundo Año
+•Materia: Procesos de Evaluacion en la Educación Secundaria (S)
+\toCorrelativas para Cursar:
+\t\t•Aprobadas: Ninguna
+\t\t•Regularizadas: Problemática de la Educación Secundaria (S), Didactica General (A)
+\toCorrelativas para Rendir:
+\t\t•Aprobadas: Didáctica General (A)
+•Materia: Práctica Profesional II (T)
+\toCorrelativas para Cursar:
+\t\t•Aprobadas: Practica Profesional I (T)
+\t\t•Regularizadas: Todo Primer Año
+•Materia: Sujeto de la Educación II (M)
+\toCorrelativas para Cursar:
+\t\t•Regularizadas: Sujeto de la Educacion (M), Epistemología (A)
+"""
+
+
+@pytest.fixture
+def espacios(plan_estudios):
+    nombres = [
+        ("Didáctica General", "1°"),
+        ("Problemática de la Educación Secundaria", "1°"),
+        ("Práctica Profesional I", "1°"),
+        ("Sujeto de la Educación I", "1°"),
+        ("Procesos de Evaluación en la Educación Secundaria", "2°"),
+        ("Práctica Profesional II", "2°"),
+        ("Sujeto de la Educación II", "2°"),
+    ]
+    return {
+        n: EspacioCurricular.objects.create(
+            plan=plan_estudios,
+            materia=Materia.objects.create(nombre=n),
+            anio=anio,
+            cuatrimestre="A",
+        )
+        for n, anio in nombres
+    }
+
+
+def _txt(tmp_path, texto, nombre="correlativas.txt"):
+    p = tmp_path / nombre
+    p.write_text(texto, encoding="utf-8")
+    return p
+
+
+def _reglas(plan):
+    return {
+        (c.espacio.nombre, c.tipo, c.requisito, c.requiere_espacio and c.requiere_espacio.nombre)
+        for c in Correlatividad.objects.filter(plan=plan).select_related(
+            "espacio__materia", "requiere_espacio__materia"
+        )
+    }
+
+
+def test_parser_de_vinetas():
+    reglas = list(parsear_vinetas(TEXTO.splitlines()))
+    assert {r.plan for r in reglas} == {("Profesorado de Matemática", "1234/2025")}
+    pe = [r for r in reglas if r.espacio.startswith("Procesos") and r.requiere]
+    assert [(r.tipo, r.requisito, r.requiere) for r in pe] == [
+        ("CURSAR", "REGULARIZADA", "Problemática de la Educación Secundaria"),
+        ("CURSAR", "REGULARIZADA", "Didactica General"),
+        ("RENDIR", "APROBADA", "Didáctica General"),
+    ]
+    assert pe[0].anio == 2
+    todo = next(r for r in reglas if r.hasta_anio)
+    assert (todo.espacio, todo.hasta_anio) == ("Práctica Profesional II", 1)
+    # "Ninguna" deja constancia del espacio (una sola vez)
+    assert [r.requiere for r in reglas if r.espacio == "Didáctica General"] == [None]
+
+
+def test_archivo_de_datos_se_parsea():
+    reglas = list(parsear(DATOS / "certificacion_docente_3151-21.txt"))
+    assert reglas[0].plan == ("Certificación Docente para la Educación Secundaria", "3151/21")
+    assert any(
+        r.espacio == "Sujeto de la Educación II" and r.requiere == "Sujeto de la Educación I"
+        for r in reglas
+    )
+
+
+def test_emparejador():
+    emp = Emparejador(
+        [(1, "Sujeto de la Educación I", 1), (2, "Sujeto de la Educación II", 2), (3, "EDI", 1)]
+    )
+    emp.por_nombre["edi"].append((4, 2))
+    assert emp.resolver("sujeto de la educacion i") == (1, None)
+    assert emp.resolver("Sujeto de la Educacion II.") == (2, None)
+    assert emp.resolver("EDI", anio=2) == (4, None)
+    assert emp.resolver("EDI")[0] is None
+    pk, sugerencia = emp.resolver("Sujeto de la Educacion")
+    assert pk is None and sugerencia.startswith("sujeto de la educacion")
+    assert emp.resolver(2) == (2, None) and emp.resolver(99) == (None, None)
+
+
+def test_importa_con_nombres_aproximados_y_reporta_los_que_faltan(tmp_path, espacios):
+    plan = espacios["Didáctica General"].plan
+    out = StringIO()
+    call_command("importar_correlatividades", str(_txt(tmp_path, TEXTO)), stdout=out)
+    salida = out.getvalue()
+    assert "5 nuevas, 0 borradas" in salida
+    assert "sin resolver 'Sujeto de la Educacion'" in salida
+    assert "sin resolver 'Epistemología'" in salida
+    assert _reglas(plan) == {
+        ("Procesos de Evaluación en la Educación Secundaria", "CURSAR", "REGULARIZADA",
+         "Problemática de la Educación Secundaria"),
+        ("Procesos de Evaluación en la Educación Secundaria", "CURSAR", "REGULARIZADA",
+         "Didáctica General"),
+        ("Procesos de Evaluación en la Educación Secundaria", "RENDIR", "APROBADA",
+         "Didáctica General"),
+        ("Práctica Profesional II", "CURSAR", "APROBADA", "Práctica Profesional I"),
+        ("Práctica Profesional II", "CURSAR", "REGULARIZADA", None),
+    }  # fmt: skip
+    assert Correlatividad.objects.get(requiere_todos_hasta_anio=1).espacio.nombre == (
+        "Práctica Profesional II"
+    )
+
+
+def test_reimportar_aplica_solo_la_diferencia(tmp_path, espacios):
+    plan = espacios["Didáctica General"].plan
+    # una regla de un espacio que el archivo no menciona no se toca
+    otra = Correlatividad.objects.create(
+        plan=plan,
+        espacio=espacios["Sujeto de la Educación I"],
+        tipo="CURSAR",
+        requisito="APROBADA",
+        requiere_espacio=espacios["Didáctica General"],
+    )
+    path = _txt(tmp_path, TEXTO)
+    importar(parsear(path))
+    ids = set(Correlatividad.objects.values_list("id", flat=True))
+
+    rep = importar(parsear(path))
+    assert (rep.planes[0].creadas, rep.planes[0].borradas) == (0, 0)
+    assert set(Correlatividad.objects.values_list("id", flat=True)) == ids
+
+    menos = TEXTO.replace(", Didactica General (A)", "")
+    rep = importar(parsear(_txt(tmp_path, menos)))
+    assert (rep.planes[0].creadas, rep.planes[0].borradas) == (0, 1)
+    assert Correlatividad.objects.filter(pk=otra.pk).exists()
+
+
+def test_requisito_sin_resolver_no_borra_las_del_espacio(tmp_path, espacios):
+    plan = espacios["Didáctica General"].plan
+    pe = espacios["Procesos de Evaluación en la Educación Secundaria"]
+    previa = Correlatividad.objects.create(
+        plan=plan,
+        espacio=pe,
+        tipo="CURSAR",
+        requisito="REGULARIZADA",
+        requiere_espacio=espacios["Didáctica General"],
+    )
+    # el archivo nombra mal uno de sus requisitos
+    texto = TEXTO.replace(
+        "Problemática de la Educación Secundaria (S),", "Problemátca Secundria (S),"
+    )
+    rep = importar(parsear(_txt(tmp_path, texto)))
+    plan_rep = rep.planes[0]
+    assert any(nombre == "Problemátca Secundria" for _l, nombre, _s in plan_rep.sin_resolver)
+    assert plan_rep.borradas == 0
+    assert list(Correlatividad.objects.filter(espacio=pe)) == [previa]
+
+
+def test_dry_run_no_escribe(tmp_path, espacios):
+    rep = importar(parsear(_txt(tmp_path, TEXTO)), dry_run=True)
+    assert rep.planes[0].creadas == 5
+    assert not Correlatividad.objects.exists()
+
+
+def test_csv_por_nombres_y_por_ids(tmp_path, espacios):
+    plan = espacios["Didáctica General"].plan
+    path = _txt(
+        tmp_path,
+        "Espacio Curricular;Para cursar debe tener Regular;Para cursar debe Aprobar;"
+        "Para rendir debe tener aprobada\n"
+        "Práctica Profesional II;Didáctica General, Sujeto de la Educación I;"
+        "Práctica Profesional I;Todos 1\n",
+        "reglas.csv",
+    )
+    call_command("importar_correlatividades", str(path), plan=plan.pk, stdout=StringIO())
+    assert Correlatividad.objects.filter(espacio=espacios["Práctica Profesional II"]).count() == 4
+    assert Correlatividad.objects.get(tipo="RENDIR").requiere_todos_hasta_anio == 1
+
+    pp2, di = espacios["Práctica Profesional II"], espacios["Didáctica General"]
+    path = _txt(
+        tmp_path,
+        "plan_id,espacio_id,requiere_espacio_id,tipo,requisito,requiere_todos_hasta_anio\n"
+        f"{plan.pk},{pp2.pk},{di.pk},CURSAR,APROBADA,\n",
+        "ids.csv",
+    )
+    out = StringIO()
+    call_command("load_correlatividades", str(path), stdout=out)
+    assert "1 nuevas, 4 borradas" in out.getvalue()
+    assert _reglas(plan) == {("Práctica Profesional II", "CURSAR", "APROBADA", "Didáctica General")}
@@ -0,0 +1,135 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from academia_core import indice_busqueda
+from academia_core.importacion import Importador, leer
+from academia_core.models import Carrera, EspacioCurricular, Materia, PlanEstudios
+
+pytestmark = pytest.mark.django_db
+
+ENCABEZADO = "anio,cuatrimestre,formato,nombre,horas\n"
+
+
+def _csv(tmp_path, texto, nombre="plan.csv"):
+    p = tmp_path / nombre
+    p.write_text(texto, encoding="utf-8")
+    return p
+
+
+def _importar(path, *args):
+    out = StringIO()
+    call_command("importar_plan", "--archivo", str(path), *args, stdout=out)
+    return out.getvalue()
+
+
+def test_importa_y_reimporta_sin_duplicar(tmp_path, carrera):
+    Materia.objects.create(nombre="Álgebra I")
+    path = _csv(
+        tmp_path,
+        ENCABEZADO
+        + "1°,1,Asignatura,Algebra I,4\n1°,A,Taller,Práctica I,3\n2°,2º,Asignatura,Geometría,5\n",
+    )
+    out = _importar(path, "--carrera", carrera.nombre, "--resolucion", "100/24")
+    assert "3 espacios nuevos, 0 actualizados, 2 materias nuevas" in out
+    plan = PlanEstudios.objects.get(carrera=carrera, resolucion="100/24")
+    assert plan.vigente
+    # "Algebra I" se resolvió contra la Materia ya cargada "Álgebra I"
+    assert Materia.objects.filter(nombre__startswith="Álgebra").count() == 1
+    assert EspacioCurricular.objects.get(plan=plan, materia__nombre="Álgebra I").horas == 4
+    nuevas = indice_busqueda.filtrar(Materia.objects.all(), "geometria")
+    assert [m.nombre for m in nuevas] == ["Geometría"]
+
+    path = _csv(tmp_path, ENCABEZADO + "1°,1,Asignatura,ALGEBRA I,6\n")
+    out = _importar(path, "--carrera", carrera.nombre, "--resolucion", "100/24")
+    assert "0 espacios nuevos, 1 actualizados, 0 materias nuevas" in out
+    assert EspacioCurricular.objects.filter(plan=plan).count() == 3
+    assert EspacioCurricular.objects.get(plan=plan, materia__nombre="Álgebra I").horas == 6
+
+
+def test_errores_por_fila_no_cortan(tmp_path, carrera):
+    path = _csv(
+        tmp_path,
+        ENCABEZADO
+        + "1°,X,Asignatura,Lengua,4\n"
+        + "1°,1,Asignatura,Historia,cuatro\n"
+        + "1°,1,Asignatura,,4\n"
+        + "1°,2,Asignatura,Psicología,4\n",
+    )
+    reporte = tmp_path / "errores.csv"
+    out = _importar(
+        path, "--carrera", carrera.nombre, "--resolucion", "1", "--reporte", str(reporte)
+    )
+    assert "1 espacios nuevos" in out
+    assert "3 filas con errores" in out
+    assert "fila 2: cuatrimestre inválido 'X'" in out
+    lineas = reporte.read_text(encoding="utf-8").splitlines()
+    assert lineas[0] == "fila,error"
+    assert [ln.split(",")[0] for ln in lineas[1:]] == ["2", "3", "4"]
+
+
+def test_archivo_con_varios_planes(tmp_path, carrera):
+    otra = Carrera.objects.create(nombre="Profesorado de Historia")
+    PlanEstudios.objects.create(carrera=otra, resolucion="9/20", vigente=True)
+    path = _csv(
+        tmp_path,
+        "carrera;resolucion;anio;cuatrimestre;formato;nombre;horas\n"
+        f"{carrera.nombre};1/24;1°;1;Asignatura;Lengua;4\n"
+        "profesorado de historia;1/24;1°;1;Asignatura;Lengua;4\n"
+        "Profesorado de Química;1/24;1°;1;Asignatura;Lengua;4\n",
+    )
+    out = _importar(path)
+    assert "2 espacios nuevos" in out
+    assert "fila 4: carrera no encontrada: Profesorado de Química" in out
+    assert Materia.objects.filter(nombre="Lengua").count() == 1
+    # la otra carrera ya tenía plan vigente: el nuevo entra como no vigente
+    assert not PlanEstudios.objects.get(carrera=otra, resolucion="1/24").vigente
+
+    with pytest.raises(CommandError, match="Faltan columnas: carrera, resolucion"):
+        _importar(_csv(tmp_path, ENCABEZADO + "1°,1,Asignatura,Lengua,4\n"))
+
+
+def test_dry_run_no_escribe(tmp_path, carrera):
+    path = _csv(tmp_path, ENCABEZADO + "1°,1,Asignatura,Lengua,4\n1°,1,Asignatura,Lengua,4\n")
+    out = _importar(path, "--carrera", carrera.nombre, "--resolucion", "1", "--dry-run")
+    assert "[dry-run] 2 filas: 1 espacios nuevos, 0 actualizados, 1 materias nuevas" in out
+    assert "[dry-run] Plan nuevo" in out
+    assert not PlanEstudios.objects.exists()
+    assert not Materia.objects.exists()
+
+
+def test_retomar_desde_una_fila(tmp_path, carrera):
+    filas = "".join(f"1°,1,Asignatura,M{i},4\n" for i in range(10))
+    path = _csv(tmp_path, ENCABEZADO + filas)
+    out = _importar(path, "--carrera", carrera.nombre, "--resolucion", "1", "--desde", "8")
+    assert "4 filas: 4 espacios nuevos" in out
+    assert "Última fila confirmada: 11" in out
+    assert sorted(Materia.objects.values_list("nombre", flat=True)) == ["M6", "M7", "M8", "M9"]
+
+
+def test_queries_por_lote_no_por_fila(tmp_path, plan_estudios):
+    carrera = plan_estudios.carrera
+    filas = "".join(f"{1 + i % 4}°,A,Asignatura,Materia {i},4\n" for i in range(300))
+    path = _csv(tmp_path, ENCABEZADO + filas)
+    imp = Importador(carrera.nombre, plan_estudios.resolucion, lote=100)
+    with CaptureQueriesContext(connection) as ctx:
+        rep = imp.importar(leer(path))
+    assert rep.creados == 300 and not rep.errores
+    assert EspacioCurricular.objects.filter(plan=plan_estudios).count() == 300
+    assert len(ctx.captured_queries) <= 3 + 3 * 8
+
+
+def test_xlsx(tmp_path, carrera):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["anio", "cuatrimestre", "formato", "nombre", "horas"])
+    ws.append(["1°", "1", "Asignatura", "Lengua", 4.0])
+    path = tmp_path / "plan.xlsx"
+    wb.save(path)
+    out = _importar(path, "--carrera", carrera.nombre, "--resolucion", "1")
+    assert "1 espacios nuevos" in out
+    assert EspacioCurricular.objects.get(materia__nombre="Lengua").horas == 4
@@ -0,0 +1,113 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import RequestFactory
+
+from academia_core import indice_busqueda
+from academia_core.models import Docente, Estudiante, Materia, TerminoBusqueda
+from ui.views import DocenteListView, EstudianteListView
+
+pytestmark = pytest.mark.django_db
+
+
+def _ids(qs):
+    return [o.pk for o in qs]
+
+
+def _lista(view, user, q):
+    req = RequestFactory().get("/", {"q": q})
+    req.user = user
+    return view.as_view()(req).context_data["items"]
+
+
+@pytest.fixture
+def alumnos(db):
+    return {
+        "perez": Estudiante.objects.create(
+            dni="30111222", apellido="Pérez", nombre="Ana", email="ana.p@mail.com"
+        ),
+        "perezoso": Estudiante.objects.create(dni="30111333", apellido="Perezoso", nombre="Luis"),
+        "mail": Estudiante.objects.create(
+            dni="40555666", apellido="Gómez", nombre="Sol", email="perez@mail.com"
+        ),
+        "nunez": Estudiante.objects.create(dni="40555777", apellido="Núñez", nombre="José Ana"),
+    }
+
+
+def test_terminos():
+    assert indice_busqueda.terminos("Pérez-Gómez") == ["perez", "gomez"]
+    assert indice_busqueda.terminos("30.111.222") == ["30111222"]
+    assert indice_busqueda.terminos("Ana.P@Mail.com") == [
+        "ana",
+        "p",
+        "mail",
+        "com",
+        "ana.p@mail.com",
+    ]
+
+
+def test_signals_mantienen_el_indice(alumnos):
+    e = alumnos["nunez"]
+    assert set(
+        TerminoBusqueda.objects.filter(tipo="estudiante", objeto_id=e.pk).values_list(
+            "termino", flat=True
+        )
+    ) == {"nunez", "jose", "ana", "40555777"}
+
+    e.apellido = "Ibáñez"
+    e.save()
+    qs = Estudiante.objects.all()
+    assert _ids(indice_busqueda.filtrar(qs, "ibanez")) == [e.pk]
+    assert _ids(indice_busqueda.filtrar(qs, "nunez")) == []
+
+    e.delete()
+    assert not TerminoBusqueda.objects.filter(tipo="estudiante", objeto_id=e.pk).exists()
+
+
+def test_sin_acentos_y_ordenado_por_relevancia(alumnos):
+    qs = Estudiante.objects.order_by("apellido", "nombre")
+    # exacto en apellido > prefijo en apellido > término del email
+    assert _ids(indice_busqueda.filtrar(qs, "PÉREZ")) == [
+        alumnos["perez"].pk,
+        alumnos["perezoso"].pk,
+        alumnos["mail"].pk,
+    ]
+    assert _ids(indice_busqueda.filtrar(qs, "nuñ")) == [alumnos["nunez"].pk]
+
+
+def test_todas_las_palabras_en_cualquier_campo(alumnos):
+    qs = Estudiante.objects.all()
+    assert _ids(indice_busqueda.filtrar(qs, "ana perez")) == [alumnos["perez"].pk]
+    assert _ids(indice_busqueda.filtrar(qs, "jose an")) == [alumnos["nunez"].pk]
+    assert _ids(indice_busqueda.filtrar(qs, "ana zzz")) == []
+    assert _ids(indice_busqueda.filtrar(qs, "30.111.2")) == [alumnos["perez"].pk]
+    assert indice_busqueda.filtrar(qs, " ,. ") is qs
+
+
+def test_listados_de_ui_usan_el_indice(admin_user, alumnos):
+    items = _lista(EstudianteListView, admin_user, "perez ana")
+    assert [e.pk for e in items] == [alumnos["perez"].pk]
+
+    d = Docente.objects.create(dni="20111222", apellido="Ramírez", nombre="Inés")
+    assert [x.pk for x in _lista(DocenteListView, admin_user, "ramirez")] == [d.pk]
+
+
+def test_materias_y_reindexar_despues_de_bulk_create():
+    Materia.objects.bulk_create([Materia(nombre="Didáctica General"), Materia(nombre="Álgebra")])
+    qs = Materia.objects.all()
+    assert _ids(indice_busqueda.filtrar(qs, "didac")) == []
+
+    out = StringIO()
+    call_command("reindexar_busqueda", "--tipo", "materia", stdout=out)
+    assert "materia: 2 indexados" in out.getvalue()
+    assert [m.nombre for m in indice_busqueda.filtrar(qs, "didac gen")] == ["Didáctica General"]
+    assert [m.nombre for m in indice_busqueda.filtrar(qs, "algebra")] == ["Álgebra"]
+
+
+def test_benchmark_no_deja_datos():
+    out = StringIO()
+    call_command("reindexar_busqueda", "--benchmark", "200", "--repeticiones", "1", stdout=out)
+    assert "icontains" in out.getvalue()
+    assert not Estudiante.objects.exists()
+    assert not TerminoBusqueda.objects.exists()
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import OperationalError, close_old_connections, connection
+from django.test import RequestFactory
+
+from academia_core.models import Estudiante, EstudianteProfesorado, InscripcionEspacio
+from academia_core.views_api import api_inscribir_espacio
+from academia_horarios.models import Comision, HorarioClase, InscripcionComision
+from academia_horarios.services import (
+    dar_de_baja_en_comision,
+    inscribir_estudiante_en_comision,
+    recontar_ocupados,
+)
+
+
+def _estudiantes(n):
+    return [
+        Estudiante.objects.create(dni=f"4000{i:04d}", apellido=f"E{i}", nombre="X")
+        for i in range(n)
+    ]
+
+
+@pytest.mark.django_db
+def test_cupo_idempotencia_y_baja(oferta):
+    _periodo, _turno, (com, otra, _), slots = oferta
+    com.cupo = 2
+    com.save()
+    a, b, c = _estudiantes(3)
+
+    primera = inscribir_estudiante_en_comision(a, com)
+    assert inscribir_estudiante_en_comision(a, com) == primera  # reintento
+    inscribir_estudiante_en_comision(b.pk, com.pk)
+    with pytest.raises(ValidationError) as exc:
+        inscribir_estudiante_en_comision(c, com)
+    assert exc.value.code == "sin_cupo"
+    com.refresh_from_db()
+    assert com.ocupados == 2
+
+    assert dar_de_baja_en_comision(b, com) and not dar_de_baja_en_comision(b, com)
+    inscribir_estudiante_en_comision(c, com)
+    com.refresh_from_db()
+    assert com.ocupados == 2
+
+    # cupo 0 = sin tope; el choque de horario no ocupa lugar
+    HorarioClase.objects.create(comision=com, timeslot=slots[0])
+    HorarioClase.objects.create(comision=otra, timeslot=slots[1])
+    with pytest.raises(ValidationError) as exc:
+        inscribir_estudiante_en_comision(a, otra)
+    assert exc.value.code == "choque_estudiante"
+    otra.refresh_from_db()
+    assert otra.ocupados == 0
+
+    Comision.objects.update(ocupados=7)
+    recontar_ocupados()
+    assert dict(Comision.objects.values_list("pk", "ocupados")) == {c.pk: 0 for c in oferta[2]} | {
+        com.pk: 2
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrencia_no_pasa_el_cupo(oferta):
+    _periodo, _turno, (com, *_), _slots = oferta
+    com.cupo = 5
+    com.save()
+    estudiantes = _estudiantes(12)
+    pedidos = [e.pk for e in estudiantes] * 2  # cada uno pide dos veces (reintentos)
+    largada = threading.Barrier(len(pedidos))
+    resultados, errores = [], []
+
+    def pedir(estudiante_id):
+        try:
+            largada.wait()
+            for _ in range(200):  # SQLite serializa escrituras: "locked" -> reintento
+                try:
+                    resultados.append(inscribir_estudiante_en_comision(estudiante_id, com.pk).pk)
+                    return
+                except ValidationError as e:
+                    resultados.append(e.code)
+                    return
+                except OperationalError:
+                    time.sleep(0.005)
+            errores.append(estudiante_id)
+        finally:
+            close_old_connections()
+            connection.close()
+
+    hilos = [threading.Thread(target=pedir, args=(pk,)) for pk in pedidos]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    assert not errores
+    com.refresh_from_db()
+    inscriptos = InscripcionComision.objects.filter(comision=com)
+    assert com.ocupados == inscriptos.count() == 5
+    assert len({i.estudiante_id for i in inscriptos}) == 5
+    ids = [r for r in resultados if r != "sin_cupo"]
+    assert set(ids) == set(inscriptos.values_list("pk", flat=True))
+
+
+@pytest.mark.django_db
+def test_inscribir_espacio_sin_duplicar(oferta):
+    _periodo, _turno, (com, *_), _slots = oferta
+    espacio = com.materia_en_plan.materia
+    (est,) = _estudiantes(1)
+    EstudianteProfesorado.objects.create(
+        estudiante=est, carrera=espacio.plan.carrera, plan=espacio.plan
+    )
+    datos = {
+        "estudiante_id": est.pk,
+        "plan_id": espacio.plan_id,
+        "espacio_id": espacio.pk,
+        "ciclo": "2025",
+    }
+    primera = api_inscribir_espacio(RequestFactory().post("/", datos))
+    reintento = api_inscribir_espacio(RequestFactory().post("/", datos))
+    assert primera.status_code == reintento.status_code == 200
+    assert InscripcionEspacio.objects.get().anio_academico == 2025
+    assert b'"ya_inscripto": true' in reintento.content
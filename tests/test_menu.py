@@ -0,0 +1,119 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import caches
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ui import context_processors, menu
+from ui.auth_views import grupos_de, resolve_role
+
+pytestmark = pytest.mark.django_db
+
+
+def _request(user, session=None):
+    request = RequestFactory().get("/dashboard")
+    request.user = user
+    request.session = session if session is not None else SessionStore()
+    return request
+
+
+@pytest.fixture
+def bedel(db):
+    user = get_user_model().objects.create_user("bedel", password="x")
+    user.groups.add(Group.objects.create(name="Bedel"))
+    return get_user_model().objects.get(pk=user.pk)  # sin cache de grupos
+
+
+def _items(secciones):
+    return [it for s in secciones for it in s["items"]]
+
+
+def test_menu_resuelto_y_congelado():
+    secciones = menu.resuelto("Bedel")
+    assert secciones is menu.resuelto("Bedel")
+    acta = next(it for it in _items(secciones) if it["label"] == "Cargar acta")
+    assert acta["path"] == acta["url"] == reverse("ui:cargar_acta")
+    assert "Correlatividades" not in [it["label"] for it in _items(secciones)]
+    assert "Correlatividades" in [it["label"] for it in _items(menu.resuelto("Admin"))]
+    assert menu.resuelto("cualquiera") is menu.resuelto("Estudiante")
+    with pytest.raises(TypeError):
+        acta["path"] = "/otra"
+    with pytest.raises(TypeError):
+        secciones[0]["items"][0] = {}
+
+
+def test_render_sin_queries_ni_reverse(bedel):
+    menu.resuelto("Bedel")  # ya armado por el primer render del proceso
+    request = _request(bedel)
+    with (
+        CaptureQueriesContext(connection) as q,
+        mock.patch.object(menu, "reverse", side_effect=AssertionError) as rev,
+    ):
+        rol = context_processors.role_from_request(request)
+        ctx = context_processors.menu(request)
+    assert rol["user_role"] == "Bedel" and ctx["menu"] is menu.resuelto("Bedel")
+    assert len(q.captured_queries) == 1  # los grupos, una vez por sesión
+    assert not rev.called
+
+    # otro request con la misma sesión (y el rol ya elegido) no consulta nada
+    request = _request(get_user_model().objects.get(pk=bedel.pk), request.session)
+    del request.session["active_role"], request.session["rol_actual"]
+    with CaptureQueriesContext(connection) as q:
+        assert context_processors.role_from_request(request)["user_role"] == "Bedel"
+        assert resolve_role(request.user, request.session) == "Bedel"
+    assert len(q.captured_queries) == 0
+
+
+def test_cambiar_grupos_invalida_la_sesion(bedel):
+    session = SessionStore()
+    assert grupos_de(bedel, session) == {"Bedel"}
+
+    otro = get_user_model().objects.get(pk=bedel.pk)
+    Group.objects.create(name="Secretaría").user_set.add(otro)
+    assert resolve_role(otro, session) == "Secretaría"
+
+    otro = get_user_model().objects.get(pk=bedel.pk)
+    otro.groups.clear()
+    assert otro.__dict__.get("_grupos_cache") is None
+    assert grupos_de(otro, session) == frozenset()
+
+    docente = Group.objects.create(name="Docente")
+    docente.user_set.add(otro)
+    docente.name = "X"
+    docente.save()  # renombrar un grupo invalida a todos
+    otro = get_user_model().objects.get(pk=bedel.pk)
+    assert grupos_de(otro, session) == {"X"}
+
+
+def test_revocar_grupo_no_revive_al_perder_el_cache(bedel):
+    session = SessionStore()
+    assert resolve_role(bedel, session) == "Bedel"
+
+    bedel.groups.clear()
+    caches["compartido"].clear()  # reinicio o cull: la versión que subió la signal se pierde
+    otro = get_user_model().objects.get(pk=bedel.pk)
+    assert resolve_role(otro, session) == "Estudiante"
+
+    # la versión vive en el cache compartido: otro proceso ve la revocación
+    Group.objects.get(name="Bedel").user_set.add(otro)
+    otro = get_user_model().objects.get(pk=bedel.pk)
+    assert resolve_role(otro, session) == "Bedel"
+    clave = f"ui:grupos:{bedel.pk}:version"
+    caches["compartido"].incr(clave)  # como lo haría la signal en otro worker
+    otro.groups.through.objects.filter(user_id=bedel.pk).delete()  # sin signals
+    otro = get_user_model().objects.get(pk=bedel.pk)
+    assert resolve_role(otro, session) == "Estudiante"
+
+
+def test_sidebar_renderiza_el_menu_resuelto(bedel):
+    request = _request(bedel)
+    html = render_to_string("ui/partials/sidebar.html", request=request)
+    assert f'href="{reverse("ui:cargar_acta")}"' in html
+    assert f'href="{reverse("ui:inscribir_materias")}"' in html
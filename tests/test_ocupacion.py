@@ -0,0 +1,117 @@
+import json
+from datetime import date, time
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from academia_core.models import Docente
+from academia_horarios import ocupacion
+from academia_horarios.models import Catedra, DocenteAsignacion, Horario, HorarioClase
+from ui.views_api import api_horarios_ocupados
+
+
+def _get(**params):
+    resp = api_horarios_ocupados(RequestFactory().get("/", params))
+    assert resp.status_code == 200
+    return json.loads(resp.content)
+
+
+def test_slots_de_turno_desde_grillas_salteando_recreos(db):
+    slots = ocupacion.slots_de_turno("manana")
+    assert slots[0] == (7 * 60 + 45, 8 * 60 + 25)
+    # 7:45-9:05 (2 bloques), recreo, 9:15-10:35 (2), recreo, 10:45-12:05 (2), 12:05-12:45
+    assert len(slots) == 7
+    assert (9 * 60 + 15, 9 * 60 + 55) in slots
+
+
+@pytest.mark.django_db
+def test_indice_docente_aula_y_curso(carrera, plan_estudios, oferta):
+    _periodo, turno, (c1, _c2, _c3), (s1, _s2, _s3) = oferta
+    doc = Docente.objects.create(dni="20333444", apellido="Sosa", nombre="Ema")
+    Horario.objects.create(
+        materia=c1.materia_en_plan.materia,
+        plan=plan_estudios,
+        profesorado=carrera,
+        anio=2,
+        docente=doc,
+        aula="Lab 1",
+        dia="ma",
+        inicio=time(8, 25),
+        fin=time(9, 5),
+        turno="manana",
+    )
+    HorarioClase.objects.create(comision=c1, timeslot=s1, aula="Aula 5")  # lunes 1er bloque
+    catedra = Catedra.objects.create(
+        materia_en_plan=c1.materia_en_plan, comision=c1, turno=turno, horas_semanales=2
+    )
+    DocenteAsignacion.objects.create(
+        catedra=catedra, docente=doc, condicion="INTERINO", fecha_desde=date(2025, 3, 1)
+    )
+
+    body = _get(turno="manana", docente=doc.id, aula="lab 1")
+    assert body["ocupado"][:2] == [0b01, 0b10]
+    assert body["libre"][1] == (1 << len(body["slots"])) - 1 - 0b10
+    assert {"dia": "ma", "inicio": "08:25", "fin": "09:05"} in body["ocupados"]
+
+    curso = _get(turno="manana", carrera=carrera.id, plan=plan_estudios.id, anio=1)
+    assert curso["ocupado"][0] == 0b01 and curso["ocupado"][1] == 0
+
+    # segunda consulta: sólo se lee la versión del cache, sin queries
+    with CaptureQueriesContext(connection) as ctx:
+        _get(turno="manana", aula="aula 5")
+    assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+def test_escrituras_invalidan_el_indice(carrera, plan_estudios, oferta):
+    _periodo, _turno, (c1, _c2, _c3), _slots = oferta
+    doc = Docente.objects.create(dni="20333555", apellido="Paz", nombre="Ivo")
+    assert _get(turno="manana", docente=doc.id)["ocupado"] == [0] * 6
+
+    h = Horario.objects.create(
+        materia=c1.materia_en_plan.materia,
+        plan=plan_estudios,
+        profesorado=carrera,
+        docente=doc,
+        dia="vi",
+        inicio=time(7, 45),
+        fin=time(9, 5),
+        turno="manana",
+    )
+    assert _get(turno="manana", docente=doc.id)["ocupado"][4] == 0b11
+
+    h.delete()
+    assert _get(turno="manana", docente=doc.id)["ocupado"][4] == 0
+
+
+@pytest.mark.django_db
+def test_version_compartida_entre_procesos(oferta):
+    _periodo, _turno, (c1, _c2, _c3), (s1, _s2, _s3) = oferta
+    compartido = caches["compartido"]
+    assert _get(turno="manana", aula="aula 5")["ocupado"][0] == 0
+
+    # otro worker guarda la grilla (sin señales en este proceso) y sube la versión compartida
+    HorarioClase.objects.bulk_create([HorarioClase(comision=c1, timeslot=s1, aula="Aula 5")])
+    compartido.incr(ocupacion.VERSION_KEY)
+    assert _get(turno="manana", aula="aula 5")["ocupado"][0] == 0b01
+
+    # si el cache pierde la versión no se vuelve a una ya usada: se rearma
+    HorarioClase.objects.update(aula="Otra")  # update(): sin señales
+    compartido.clear()
+    assert _get(turno="manana", aula="aula 5")["ocupado"][0] == 0
+
+
+@pytest.mark.django_db
+def test_turno_normalizado_y_desconocidos_rechazados():
+    assert _get(turno="Maniana")["turno"] == "manana"
+    assert _get(turno="noche")["turno"] == "vespertino"
+    assert _get(turno="sabado")["turno"] == "manana"  # el sábado va con la mañana
+    for turno in ("x", "manana2", "<script>"):
+        resp = api_horarios_ocupados(RequestFactory().get("/", {"turno": turno}))
+        assert resp.status_code == 400
+    assert set(ocupacion._indices) == {"manana", "vespertino"}
+    with pytest.raises(KeyError):
+        ocupacion.indice("maniana")  # sólo slugs canónicos
@@ -0,0 +1,127 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from academia_core.models import (
+    Condicion,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+    Movimiento,
+)
+from academia_core.promedios import promedio, promedios_diferidos
+from ui.forms import InscripcionProfesoradoForm
+
+
+@pytest.fixture
+def insc(carrera, plan_estudios):
+    for c, t in [("REGULAR", "REG"), ("PROMOCION", "REG"), ("LIBRE", "REG")]:
+        Condicion.objects.create(codigo=c, nombre=c.title(), tipo=t)
+    est = Estudiante.objects.create(dni="41000000", apellido="Rios", nombre="Eva")
+    return EstudianteProfesorado.objects.create(estudiante=est, carrera=carrera, plan=plan_estudios)
+
+
+@pytest.fixture
+def espacios(plan_estudios):
+    return [
+        EspacioCurricular.objects.create(
+            plan=plan_estudios,
+            materia=Materia.objects.create(nombre=f"P{i}"),
+            anio="1°",
+            cuatrimestre="A",
+        )
+        for i in range(6)
+    ]
+
+
+def _mov(insc, esp, nota, codigo="PROMOCION", **kw):
+    return Movimiento.objects.create(
+        inscripcion=insc,
+        espacio=esp,
+        tipo="REG",
+        condicion_id=codigo,
+        fecha=date(2024, 7, 1),
+        nota_num=nota,
+        **kw,
+    )
+
+
+def _estado(insc):
+    insc.refresh_from_db()
+    return insc.promedio_general, insc.cant_notas_aprobadas, insc.suma_notas_aprobadas
+
+
+@pytest.mark.django_db
+def test_alta_edicion_y_baja_actualizan_agregados(insc, espacios):
+    a = _mov(insc, espacios[0], 8)
+    _mov(insc, espacios[1], 7)
+    _mov(insc, espacios[2], 4)  # no aprueba: no cuenta
+    _mov(insc, espacios[3], None, codigo="REGULAR")
+    assert _estado(insc) == (Decimal("7.50"), 2, Decimal("15"))
+
+    a = Movimiento.objects.get(pk=a.pk)
+    a.nota_num = 10
+    a.save()
+    assert _estado(insc) == (Decimal("8.50"), 2, Decimal("17"))
+
+    a.condicion_id = "LIBRE"  # deja de aprobar
+    a.save()
+    assert _estado(insc) == (Decimal("7.00"), 1, Decimal("7"))
+
+    Movimiento.objects.filter(espacio=espacios[1]).get().delete()
+    assert _estado(insc) == (None, 0, Decimal("0"))
+
+
+@pytest.mark.django_db
+def test_guardar_un_movimiento_no_lee_la_historia(insc, espacios):
+    for i in range(4):
+        _mov(insc, espacios[i], 6 + i)
+    with CaptureQueriesContext(connection) as ctx:
+        _mov(insc, espacios[4], 9)
+    sqls = [q["sql"] for q in ctx.captured_queries]
+    assert len(sqls) == 3  # INSERT del movimiento + SELECT FOR UPDATE y UPDATE de la inscripción
+    assert not any('FROM "academia_core_movimiento"' in s for s in sqls)
+    assert _estado(insc)[:2] == (Decimal("7.80"), 5)
+
+
+@pytest.mark.django_db
+def test_promedios_diferidos_recalcula_una_vez_por_inscripcion(insc, espacios):
+    with CaptureQueriesContext(connection) as ctx:
+        with promedios_diferidos():
+            for i, esp in enumerate(espacios):
+                _mov(insc, esp, 5 + i, nota_texto="")
+    inserts = sum(q["sql"].startswith("INSERT") for q in ctx.captured_queries)
+    assert inserts == len(espacios)
+    # 6 inserts + 1 select de movimientos + 1 update (bulk)
+    assert len(ctx.captured_queries) == len(espacios) + 2
+    # aprueban 6, 7, 8, 9, 10
+    assert _estado(insc)[:2] == (Decimal("8.00"), 5)
+
+
+@pytest.mark.django_db
+def test_recalcular_promedio_reconstruye_agregados(insc, espacios):
+    _mov(insc, espacios[0], 9)
+    EstudianteProfesorado.objects.filter(pk=insc.pk).update(
+        suma_notas_aprobadas=0, cant_notas_aprobadas=0, promedio_general=None
+    )
+    insc.recalcular_promedio()
+    assert (insc.promedio_general, insc.cant_notas_aprobadas) == (Decimal("9.00"), 1)
+
+
+@pytest.mark.django_db
+def test_incremental_redondea_igual_que_el_recalculo(insc, espacios):
+    for esp, nota in zip(espacios, ("7.5", "7", "7", "7"), strict=False):
+        _mov(insc, esp, Decimal(nota))  # 28.5 / 4 = 7.125
+    incremental = _estado(insc)
+    insc.recalcular_promedio()
+    assert _estado(insc) == incremental
+    assert incremental[0] == promedio(Decimal("28.5"), 4)
+
+
+def test_agregados_no_editables_en_formularios():
+    campos = InscripcionProfesoradoForm.base_fields
+    assert "suma_notas_aprobadas" not in campos and "cant_notas_aprobadas" not in campos
@@ -0,0 +1,152 @@
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from academia_core import carton, vencimientos
+from academia_core.estado_academico import StudentAcademicSnapshot
+from academia_core.models import (
+    Carrera,
+    CartonFila,
+    Condicion,
+    EspacioCurricular,
+    Estudiante,
+    EstudianteProfesorado,
+    Materia,
+    Movimiento,
+    PlanEstudios,
+)
+from academia_core.utils_inscripciones import tiene_regularidad_vigente
+
+pytestmark = pytest.mark.django_db
+
+HOY = date(2025, 3, 1)
+VIGENCIA = timedelta(days=730)
+
+
+@pytest.fixture
+def datos(plan_estudios):
+    """Cinco estudiantes con un Regular en Álgebra que vence a los 0, 10, 20, 30 y -5 días
+    de HOY, y uno de otra carrera que vence a los 15."""
+    Condicion.objects.create(codigo="REGULAR", nombre="Regular", tipo="REG")
+    otro_plan = PlanEstudios.objects.create(
+        carrera=Carrera.objects.create(nombre="Prof. de Historia", abreviatura="PH"),
+        resolucion="99/2020",
+        nombre="Plan Historia",
+    )
+    inscs = {}
+    for i, (plan, dias) in enumerate(
+        [(plan_estudios, d) for d in (0, 10, 20, 30, -5)] + [(otro_plan, 15)]
+    ):
+        esp, _ = EspacioCurricular.objects.get_or_create(
+            plan=plan,
+            materia=Materia.objects.get_or_create(nombre="Álgebra")[0],
+            anio="1°",
+            cuatrimestre="A",
+        )
+        insc = EstudianteProfesorado.objects.create(
+            estudiante=Estudiante.objects.create(dni=f"3000000{i}", apellido=f"E{i}", nombre="X"),
+            carrera=plan.carrera,
+            plan=plan,
+        )
+        Movimiento.objects.create(
+            inscripcion=insc,
+            espacio=esp,
+            tipo="REG",
+            condicion_id="REGULAR",
+            fecha=HOY + timedelta(days=dias) - VIGENCIA,
+        )
+        inscs[dias] = (insc, esp)
+    carton.reconstruir()
+    return plan_estudios, otro_plan, inscs
+
+
+def _regular_hace(dias):
+    fecha = HOY - timedelta(days=dias)
+    return [carton.MovimientoSnap(1, 1, "REG", "REGULAR", fecha, None, "", False, False)]
+
+
+def test_regular_hasta_y_estado_segun_hoy():
+    vigente = carton.calcular(_regular_hace(100), [], [], hoy=HOY)
+    assert vigente["estado"] == "REGULAR" and vigente["regular_hasta"] == HOY + timedelta(630)
+    vencida = carton.calcular(_regular_hace(731), [], [], hoy=HOY)
+    assert vencida["estado"] == "LIBRE" and vencida["regular_hasta"] == HOY - timedelta(1)
+
+
+def test_vencer_pasa_a_libre_lo_vencido(datos):
+    _plan, _otro, inscs = datos
+    # reconstruir ya usó la fecha real (todo vencido): se simula el cartón a HOY
+    CartonFila.objects.update(estado="REGULAR")
+    assert vencimientos.vencer(HOY) == 1
+    assert vencimientos.vencer(HOY) == 0
+    insc, esp = inscs[-5]
+    assert CartonFila.objects.get(inscripcion=insc).estado == "LIBRE"
+    assert CartonFila.objects.filter(estado="REGULAR").count() == 5
+
+
+def test_vigencia_lee_la_columna(datos):
+    _plan, _otro, inscs = datos
+    for dias, (insc, esp) in inscs.items():
+        snap = StudentAcademicSnapshot.de(insc)
+        with CaptureQueriesContext(connection) as q:
+            vigente = tiene_regularidad_vigente(insc, esp, HOY)
+        assert len(q.captured_queries) == 1
+        assert vigente == snap.regularidad_vigente(esp, HOY) == (dias >= 0)
+    assert not tiene_regularidad_vigente(inscs[0][0].pk, 999999, HOY)
+
+
+def test_vigencia_empieza_con_la_regularidad(datos):
+    _plan, _otro, inscs = datos
+    insc, esp = inscs[10]
+    desde = HOY + timedelta(days=10) - VIGENCIA
+    snap = StudentAcademicSnapshot.de(insc)
+    for a_fecha, esperado in [(desde - timedelta(days=1), False), (desde, True)]:
+        assert tiene_regularidad_vigente(insc, esp, a_fecha) is esperado
+        assert snap.regularidad_vigente(esp, a_fecha) is esperado
+
+
+def test_por_vencer_keyset_por_carrera(datos):
+    plan, otro, inscs = datos
+    CartonFila.objects.update(estado="REGULAR")
+    vencimientos.vencer(HOY)
+
+    pagina = vencimientos.por_vencer(carrera_id=plan.carrera_id, dias=25, hoy=HOY, limite=2)
+    assert [it["dias"] for it in pagina["items"]] == [0, 10]
+    pagina = vencimientos.por_vencer(
+        carrera_id=plan.carrera_id, dias=25, hoy=HOY, limite=2, cursor=pagina["next"]
+    )
+    assert [it["dias"] for it in pagina["items"]] == [20] and pagina["next"] is None
+
+    (item,) = vencimientos.por_vencer(plan_id=otro.pk, hoy=HOY)["items"]
+    assert item["inscripcion"] == inscs[15][0].pk and item["materia"] == "Álgebra"
+    assert len(vencimientos.por_vencer(hoy=HOY)["items"]) == 5
+    with pytest.raises(ValueError):
+        vencimientos.por_vencer(cursor="nada")
+
+
+def test_api_y_comando(client, admin_user, datos):
+    plan, _otro, _inscs = datos
+    url = reverse("ui:api_regularidades_por_vencer")
+    client.force_login(get_user_model().objects.create_user("alumno", password="x"))
+    assert client.get(url).status_code == 403
+
+    client.force_login(admin_user)
+    # con la fecha real todos ya vencieron: el barrido los pasa a LIBRE
+    CartonFila.objects.update(estado="REGULAR")
+    out = StringIO()
+    call_command("vencer_regularidades", stdout=out)
+    assert out.getvalue().startswith("6 regularidades vencidas")
+    assert client.get(url, {"carrera": plan.carrera_id}).json() == {"items": [], "next": None}
+    assert client.get(url, {"dias": "x"}).status_code == 400
+
+    CartonFila.objects.update(estado="REGULAR")
+    out = StringIO()
+    call_command("vencer_regularidades", fecha=HOY.isoformat(), avisar=12, stdout=out)
+    lineas = out.getvalue().splitlines()
+    assert lineas[0] == f"1 regularidades vencidas al {HOY}"
+    assert lineas[-1] == f"2 vencen hasta el {HOY + timedelta(days=12)}"
@@ -0,0 +1,292 @@
+# ui/admision.py
+# Control de admisión para las vistas de inscripción (sala de espera del día que abre la
+# inscripción). Por cada request a una vista de ADMISION_VISTAS:
+#   - token bucket por usuario (ráfaga + reposición por minuto),
+#   - tope de requests en curso por carrera,
+#   - si no entra (o ya hay cola), un ticket con número de turno: el cliente consulta
+#     ui:api_admision_turno cada pocos segundos, sin tocar la base, hasta que le toca.
+# Todo vive en el cache "admision", en disco y compartido por los procesos del servidor
+# (CACHE_COMPARTIDO_DIR): un ticket emitido en un worker se consulta desde cualquier otro.
+# Los contadores no son atómicos entre procesos; un desvío se repone con EN_CURSO_TTL.
+# Cada contador se escribe con su TTL explícito (el alias no vence por defecto).
+#
+#   ADMISION_VISTAS = ("ui:inscribir_materias",)
+#   ADMISION_LIMITES = {"*": {"concurrencia": 40, "rafaga": 10, "por_minuto": 30},
+#                       "3": {"concurrencia": 10}}   # por id de carrera, completa con "*"
+#   ADMISION_SONDEO_S = 3                           # cada cuánto consulta el que espera
+
+from __future__ import annotations
+
+import secrets
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.urls import reverse
+
+from academia_core.models import EstudianteProfesorado
+
+LIMITES = {"concurrencia": 40, "rafaga": 10, "por_minuto": 30}
+SONDEO_S = 3
+TICKET_TTL = 15 * 60
+PASE_TTL = 60
+EN_CURSO_TTL = 5 * 60  # si un proceso muere con requests en curso, el contador se repone
+PENDIENTES_TTL = PASE_TTL + TICKET_TTL
+COLA_TTL = 2 * TICKET_TTL  # emitidos y atendidos vencen juntos, sin tickets vivos
+METRICAS_TTL = 24 * 60 * 60
+
+
+def _ahora() -> float:
+    return time.time()
+
+
+def _cache():
+    return caches["admision"]
+
+
+def _k(*partes) -> str:
+    return "admision:" + ":".join(str(p) for p in partes)
+
+
+def limites(carrera) -> dict:
+    conf = getattr(settings, "ADMISION_LIMITES", {})
+    return {**LIMITES, **conf.get("*", {}), **conf.get(str(carrera), {})}
+
+
+def _sondeo() -> int:
+    return getattr(settings, "ADMISION_SONDEO_S", SONDEO_S)
+
+
+def _contador(key) -> int:
+    return _cache().get(key) or 0
+
+
+def _sumar(key, n, timeout) -> int:
+    """get + set con el TTL del contador: el incr de FileBasedCache reescribe con el
+    TIMEOUT del alias y cada contador vencería por su cuenta."""
+    cache = _cache()
+    valor = (cache.get(key) or 0) + n
+    cache.set(key, valor, timeout=timeout)
+    return valor
+
+
+def _restar(key, timeout) -> None:
+    """Resta uno si el contador existe (uno vencido no queda en negativo)."""
+    cache = _cache()
+    valor = cache.get(key)
+    if valor is not None:
+        cache.set(key, valor - 1, timeout=timeout)
+
+
+def _sumar_cola(carrera, campo, n=1) -> int:
+    otro = "atendidos" if campo == "emitidos" else "emitidos"
+    _cache().touch(_k(carrera, otro), COLA_TTL)
+    return _sumar(_k(carrera, campo), n, COLA_TTL)
+
+
+# ---------- token bucket por usuario ----------
+def tomar_token(usuario_id, carrera) -> bool:
+    lim = limites(carrera)
+    cache, key, ahora = _cache(), _k("bucket", usuario_id), _ahora()
+    tokens, desde = cache.get(key) or (float(lim["rafaga"]), ahora)
+    tokens = min(float(lim["rafaga"]), tokens + (ahora - desde) * lim["por_minuto"] / 60)
+    ok = tokens >= 1
+    cache.set(key, (tokens - 1 if ok else tokens, ahora), timeout=TICKET_TTL)
+    return ok
+
+
+# ---------- concurrencia por carrera ----------
+def entrar(carrera, forzar=False) -> bool:
+    key = _k(carrera, "en_curso")
+    if _sumar(key, 1, EN_CURSO_TTL) <= limites(carrera)["concurrencia"] or forzar:
+        return True
+    salir(carrera)
+    return False
+
+
+def salir(carrera) -> None:
+    _restar(_k(carrera, "en_curso"), EN_CURSO_TTL)
+
+
+# ---------- cola ----------
+def _en_cola(carrera) -> int:
+    return max(_contador(_k(carrera, "emitidos")) - _contador(_k(carrera, "atendidos")), 0)
+
+
+def emitir(usuario_id, carrera, url) -> dict:
+    """Ticket del usuario: el que ya tenía pendiente o uno nuevo al final de la cola."""
+    cache = _cache()
+    ticket_id = cache.get(_k("usuario", usuario_id))
+    ticket = cache.get(_k("ticket", ticket_id)) if ticket_id else None
+    if ticket is None:
+        ticket_id = secrets.token_urlsafe(12)
+        ticket = {
+            "id": ticket_id,
+            "usuario": usuario_id,
+            "carrera": carrera,
+            "numero": _sumar_cola(carrera, "emitidos"),
+            "emitido": _ahora(),
+            "url": url,
+        }
+        cache.set(_k("ticket", ticket_id), ticket, timeout=TICKET_TTL)
+        cache.set(_k("usuario", usuario_id), ticket_id, timeout=TICKET_TTL)
+    return ticket
+
+
+def _avanzar(carrera) -> int:
+    """Deja pasar tantos turnos como lugares libres, a lo sumo una vez por sondeo. Los que
+    ya pasaron y todavía no llegaron (pendientes) cuentan como lugares ocupados."""
+    cache = _cache()
+    atendidos = _contador(_k(carrera, "atendidos"))
+    libres = (
+        limites(carrera)["concurrencia"]
+        - _contador(_k(carrera, "en_curso"))
+        - max(_contador(_k(carrera, "pendientes")), 0)
+    )
+    if libres > 0 and cache.add(_k(carrera, "avance"), True, timeout=_sondeo()):
+        n = min(libres, _contador(_k(carrera, "emitidos")) - atendidos)
+        if n > 0:
+            atendidos = _sumar_cola(carrera, "atendidos", n)
+            _sumar(_k(carrera, "pendientes"), n, PENDIENTES_TTL)
+    return atendidos
+
+
+def consultar(ticket_id) -> dict | None:
+    """Estado del ticket (None si no existe). Si ya le tocó, deja un pase para el próximo
+    request de su usuario. El id es secreto: quien lo tiene es el que hizo la fila."""
+    cache = _cache()
+    ticket = cache.get(_k("ticket", ticket_id))
+    if ticket is None:
+        return None
+    usuario_id, carrera = ticket["usuario"], ticket["carrera"]
+    atendidos = _avanzar(carrera)
+    if ticket["numero"] > atendidos:
+        return {
+            "estado": "esperando",
+            "turno": ticket["numero"],
+            "adelante": ticket["numero"] - atendidos - 1,
+            "reintentar_en": _sondeo(),
+        }
+    espera = _ahora() - ticket["emitido"]
+    cache.delete_many([_k("ticket", ticket_id), _k("usuario", usuario_id)])
+    cache.set(_k("pase", usuario_id), carrera, timeout=PASE_TTL)
+    _sumar(_k(carrera, "espera_ms"), int(espera * 1000), METRICAS_TTL)
+    _sumar(_k(carrera, "esperas"), 1, METRICAS_TTL)
+    if espera > (cache.get(_k(carrera, "espera_max")) or 0):
+        cache.set(_k(carrera, "espera_max"), espera, timeout=METRICAS_TTL)
+    return {"estado": "adelante", "url": ticket["url"], "espera_s": round(espera, 1)}
+
+
+def metricas(carreras) -> dict:
+    """{carrera: en_cola, en_curso, pendientes, emitidos, atendidos, espera_prom_s,
+    espera_max_s}."""
+    res = {}
+    for c in carreras:
+        esperas = _contador(_k(c, "esperas"))
+        res[str(c)] = {
+            "en_cola": _en_cola(c),
+            "en_curso": _contador(_k(c, "en_curso")),
+            "pendientes": max(_contador(_k(c, "pendientes")), 0),
+            "emitidos": _contador(_k(c, "emitidos")),
+            "atendidos": _contador(_k(c, "atendidos")),
+            "espera_prom_s": round(_contador(_k(c, "espera_ms")) / esperas / 1000, 1)
+            if esperas
+            else 0.0,
+            "espera_max_s": round(_cache().get(_k(c, "espera_max")) or 0.0, 1),
+        }
+    return res
+
+
+def carreras_conocidas() -> list[str]:
+    return ["*", *(c for c in getattr(settings, "ADMISION_LIMITES", {}) if c != "*")]
+
+
+# ---------- middleware ----------
+def _carreras_propias(request) -> list[str]:
+    """Carreras en las que está inscripto el estudiante del usuario (una vez por sesión)."""
+    if "_admision_carreras" not in request.session:
+        perfil = getattr(request.user, "perfil", None)
+        carreras = []
+        if perfil is not None and perfil.estudiante_id:
+            carreras = (
+                EstudianteProfesorado.objects.filter(estudiante_id=perfil.estudiante_id)
+                .order_by("pk")
+                .values_list("carrera_id", flat=True)
+            )
+        request.session["_admision_carreras"] = list(dict.fromkeys(str(c) for c in carreras))
+    return request.session["_admision_carreras"]
+
+
+def carrera_de(request) -> str:
+    """Carrera del request: la del parámetro si es una de las del estudiante (un id ajeno
+    no elige límite ni cola), si no la primera suya; "*" si no tiene."""
+    propias = _carreras_propias(request)
+    datos = request.POST if request.method == "POST" else request.GET
+    for nombre in ("carrera", "carrera_id", "profesorado_id"):
+        if datos.get(nombre) in propias:
+            return datos[nombre]
+    return propias[0] if propias else "*"
+
+
+def _esperar(request, ticket) -> JsonResponse:
+    atendidos = _contador(_k(ticket["carrera"], "atendidos"))
+    data = {
+        "estado": "esperando",
+        "ticket": ticket["id"],
+        "turno": ticket["numero"],
+        "adelante": max(ticket["numero"] - atendidos - 1, 0),
+        "consultar": reverse("ui:api_admision_turno", args=[ticket["id"]]),
+        "reintentar_en": _sondeo(),
+    }
+    if request.method == "GET" and "json" not in request.headers.get("Accept", ""):
+        resp = render(request, "ui/admision/espera.html", data, status=429)
+    else:
+        resp = JsonResponse(data, status=429)
+    resp["Retry-After"] = str(data["reintentar_en"])
+    return resp
+
+
+class AdmisionMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "ADMISION_VISTAS", ()):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        carrera = getattr(request, "_admision_carrera", None)
+        if carrera is not None:
+            salir(carrera)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if match is None or match.view_name not in settings.ADMISION_VISTAS:
+            return None
+        if not request.user.is_authenticated:
+            return None  # el login_required de la vista lo manda a loguearse
+        uid, cache = request.user.pk, _cache()
+        carrera = carrera_de(request)
+
+        pase = cache.get(_k("pase", uid))
+        if pase is not None:  # le tocó el turno: entra aunque esté lleno
+            cache.delete(_k("pase", uid))
+            _restar(_k(pase, "pendientes"), PENDIENTES_TTL)
+            entrar(pase, forzar=True)
+            request._admision_carrera = pase
+            return None
+
+        pendiente = cache.get(_k("usuario", uid))
+        if pendiente is None and not _en_cola(carrera) and tomar_token(uid, carrera):
+            if entrar(carrera):
+                request._admision_carrera = carrera
+                return None
+        return _esperar(request, emitir(uid, carrera, request.get_full_path()))
+
+
+def limpiar() -> None:
+    """Vacía buckets, colas y métricas (tests)."""
+    _cache().clear()
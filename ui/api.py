@@ -7,9 +7,18 @@ from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponseBadRequest, JsonResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.views.decorators.http import require_GET, require_POST
 
+from academia_core import carton, vencimientos
+from academia_core.actas import cargar_acta, planilla
+from academia_core.busqueda import buscar_estudiantes
+
+from . import admision, descubrimiento
+from .auth_views import resolve_role
+from .cache_respuestas import cacheada
 from .forms import InscripcionProfesoradoForm
+from .views import estudiante_id_para_carton
 
 logger = logging.getLogger(__name__)
 
@@ -28,78 +37,6 @@ def _best_label(obj):
     return str(obj)
 
 
-def _find_plan_model():
-    """
-    Busca un modelo que represente 'Plan' (PlanEstudio/Plan/etc.) con un FK a Profesorado/Carrera.
-    """
-    candidates = []
-    for m in apps.get_models():
-        n = m.__name__.lower()
-        # el nombre del modelo debe insinuar que es un plan
-        if "plan" in n:
-            # Heurística: que tenga algún FK que suene a profesorados/carreras
-            fks = [f for f in m._meta.get_fields() if getattr(f, "many_to_one", False)]
-            for fk in fks:
-                fkname = fk.name.lower()
-                target = fk.related_model.__name__.lower()
-                if any(k in fkname for k in ("carr", "prof")) or any(
-                    k in target for k in ("carr", "prof")
-                ):
-                    candidates.append(m)
-                    break
-    # si hay muchos, priorizo los que incluyan 'estudio' en el nombre
-    for m in candidates:
-        if "estudio" in m.__name__.lower():
-            return m
-    return candidates[0] if candidates else None
-
-
-def _find_espacio_model():
-    """
-    Busca un modelo de 'materias/espacios/asignaturas' asociado a Plan.
-    """
-    for m in apps.get_models():
-        n = m.__name__.lower()
-        if any(k in n for k in ("espacio", "materia", "asignatura")):
-            # que tenga FK a un modelo cuyo nombre contenga 'plan'
-            fks = [f for f in m._meta.get_fields() if getattr(f, "many_to_one", False)]
-            for fk in fks:
-                target = fk.related_model.__name__.lower()
-                if "plan" in target:
-                    return m
-    # fallback: el primero que tenga muchos campos tipo 'anio', 'cuatrimestre' y algún FK a plan
-    for m in apps.get_models():
-        n = m.__name__.lower()
-        if any(k in n for k in ("espacio", "materia", "asignatura")):
-            return m
-    return None
-
-
-def _first_matching_fk_name(model, *candidates):
-    """
-    Devuelve el nombre de FK del 'model' cuyo nombre coincida con alguno de 'candidates'.
-    Si no hay match exacto, intenta por el modelo de destino (profesorado/carrera/plan).
-    """
-    fks = [f for f in model._meta.get_fields() if getattr(f, "many_to_one", False)]
-    # 1) por nombre del campo
-    for wanted in candidates:
-        for fk in fks:
-            if fk.name.lower() == wanted.lower():
-                return fk.name
-    # 2) por nombre del modelo de destino
-    for fk in fks:
-        target = fk.related_model.__name__.lower()
-        for wanted in candidates:
-            if wanted.lower() in target:
-                return fk.name
-    # 3) por heurística: el primero que “suena”
-    for fk in fks:
-        nm = fk.name.lower()
-        if any(k in nm for k in candidates):
-            return fk.name
-    return fks[0].name if fks else None
-
-
 # ============ Endpoints ============
 
 
@@ -109,6 +46,7 @@ def api_planes_por_carrera(request):
     """
     GET /ui/api/planes?profesorado=<id> o ?prof=<id>
     Devuelve: {"planes":[{"id":..., "nombre":"..."}]}
+    Modelo, FK y etiqueta salen de ui.descubrimiento (resueltos al arrancar).
     """
     carrera_id = (
         request.GET.get("profesorado")
@@ -119,35 +57,14 @@ def api_planes_por_carrera(request):
     )
     if not carrera_id:
         return HttpResponseBadRequest("Falta carrera o prof")
+    if not carrera_id.isdigit():
+        return HttpResponseBadRequest("carrera debe ser un número")
 
-    PlanModel = _find_plan_model()
-    if not PlanModel:
-        logger.error("No se pudo inferir el modelo de Plan (Plan/PlanEstudio).")
+    fuente = descubrimiento.PLANES
+    if fuente is None:
         return HttpResponseBadRequest("No se pudo inferir el modelo de Plan.")
-
-    fk_name = _first_matching_fk_name(PlanModel, "carrera", "profesorado", "titulo", "prof")
-    logger.debug("PlanModel=%s, FK a profesorados=%s", PlanModel.__name__, fk_name)
-
-    qs = PlanModel.objects.all()
-    # filtrar por el FK descubierto
-    if fk_name:
-        qs = qs.filter(**{f"{fk_name}_id": carrera_id})
-
-    # filtros típicos de soft delete / activo si existieran
-    if hasattr(PlanModel, "activo"):
-        qs = qs.filter(activo=True)
-    if hasattr(PlanModel, "is_active"):
-        qs = qs.filter(is_active=True)
-
-    planes_qs = qs.order_by("pk")
-    planes_data = []
-    for p in planes_qs:
-        # Ajustá estos getattr a tus campos reales
-        nombre = getattr(p, "nombre", None) or str(p)
-        # No necesitamos resol ni anio para este endpoint, solo id y nombre
-        planes_data.append({"id": p.id, "nombre": nombre})
-
-    return JsonResponse({"planes": planes_data})
+    planes = [{"id": it["id"], "nombre": it["label"]} for it in fuente.items(carrera_id)]
+    return JsonResponse({"planes": planes})
 
 
 @login_required
@@ -160,31 +77,38 @@ def api_materias_por_plan(request):
     plan_id = request.GET.get("plan_id")
     if not plan_id:
         return HttpResponseBadRequest("Falta plan_id")
+    if not plan_id.isdigit():
+        return HttpResponseBadRequest("plan_id debe ser un número")
 
-    EspacioModel = _find_espacio_model()
-    PlanModel = _find_plan_model()
-    if not EspacioModel or not PlanModel:
-        logger.error("No se pudieron inferir modelos de Espacio/Materia o Plan.")
+    fuente = descubrimiento.ESPACIOS
+    if fuente is None or descubrimiento.PLANES is None:
         return HttpResponseBadRequest("No se pudieron inferir modelos (Materias/Plan).")
+    return JsonResponse({"items": fuente.items(plan_id)})
 
-    fk_name = _first_matching_fk_name(EspacioModel, "plan", "plan_estudio", "planestudio")
-    logger.debug("EspacioModel=%s, FK a plan=%s", EspacioModel.__name__, fk_name)
-
-    qs = EspacioModel.objects.all()
-    if fk_name:
-        qs = qs.filter(**{f"{fk_name}_id": plan_id})
-
-    if hasattr(EspacioModel, "activo"):
-        qs = qs.filter(activo=True)
-    if hasattr(EspacioModel, "is_active"):
-        qs = qs.filter(is_active=True)
 
-    items = [{"id": obj.pk, "label": _best_label(obj)} for obj in qs.order_by("pk")]
-    return JsonResponse({"items": items})
+@login_required
+@require_GET
+def api_estudiantes_buscar(request):
+    """
+    GET /ui/api/estudiantes/buscar/?q=<texto|dni>&cursor=<next>&limit=20[&todos=1]
+    Devuelve: {"items":[{"id":..,"apellido":..,"nombre":..,"dni":..,"label":..}], "next": ...}
+    Sin acentos/mayúsculas, DNI por prefijo; `next` es el cursor de la página siguiente.
+    """
+    try:
+        data = buscar_estudiantes(
+            request.GET.get("q", ""),
+            cursor=request.GET.get("cursor") or None,
+            limite=int(request.GET.get("limit") or 20),
+            solo_activos=request.GET.get("todos") != "1",
+        )
+    except ValueError:
+        return HttpResponseBadRequest("cursor o limit inválido")
+    return JsonResponse(data)
 
 
 @login_required
 @require_GET
+@cacheada(extra=lambda: timezone.now().year)
 def api_cohortes_por_plan(request):
     """
     GET /ui/api/cohortes?plan_id=<ID>&start=<YYYY>&end=<YYYY>&order=asc|desc
@@ -295,3 +219,159 @@ def api_calcular_estado_administrativo(request):
             "is_cert_docente": is_cert_docente,
         }
     )
+
+
+ROLES_ACTA = {"Admin", "Secretaría", "Bedel", "Docente"}
+
+
+@login_required
+@require_GET
+def api_acta_planilla(request):
+    """
+    GET /ui/api/actas/planilla/?espacio=<id>&tipo=REG|FIN[&anio=<ciclo>][&fecha=AAAA-MM-DD]
+    Devuelve: {"items":[{"inscripcion":..,"apellido":..,"nombre":..,"dni":..}]}
+    Cursantes del espacio (REG) o inscriptos a la mesa (FIN) para armar el acta.
+    Nombres y DNI: sólo para los roles que cargan actas.
+    """
+    if resolve_role(request.user, request.session) not in ROLES_ACTA:
+        return JsonResponse({"error": "No tenés permiso para ver planillas de actas."}, status=403)
+    espacio = request.GET.get("espacio") or ""
+    tipo = request.GET.get("tipo") or "REG"
+    anio = request.GET.get("anio") or ""
+    if not espacio.isdigit() or tipo not in ("REG", "FIN") or (anio and not anio.isdigit()):
+        return HttpResponseBadRequest("Parámetros inválidos (espacio, tipo, anio)")
+    fecha = None
+    if request.GET.get("fecha"):
+        try:
+            fecha = parse_date(request.GET["fecha"])
+        except ValueError:  # con formato válido pero imposible (2024-13-45)
+            fecha = None
+        if fecha is None:
+            return HttpResponseBadRequest("Parámetro inválido (fecha)")
+    items = planilla(int(espacio), tipo, anio_academico=int(anio) if anio else None, fecha=fecha)
+    return JsonResponse({"items": items})
+
+
+@login_required
+@require_POST
+def api_acta_guardar(request):
+    """
+    POST /ui/api/actas/guardar/ (JSON)
+    {"espacio":..,"tipo":"REG|FIN","fecha":"AAAA-MM-DD","folio":..,"libro":..,
+     "disposicion_interna":..,"solo_validar":false,
+     "filas":[{"inscripcion":..,"condicion":"REGULAR","nota":7,"ausente":false}, ...]}
+    Devuelve {"ok":true,"creados":N} o, si alguna fila no valida, 400 con
+    {"ok":false,"errores":[{"fila":..,"inscripcion":..,"error":".."}]} sin guardar nada.
+    """
+    if resolve_role(request.user, request.session) not in ROLES_ACTA:
+        return JsonResponse(
+            {"ok": False, "error": "No tenés permiso para cargar actas."}, status=403
+        )
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return HttpResponseBadRequest("Invalid JSON")
+
+    filas = data.get("filas")
+    try:
+        fecha = parse_date(data.get("fecha") or "")
+    except ValueError:
+        fecha = None
+    if fecha is None or not isinstance(filas, list) or not filas:
+        return JsonResponse({"ok": False, "error": "Faltan fecha o filas."}, status=400)
+    try:
+        res = cargar_acta(
+            data.get("espacio"),
+            data.get("tipo"),
+            fecha,
+            [f if isinstance(f, dict) else {} for f in filas],
+            folio=(data.get("folio") or "").strip(),
+            libro=(data.get("libro") or "").strip(),
+            disposicion_interna=(data.get("disposicion_interna") or "").strip(),
+            solo_validar=bool(data.get("solo_validar")),
+        )
+    except ValueError as e:
+        return JsonResponse({"ok": False, "error": str(e)}, status=400)
+
+    if not res.ok:
+        errores = [{"fila": n, "inscripcion": i, "error": msg} for n, i, msg in res.errores]
+        return JsonResponse({"ok": False, "validas": res.validas, "errores": errores}, status=400)
+    return JsonResponse({"ok": True, "validas": res.validas, "creados": len(res.creados)})
+
+
+@login_required
+@require_GET
+def api_carton(request):
+    """
+    GET /ui/api/carton/[?est=<id>]
+    Devuelve: {"carreras":[{"inscripcion":..,"carrera":..,"totales":{..},"filas":[..]}]}
+    El estudiante sólo ve su propio cartón; Bedel/Secretaría/Admin indican ?est=.
+    """
+    est_id = estudiante_id_para_carton(request)
+    if est_id is None:
+        return JsonResponse({"carreras": []})
+    grupos = carton.por_carrera(carton.de_estudiante(est_id))
+    for g in grupos:
+        g["filas"] = [carton.a_dict(f) for f in g["filas"]]
+    return JsonResponse({"carreras": grupos})
+
+
+ROLES_VENCIMIENTOS = {"Admin", "Secretaría", "Bedel"}
+
+
+@login_required
+@require_GET
+def api_regularidades_por_vencer(request):
+    """
+    GET /ui/api/regularidades/por-vencer/?carrera=<id>&plan=<id>&dias=60&cursor=<next>&limit=50
+    Devuelve: {"items":[{"inscripcion":..,"apellido":..,"materia":..,"regular_hasta":..,
+    "dias":..}], "next": ...}, de la más próxima a vencer a la más lejana.
+    """
+    if resolve_role(request.user, request.session) not in ROLES_VENCIMIENTOS:
+        return JsonResponse({"error": "No tenés permiso para ver vencimientos."}, status=403)
+    params = {k: request.GET.get(k) or "" for k in ("carrera", "plan", "dias", "limit")}
+    if any(v and not v.isdigit() for v in params.values()):
+        return HttpResponseBadRequest("Parámetros inválidos (carrera, plan, dias, limit)")
+    try:
+        data = vencimientos.por_vencer(
+            carrera_id=int(params["carrera"] or 0) or None,
+            plan_id=int(params["plan"] or 0) or None,
+            dias=int(params["dias"] or vencimientos.DIAS),
+            cursor=request.GET.get("cursor") or None,
+            limite=int(params["limit"] or vencimientos.LIMITE),
+        )
+    except ValueError:
+        return HttpResponseBadRequest("cursor inválido")
+    return JsonResponse(data)
+
+
+@require_GET
+def api_admision_turno(request, ticket):
+    """
+    GET /ui/api/admision/turno/<ticket>  (lo consulta la sala de espera cada pocos segundos)
+    {"estado": "esperando", "turno", "adelante", "reintentar_en"} o
+    {"estado": "adelante", "url", "espera_s"}. Sólo cache: ni sesión ni usuario, el ticket
+    es la credencial, así que no toca la base.
+    """
+    data = admision.consultar(ticket)
+    if data is None:
+        return JsonResponse({"error": "Turno inexistente o vencido."}, status=404)
+    return JsonResponse(data)
+
+
+ROLES_ADMISION = {"Admin", "Secretaría", "Bedel"}
+
+
+@login_required
+@require_GET
+def api_admision_metricas(request):
+    """
+    GET /ui/api/admision/metricas/?carrera=<id>
+    Por carrera: en_cola, en_curso, emitidos, atendidos, espera_prom_s, espera_max_s.
+    """
+    if resolve_role(request.user, request.session) not in ROLES_ADMISION:
+        return JsonResponse({"error": "No tenés permiso para ver la sala de espera."}, status=403)
+    carrera = request.GET.get("carrera") or ""
+    if carrera and not carrera.isdigit():
+        return HttpResponseBadRequest("carrera inválida")
+    return JsonResponse(admision.metricas([carrera] if carrera else admision.carreras_conocidas()))
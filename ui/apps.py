@@ -6,4 +6,7 @@ class UiConfig(AppConfig):
     name = "ui"
 
     def ready(self):
-        from . import signals  # noqa
+        from . import descubrimiento, signals  # noqa
+
+        # modelos de los selects en cascada de ui.api: heurísticas una sola vez
+        descubrimiento.construir()
@@ -2,8 +2,49 @@
 from django.contrib.auth.views import LoginView
 from django.urls import reverse
 
+from academia_core import versiones
 
-def resolve_role(user) -> str:
+# Grupos del usuario cacheados en el objeto user (el mismo durante el request) y en la
+# sesión, validados contra versiones en el cache compartido entre procesos que suben las
+# signals de User.groups / Group (ver ui.signals). Así resolver el rol no consulta la base.
+_SESION_GRUPOS = "_grupos"
+
+
+def _claves_version(user_id) -> tuple[str, str]:
+    return ("ui:grupos:version", f"ui:grupos:{user_id}:version")
+
+
+def _version_grupos(user_id) -> list[int]:
+    # una versión perdida arranca en un valor nuevo: los grupos de la sesión se releen
+    return list(versiones.leer(*_claves_version(user_id)))
+
+
+def invalidar_grupos(user_id=None) -> None:
+    """Sube la versión de los grupos de un usuario (o de todos, con None)."""
+    versiones.subir_al_confirmar(_claves_version(user_id)[0 if user_id is None else 1])
+
+
+def grupos_de(user, session=None) -> frozenset[str]:
+    """Nombres de los grupos del usuario; a lo sumo una query por sesión y cambio de grupos."""
+    if not getattr(user, "is_authenticated", False):
+        return frozenset()
+    grupos = getattr(user, "_grupos_cache", None)
+    if grupos is not None:
+        return grupos
+
+    version = _version_grupos(user.pk)
+    guardado = session.get(_SESION_GRUPOS) if session is not None else None
+    if guardado and guardado[:2] == [user.pk, version]:
+        grupos = frozenset(guardado[2])
+    else:
+        grupos = frozenset(user.groups.values_list("name", flat=True))
+        if session is not None:
+            session[_SESION_GRUPOS] = [user.pk, version, sorted(grupos)]
+    user._grupos_cache = grupos
+    return grupos
+
+
+def resolve_role(user, session=None) -> str:
     """
     Devuelve el rol principal del usuario según superusuario y grupos.
     Posibles valores: 'Admin', 'Secretaría', 'Bedel', 'Docente', 'Estudiante'.
@@ -14,7 +55,7 @@ def resolve_role(user) -> str:
     if user.is_superuser:
         return "Admin"
 
-    names = set(user.groups.values_list("name", flat=True))
+    names = grupos_de(user, session)
     if "Secretaría" in names:
         return "Secretaría"
     if "Bedel" in names:
@@ -48,7 +89,7 @@ class RoleAwareLoginView(LoginView):
             return redirect_to
 
         # 2) Determinar rol y guardarlo en sesión
-        role = resolve_role(self.request.user)
+        role = resolve_role(self.request.user, self.request.session)
         if hasattr(self.request, "session"):
             self.request.session["active_role"] = role
 
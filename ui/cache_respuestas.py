@@ -0,0 +1,102 @@
+# ui/cache_respuestas.py
+# Cache de las respuestas JSON de datos de referencia (selects en cascada de la UI).
+# La clave es vista + versiones de las tablas que lee (academia_core.versiones) + query
+# string: un cambio en la tabla cambia la clave, no hace falta borrar nada. Los cuerpos
+# van al cache "respuestas" (por proceso o en disco); las versiones, al compartido.
+# Se guarda el cuerpo ya codificado con su ETag fuerte; If-None-Match coincidente -> 304.
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import Counter
+from functools import wraps
+
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+from academia_core import versiones
+
+ALIAS = "respuestas"
+
+_contadores: Counter = Counter()
+_lock = threading.Lock()
+
+
+def _contar(vista: str, evento: str) -> None:
+    with _lock:
+        _contadores[(vista, evento)] += 1
+
+
+def estadisticas() -> dict[str, dict[str, int]]:
+    """{vista: {"hit", "miss", "304"}} de este proceso."""
+    with _lock:
+        datos = dict(_contadores)
+    res: dict[str, dict[str, int]] = {}
+    for (vista, evento), n in sorted(datos.items()):
+        res.setdefault(vista, {"hit": 0, "miss": 0, "304": 0})[evento] = n
+    return res
+
+
+def _clave(vista: str, tablas, extra, request) -> str:
+    params = sorted((k, v) for k, vs in request.GET.lists() for v in vs)
+    partes = (versiones.de(*tablas) if tablas else (), extra() if extra else None, params)
+    return f"respuesta:{vista}:{hashlib.sha1(repr(partes).encode()).hexdigest()}"
+
+
+def _responder(request, vista: str, etag: str, cuerpo: bytes, tipo: str) -> HttpResponse:
+    pedidas = parse_etags(request.headers.get("If-None-Match", ""))
+    # comparación débil, como pide If-None-Match: W/"x" coincide con "x"
+    if "*" in pedidas or etag in (e.removeprefix("W/") for e in pedidas):
+        _contar(vista, "304")
+        resp = HttpResponseNotModified()
+    else:
+        resp = HttpResponse(cuerpo, content_type=tipo)
+    resp["ETag"] = etag
+    resp["Cache-Control"] = "private, no-cache"  # el navegador guarda y revalida
+    return resp
+
+
+def cacheada(*tablas: str, extra=None):
+    """
+    Cachea las respuestas 200 de una vista GET de datos de referencia.
+    `tablas`: labels de academia_core.versiones.TABLAS que lee la vista;
+    `extra`: callable cuyo valor también entra en la clave (p. ej. la versión de grillas).
+    """
+    desconocidas = set(tablas) - set(versiones.TABLAS)
+    if desconocidas:
+        raise ValueError(f"Tablas sin versión (agregar a versiones.TABLAS): {desconocidas}")
+
+    def decorador(view):
+        vista = view.__name__
+
+        @wraps(view)
+        def envoltura(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+            cache = caches[ALIAS]
+            clave = _clave(vista, tablas, extra, request)
+            guardada = cache.get(clave)
+            if guardada is not None:
+                _contar(vista, "hit")
+            else:
+                _contar(vista, "miss")
+                resp = view(request, *args, **kwargs)
+                if resp.status_code != 200 or resp.streaming:
+                    return resp
+                etag = f'"{hashlib.sha1(resp.content).hexdigest()[:20]}"'
+                guardada = (etag, resp.content, resp["Content-Type"])
+                cache.set(clave, guardada)
+            return _responder(request, vista, *guardada)
+
+        return envoltura
+
+    return decorador
+
+
+def limpiar() -> None:
+    """Vacía respuestas y contadores (tests)."""
+    caches[ALIAS].clear()
+    with _lock:
+        _contadores.clear()
@@ -1,77 +1,53 @@
 # ui/context_processors.py
-import unicodedata
-
 from django.conf import settings
-from django.urls import NoReverseMatch, reverse
 
-from .menu import for_role
+from academia_core.utils import normalizar
+
+from .auth_views import grupos_de
+from .menu import resuelto
 
 # --- helpers de rol ---
 ROLE_MAP = {
     "admin": "Admin",
     "administrador": "Admin",
     "bedel": "Bedel",
-    "secretaria": "Secretaria",
-    "secretaría": "Secretaria",
+    "secretaria": "Secretaría",
     "docente": "Docente",
     "estudiante": "Estudiante",
     "alumno": "Estudiante",
 }
 
 
-def _norm(s):  # quita acentos y lower
-    s = unicodedata.normalize("NFKD", s or "")
-    return "".join(ch for ch in s if not unicodedata.combining(ch)).lower().strip()
+_norm = normalizar  # quita acentos y lower
 
 
-def _infer_role_from_user(user):
+def _infer_role_from_user(user, session=None):
     if not user or not user.is_authenticated:
         return ""
     if getattr(user, "is_superuser", False):
         return "Admin"
-    for g in user.groups.all():
-        hit = ROLE_MAP.get(_norm(g.name))
+    for name in sorted(grupos_de(user, session)):
+        hit = ROLE_MAP.get(_norm(name))
         if hit:
             return hit
     return ""
 
 
-# --- resolver paths de menú ---
-def _resolve_menu_paths(items):
-    for it in items:
-        url_name = it.pop("url_name", None)
-        if url_name and "path" not in it:
-            try:
-                it["path"] = reverse(url_name)
-            except NoReverseMatch:
-                it["path"] = "#"
-        if "url" not in it and "path" in it:
-            it["url"] = it["path"]
-        if isinstance(it.get("children"), list):
-            _resolve_menu_paths(it["children"])
+def _role(request):
+    # leer rol desde sesión (ambas claves) o inferir del user; una vez por request
+    role = getattr(request, "_ui_role", None)
+    if role is None:
+        session = getattr(request, "session", None)
+        role = (
+            session.get("active_role") or session.get("rol_actual") if session else None
+        ) or _infer_role_from_user(getattr(request, "user", None), session)
+        request._ui_role = role
+    return role
 
 
 def menu(request):
-    # leer rol desde sesión (ambas claves) o inferir del user
-    role = (
-        request.session.get("rol_actual")
-        or request.session.get("active_role")
-        or _infer_role_from_user(getattr(request, "user", None))
-    )
-
-    sections = for_role(role) or []
-    # clonar para no mutar el original
-    resolved = []
-    for s in sections:
-        node = dict(s)  # copia superficial
-        _resolve_menu_paths(node.get("children", []))
-        if node.get("url_name") and not node.get("path"):
-            try:
-                node["path"] = reverse(node["url_name"])
-                node["url"] = node["path"]
-            except Exception:
-                node["path"] = node["url"] = "#"
-        resolved.append(node)
+    # árbol congelado y ya resuelto por rol: sin queries ni reverse() por render
+    resolved = resuelto(_role(request))
 
     # ⚠️ devolvemos AMBOS nombres por compatibilidad con templates
     return {"menu": resolved, "menu_sections": resolved}
@@ -79,12 +55,13 @@ def menu(request):
 
 def role_from_request(request):
     # unificar claves de sesión y exponer 'user_role'
-    role = request.session.get("active_role") or request.session.get("rol_actual")
-    if not role:
-        role = _infer_role_from_user(getattr(request, "user", None))
-    if role:
-        request.session["active_role"] = role
-        request.session["rol_actual"] = role
+    role = _role(request)
+    session = getattr(request, "session", None)
+    if role and session is not None:
+        # sólo si cambió: asignar siempre marca la sesión y la vuelve a guardar
+        for key in ("active_role", "rol_actual"):
+            if session.get(key) != role:
+                session[key] = role
     return {"user_role": role, "role": role, "active_role": role}
 
 
@@ -0,0 +1,166 @@
+# ui/descubrimiento.py
+# Modelos de Plan y de Espacio/Materia que usan los selects en cascada de ui.api
+# (planes por carrera, materias por plan). Las heurísticas recorren apps.get_models() y
+# los _meta de cada modelo: corren una sola vez, en UiConfig.ready(), y dejan una Fuente
+# congelada con el queryset .values() ya armado. Cada request sólo filtra y evalúa.
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.db import models
+
+logger = logging.getLogger(__name__)
+
+# Campos candidatos a etiqueta, en orden de preferencia (como ui.api._best_label)
+ETIQUETAS = ("nombre", "name", "descripcion", "descripcion_corta", "titulo", "resolucion")
+
+
+# ============ Heurísticas (sólo al arrancar) ============
+def _fks(model):
+    return [f for f in model._meta.get_fields() if getattr(f, "many_to_one", False)]
+
+
+def find_plan_model():
+    """
+    Busca un modelo que represente 'Plan' (PlanEstudio/Plan/etc.) con un FK a Profesorado/Carrera.
+    """
+    candidates = []
+    for m in apps.get_models():
+        n = m.__name__.lower()
+        # el nombre del modelo debe insinuar que es un plan
+        if "plan" in n:
+            # Heurística: que tenga algún FK que suene a profesorados/carreras
+            for fk in _fks(m):
+                fkname = fk.name.lower()
+                target = fk.related_model.__name__.lower()
+                if any(k in fkname for k in ("carr", "prof")) or any(
+                    k in target for k in ("carr", "prof")
+                ):
+                    candidates.append(m)
+                    break
+    # si hay muchos, priorizo los que incluyan 'estudio' en el nombre
+    for m in candidates:
+        if "estudio" in m.__name__.lower():
+            return m
+    return candidates[0] if candidates else None
+
+
+def find_espacio_model():
+    """
+    Busca un modelo de 'materias/espacios/asignaturas' asociado a Plan.
+    """
+    for m in apps.get_models():
+        n = m.__name__.lower()
+        if any(k in n for k in ("espacio", "materia", "asignatura")):
+            # que tenga FK a un modelo cuyo nombre contenga 'plan'
+            for fk in _fks(m):
+                target = fk.related_model.__name__.lower()
+                if "plan" in target:
+                    return m
+    # fallback: el primero que suene a materia
+    for m in apps.get_models():
+        n = m.__name__.lower()
+        if any(k in n for k in ("espacio", "materia", "asignatura")):
+            return m
+    return None
+
+
+def first_matching_fk_name(model, *candidates):
+    """
+    Devuelve el nombre de FK del 'model' cuyo nombre coincida con alguno de 'candidates'.
+    Si no hay match exacto, intenta por el modelo de destino (profesorado/carrera/plan).
+    """
+    fks = _fks(model)
+    # 1) por nombre del campo
+    for wanted in candidates:
+        for fk in fks:
+            if fk.name.lower() == wanted.lower():
+                return fk.name
+    # 2) por nombre del modelo de destino
+    for fk in fks:
+        target = fk.related_model.__name__.lower()
+        for wanted in candidates:
+            if wanted.lower() in target:
+                return fk.name
+    # 3) por heurística: el primero que “suena”
+    for fk in fks:
+        nm = fk.name.lower()
+        if any(k in nm for k in candidates):
+            return fk.name
+    return fks[0].name if fks else None
+
+
+def _concretos(model) -> set[str]:
+    return {f.name for f in model._meta.concrete_fields}
+
+
+def campos_etiqueta(model, palabras=()) -> tuple[str, ...]:
+    """
+    Campos (para .values()) de donde sale la etiqueta, en orden de preferencia.
+    Si `nombre` es una property (p. ej. EspacioCurricular.nombre -> materia.nombre), se
+    sigue el FK cuyo modelo suena a alguna de `palabras` y tiene ese campo concreto.
+    """
+    propios = _concretos(model)
+    campos = [c for c in ETIQUETAS if c in propios]
+    for attr in ETIQUETAS:
+        if attr in propios or not isinstance(getattr(model, attr, None), property):
+            continue
+        for fk in _fks(model):
+            destino = fk.related_model
+            if attr in _concretos(destino) and any(p in destino.__name__.lower() for p in palabras):
+                campos.insert(0, f"{fk.name}__{attr}")
+                break
+    return tuple(campos)
+
+
+# ============ Registro congelado ============
+@dataclass(frozen=True)
+class Fuente:
+    model: type[models.Model]
+    fk: str | None  # attname del FK por el que filtra el endpoint (p. ej. "carrera_id")
+    etiquetas: tuple[str, ...]
+    base: models.QuerySet  # sin evaluar: cada request lo clona con .filter()
+
+    def items(self, valor) -> list[dict]:
+        """[{"id", "label"}] de las filas con fk == valor: una query .values()."""
+        qs = self.base.filter(**{self.fk: valor}) if self.fk else self.base.all()
+        return [
+            {
+                "id": f["pk"],
+                "label": next((str(f[c]) for c in self.etiquetas if f[c]), str(f["pk"])),
+            }
+            for f in qs
+        ]
+
+
+def _fuente(model, fk_candidatos, palabras=()) -> Fuente | None:
+    if model is None:
+        return None
+    fk_name = first_matching_fk_name(model, *fk_candidatos)
+    fk = model._meta.get_field(fk_name).attname if fk_name else None
+    # filtros típicos de soft delete / activo si existieran
+    filtros = {c: True for c in ("activo", "is_active") if c in _concretos(model)}
+    etiquetas = campos_etiqueta(model, palabras)
+    base = model._default_manager.filter(**filtros).order_by("pk").values("pk", *etiquetas)
+    logger.debug("Fuente %s: fk=%s etiquetas=%s", model.__name__, fk, etiquetas)
+    return Fuente(model=model, fk=fk, etiquetas=etiquetas, base=base)
+
+
+PLANES: Fuente | None = None
+ESPACIOS: Fuente | None = None
+
+
+def construir() -> None:
+    """Corre las heurísticas y fija PLANES/ESPACIOS (UiConfig.ready; tests si cambian modelos)."""
+    global PLANES, ESPACIOS
+    PLANES = _fuente(find_plan_model(), ("carrera", "profesorado", "titulo", "prof"))
+    ESPACIOS = _fuente(
+        find_espacio_model(),
+        ("plan", "plan_estudio", "planestudio"),
+        palabras=("materia", "asignatura"),
+    )
+    if PLANES is None or ESPACIOS is None:
+        logger.error("No se pudieron inferir modelos de Plan y/o Espacio/Materia.")
@@ -2,6 +2,8 @@
 from django import forms
 from django.apps import apps
 
+from academia_core.busqueda import EstudianteSelect
+
 PlanEstudios = apps.get_model("academia_core", "PlanEstudios")
 Estudiante = apps.get_model("academia_core", "Estudiante")
 Docente = apps.get_model("academia_core", "Docente")
@@ -90,6 +92,7 @@ class InscripcionProfesoradoForm(UIFormMixin, forms.ModelForm):
     class Meta:
         model = EstudianteProfesorado
         exclude = ["legajo_estado", "condicion_admin", "promedio_general"]
+        widgets = {"estudiante": EstudianteSelect()}
 
     def compute_estado_admin(self):
         return None
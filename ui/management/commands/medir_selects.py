@@ -0,0 +1,98 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from academia_core.models import Carrera, EspacioCurricular, Materia, PlanEstudios
+from ui import descubrimiento
+from ui.api import _best_label
+
+
+class _Deshacer(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark de los selects en cascada (planes por carrera, materias por plan): "
+        "heurísticas + instancias por request (como antes) contra el registro de "
+        "ui.descubrimiento. Crea los datos en una transacción que se descarta."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--espacios", type=int, default=40)
+        parser.add_argument("--repeticiones", type=int, default=200)
+
+    def handle(self, *args, **opts):
+        try:
+            with transaction.atomic():
+                carrera = Carrera.objects.create(nombre="Benchmark", abreviatura="BENCH")
+                plan = PlanEstudios.objects.create(carrera=carrera, resolucion="0/0", nombre="B")
+                materias = Materia.objects.bulk_create(
+                    Materia(nombre=f"Materia {i:03d}") for i in range(opts["espacios"])
+                )
+                EspacioCurricular.objects.bulk_create(
+                    EspacioCurricular(plan=plan, materia=m, anio="1°", cuatrimestre="A")
+                    for m in materias
+                )
+                self._reporte(carrera.pk, plan.pk, opts["repeticiones"])
+                raise _Deshacer
+        except _Deshacer:
+            pass
+
+    def _reporte(self, carrera_id, plan_id, repeticiones):
+        filas = [
+            ("descubrimiento", self._heuristicas, lambda: None),
+            (
+                "planes",
+                lambda: self._antes(
+                    descubrimiento.find_plan_model(),
+                    ("carrera", "profesorado", "titulo", "prof"),
+                    carrera_id,
+                ),
+                lambda: descubrimiento.PLANES.items(carrera_id),
+            ),
+            (
+                "materias",
+                lambda: self._antes(
+                    descubrimiento.find_espacio_model(),
+                    ("plan", "plan_estudio", "planestudio"),
+                    plan_id,
+                ),
+                lambda: descubrimiento.ESPACIOS.items(plan_id),
+            ),
+        ]
+        self.stdout.write(f"ms por request (mejor de {repeticiones}); queries entre paréntesis")
+        self.stdout.write(f"{'':<16}{'antes':>14}{'después':>14}")
+        for nombre, antes, despues in filas:
+            (ms_a, q_a), (ms_d, q_d) = (
+                self._medir(antes, repeticiones),
+                self._medir(despues, repeticiones),
+            )
+            self.stdout.write(f"{nombre:<16}{ms_a:>9.3f} ({q_a:>2}){ms_d:>9.3f} ({q_d:>2})")
+
+    @staticmethod
+    def _heuristicas():
+        # lo que cada request pagaba antes de consultar
+        for modelo, fks in (
+            (descubrimiento.find_plan_model(), ("carrera", "profesorado")),
+            (descubrimiento.find_espacio_model(), ("plan", "plan_estudio")),
+        ):
+            descubrimiento.first_matching_fk_name(modelo, *fks)
+
+    @staticmethod
+    def _antes(modelo, fks, valor):
+        fk = descubrimiento.first_matching_fk_name(modelo, *fks)
+        qs = modelo.objects.filter(**{f"{fk}_id": valor}).order_by("pk")
+        return [{"id": o.pk, "label": _best_label(o)} for o in qs]
+
+    @staticmethod
+    def _medir(funcion, repeticiones):
+        mejor = float("inf")
+        for _ in range(repeticiones):
+            with CaptureQueriesContext(connection) as q:
+                t0 = time.perf_counter()
+                funcion()
+                mejor = min(mejor, (time.perf_counter() - t0) * 1000)
+        return mejor, len(q.captured_queries)
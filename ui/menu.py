@@ -1,4 +1,8 @@
 # ui/menu.py
+from functools import cache
+from types import MappingProxyType
+
+from django.urls import NoReverseMatch, reverse
 
 # Estructura: lista de secciones. Cada sección tiene un título y sus items.
 # Usamos rutas absolutas (strings) para la mayoría, y 'url_name' sólo donde necesitamos
@@ -34,6 +38,7 @@ BEDEL_MENU = [
             },
             {"label": "Cartón", "path": "/carton", "icon": "id-card"},
             {"label": "Histórico", "path": "/historico", "icon": "clock"},
+            {"label": "Cargar acta", "url_name": "ui:cargar_acta", "icon": "pencil"},
             {
                 "label": "Correlatividades",
                 "path": "/academico/correlatividades",
@@ -96,6 +101,10 @@ DOCENTE_MENU = [
         "title": "INICIO",
         "items": [{"label": "Dashboard", "path": "/dashboard", "icon": "home"}],
     },
+    {
+        "title": "ACADÉMICO",
+        "items": [{"label": "Cargar acta", "url_name": "ui:cargar_acta", "icon": "pencil"}],
+    },
 ]
 
 # Estudiante
@@ -129,17 +138,61 @@ ESTUDIANTE_MENU = [
 ]
 
 
+ROLES = ("Admin", "Secretaría", "Bedel", "Docente", "Estudiante")
+MENUS = {
+    "Admin": ADMIN_MENU,
+    "Secretaría": SECRETARIA_MENU,
+    "Bedel": BEDEL_MENU,
+    "Docente": DOCENTE_MENU,
+    "Estudiante": ESTUDIANTE_MENU,
+}
+
+
 def for_role(role):
-    role = (role or "").strip()
-    if role == "Admin":
-        return ADMIN_MENU
-    if role == "Secretaría":
-        return SECRETARIA_MENU
-    if role == "Bedel":
-        return BEDEL_MENU
-    if role == "Docente":
-        return DOCENTE_MENU
-    if role == "Estudiante":
-        return ESTUDIANTE_MENU
-    # Fallback sensato
-    return ESTUDIANTE_MENU
+    # Fallback sensato: Estudiante
+    return MENUS.get((role or "").strip(), ESTUDIANTE_MENU)
+
+
+def _congelar(valor):
+    if isinstance(valor, dict):
+        return MappingProxyType({k: _congelar(v) for k, v in valor.items()})
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+def _resolver_items(items, role):
+    resueltos = []
+    for it in items:
+        if role not in it.get("roles", ROLES):
+            continue
+        it = dict(it)
+        url_name = it.pop("url_name", None)
+        if url_name and "path" not in it:
+            try:
+                it["path"] = reverse(url_name)
+            except NoReverseMatch:
+                it["path"] = "#"
+        if "url" not in it and "path" in it:
+            it["url"] = it["path"]
+        for hijos in ("items", "children"):
+            if isinstance(it.get(hijos), list):
+                it[hijos] = _resolver_items(it[hijos], role)
+        resueltos.append(it)
+    return resueltos
+
+
+def resuelto(role):
+    """
+    Menú del rol con las URLs ya resueltas (reverse) y sin los items de otros roles.
+    Se arma la primera vez que se pide, con el URLconf ya cargado, y queda congelado
+    (tuplas y MappingProxyType) para todo el proceso. ui.signals lo limpia si cambia
+    ROOT_URLCONF.
+    """
+    return _resuelto(role if role in MENUS else "Estudiante")
+
+
+@cache
+def _resuelto(role):
+    secciones = [dict(s, items=_resolver_items(s.get("items", []), role)) for s in MENUS[role]]
+    return _congelar(secciones)
@@ -10,7 +10,7 @@ class RolesAllowedMixin:
     def dispatch(self, request, *args, **kwargs):
         if not request.user.is_authenticated:
             raise PermissionDenied
-        role = request.session.get("active_role") or resolve_role(request.user)
+        role = request.session.get("active_role") or resolve_role(request.user, request.session)
         if self.allowed_roles and role not in self.allowed_roles:
             raise PermissionDenied
         return super().dispatch(request, *args, **kwargs)
@@ -1,6 +1,8 @@
 # ui/permissions.py
 from django.contrib.auth.mixins import UserPassesTestMixin
 
+from .auth_views import grupos_de
+
 
 class RolesPermitidosMixin(UserPassesTestMixin):
     """
@@ -19,8 +21,7 @@ class RolesPermitidosMixin(UserPassesTestMixin):
         # Use allowed_roles from the view if it exists
         allowed = getattr(self, "allowed_roles", self.allowed)
 
-        names = set(u.groups.values_list("name", flat=True))
-        return bool(set(allowed) & names)
+        return bool(set(allowed) & grupos_de(u, self.request.session))
 
 
 # Alias retrocompatible: cualquier vista que use RolesAllowedMixin seguirá funcionando
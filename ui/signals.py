@@ -1,13 +1,18 @@
 # ui/signals.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
 from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.core.signals import setting_changed
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from .auth_views import resolve_role
+from . import menu
+from .auth_views import invalidar_grupos, resolve_role
 
 
 @receiver(user_logged_in)
 def set_active_role(sender, user, request, **kwargs):
-    role = resolve_role(user)
+    role = resolve_role(user, request.session)
     request.session["active_role"] = role
 
 
@@ -15,3 +20,31 @@ def set_active_role(sender, user, request, **kwargs):
 def clear_active_role(sender, user, request, **kwargs):
     if hasattr(request, "session"):
         request.session.pop("active_role", None)
+
+
+# ---------- cache de grupos (ver auth_views.grupos_de) ----------
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def _grupos_cambiaron(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:  # user.groups.add(...)
+        instance.__dict__.pop("_grupos_cache", None)
+        invalidar_grupos(instance.pk)
+    elif pk_set:  # group.user_set.add(...)
+        for user_id in pk_set:
+            invalidar_grupos(user_id)
+    else:  # group.user_set.clear(): no sabemos a quiénes afectó
+        invalidar_grupos()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def _grupo_cambio(sender, raw=False, **kwargs):
+    if not raw:  # renombrar o borrar un grupo cambia los nombres de todos sus usuarios
+        invalidar_grupos()
+
+
+@receiver(setting_changed)
+def _urlconf_cambio(setting, **kwargs):
+    if setting == "ROOT_URLCONF":
+        menu._resuelto.cache_clear()
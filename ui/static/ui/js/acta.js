@@ -0,0 +1,114 @@
+// Acta volante: arma la grilla de la comisión/mesa y la guarda de una sola vez
+// contra ui:api_acta_guardar (que devuelve los errores por fila).
+(function () {
+  const form = document.getElementById('form-acta');
+  if (!form) return;
+
+  const $ = (id) => document.getElementById(id);
+  const condiciones = JSON.parse($('acta-condiciones').textContent);
+  const filas = $('acta-filas');
+  const msg = $('acta-mensaje');
+
+  const tipoInicial = new URLSearchParams(window.location.search).get('tipo');
+  if (tipoInicial === 'REG' || tipoInicial === 'FIN') $('acta-tipo').value = tipoInicial;
+
+  function getCookie(name) {
+    const m = document.cookie.match('(^|;)\\s*' + name + '\\s*=\\s*([^;]+)');
+    return m ? decodeURIComponent(m.pop()) : '';
+  }
+
+  async function llenar(select, url, label) {
+    select.innerHTML = '<option value="">— Seleccioná —</option>';
+    const data = await (await fetch(url)).json();
+    for (const it of data.results || []) {
+      select.add(new Option(it[label], it.id));
+    }
+  }
+
+  function opcionesCondicion() {
+    const tipo = $('acta-tipo').value;
+    return condiciones
+      .filter((c) => c.tipo === tipo)
+      .map((c) => `<option value="${c.codigo}">${c.nombre}</option>`)
+      .join('');
+  }
+
+  function aviso(texto, tono) {
+    msg.textContent = texto;
+    msg.className = 'text-sm mb-3 ' + (tono === 'error' ? 'text-red-600' : 'text-emerald-700');
+  }
+
+  llenar($('acta-carrera'), form.dataset.apiCarreras, 'nombre');
+  $('acta-carrera').addEventListener('change', (e) => {
+    llenar($('acta-plan'), `${form.dataset.apiPlanes}?carrera=${e.target.value}`, 'nombre');
+  });
+  $('acta-plan').addEventListener('change', (e) => {
+    llenar($('acta-espacio'), `${form.dataset.apiMats}?plan_id=${e.target.value}`, 'nombre');
+  });
+
+  $('acta-traer').addEventListener('click', async () => {
+    const params = new URLSearchParams({
+      espacio: $('acta-espacio').value,
+      tipo: $('acta-tipo').value,
+    });
+    if ($('acta-anio').value) params.set('anio', $('acta-anio').value);
+    if ($('acta-tipo').value === 'FIN' && $('acta-fecha').value) params.set('fecha', $('acta-fecha').value);
+    const resp = await fetch(`${form.dataset.apiPlanilla}?${params}`);
+    if (!resp.ok) return aviso('Elegí el espacio y el tipo de acta.', 'error');
+    const { items } = await resp.json();
+    const opts = opcionesCondicion();
+    filas.innerHTML = items
+      .map(
+        (it) => `<tr class="border-b" data-inscripcion="${it.inscripcion}">
+          <td class="py-1">${it.apellido}, ${it.nombre}</td><td>${it.dni}</td>
+          <td><select class="rounded border px-2 py-1" name="condicion">${opts}</select></td>
+          <td><input class="w-20 rounded border px-2 py-1" name="nota" inputmode="decimal"></td>
+          <td><input type="checkbox" name="ausente"></td>
+          <td><input type="checkbox" name="ausencia_justificada"></td>
+          <td class="text-red-600" data-error></td>
+        </tr>`
+      )
+      .join('');
+    aviso(items.length ? `${items.length} estudiantes.` : 'No hay estudiantes para esta acta.');
+  });
+
+  async function enviar(soloValidar) {
+    const rows = [...filas.querySelectorAll('tr')];
+    rows.forEach((tr) => (tr.querySelector('[data-error]').textContent = ''));
+    const payload = {
+      espacio: $('acta-espacio').value,
+      tipo: $('acta-tipo').value,
+      fecha: $('acta-fecha').value,
+      libro: $('acta-libro').value,
+      folio: $('acta-folio').value,
+      solo_validar: soloValidar,
+      filas: rows.map((tr) => ({
+        inscripcion: tr.dataset.inscripcion,
+        condicion: tr.querySelector('[name=condicion]').value,
+        nota: tr.querySelector('[name=nota]').value,
+        ausente: tr.querySelector('[name=ausente]').checked,
+        ausencia_justificada: tr.querySelector('[name=ausencia_justificada]').checked,
+      })),
+    };
+    const resp = await fetch(form.dataset.apiGuardar, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', 'X-CSRFToken': getCookie('csrftoken') },
+      body: JSON.stringify(payload),
+    });
+    const data = await resp.json();
+    if (data.ok) {
+      return aviso(soloValidar ? `Las ${data.validas} filas validan.` : `Acta guardada: ${data.creados} movimientos.`);
+    }
+    for (const e of data.errores || []) {
+      const tr = rows[e.fila - 1];
+      if (tr) tr.querySelector('[data-error]').textContent = e.error;
+    }
+    aviso(data.error || `${(data.errores || []).length} filas con errores; no se guardó nada.`, 'error');
+  }
+
+  $('acta-validar').addEventListener('click', () => enviar(true));
+  form.addEventListener('submit', (e) => {
+    e.preventDefault();
+    enviar(false);
+  });
+})();
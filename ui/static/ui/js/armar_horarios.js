@@ -17,7 +17,7 @@ function turnoSlugFromSelect($selTurno) {
   const txt = $selTurno.options[$selTurno.selectedIndex]?.text?.toLowerCase() ?? "";
   if (txt.startsWith("mañ")) return "manana";
   if (txt.startsWith("tar")) return "tarde";
-  if (txt.startsWith("noc")) return "noche";
+  if (txt.startsWith("noc") || txt.startsWith("ves")) return "vespertino";
   return txt || "manana";
 }
 
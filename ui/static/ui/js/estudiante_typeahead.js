@@ -0,0 +1,97 @@
+// ui/static/ui/js/estudiante_typeahead.js
+// Convierte <select data-typeahead="estudiantes" data-url="..."> en un buscador:
+// pide de a una página (?q=&limit=&cursor=) y agrega "Ver más" con el cursor `next`.
+// El <select> sigue siendo el campo del form (value/change como siempre).
+(function () {
+  const LIMITE = 20;
+  const ESPERA_MS = 250;
+
+  function opcion(value, label, selected) {
+    const o = document.createElement("option");
+    o.value = value;
+    o.textContent = label;
+    if (selected) o.selected = true;
+    return o;
+  }
+
+  function mejorar(sel) {
+    if (sel.dataset.typeaheadListo) return;
+    sel.dataset.typeaheadListo = "1";
+
+    const url = sel.dataset.url;
+    const input = document.createElement("input");
+    input.type = "search";
+    input.autocomplete = "off";
+    input.placeholder = "Buscar por apellido, nombre o DNI…";
+    input.className = sel.className;
+    input.style.marginBottom = "0.25rem";
+
+    const mas = document.createElement("button");
+    mas.type = "button";
+    mas.textContent = "Ver más";
+    mas.hidden = true;
+    mas.className = "btn btn-link btn-sm p-0 text-sm underline";
+
+    sel.parentNode.insertBefore(input, sel);
+    sel.parentNode.insertBefore(mas, sel.nextSibling);
+
+    let siguiente = null;
+    let pedido = 0;
+    let timer = null;
+
+    async function cargar(agregar) {
+      const n = ++pedido;
+      const params = new URLSearchParams({ q: input.value.trim(), limit: LIMITE });
+      if (agregar && siguiente) params.set("cursor", siguiente);
+      let data;
+      try {
+        const resp = await fetch(`${url}?${params}`, {
+          headers: { "X-Requested-With": "XMLHttpRequest" },
+          credentials: "same-origin",
+        });
+        if (!resp.ok) return;
+        data = await resp.json();
+      } catch (_e) {
+        return;
+      }
+      if (n !== pedido) return; // llegó tarde: ya hay otra búsqueda en curso
+
+      const elegido = sel.value;
+      if (!agregar) {
+        // se conserva el vacío y el elegido; el resto se reemplaza
+        Array.from(sel.options).forEach((o) => {
+          if (o.value !== "" && o.value !== elegido) o.remove();
+        });
+      }
+      const presentes = new Set(Array.from(sel.options).map((o) => o.value));
+      (data.items || []).forEach((it) => {
+        const v = String(it.id);
+        if (!presentes.has(v)) sel.appendChild(opcion(v, it.label, false));
+      });
+      siguiente = data.next || null;
+      mas.hidden = !siguiente;
+    }
+
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => cargar(false), ESPERA_MS);
+    });
+    mas.addEventListener("click", () => cargar(true));
+    sel.addEventListener("focus", () => {
+      if (sel.options.length <= 2 && !siguiente) cargar(false);
+    }, { once: true });
+  }
+
+  function mejorarTodos(raiz) {
+    (raiz || document)
+      .querySelectorAll('select[data-typeahead="estudiantes"]')
+      .forEach(mejorar);
+  }
+
+  window.estudianteTypeahead = mejorarTodos;
+  if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", () => mejorarTodos());
+  } else {
+    mejorarTodos();
+  }
+})();
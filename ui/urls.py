@@ -2,6 +2,7 @@ from django.urls import path
 
 from . import api, views, views_api, views_docentes, views_panel
 from .views import (
+    CargarActaView,
     CartonEstudianteView,
     CorrelatividadesView,
     DashboardView,
@@ -39,6 +40,7 @@ urlpatterns = [
     path("inscripciones/materia/nueva/", views.insc_materia_new, name="insc_materia_new"),
     path("inscripciones/mesa/nueva/", views.insc_mesa_new, name="insc_mesa_new"),
     # Académico
+    path("academico/actas", CargarActaView.as_view(), name="cargar_acta"),
     path("academico/correlatividades", CorrelatividadesView.as_view(), name="correlatividades"),
     # Cartón e Histórico del Estudiante
     path("estudiante/carton", CartonEstudianteView.as_view(), name="carton_estudiante"),
@@ -50,6 +52,7 @@ urlpatterns = [
     path("api/materias/", views_api.api_materias, name="api_materias"),
     path("api/docentes/", views_api.api_docentes, name="api_docentes"),
     path("api/horario/save", views_api.api_horario_save, name="api_horario_save"),
+    path("api/horarios/grilla/save", views_api.api_grilla_save, name="api_grilla_save"),
     path(
         "api/horarios/materia/", views_api.api_get_horarios_materia, name="api_get_horarios_materia"
     ),
@@ -73,6 +76,17 @@ urlpatterns = [
         name="api_correlatividades_por_espacio",
     ),
     path("api/materias-por-plan/", api.api_materias_por_plan, name="api_materias_por_plan"),
+    path("api/estudiantes/buscar/", api.api_estudiantes_buscar, name="api_estudiantes_buscar"),
+    path("api/actas/planilla/", api.api_acta_planilla, name="api_acta_planilla"),
+    path("api/actas/guardar/", api.api_acta_guardar, name="api_acta_guardar"),
+    path("api/carton/", api.api_carton, name="api_carton"),
+    path(
+        "api/regularidades/por-vencer/",
+        api.api_regularidades_por_vencer,
+        name="api_regularidades_por_vencer",
+    ),
+    path("api/admision/turno/<str:ticket>", api.api_admision_turno, name="api_admision_turno"),
+    path("api/admision/metricas/", api.api_admision_metricas, name="api_admision_metricas"),
     path(
         "api/calcular-estado-administrativo/",
         api.api_calcular_estado_administrativo,
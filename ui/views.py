@@ -5,7 +5,6 @@ from django.contrib.auth.decorators import login_required  # Added for new views
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Q
 from django.http import (
     HttpResponse,  # Added for new views
     HttpResponseForbidden,
@@ -23,11 +22,12 @@ from django.views.generic import (
 )
 
 # Modelos
-from academia_core.models import Docente, Estudiante
+from academia_core import carton, indice_busqueda
+from academia_core.models import Condicion, Docente, Estudiante
 from academia_horarios.forms import DocenteAsignacionForm
 from academia_horarios.models import Catedra, Comision, HorarioClase, TimeSlot, TurnoModel
 
-from .auth_views import ROLE_HOME  # Importar ROLE_HOME
+from .auth_views import ROLE_HOME, grupos_de, resolve_role  # Importar ROLE_HOME
 
 # Formularios de la app UI
 from .forms import (
@@ -62,6 +62,22 @@ def resolve_estudiante_from_request(request):
     return None
 
 
+ROLES_CARTON_AJENO = {"Admin", "Secretaría", "Bedel"}
+
+
+def estudiante_id_para_carton(request):
+    """
+    ID del estudiante cuyo cartón se muestra o None.
+    - Bedel/Secretaría/Admin -> el de ?est=<ID>.
+    - Cualquier otro rol -> sólo el propio (perfil.estudiante), se ignora ?est=.
+    """
+    if resolve_role(request.user, request.session) in ROLES_CARTON_AJENO:
+        est = request.GET.get("est") or ""
+        return int(est) if est.isdigit() else None
+    perfil = getattr(request.user, "perfil", None)
+    return perfil.estudiante_id if perfil else None
+
+
 # ---------- Dashboard ----------
 class DashboardView(LoginRequiredMixin, TemplateView):
     template_name = "ui/dashboard.html"
@@ -92,15 +108,7 @@ class EstudianteListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         qs = super().get_queryset().order_by("apellido", "nombre")
-        q = (self.request.GET.get("q") or "").strip()
-        if q:
-            qs = qs.filter(
-                Q(apellido__icontains=q)
-                | Q(nombre__icontains=q)
-                | Q(dni__icontains=q)
-                | Q(email__icontains=q)
-            )
-        return qs
+        return indice_busqueda.filtrar(qs, self.request.GET.get("q") or "")
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -130,15 +138,7 @@ class DocenteListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         qs = super().get_queryset().order_by("apellido", "nombre")
-        q = (self.request.GET.get("q") or "").strip()
-        if q:
-            qs = qs.filter(
-                Q(apellido__icontains=q)
-                | Q(nombre__icontains=q)
-                | Q(dni__icontains=q)
-                | Q(email__icontains=q)
-            )
-        return qs
+        return indice_busqueda.filtrar(qs, self.request.GET.get("q") or "")
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -173,11 +173,13 @@ class InscribirMateriaView(LoginRequiredMixin, RolesAllowedMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx["prefill_est"] = self.request.GET.get("est") or ""
-        ctx["estudiantes"] = (
-            Estudiante.objects.all()
-            .order_by("apellido", "nombre")
-            .values("id", "apellido", "nombre", "dni")
+        est = self.request.GET.get("est") or ""
+        ctx["prefill_est"] = est
+        # El resto de las opciones las trae el typeahead (ui:api_estudiantes_buscar)
+        ctx["estudiante_elegido"] = (
+            Estudiante.objects.filter(pk=est).values("id", "apellido", "nombre", "dni").first()
+            if est.isdigit()
+            else None
         )
         return ctx
 
@@ -189,6 +191,21 @@ class InscribirFinalView(LoginRequiredMixin, RolesAllowedMixin, TemplateView):
     extra_context = {"page_title": "Inscribir a Mesa de Final"}
 
 
+class CargarActaView(LoginRequiredMixin, RolesAllowedMixin, TemplateView):
+    """Acta volante: toda la comisión o la mesa en una grilla, se guarda en bloque."""
+
+    allowed_roles = ["Admin", "Secretaría", "Bedel", "Docente"]
+    template_name = "ui/calificaciones/acta.html"
+    extra_context = {"page_title": "Cargar acta"}
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["condiciones"] = list(
+            Condicion.objects.order_by("tipo", "nombre").values("codigo", "nombre", "tipo")
+        )
+        return ctx
+
+
 class InscripcionProfesoradoView(RolesPermitidosMixin, LoginRequiredMixin, CreateView):
     allowed_roles = {"Admin", "Secretaría", "Bedel"}
     template_name = "ui/inscripciones/inscripcion_profesorado_form.html"
@@ -290,9 +307,20 @@ class CorrelatividadesView(LoginRequiredMixin, RolesAllowedMixin, FormView):
 
 # --- Vistas del Estudiante ---
 class CartonEstudianteView(LoginRequiredMixin, RolesAllowedMixin, TemplateView):
+    """Cartón leído de CartonFila (una query); ver academia_core.carton."""
+
     template_name = "ui/estudiante/carton.html"
     allowed_roles = ["Estudiante", "Bedel", "Secretaría", "Admin"]
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        est_id = estudiante_id_para_carton(self.request)
+        filas = list(carton.de_estudiante(est_id)) if est_id else []
+        ctx["estudiante"] = filas[0].inscripcion.estudiante if filas else None
+        ctx["carreras"] = carton.por_carrera(filas)
+        ctx["est_id"] = est_id
+        return ctx
+
 
 class HistoricoEstudianteView(LoginRequiredMixin, RolesAllowedMixin, TemplateView):
     template_name = "ui/estudiante/historico.html"
@@ -303,7 +331,7 @@ class HistoricoEstudianteView(LoginRequiredMixin, RolesAllowedMixin, TemplateVie
 class SwitchRoleView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         new_role = request.POST.get("role")
-        allowed = set(request.user.groups.values_list("name", flat=True))
+        allowed = set(grupos_de(request.user, request.session))
         if request.user.is_superuser:
             allowed.add("Admin")
         if new_role not in allowed:
@@ -5,12 +5,22 @@ import logging
 
 from django.apps import apps
 from django.db import transaction
-from django.db.models import CharField, F, Value
+from django.db.models import CharField, F, Q, Value
 from django.db.models.functions import Coalesce, Concat
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET, require_POST
 
-from academia_horarios.models import Bloque, Horario, MateriaEnPlan, TurnoModel
+from academia_horarios import grillas, ocupacion
+from academia_horarios.conflictos import (
+    DIA_SLUG,
+    detectar_conflictos,
+    franja_de_horario,
+    franja_de_item,
+)
+from academia_horarios.models import Horario, MateriaEnPlan, TurnoModel
+from academia_horarios.services import guardar_grillas
+
+from .cache_respuestas import cacheada
 
 PlanEstudios = apps.get_model("academia_core", "PlanEstudios")
 EspacioCurricular = apps.get_model("academia_core", "EspacioCurricular")
@@ -21,6 +31,7 @@ logger = logging.getLogger(__name__)
 
 
 @require_GET
+@cacheada("academia_core.Carrera")
 def api_carreras(request):
     qs = Carrera.objects.order_by("nombre").values("id", "nombre")
     results = list(qs)
@@ -29,6 +40,7 @@ def api_carreras(request):
 
 
 @require_GET
+@cacheada("academia_core.PlanEstudios")
 def api_planes(request):
     # Aceptamos carrera o carrera_id
     carrera_id = request.GET.get("carrera") or request.GET.get("carrera_id")
@@ -44,6 +56,7 @@ def api_planes(request):
 
 
 @require_GET
+@cacheada("academia_core.EspacioCurricular", "academia_core.Materia", "academia_horarios.Periodo")
 def api_materias(request):
     params = request.GET.dict()
     logger.info("api_materias GET params=%s", params)
@@ -84,6 +97,12 @@ def _get(request, *names):
 
 
 @require_GET
+@cacheada(
+    "academia_core.Docente",
+    "academia_core.DocenteEspacio",
+    "academia_core.EspacioCurricular",
+    "academia_core.PlanEstudios",
+)
 def api_docentes(request):
     carrera_id = _get(request, "carrera", "carrera_id")
     materia_id = _get(request, "materia")
@@ -111,6 +130,7 @@ def api_docentes(request):
 
 
 @require_GET
+@cacheada("academia_horarios.TurnoModel")
 def api_turnos(request):
     """
     GET /ui/api/turnos
@@ -127,23 +147,52 @@ def api_turnos(request):
 
 @require_GET
 def api_horarios_ocupados(request):
-    turno_slug = (request.GET.get("turno") or "").lower()
-    if turno_slug == "sabado":
+    """
+    GET /ui/api/horarios-ocupados/?turno=manana&docente=3&aula=12&carrera=1&plan=2&anio=1
+    Bloques del turno ocupados/libres para la combinación pedida, como bitsets por día
+    (bit i = slots[i]) desde el índice de ocupación precalculado.
+    """
+    crudo = (request.GET.get("turno") or "").strip()
+    if not crudo:
+        return JsonResponse({"ocupados": []})
+    turno_slug = grillas.normalizar_turno(crudo)
+    if turno_slug is None:
+        return JsonResponse({"error": "Turno inválido"}, status=400)
+    if turno_slug == "sabado":  # el sábado se muestra con el turno mañana
         turno_slug = "manana"
 
-    docente_id = request.GET.get("docente") or None
-    aula_id = request.GET.get("aula") or None
-
-    ocupados = []
-    if turno_slug:
-        qs = Horario.objects.filter(turno=turno_slug)  # quitar activo=True
-
-        if docente_id:
-            ocupados.extend(list(qs.filter(docente_id=docente_id).values("dia", "inicio", "fin")))
-        if aula_id:
-            ocupados.extend(list(qs.filter(aula_id=aula_id).values("dia", "inicio", "fin")))
-
-    return JsonResponse({"ocupados": ocupados})
+    claves = []
+    try:
+        if request.GET.get("docente"):
+            claves.append(ocupacion.clave_docente(request.GET["docente"]))
+        if request.GET.get("aula"):
+            claves.append(ocupacion.clave_aula(request.GET["aula"]))
+        curso = [request.GET.get(k) for k in ("carrera", "plan", "anio")]
+        if all(curso):
+            claves.append(ocupacion.clave_curso(*curso))
+    except ValueError:
+        return JsonResponse({"error": "Parámetros inválidos"}, status=400)
+
+    idx = ocupacion.indice(turno_slug)
+    ocupado = idx.ocupado(*claves)
+    slots = [[f"{i // 60:02d}:{i % 60:02d}", f"{f // 60:02d}:{f % 60:02d}"] for i, f in idx.slots]
+    return JsonResponse(
+        {
+            "turno": turno_slug,
+            "version": idx.version,
+            "dias": ocupacion.DIAS,
+            "slots": slots,
+            "ocupado": ocupado,
+            "libre": idx.libres(*claves),
+            # formato anterior (lista de bloques ocupados), para la grilla actual
+            "ocupados": [
+                {"dia": dia, "inicio": slots[i][0], "fin": slots[i][1]}
+                for d, dia in enumerate(ocupacion.DIAS)
+                for i in range(len(slots))
+                if ocupado[d] >> i & 1
+            ],
+        }
+    )
 
 
 def _validate_draft_overlaps(draft):
@@ -181,6 +230,32 @@ def _validate_draft_overlaps(draft):
     return None
 
 
+def _conflictos_con_grilla(items, reemplaza, profesorado_id, anio, comision_seccion):
+    """
+    Choques del borrador contra los Horario ya guardados (menos los que `reemplaza`):
+    mismo docente, misma aula o mismo curso (profesorado + año + comisión).
+    """
+    dias = {it["dia"] for it in items if it.get("dia") in DIA_SLUG}
+    if not dias:
+        return []
+    docentes = {it["docente_id"] for it in items if it.get("docente_id")}
+    aulas = {it["aula"].strip() for it in items if (it.get("aula") or "").strip()}
+
+    relevantes = Q(profesorado_id=profesorado_id, anio=anio) | Q(docente_id__in=docentes)
+    if aulas:
+        relevantes |= Q(aula__in=aulas)
+    existentes = (
+        Horario.objects.filter(relevantes, dia__in=dias)
+        .exclude(pk__in=reemplaza.values("pk"))
+        .only("id", "dia", "inicio", "fin", "docente", "aula", "profesorado", "anio", "comision")
+    )
+    nuevas = [
+        franja_de_item(it, profesorado_id, anio, comision_seccion, ref=("borrador", i))
+        for i, it in enumerate(items)
+    ]
+    return detectar_conflictos(nuevas, [franja_de_horario(h) for h in existentes])
+
+
 @require_POST
 def api_horario_save(request):
     try:
@@ -230,15 +305,27 @@ def api_horario_save(request):
     if err:
         return JsonResponse({"ok": False, "error": err}, status=400)
 
+    # El borrado ahora es específico para la comisión
+    reemplaza = Horario.objects.filter(
+        materia_id=materia_id,
+        plan_id=plan_id,
+        profesorado_id=profesorado_id,
+        turno=turno,
+        comision=comision_seccion,
+    )
+    conflictos = _conflictos_con_grilla(items, reemplaza, profesorado_id, anio, comision_seccion)
+    if conflictos:
+        return JsonResponse(
+            {
+                "ok": False,
+                "error": conflictos[0].mensaje,
+                "conflictos": [c.as_dict() for c in conflictos],
+            },
+            status=400,
+        )
+
     with transaction.atomic():
-        # El borrado ahora es específico para la comisión
-        Horario.objects.filter(
-            materia_id=materia_id,
-            plan_id=plan_id,
-            profesorado_id=profesorado_id,
-            turno=turno,
-            comision=comision_seccion,
-        ).delete()
+        reemplaza.delete()
 
         nuevos = [
             Horario(
@@ -256,10 +343,44 @@ def api_horario_save(request):
             for item in items
         ]
         Horario.objects.bulk_create(nuevos)
+        ocupacion.invalidar()  # bulk_create no dispara señales
 
     return JsonResponse({"ok": True, "count": len(nuevos)})
 
 
+@require_POST
+def api_grilla_save(request):
+    """
+    Guarda la grilla semanal completa de una o más comisiones (HorarioClase):
+    {"comisiones": [{"comision_id": 1, "bloques": [{"dia_semana": 1, "inicio": "07:45",
+    "fin": "08:25", "aula": "5"}]}], "dry_run": false}
+    Valida todo en una pasada y aplica sólo los bloques que cambian.
+    """
+    try:
+        payload = json.loads(request.body.decode("utf-8"))
+        por_comision = {
+            int(c["comision_id"]): c.get("bloques") or [] for c in payload["comisiones"]
+        }
+    except Exception:
+        return JsonResponse({"ok": False, "error": "JSON inválido"}, status=400)
+    if not por_comision:
+        return JsonResponse({"ok": False, "error": "Faltan comisiones"}, status=400)
+
+    res = guardar_grillas(por_comision, dry_run=bool(payload.get("dry_run")))
+    if not res["ok"]:
+        primero = (res["errores"] or res["conflictos"])[0]
+        res["error"] = primero.get("error") or primero.get("mensaje")
+        return JsonResponse(res, status=400)
+    logger.info(
+        "api_grilla_save comisiones=%s +%s ~%s -%s",
+        list(por_comision),
+        res["creados"],
+        res["actualizados"],
+        res["borrados"],
+    )
+    return JsonResponse(res)
+
+
 @require_GET
 def api_horarios_profesorado(request):
     carrera_id = request.GET.get("profesorado_id") or request.GET.get("carrera_id")
@@ -387,37 +508,17 @@ def api_horarios_materia_plan(request):
 
 
 @require_GET
+@cacheada(extra=grillas.version)
 def api_grilla_config(request):
-    turno = (request.GET.get("turno") or "manana").lower()
-    # normaliza tildes si hace falta
-
-    try:
-        if turno == "sabado":
-            qs = Bloque.objects.filter(turno__isnull=True).order_by("orden")
-        else:
-            qs = Bloque.objects.filter(turno__slug=turno).order_by("orden")
-
-        bloques = list(qs.values("dia_semana", "inicio", "fin", "es_recreo"))
-
-        for b in bloques:
-            b["inicio_str"] = b["inicio"].strftime("%H:%M")
-            b["fin_str"] = b["fin"].strftime("%H:%M")
-
-        return JsonResponse(
-            {
-                "rows": [
-                    {"ini": b["inicio_str"], "fin": b["fin_str"], "recreo": b["es_recreo"]}
-                    for b in bloques
-                ]
-            }
-        )
-
-    except Exception:
-        logger.exception(f"api_grilla_config error para turno={turno}")
-        return JsonResponse(
-            {"error": "Error al obtener la configuración de la grilla."},
-            status=500,
-        )
+    """Filas (bloques y recreos) del turno, desde el registro de grillas."""
+    g = grillas.registro().get(request.GET.get("turno")) or grillas.grilla("manana")
+    return JsonResponse(
+        {
+            "rows": [
+                {"ini": r["ini"], "fin": r["fin"], "recreo": r["recreo"]} for r in g.as_json()["lv"]
+            ]
+        }
+    )
 
 
 @require_GET